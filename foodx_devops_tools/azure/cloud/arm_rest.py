@@ -0,0 +1,795 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""
+Azure Resource Manager REST API command backend.
+
+Serves the ``az`` commands used by ``azure.cloud`` directly from the ARM REST
+API on the running event loop, avoiding an ``az`` process per command. Each
+tenant has its own pooled keep-alive connections and cached service principal
+access token; long running operations are polled per the ARM asynchronous
+operation conventions.
+"""
+
+import asyncio
+import json
+import logging
+import pathlib
+import re
+import time
+import typing
+import urllib.parse
+
+from foodx_devops_tools.profiling import SpanKind, trace_span
+from foodx_devops_tools.utilities.command import (
+    CommandArgs,
+    CommandBackend,
+    CompletedCommand,
+    SubprocessBackend,
+    command_label,
+)
+from foodx_devops_tools.utilities.http import (
+    HttpError,
+    HttpResponse,
+    HttpSession,
+)
+
+log = logging.getLogger(__name__)
+
+ARM_ENDPOINT = "https://management.azure.com"
+AUTHORITY_ENDPOINT = "https://login.microsoftonline.com"
+
+RESOURCES_API_VERSION = "2021-04-01"
+SUBSCRIPTIONS_API_VERSION = "2020-01-01"
+
+# refresh access tokens this long before they expire.
+TOKEN_REFRESH_MARGIN_SECONDS = 300.0
+DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+MAXIMUM_POLL_INTERVAL_SECONDS = 60.0
+MAXIMUM_THROTTLE_RETRIES = 5
+
+TERMINAL_OPERATION_STATES = {"succeeded", "failed", "canceled"}
+
+GUID_PATTERN = re.compile(
+    r"^[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}$"
+)
+
+
+class ArmRestError(Exception):
+    """Problem occurred with an ARM REST API request."""
+
+
+class _UnsupportedCommand(Exception):
+    """Command, or command option, is not served by the REST backend."""
+
+
+def _parse_options(
+    arguments: CommandArgs,
+) -> typing.Tuple[typing.List[str], typing.Dict[str, typing.List[str]]]:
+    """Split ``az`` arguments into command words and option values."""
+    words: typing.List[str] = list()
+    options: typing.Dict[str, typing.List[str]] = dict()
+    index = 0
+    while index < len(arguments):
+        this_argument = arguments[index]
+        if this_argument.startswith("--"):
+            options.setdefault(this_argument, list())
+            if (index + 1 < len(arguments)) and (
+                not arguments[index + 1].startswith("--")
+            ):
+                options[this_argument].append(arguments[index + 1])
+                index += 1
+            else:
+                options[this_argument].append("")
+        elif not options:
+            words.append(this_argument)
+        else:
+            raise _UnsupportedCommand(
+                "unexpected argument, {0}".format(this_argument)
+            )
+        index += 1
+
+    return words, options
+
+
+def _option(
+    options: typing.Dict[str, typing.List[str]],
+    name: str,
+    default: typing.Optional[str] = None,
+) -> str:
+    if name in options:
+        return options[name][-1]
+    elif default is not None:
+        return default
+    else:
+        raise ArmRestError("missing option, {0}".format(name))
+
+
+def _error_message(response: HttpResponse) -> str:
+    """Format an ARM error response similarly to the ``az`` CLI."""
+    try:
+        data = response.json()
+        this_error = data.get("error", data) if isinstance(data, dict) else {}
+        message = "({0}) {1}".format(
+            this_error.get("code", response.status),
+            this_error.get("message", ""),
+        )
+        for x in this_error.get("details", None) or list():
+            message += "\n({0}) {1}".format(x.get("code"), x.get("message"))
+        return message
+    except ValueError:
+        return "({0}) {1}".format(
+            response.status, response.body.decode(errors="replace")
+        )
+
+
+T = typing.TypeVar("T", bound="ServicePrincipalToken")
+
+
+class ServicePrincipalToken:
+    """
+    OAuth2 access token of a service principal, cached until near expiry.
+
+    Concurrent requests for an expired token share a single token request.
+    """
+
+    __token: typing.Optional[str]
+    __expires_at: float
+    __lock: typing.Optional[asyncio.Lock]
+
+    def __init__(
+        self: T,
+        session: HttpSession,
+        tenant: str,
+        client_id: str,
+        client_secret: str,
+        authority_endpoint: str = AUTHORITY_ENDPOINT,
+        resource_endpoint: str = ARM_ENDPOINT,
+    ) -> None:
+        """
+        Construct ``ServicePrincipalToken`` object.
+
+        Args:
+            session: HTTP session for token requests.
+            tenant: Azure tenant id.
+            client_id: Service principal application id.
+            client_secret: Service principal secret.
+            authority_endpoint: Azure AD authority.
+            resource_endpoint: Resource the token grants access to.
+        """
+        self.__session = session
+        self.__url = "{0}/{1}/oauth2/v2.0/token".format(
+            authority_endpoint.rstrip("/"), tenant
+        )
+        self.__form = urllib.parse.urlencode(
+            {
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "grant_type": "client_credentials",
+                "scope": "{0}/.default".format(resource_endpoint.rstrip("/")),
+            }
+        ).encode()
+        self.__token = None
+        self.__expires_at = 0.0
+        # created on first use within the event loop.
+        self.__lock = None
+
+    async def get(self: T) -> str:
+        """
+        Get a valid access token, requesting a new token if necessary.
+
+        Raises:
+            ArmRestError: If a token could not be acquired.
+        """
+        if not self.__lock:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            if (not self.__token) or (
+                time.monotonic()
+                >= (self.__expires_at - TOKEN_REFRESH_MARGIN_SECONDS)
+            ):
+                await self.__refresh()
+
+        return typing.cast(str, self.__token)
+
+    async def __refresh(self: T) -> None:
+        log.debug("requesting access token, {0}".format(self.__url))
+        with trace_span("access token", SpanKind.login):
+            response = await self.__session.request(
+                "POST",
+                self.__url,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                body=self.__form,
+            )
+        if not response.ok:
+            raise ArmRestError(
+                "access token request failed, {0}".format(
+                    _error_message(response)
+                )
+            )
+        data = response.json()
+        self.__token = data["access_token"]
+        self.__expires_at = time.monotonic() + float(
+            data.get("expires_in", 3600)
+        )
+
+
+C = typing.TypeVar("C", bound="ArmTenantClient")
+
+
+class ArmTenantClient:
+    """Authenticated ARM REST requests on behalf of a single tenant."""
+
+    def __init__(
+        self: C,
+        tenant: str,
+        client_id: str,
+        client_secret: str,
+        arm_endpoint: str = ARM_ENDPOINT,
+        authority_endpoint: str = AUTHORITY_ENDPOINT,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Construct ``ArmTenantClient`` object.
+
+        Args:
+            tenant: Azure tenant id.
+            client_id: Service principal application id.
+            client_secret: Service principal secret.
+            arm_endpoint: ARM REST API endpoint.
+            authority_endpoint: Azure AD authority.
+            poll_interval_seconds: Default long running operation poll
+                                   interval, if the service does not specify
+                                   one.
+        """
+        self.tenant = tenant
+        self.arm_endpoint = arm_endpoint.rstrip("/")
+        self.poll_interval_seconds = poll_interval_seconds
+        self.session = HttpSession()
+        self.token = ServicePrincipalToken(
+            self.session,
+            tenant,
+            client_id,
+            client_secret,
+            authority_endpoint=authority_endpoint,
+            resource_endpoint=arm_endpoint,
+        )
+
+    def url(self: C, path: str, api_version: str) -> str:
+        """Construct an ARM request URL from a resource path."""
+        return "{0}{1}?api-version={2}".format(
+            self.arm_endpoint, path, api_version
+        )
+
+    async def request(
+        self: C,
+        method: str,
+        url: str,
+        data: typing.Optional[typing.Any] = None,
+    ) -> HttpResponse:
+        """
+        Send an authenticated request, retrying if throttled.
+
+        Args:
+            method: HTTP method.
+            url: Absolute request URL.
+            data: JSON compatible request body.
+
+        Returns:
+            Response.
+        """
+        body = json.dumps(data).encode() if data is not None else None
+        for _ in range(MAXIMUM_THROTTLE_RETRIES):
+            headers = {
+                "Authorization": "Bearer {0}".format(await self.token.get()),
+                "Accept": "application/json",
+            }
+            if body is not None:
+                headers["Content-Type"] = "application/json"
+            response = await self.session.request(method, url, headers, body)
+            if response.status != 429:
+                return response
+            retry_seconds = self.__retry_after(response)
+            log.warning(
+                "ARM request throttled, retrying in {0}s".format(retry_seconds)
+            )
+            await asyncio.sleep(retry_seconds)
+
+        return response
+
+    async def request_list(self: C, url: str) -> typing.List[dict]:
+        """Request all pages of an ARM list."""
+        values: typing.List[dict] = list()
+        next_url: typing.Optional[str] = url
+        while next_url:
+            response = await self.request("GET", next_url)
+            if not response.ok:
+                raise ArmRestError(_error_message(response))
+            data = response.json()
+            values += data.get("value", list())
+            next_url = data.get("nextLink")
+
+        return values
+
+    async def wait_for_operation(
+        self: C, response: HttpResponse
+    ) -> typing.Optional[HttpResponse]:
+        """
+        Poll a long running operation to completion.
+
+        Args:
+            response: Initial response to the request that started the
+                      operation.
+
+        Returns:
+            Final response of a location polled operation; ``None`` for an
+            operation polled by asynchronous operation status.
+        Raises:
+            ArmRestError: If the operation failed.
+        """
+        if not response.ok:
+            raise ArmRestError(_error_message(response))
+
+        if "azure-asyncoperation" in response.headers:
+            status_url = response.headers["azure-asyncoperation"]
+            this_response = response
+            while True:
+                await asyncio.sleep(self.__retry_after(this_response))
+                this_response = await self.request("GET", status_url)
+                if not this_response.ok:
+                    raise ArmRestError(_error_message(this_response))
+                data = this_response.json()
+                status = str(data.get("status", "")).lower()
+                if status == "succeeded":
+                    return None
+                elif status in TERMINAL_OPERATION_STATES:
+                    raise ArmRestError(
+                        "operation {0}, {1}".format(
+                            status, _error_message(this_response)
+                        )
+                    )
+        elif (response.status == 202) and ("location" in response.headers):
+            location_url = response.headers["location"]
+            this_response = response
+            while this_response.status == 202:
+                await asyncio.sleep(self.__retry_after(this_response))
+                this_response = await self.request("GET", location_url)
+            if not this_response.ok:
+                raise ArmRestError(_error_message(this_response))
+            return this_response
+        else:
+            return response
+
+    async def close(self: C) -> None:
+        """Close idle connections."""
+        await self.session.close()
+
+    def __retry_after(self: C, response: HttpResponse) -> float:
+        try:
+            return min(
+                float(response.headers["retry-after"]),
+                MAXIMUM_POLL_INTERVAL_SECONDS,
+            )
+        except (KeyError, ValueError):
+            return self.poll_interval_seconds
+
+
+def _load_parameters(values: typing.List[str]) -> dict:
+    """Merge ``--parameters`` option values into ARM parameters."""
+    parameters: dict = dict()
+    for this_value in values:
+        if this_value.startswith("@"):
+            with pathlib.Path(this_value[1:]).open(mode="r") as f:
+                data = json.load(f)
+        elif this_value.lstrip().startswith("{"):
+            data = json.loads(this_value)
+        else:
+            # KEY=VALUE parameters are left to the az CLI.
+            raise _UnsupportedCommand("unsupported parameters format")
+
+        if ("parameters" in data) and (
+            ("$schema" in data) or ("contentVersion" in data)
+        ):
+            data = data["parameters"]
+        parameters.update(data)
+
+    return parameters
+
+
+B = typing.TypeVar("B", bound="ArmRestBackend")
+
+
+class ArmRestBackend(CommandBackend):
+    """
+    Command backend serving ``az`` commands from the ARM REST API.
+
+    Supports ``login --service-principal``, ``group list/create/delete``,
+    ``deployment group create/validate/list`` of JSON ARM templates and
+    ``resource list``. Any other command, or unsupported option such as a
+    bicep template, is passed to the fallback backend. A service principal
+    login is also passed to the fallback backend so that the commands it
+    runs are authenticated.
+    """
+
+    __clients: typing.Dict[typing.Tuple[str, str], ArmTenantClient]
+    # subscription name or id to subscription id and tenant client.
+    __subscriptions: typing.Dict[str, typing.Tuple[str, ArmTenantClient]]
+
+    def __init__(
+        self: B,
+        arm_endpoint: str = ARM_ENDPOINT,
+        authority_endpoint: str = AUTHORITY_ENDPOINT,
+        fallback: typing.Optional[CommandBackend] = None,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Construct ``ArmRestBackend`` object.
+
+        Args:
+            arm_endpoint: ARM REST API endpoint.
+            authority_endpoint: Azure AD authority.
+            fallback: Backend for commands not served by the REST API.
+            poll_interval_seconds: Default long running operation poll
+                                   interval.
+        """
+        self.arm_endpoint = arm_endpoint
+        self.authority_endpoint = authority_endpoint
+        self.fallback = fallback if fallback else SubprocessBackend()
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self.__clients = dict()
+        self.__subscriptions = dict()
+
+    @property
+    def connections_opened(self: B) -> int:
+        """Number of HTTP connections opened over the life of the backend."""
+        return sum(
+            x.session.connections_opened for x in self.__clients.values()
+        )
+
+    async def run(self: B, command: CommandArgs) -> CompletedCommand:
+        """Serve an ``az`` command from the REST API, or run the command."""
+        if (not command) or (command[0] != "az"):
+            return await self.fallback.run(command)
+
+        try:
+            words, options = _parse_options(command[1:])
+            output = await self.__handler(words)(options)
+            if words == ["login"]:
+                # commands served by the fallback, such as bicep deployments
+                # and step scripts, need the same login.
+                result = await self.fallback.run(command)
+                if result.returncode != 0:
+                    return result
+        except _UnsupportedCommand as e:
+            log.debug(
+                "command not served by ARM REST backend, {0}, {1}".format(
+                    command_label(command), str(e)
+                )
+            )
+            return await self.fallback.run(command)
+        except (
+            ArmRestError,
+            HttpError,
+            OSError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as e:
+            # json decode errors are value errors.
+            return CompletedCommand(
+                returncode=1, out=b"", error="ERROR: {0}".format(e).encode()
+            )
+
+        return CompletedCommand(
+            returncode=0,
+            out=json.dumps(output, indent=2).encode()
+            if output is not None
+            else b"",
+            error=b"",
+        )
+
+    async def aclose(self: B) -> None:
+        """Close idle connections of all tenants."""
+        for this_client in self.__clients.values():
+            await this_client.close()
+
+    def __handler(
+        self: B, words: typing.List[str]
+    ) -> typing.Callable[
+        [typing.Dict[str, typing.List[str]]], typing.Awaitable[typing.Any]
+    ]:
+        handlers: typing.Dict[
+            typing.Tuple[str, ...],
+            typing.Callable[
+                [typing.Dict[str, typing.List[str]]],
+                typing.Awaitable[typing.Any],
+            ],
+        ] = {
+            ("login",): self.__login,
+            ("group", "list"): self.__group_list,
+            ("group", "create"): self.__group_create,
+            ("group", "delete"): self.__group_delete,
+            ("deployment", "group", "create"): self.__deployment_create,
+            ("deployment", "group", "validate"): self.__deployment_validate,
+            ("deployment", "group", "what-if"): self.__deployment_what_if,
+            ("deployment", "group", "list"): self.__deployment_list,
+            ("deployment", "group", "show"): self.__deployment_show,
+            ("resource", "list"): self.__resource_list,
+        }
+        this_key = tuple(words)
+        if this_key not in handlers:
+            raise _UnsupportedCommand("unsupported command")
+
+        return handlers[this_key]
+
+    def __subscription(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> typing.Tuple[str, ArmTenantClient]:
+        subscription = _option(options, "--subscription")
+        if subscription in self.__subscriptions:
+            return self.__subscriptions[subscription]
+        elif GUID_PATTERN.match(subscription) and (len(self.__clients) == 1):
+            return subscription, list(self.__clients.values())[0]
+        else:
+            raise ArmRestError(
+                "subscription not found for logged in service principals, "
+                "{0}".format(subscription)
+            )
+
+    async def __login(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> list:
+        if "--service-principal" not in options:
+            raise _UnsupportedCommand("only service principal login")
+        tenant = _option(options, "--tenant")
+        client_id = _option(options, "--username")
+        this_client = ArmTenantClient(
+            tenant,
+            client_id,
+            _option(options, "--password"),
+            arm_endpoint=self.arm_endpoint,
+            authority_endpoint=self.authority_endpoint,
+            poll_interval_seconds=self.poll_interval_seconds,
+        )
+        # acquire a token now to fail early on bad credentials.
+        await this_client.token.get()
+        previous = self.__clients.pop((tenant, client_id), None)
+        if previous:
+            await previous.close()
+        self.__clients[(tenant, client_id)] = this_client
+
+        subscriptions = await this_client.request_list(
+            this_client.url("/subscriptions", SUBSCRIPTIONS_API_VERSION)
+        )
+        result = list()
+        for x in subscriptions:
+            this_id = x["subscriptionId"]
+            self.__subscriptions[this_id] = (this_id, this_client)
+            self.__subscriptions[x["displayName"]] = (this_id, this_client)
+            result.append(
+                {
+                    "cloudName": "AzureCloud",
+                    "id": this_id,
+                    "isDefault": False,
+                    "name": x["displayName"],
+                    "state": x.get("state", "Enabled"),
+                    "tenantId": x.get("tenantId", tenant),
+                    "user": {"name": client_id, "type": "servicePrincipal"},
+                }
+            )
+        log.info(
+            "ARM REST login succeeded, {0}, {1} subscriptions".format(
+                tenant, len(result)
+            )
+        )
+
+        return result
+
+    async def __group_list(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> list:
+        subscription_id, this_client = self.__subscription(options)
+        return await this_client.request_list(
+            this_client.url(
+                "/subscriptions/{0}/resourcegroups".format(subscription_id),
+                RESOURCES_API_VERSION,
+            )
+        )
+
+    def __group_url(
+        self: B,
+        options: typing.Dict[str, typing.List[str]],
+        suffix: str = "",
+    ) -> typing.Tuple[str, ArmTenantClient]:
+        subscription_id, this_client = self.__subscription(options)
+        path = "/subscriptions/{0}/resourcegroups/{1}{2}".format(
+            subscription_id,
+            urllib.parse.quote(_option(options, "--resource-group")),
+            suffix,
+        )
+        return this_client.url(path, RESOURCES_API_VERSION), this_client
+
+    async def __group_create(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        url, this_client = self.__group_url(options)
+        data: typing.Dict[str, typing.Any] = {
+            "location": _option(options, "--location")
+        }
+        if "--tags" in options:
+            data["tags"] = {
+                x.partition("=")[0]: x.partition("=")[2]
+                for x in options["--tags"]
+            }
+        response = await this_client.request("PUT", url, data)
+        if not response.ok:
+            raise ArmRestError(_error_message(response))
+
+        return response.json()
+
+    async def __group_delete(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> None:
+        url, this_client = self.__group_url(options)
+        response = await this_client.request("DELETE", url)
+        if "--no-wait" in options:
+            if not response.ok:
+                raise ArmRestError(_error_message(response))
+        else:
+            await this_client.wait_for_operation(response)
+
+    def __deployment_body(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        template_path = pathlib.Path(_option(options, "--template-file"))
+        if template_path.suffix.lower() != ".json":
+            raise _UnsupportedCommand("only JSON ARM templates")
+        with template_path.open(mode="r") as f:
+            template = json.load(f)
+
+        return {
+            "properties": {
+                "mode": _option(options, "--mode", "Incremental"),
+                "parameters": _load_parameters(
+                    options.get("--parameters", list())
+                ),
+                "template": template,
+            }
+        }
+
+    def __deployment_name(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> str:
+        # same default as az CLI; the template file name.
+        return _option(
+            options,
+            "--name",
+            pathlib.Path(_option(options, "--template-file")).stem,
+        )
+
+    async def __deployment_create(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> typing.Optional[dict]:
+        body = self.__deployment_body(options)
+        url, this_client = self.__group_url(
+            options,
+            "/providers/Microsoft.Resources/deployments/{0}".format(
+                urllib.parse.quote(self.__deployment_name(options))
+            ),
+        )
+        response = await this_client.request("PUT", url, body)
+        if "--no-wait" in options:
+            if not response.ok:
+                raise ArmRestError(_error_message(response))
+            return None
+
+        await this_client.wait_for_operation(response)
+        final_response = await this_client.request("GET", url)
+        if not final_response.ok:
+            raise ArmRestError(_error_message(final_response))
+        result = final_response.json()
+        state = result.get("properties", dict()).get("provisioningState")
+        if state != "Succeeded":
+            raise ArmRestError(
+                "deployment {0}, {1}".format(
+                    state, _error_message(final_response)
+                )
+            )
+
+        return result
+
+    async def __deployment_validate(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> typing.Optional[dict]:
+        body = self.__deployment_body(options)
+        url, this_client = self.__group_url(
+            options,
+            "/providers/Microsoft.Resources/deployments/{0}/validate".format(
+                urllib.parse.quote(self.__deployment_name(options))
+            ),
+        )
+        response = await this_client.request("POST", url, body)
+        final_response = await this_client.wait_for_operation(response)
+
+        return final_response.json() if final_response else None
+
+    async def __deployment_what_if(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        body = self.__deployment_body(options)
+        url, this_client = self.__group_url(
+            options,
+            "/providers/Microsoft.Resources/deployments/{0}/whatIf".format(
+                urllib.parse.quote(self.__deployment_name(options))
+            ),
+        )
+        response = await this_client.request("POST", url, body)
+        final_response = await this_client.wait_for_operation(response)
+        result = (final_response.json() if final_response else None) or dict()
+
+        # same structure as the az CLI output; properties are flattened.
+        return {
+            "status": result.get("status"),
+            "changes": result.get("properties", dict()).get("changes", list()),
+            "error": result.get("error"),
+        }
+
+    async def __deployment_list(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> list:
+        url, this_client = self.__group_url(
+            options, "/providers/Microsoft.Resources/deployments"
+        )
+        if "--filter" in options:
+            url += "&$filter={0}".format(
+                urllib.parse.quote(_option(options, "--filter"))
+            )
+        return await this_client.request_list(url)
+
+    async def __deployment_show(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        url, this_client = self.__group_url(
+            options,
+            "/providers/Microsoft.Resources/deployments/{0}".format(
+                urllib.parse.quote(_option(options, "--name"))
+            ),
+        )
+        response = await this_client.request("GET", url)
+        if not response.ok:
+            raise ArmRestError(_error_message(response))
+
+        return response.json()
+
+    async def __resource_list(
+        self: B, options: typing.Dict[str, typing.List[str]]
+    ) -> list:
+        subscription_id, this_client = self.__subscription(options)
+        resources = await this_client.request_list(
+            this_client.url(
+                "/subscriptions/{0}/resources".format(subscription_id),
+                RESOURCES_API_VERSION,
+            )
+        )
+        name = _option(options, "--name", "")
+        location = _option(options, "--location", "")
+        tag_name, _, tag_value = _option(options, "--tag", "").partition("=")
+
+        return [
+            x
+            for x in resources
+            if ((not name) or (x.get("name") == name))
+            and ((not location) or (x.get("location") == location))
+            and (
+                (not tag_name)
+                or (
+                    tag_name in (x.get("tags") or dict())
+                    and ((not tag_value) or (x["tags"][tag_name] == tag_value))
+                )
+            )
+        ]
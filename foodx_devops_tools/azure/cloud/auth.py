@@ -13,6 +13,7 @@ import json
 import logging
 import typing
 
+from foodx_devops_tools.profiling import SpanKind, trace_span
 from foodx_devops_tools.utilities import CapturedStreams, run_async_command
 from foodx_devops_tools.utilities.exceptions import CommandError
 
@@ -106,7 +107,10 @@ async def login_service_principal(credentials: AzureCredentials) -> dict:
             f"subscription, {credentials.subscription}"
             f"tenant, {credentials.tenant}"
         )
-        result = await run_async_command(this_command)
+        with trace_span(
+            "az login", SpanKind.login, subscription=credentials.subscription
+        ):
+            result = await run_async_command(this_command)
 
         log.info(
             "login succeeded, {0} ({1}, {2})".format(
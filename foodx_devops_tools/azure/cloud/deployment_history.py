@@ -0,0 +1,268 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Pruning of resource group ARM deployment history."""
+
+import asyncio
+import collections
+import json
+import logging
+import typing
+
+from foodx_devops_tools.profiling import SpanKind, trace_span
+from foodx_devops_tools.utilities import run_async_command
+from foodx_devops_tools.utilities.exceptions import CommandError
+
+from .deployment_poller import TERMINAL_STATES
+from .model import AzureSubscriptionConfiguration
+from .resource_group import get_resource_group_index
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAXIMUM_CONCURRENCY = 10
+DEFAULT_RETAIN_COUNT = 5
+
+_GroupKey = typing.Tuple[str, str]
+
+
+class DeploymentHistoryError(Exception):
+    """Problem occurred querying or pruning deployment history."""
+
+
+def deployment_step_name(deployment_name: str) -> str:
+    """
+    Identify the step of a deployment from its name.
+
+    Deployment names are constructed as ``<application>[_<step>]_<pipeline
+    id>`` (see ``FlattenedDeployment.construct_deployment_name``), so the
+    pipeline id suffix is discarded. Names without a pipeline id suffix are
+    their own step.
+    """
+    return deployment_name.rsplit("_", 1)[0]
+
+
+def select_prunable(
+    deployments: typing.List[dict], retain_count: int
+) -> typing.List[str]:
+    """
+    Select the deployments to prune from a resource group history.
+
+    The most recent ``retain_count`` deployments of each step are retained.
+    Deployments that have not reached a terminal state are never selected.
+
+    Args:
+        deployments: Deployment history of a resource group.
+        retain_count: Number of deployments to retain for each step.
+
+    Returns:
+        Names of the deployments to prune, oldest first.
+    """
+    by_step: typing.Dict[str, typing.List[dict]] = collections.defaultdict(list)
+    for this_deployment in deployments:
+        by_step[deployment_step_name(this_deployment["name"])].append(
+            this_deployment
+        )
+
+    result: typing.List[typing.Tuple[str, str]] = list()
+    for step_deployments in by_step.values():
+        newest_first = sorted(
+            step_deployments,
+            key=lambda x: (x.get("properties") or dict()).get("timestamp")
+            or "",
+            reverse=True,
+        )
+        for this_deployment in newest_first[retain_count:]:
+            properties = this_deployment.get("properties") or dict()
+            if properties.get("provisioningState") in TERMINAL_STATES:
+                result.append(
+                    (properties.get("timestamp") or "", this_deployment["name"])
+                )
+
+    return [x[1] for x in sorted(result)]
+
+
+async def list_deployments(
+    resource_group_name: str,
+    subscription: AzureSubscriptionConfiguration,
+) -> typing.List[dict]:
+    """
+    List the deployment history of a resource group.
+
+    Args:
+        resource_group_name: Resource group to query.
+        subscription: Subscription of the resource group.
+
+    Returns:
+        Deployment data.
+    Raises:
+        DeploymentHistoryError: If the query fails.
+    """
+    this_command = [
+        "az",
+        "deployment",
+        "group",
+        "list",
+        "--resource-group",
+        resource_group_name,
+        "--subscription",
+        subscription.subscription_id,
+    ]
+    try:
+        result = await run_async_command(this_command)
+        return json.loads(result.out)
+    except (CommandError, ValueError) as e:
+        raise DeploymentHistoryError(
+            "deployment history query failed, {0} ({1}), {2}".format(
+                resource_group_name, subscription.subscription_id, str(e)
+            )
+        ) from e
+
+
+async def delete_deployment(
+    resource_group_name: str,
+    deployment_name: str,
+    subscription: AzureSubscriptionConfiguration,
+) -> None:
+    """
+    Request deletion of a deployment history entry, without waiting.
+
+    Deleting a deployment does not affect the deployed resources.
+
+    Args:
+        resource_group_name: Resource group of the deployment.
+        deployment_name: Name of the deployment.
+        subscription: Subscription of the resource group.
+    """
+    this_command = [
+        "az",
+        "deployment",
+        "group",
+        "delete",
+        "--name",
+        deployment_name,
+        "--resource-group",
+        resource_group_name,
+        "--subscription",
+        subscription.subscription_id,
+        "--no-wait",
+    ]
+    await run_async_command(this_command)
+
+
+async def prune_deployment_history(
+    subscriptions: typing.List[AzureSubscriptionConfiguration],
+    resource_group_names: typing.Set[str],
+    retain_count: int = DEFAULT_RETAIN_COUNT,
+    dry_run: bool = False,
+    maximum_concurrency: int = DEFAULT_MAXIMUM_CONCURRENCY,
+) -> typing.Dict[_GroupKey, typing.List[str]]:
+    """
+    Prune the deployment history of resource groups across subscriptions.
+
+    Only resource groups that exist in a subscription are queried. Queries
+    and delete requests share a concurrency limit; deletion is requested
+    without waiting.
+
+    Args:
+        subscriptions: Subscriptions to search.
+        resource_group_names: Resource groups to prune.
+        retain_count: Number of deployments to retain for each step.
+        dry_run: Only select the deployments to prune; do not delete them.
+        maximum_concurrency: Maximum number of concurrent ``az`` requests.
+
+    Returns:
+        Names of pruned deployments, by subscription and resource group name.
+    Raises:
+        DeploymentHistoryError: If any query or deletion failed. Other
+                                deletions are completed regardless.
+    """
+    index = get_resource_group_index()
+    limit = asyncio.Semaphore(maximum_concurrency)
+
+    async def _prune_group(
+        resource_group_name: str, subscription: AzureSubscriptionConfiguration
+    ) -> typing.List[str]:
+        async with limit:
+            deployments = await list_deployments(
+                resource_group_name, subscription
+            )
+        prunable = select_prunable(deployments, retain_count)
+        log.info(
+            "prunable deployments, {0} ({1}), {2} of {3}".format(
+                resource_group_name,
+                subscription.subscription_id,
+                len(prunable),
+                len(deployments),
+            )
+        )
+        if not dry_run:
+
+            async def _delete_one(deployment_name: str) -> None:
+                async with limit:
+                    await delete_deployment(
+                        resource_group_name, deployment_name, subscription
+                    )
+
+            await asyncio.gather(*[_delete_one(x) for x in prunable])
+
+        return prunable
+
+    async def _existing_groups(
+        subscription: AzureSubscriptionConfiguration,
+    ) -> typing.List[str]:
+        return [
+            x
+            for x in await index.names(subscription)
+            if x in resource_group_names
+        ]
+
+    existing_groups = await asyncio.gather(
+        *[_existing_groups(x) for x in subscriptions]
+    )
+    groups = [
+        (name, subscription)
+        for subscription, names in zip(subscriptions, existing_groups)
+        for name in names
+    ]
+    with trace_span(
+        "deployment history pruning",
+        SpanKind.deployment,
+        resource_groups=len(groups),
+    ):
+        results = await asyncio.gather(
+            *[
+                _prune_group(name, subscription)
+                for name, subscription in groups
+            ],
+            return_exceptions=True,
+        )
+
+    pruned: typing.Dict[_GroupKey, typing.List[str]] = dict()
+    failures = list()
+    for (name, subscription), this_result in zip(groups, results):
+        if isinstance(this_result, asyncio.CancelledError):
+            raise this_result
+        elif isinstance(this_result, Exception):
+            log.error(
+                "deployment history pruning failed, {0} ({1}), {2}".format(
+                    name, subscription.subscription_id, str(this_result)
+                )
+            )
+            failures.append(name)
+        else:
+            pruned[(subscription.subscription_id, name)] = typing.cast(
+                typing.List[str], this_result
+            )
+
+    if failures:
+        raise DeploymentHistoryError(
+            "deployment history pruning failed, {0}".format(
+                ", ".join(sorted(failures))
+            )
+        )
+
+    return pruned
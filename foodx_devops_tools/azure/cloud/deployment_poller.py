@@ -0,0 +1,345 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Centralised status polling of ARM deployments submitted without waiting."""
+
+import asyncio
+import collections
+import json
+import logging
+import typing
+
+from foodx_devops_tools.profiling import SpanKind, trace_span
+from foodx_devops_tools.utilities import run_async_command
+from foodx_devops_tools.utilities.exceptions import CommandError
+
+from .model import AzureSubscriptionConfiguration
+
+log = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SECONDS = 15.0
+# consecutive polls a submitted deployment may be absent from its resource
+# group deployment list before it is considered lost.
+DEFAULT_MISSING_POLL_LIMIT = 10
+DEFAULT_MAXIMUM_CONCURRENCY = 10
+
+TERMINAL_STATES = {"Succeeded", "Failed", "Canceled"}
+
+
+class DeploymentPollError(Exception):
+    """A polled deployment failed, or its status could not be determined."""
+
+
+_GroupKey = typing.Tuple[str, str]
+
+
+class _PendingDeployment:
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.missing_polls = 0
+
+
+T = typing.TypeVar("T", bound="DeploymentPoller")
+
+
+class DeploymentPoller:
+    """
+    Track submitted ARM deployments to completion from a single poll loop.
+
+    Each poll makes one ``az deployment group list`` query of the running
+    deployments per resource group with pending deployments, grouped by
+    subscription, so the number of ``az`` processes is independent of the
+    number of deployments in progress. Only a pending deployment that is no
+    longer running is queried individually, to acquire its terminal state.
+    The queries of each subscription share a concurrency limit.
+    """
+
+    __pending: typing.Dict[_GroupKey, typing.Dict[str, _PendingDeployment]]
+    __task: typing.Optional[asyncio.Task]
+
+    def __init__(
+        self: T,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        missing_poll_limit: int = DEFAULT_MISSING_POLL_LIMIT,
+        maximum_concurrency: int = DEFAULT_MAXIMUM_CONCURRENCY,
+    ) -> None:
+        """
+        Construct ``DeploymentPoller`` object.
+
+        Args:
+            poll_interval_seconds: Time between status polls.
+            missing_poll_limit: Number of consecutive polls a deployment may
+                                be absent from query results before failing.
+            maximum_concurrency: Maximum number of concurrent ``az`` queries
+                                 per subscription.
+        """
+        self.poll_interval_seconds = poll_interval_seconds
+        self.missing_poll_limit = missing_poll_limit
+        self.maximum_concurrency = maximum_concurrency
+        # number of status queries made over the life of the poller.
+        self.queries = 0
+
+        self.__pending = collections.defaultdict(dict)
+        self.__task = None
+
+    @property
+    def pending(self: T) -> int:
+        """Number of deployments awaiting a terminal state."""
+        return sum(len(x) for x in self.__pending.values())
+
+    async def wait(
+        self: T,
+        resource_group_name: str,
+        deployment_name: str,
+        subscription: AzureSubscriptionConfiguration,
+    ) -> dict:
+        """
+        Wait for a submitted deployment to reach a terminal state.
+
+        Args:
+            resource_group_name: Resource group of the deployment.
+            deployment_name: Name of the deployment.
+            subscription: Subscription of the deployment.
+
+        Returns:
+            Deployment data of the succeeded deployment.
+        Raises:
+            DeploymentPollError: If the deployment did not succeed.
+        """
+        group_key = (subscription.subscription_id, resource_group_name)
+        this_future = asyncio.get_running_loop().create_future()
+        self.__pending[group_key][deployment_name] = _PendingDeployment(
+            this_future
+        )
+        if (not self.__task) or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+
+        try:
+            return await this_future
+        finally:
+            this_pending = self.__pending.get(group_key, dict())
+            if (deployment_name in this_pending) and (
+                this_pending[deployment_name].future is this_future
+            ):
+                del this_pending[deployment_name]
+
+    async def stop(self: T) -> None:
+        """Stop polling, cancelling any deployments still awaited."""
+        if self.__task:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+        for this_group in self.__pending.values():
+            for x in this_group.values():
+                x.future.cancel()
+        self.__pending.clear()
+
+    async def __run(self: T) -> None:
+        while self.pending:
+            await asyncio.sleep(self.poll_interval_seconds)
+            by_subscription: typing.Dict[
+                str, typing.List[_GroupKey]
+            ] = collections.defaultdict(list)
+            for group_key, this_group in list(self.__pending.items()):
+                if this_group:
+                    by_subscription[group_key[0]].append(group_key)
+                else:
+                    del self.__pending[group_key]
+
+            await asyncio.gather(
+                *[
+                    self.__poll_subscription(subscription_id, group_keys)
+                    for subscription_id, group_keys in by_subscription.items()
+                ]
+            )
+
+    async def __poll_subscription(
+        self: T, subscription_id: str, group_keys: typing.List[_GroupKey]
+    ) -> None:
+        with trace_span(
+            "deployment status poll",
+            SpanKind.deployment,
+            subscription=subscription_id,
+            resource_groups=len(group_keys),
+        ):
+            limit = asyncio.Semaphore(self.maximum_concurrency)
+            await asyncio.gather(
+                *[self.__poll_group(x, limit) for x in group_keys]
+            )
+
+    async def __poll_group(
+        self: T, group_key: _GroupKey, limit: asyncio.Semaphore
+    ) -> None:
+        subscription_id, resource_group_name = group_key
+        this_command = [
+            "az",
+            "deployment",
+            "group",
+            "list",
+            "--resource-group",
+            resource_group_name,
+            "--subscription",
+            subscription_id,
+            # the unfiltered list includes the full deployment history of
+            # the resource group.
+            "--filter",
+            "provisioningState eq 'Running'",
+        ]
+        try:
+            async with limit:
+                self.queries += 1
+                result = await run_async_command(this_command)
+            running = {
+                x["name"]
+                for x in json.loads(result.out)
+                if x.get("properties", dict()).get("provisioningState")
+                not in TERMINAL_STATES
+            }
+        except (CommandError, ValueError, KeyError, TypeError) as e:
+            # transient query failures are retried on the next poll.
+            log.warning(
+                "deployment status query failed, {0} ({1}), {2}".format(
+                    resource_group_name, subscription_id, str(e)
+                )
+            )
+            return
+
+        changed = list()
+        for deployment_name, this_pending in list(
+            self.__pending[group_key].items()
+        ):
+            if this_pending.future.done():
+                continue
+            if deployment_name in running:
+                this_pending.missing_polls = 0
+                log.debug(
+                    "deployment status, {0}, {1}, Running".format(
+                        deployment_name, resource_group_name
+                    )
+                )
+            else:
+                changed.append(
+                    self.__poll_deployment(
+                        group_key, deployment_name, this_pending, limit
+                    )
+                )
+        await asyncio.gather(*changed)
+
+    async def __poll_deployment(
+        self: T,
+        group_key: _GroupKey,
+        deployment_name: str,
+        this_pending: _PendingDeployment,
+        limit: asyncio.Semaphore,
+    ) -> None:
+        subscription_id, resource_group_name = group_key
+        this_command = [
+            "az",
+            "deployment",
+            "group",
+            "show",
+            "--name",
+            deployment_name,
+            "--resource-group",
+            resource_group_name,
+            "--subscription",
+            subscription_id,
+        ]
+        try:
+            async with limit:
+                self.queries += 1
+                result = await run_async_command(this_command)
+            data = json.loads(result.out)
+            properties = data.get("properties", dict())
+        except (CommandError, ValueError, AttributeError) as e:
+            # a submitted deployment may not be visible immediately, so a
+            # failed query counts towards the deployment being lost.
+            log.debug(
+                "deployment status query failed, {0}, {1} ({2}), {3}".format(
+                    deployment_name,
+                    resource_group_name,
+                    subscription_id,
+                    str(e),
+                )
+            )
+            data = None
+
+        if this_pending.future.done():
+            return
+        if data is None:
+            this_pending.missing_polls += 1
+            if this_pending.missing_polls >= self.missing_poll_limit:
+                this_pending.future.set_exception(
+                    DeploymentPollError(
+                        "submitted deployment not found, {0}, {1} "
+                        "({2})".format(
+                            deployment_name,
+                            resource_group_name,
+                            subscription_id,
+                        )
+                    )
+                )
+            return
+
+        this_pending.missing_polls = 0
+        state = properties.get("provisioningState")
+        log.debug(
+            "deployment status, {0}, {1}, {2}".format(
+                deployment_name, resource_group_name, state
+            )
+        )
+        if state == "Succeeded":
+            this_pending.future.set_result(data)
+        elif state in TERMINAL_STATES:
+            this_pending.future.set_exception(
+                DeploymentPollError(
+                    "deployment {0}, {1}, {2} ({3}), {4}".format(
+                        state.lower(),
+                        deployment_name,
+                        resource_group_name,
+                        subscription_id,
+                        json.dumps(properties.get("error")),
+                    )
+                )
+            )
+
+
+_deployment_poller: typing.Optional[DeploymentPoller] = None
+
+
+def get_deployment_poller() -> typing.Optional[DeploymentPoller]:
+    """
+    Get the deployment poller of the current run.
+
+    Returns:
+        The deployment poller, or ``None`` if deployments are submitted and
+        awaited by the ``az`` CLI.
+    """
+    return _deployment_poller
+
+
+def set_deployment_poller(
+    poller: typing.Optional[DeploymentPoller],
+) -> typing.Optional[DeploymentPoller]:
+    """
+    Set the deployment poller used by resource group deployments.
+
+    Args:
+        poller: Deployment poller to install, or ``None`` to have the ``az``
+                CLI wait for each deployment.
+
+    Returns:
+        The previously installed deployment poller.
+    """
+    global _deployment_poller
+    previous_poller = _deployment_poller
+    _deployment_poller = poller
+
+    return previous_poller
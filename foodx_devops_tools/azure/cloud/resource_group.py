@@ -8,16 +8,20 @@
 """Azure resource group utilities."""
 
 import asyncio
+import collections
 import contextlib
+import dataclasses
 import json
 import logging
 import pathlib
 import re
 import typing
 
+from foodx_devops_tools.profiling import SpanKind, trace_span
 from foodx_devops_tools.utilities import run_async_command
 from foodx_devops_tools.utilities.exceptions import CommandError
 
+from .deployment_poller import DeploymentPollError, get_deployment_poller
 from .model import AzureSubscriptionConfiguration
 
 log = logging.getLogger(__name__)
@@ -30,11 +34,224 @@ AZURE_GROUP_ID_PATTERN = (
 )
 AZURE_GROUP_MATCH = re.compile(AZURE_GROUP_ID_PATTERN)
 
+# what-if change types that do not change deployed resources.
+NO_OP_CHANGE_TYPES = {"Ignore", "NoChange"}
+
+# tag identifying a validation deployment resource group, and its pipeline.
+VALIDATION_TAG = "foodx-validation"
+
+T = typing.TypeVar("T", bound="ResourceGroupIndex")
+
 
 class ResourceGroupError(Exception):
     """Problem occurred with resource group related actions."""
 
 
+class ResourceGroupIndex:
+    """
+    Per-subscription index of existing resource groups.
+
+    Each subscription is listed once using ``az group list``; subsequent
+    lookups are answered from the index, which is updated in place as
+    resource groups are created and deleted. Concurrent lookups for a
+    subscription that has not yet been listed share a single listing, and
+    concurrent creation of the same resource group shares a single creation.
+    """
+
+    __groups: typing.Dict[str, typing.Dict[str, dict]]
+    __loads: typing.Dict[str, asyncio.Future]
+    __creations: typing.Dict[typing.Tuple[str, str], asyncio.Future]
+
+    def __init__(self: T) -> None:
+        """Construct ``ResourceGroupIndex`` object."""
+        self.__groups = dict()
+        self.__loads = dict()
+        self.__creations = dict()
+
+    async def get(
+        self: T,
+        resource_group_name: str,
+        subscription: AzureSubscriptionConfiguration,
+    ) -> dict:
+        """
+        Look up resource group data, listing the subscription if necessary.
+
+        Args:
+            resource_group_name: Name of resource group to find.
+            subscription: Subscription to search for resource group.
+
+        Returns:
+            Resource group data if the group exists. Empty dictionary
+            otherwise.
+        """
+        groups = await self.__subscription_groups(subscription)
+        return groups.get(resource_group_name, dict()).copy()
+
+    async def names(
+        self: T, subscription: AzureSubscriptionConfiguration
+    ) -> typing.List[str]:
+        """List resource group names, listing the subscription if necessary."""
+        groups = await self.__subscription_groups(subscription)
+        return sorted(groups.keys())
+
+    async def groups(
+        self: T, subscription: AzureSubscriptionConfiguration
+    ) -> typing.Dict[str, dict]:
+        """List resource group data, listing the subscription if necessary."""
+        groups = await self.__subscription_groups(subscription)
+        return {k: v.copy() for k, v in groups.items()}
+
+    def add(
+        self: T,
+        resource_group_name: str,
+        subscription: AzureSubscriptionConfiguration,
+        group_data: dict,
+    ) -> None:
+        """Record a created resource group, if the subscription is indexed."""
+        if subscription.subscription_id in self.__groups:
+            self.__groups[subscription.subscription_id][
+                resource_group_name
+            ] = group_data.copy()
+
+    def discard(
+        self: T,
+        resource_group_name: str,
+        subscription: AzureSubscriptionConfiguration,
+    ) -> None:
+        """Remove a deleted resource group from the index."""
+        if subscription.subscription_id in self.__groups:
+            self.__groups[subscription.subscription_id].pop(
+                resource_group_name, None
+            )
+
+    def creation(
+        self: T,
+        resource_group_name: str,
+        subscription: AzureSubscriptionConfiguration,
+    ) -> typing.Optional[asyncio.Future]:
+        """Get the in-flight creation of a resource group, if any."""
+        return self.__creations.get(
+            (subscription.subscription_id, resource_group_name)
+        )
+
+    def track_creation(
+        self: T,
+        resource_group_name: str,
+        subscription: AzureSubscriptionConfiguration,
+        this_creation: asyncio.Future,
+    ) -> None:
+        """Record an in-flight resource group creation until it is done."""
+        key = (subscription.subscription_id, resource_group_name)
+        self.__creations[key] = this_creation
+        this_creation.add_done_callback(
+            lambda _: self.__creations.pop(key, None)
+        )
+
+    def invalidate(
+        self: T,
+        subscription: typing.Optional[AzureSubscriptionConfiguration] = None,
+    ) -> None:
+        """
+        Discard indexed resource groups.
+
+        Args:
+            subscription: Subscription to discard. All subscriptions if
+                ``None``.
+        """
+        if subscription:
+            self.__groups.pop(subscription.subscription_id, None)
+        else:
+            self.__groups = dict()
+
+    async def __subscription_groups(
+        self: T, subscription: AzureSubscriptionConfiguration
+    ) -> typing.Dict[str, dict]:
+        subscription_id = subscription.subscription_id
+        if subscription_id in self.__groups:
+            return self.__groups[subscription_id]
+
+        this_load: asyncio.Future
+        if subscription_id not in self.__loads:
+            this_load = asyncio.ensure_future(
+                _list_resource_groups(subscription)
+            )
+            self.__loads[subscription_id] = this_load
+            this_load.add_done_callback(
+                lambda _: self.__loads.pop(subscription_id, None)
+            )
+        else:
+            this_load = self.__loads[subscription_id]
+            log.debug(
+                "waiting for in-flight resource group listing, {0}".format(
+                    subscription_id
+                )
+            )
+
+        # shield the shared listing from cancellation of any one caller.
+        groups = await asyncio.shield(this_load)
+        if subscription_id not in self.__groups:
+            self.__groups[subscription_id] = groups
+
+        return self.__groups[subscription_id]
+
+
+async def _list_resource_groups(
+    subscription: AzureSubscriptionConfiguration,
+) -> typing.Dict[str, dict]:
+    """List the resource groups in a subscription, indexed by name."""
+    this_command = [
+        "az",
+        "group",
+        "list",
+        "--subscription",
+        subscription.subscription_id,
+    ]
+    log.debug("{0}".format(str(this_command)))
+    with trace_span(
+        "resource group list",
+        SpanKind.resource_group,
+        subscription=subscription.subscription_id,
+    ):
+        result = await run_async_command(this_command)
+    log.debug("resource group list stdout, {0}".format(result.out))
+    log.debug("resource group list stderr, {0}".format(result.error))
+
+    result_data = json.loads(result.out)
+    groups: typing.Dict[str, dict] = dict()
+    for this_group in result_data:
+        this_match = AZURE_GROUP_MATCH.match(this_group["id"])
+        if this_match:
+            groups[this_match.group("group_name")] = this_group.copy()
+    log.debug(
+        "indexed resource groups, {0}, {1}".format(
+            subscription.subscription_id, len(groups)
+        )
+    )
+
+    return groups
+
+
+_resource_group_index = ResourceGroupIndex()
+
+
+def get_resource_group_index() -> ResourceGroupIndex:
+    """Get the resource group index of the current run."""
+    return _resource_group_index
+
+
+def reset_resource_group_index() -> ResourceGroupIndex:
+    """
+    Start a new resource group index for a new run.
+
+    Returns:
+        The new resource group index.
+    """
+    global _resource_group_index
+
+    _resource_group_index = ResourceGroupIndex()
+    return _resource_group_index
+
+
 async def check_exists(
     resource_group_name: str, subscription: AzureSubscriptionConfiguration
 ) -> dict:
@@ -42,7 +259,8 @@ async def check_exists(
     Determine if a resource group exists in the specified subscription.
 
     Assume authentication has already occurred such that subsequent ``az``
-    CLI commands will succeed.
+    CLI commands will succeed. The subscription is only listed on the first
+    check; subsequent checks use the resource group index.
 
     Args:
         resource_group_name: Name of resource group to find
@@ -55,33 +273,16 @@ async def check_exists(
                             completing.
     """
     try:
-        this_command = [
-            "az",
-            "group",
-            "list",
-            "--subscription",
-            subscription.subscription_id,
-        ]
-        log.debug("{0}".format(str(this_command)))
-        result = await run_async_command(this_command)
-        log.debug(
-            "resource group existence check stdout, {0}".format(result.out)
-        )
-        log.debug(
-            "resource group existence check stderr, {0}".format(result.error)
-        )
-
-        result_data = json.loads(result.out)
-        log.debug("{0}".format(str(result_data)))
-        group_result = dict()
-        for this_group in result_data:
-            this_match = AZURE_GROUP_MATCH.match(this_group["id"])
-            if (
-                this_match
-                and this_match.group("group_name") == resource_group_name
-            ):
-                group_result = this_group.copy()
-                log.debug("group exists, {0}".format(str(group_result)))
+        with trace_span(
+            "resource group check",
+            SpanKind.resource_group,
+            resource_group=resource_group_name,
+        ):
+            group_result = await _resource_group_index.get(
+                resource_group_name, subscription
+            )
+        if group_result:
+            log.debug("group exists, {0}".format(str(group_result)))
 
         return group_result
     except asyncio.CancelledError:
@@ -95,41 +296,155 @@ async def check_exists(
         ) from e
 
 
+def _created_group_data(
+    output: str,
+    resource_group_name: str,
+    location: str,
+    subscription: AzureSubscriptionConfiguration,
+    tags: typing.Optional[typing.Dict[str, str]],
+) -> dict:
+    """Extract created resource group data from ``az group create`` output."""
+    try:
+        group_data = json.loads(output)
+        if isinstance(group_data, dict) and ("id" in group_data):
+            return group_data
+    except ValueError:
+        pass
+
+    result: typing.Dict[str, typing.Any] = {
+        "id": "/subscriptions/{0}/resourceGroups/{1}".format(
+            subscription.subscription_id, resource_group_name
+        ),
+        "location": location,
+        "name": resource_group_name,
+    }
+    if tags:
+        result["tags"] = tags.copy()
+
+    return result
+
+
 async def create(
     resource_group_name: str,
     location: str,
     subscription: AzureSubscriptionConfiguration,
+    tags: typing.Optional[typing.Dict[str, str]] = None,
 ) -> None:
     """
     Idempotent creation of an Azure resource group.
 
+    Concurrent creation of the same resource group, for example by
+    ``create_all`` and a step deployment, waits for the creation already in
+    flight.
+
     Args:
         resource_group_name: Name of resource group to create.
         location: Azure location in which to create the resource group.
         subscription: Azure subscription identity for the resource group.
+        tags: Tags applied to the resource group if it is created.
+              (optional; default None)
     """
     group_data = await check_exists(resource_group_name, subscription)
     if not group_data:
-        result = await run_async_command(
-            [
-                "az",
-                "group",
-                "create",
-                "--resource-group",
-                resource_group_name,
-                "--location",
-                location,
-                "--subscription",
-                subscription.subscription_id,
-            ]
+        this_creation = _resource_group_index.creation(
+            resource_group_name, subscription
+        )
+        if this_creation:
+            log.debug(
+                "waiting for in-flight resource group creation, {0}, "
+                "{1}".format(resource_group_name, subscription.subscription_id)
+            )
+        else:
+            this_creation = asyncio.ensure_future(
+                _create_group(resource_group_name, location, subscription, tags)
+            )
+            _resource_group_index.track_creation(
+                resource_group_name, subscription, this_creation
+            )
+
+        # shield the shared creation from cancellation of any one caller.
+        await asyncio.shield(this_creation)
+
+
+async def _create_group(
+    resource_group_name: str,
+    location: str,
+    subscription: AzureSubscriptionConfiguration,
+    tags: typing.Optional[typing.Dict[str, str]],
+) -> None:
+    this_command = [
+        "az",
+        "group",
+        "create",
+        "--resource-group",
+        resource_group_name,
+        "--location",
+        location,
+        "--subscription",
+        subscription.subscription_id,
+    ]
+    if tags:
+        this_command += ["--tags"] + [
+            "{0}={1}".format(k, v) for k, v in sorted(tags.items())
+        ]
+    result = await run_async_command(this_command)
+    log.debug("resource group creation stdout, {0}".format(result.out))
+    log.debug("resource group creation stderr, {0}".format(result.error))
+    _resource_group_index.add(
+        resource_group_name,
+        subscription,
+        _created_group_data(
+            result.out, resource_group_name, location, subscription, tags
+        ),
+    )
+
+
+async def create_all(
+    resource_groups: typing.Dict[str, str],
+    subscription: AzureSubscriptionConfiguration,
+    tags: typing.Optional[typing.Dict[str, str]] = None,
+) -> typing.Dict[str, Exception]:
+    """
+    Concurrently create any missing resource groups in a subscription.
+
+    Args:
+        resource_groups: Location of each resource group, by name.
+        subscription: Azure subscription identity for the resource groups.
+        tags: Tags applied to the resource groups that are created.
+              (optional; default None)
+
+    Returns:
+        Creation failures, by resource group name.
+    """
+    names = sorted(resource_groups.keys())
+    with trace_span(
+        "resource group create all",
+        SpanKind.resource_group,
+        subscription=subscription.subscription_id,
+        resource_groups=len(names),
+    ):
+        results = await asyncio.gather(
+            *[
+                create(x, resource_groups[x], subscription, tags=tags)
+                for x in names
+            ],
+            return_exceptions=True,
         )
-        log.debug("resource group creation stdout, {0}".format(result.out))
-        log.debug("resource group creation stderr, {0}".format(result.error))
+
+    failures: typing.Dict[str, Exception] = dict()
+    for name, this_result in zip(names, results):
+        if isinstance(this_result, asyncio.CancelledError):
+            raise this_result
+        elif isinstance(this_result, Exception):
+            failures[name] = this_result
+
+    return failures
 
 
 async def delete(
     resource_group_name: str,
     subscription: AzureSubscriptionConfiguration,
+    no_wait: bool = False,
 ) -> None:
     """
     Delete an Azure resource group.
@@ -137,6 +452,7 @@ async def delete(
     Args:
         resource_group_name: Name of resource group to create.
         subscription: Azure subscription identity for the resource group.
+        no_wait: Request deletion without waiting for it to complete.
     """
     group_data = await check_exists(resource_group_name, subscription)
     if group_data:
@@ -145,20 +461,22 @@ async def delete(
                 resource_group_name, subscription.subscription_id
             )
         )
-        result = await run_async_command(
-            [
-                "az",
-                "group",
-                "delete",
-                "--resource-group",
-                resource_group_name,
-                "--yes",
-                "--subscription",
-                subscription.subscription_id,
-            ]
-        )
+        this_command = [
+            "az",
+            "group",
+            "delete",
+            "--resource-group",
+            resource_group_name,
+            "--yes",
+            "--subscription",
+            subscription.subscription_id,
+        ]
+        if no_wait:
+            this_command.append("--no-wait")
+        result = await run_async_command(this_command)
         log.debug("resource group deletion stdout, {0}".format(result.out))
         log.debug("resource group deletion stderr, {0}".format(result.error))
+        _resource_group_index.discard(resource_group_name, subscription)
     else:
         log.info(
             "no delete resource group as it does not exist, {0}, {1}".format(
@@ -176,6 +494,243 @@ def _make_arm_parameter_values(key_values: dict) -> dict:
     return result
 
 
+def _template_arguments(
+    resource_group_name: str,
+    arm_template_path: pathlib.Path,
+    arm_parameters_path: pathlib.Path,
+    mode: str,
+    subscription: AzureSubscriptionConfiguration,
+) -> typing.List[str]:
+    """Construct ``az deployment group`` template related arguments."""
+    return [
+        "--mode",
+        mode,
+        "--resource-group",
+        resource_group_name,
+        "--subscription",
+        subscription.subscription_id,
+        "--template-file",
+        str(arm_template_path),
+        "--parameters",
+        "@{0}".format(arm_parameters_path),
+    ]
+
+
+def _override_arguments(
+    override_parameters: typing.Optional[dict],
+) -> typing.List[str]:
+    """Construct ``az deployment group`` override parameters arguments."""
+    result = list()
+    if override_parameters:
+        # WARNING: these external parameters may be sensitive content
+        # such as secrets, so DO NOT LOG.
+        log.debug(
+            "az command override parameters specified. content "
+            "withheld from log."
+        )
+        result = [
+            "--parameters",
+            "{0}".format(
+                json.dumps(_make_arm_parameter_values(override_parameters))
+            ),
+        ]
+
+    return result
+
+
+@dataclasses.dataclass
+class WhatIfSummary:
+    """Changes predicted by an ARM deployment what-if operation."""
+
+    # number of resources by change type, eg. "Create", "Modify".
+    changes: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+
+    @property
+    def is_noop(self: "WhatIfSummary") -> bool:
+        """Indicate that the deployment is not predicted to change anything."""
+        return all(x in NO_OP_CHANGE_TYPES for x in self.changes.keys())
+
+    def __str__(self: "WhatIfSummary") -> str:
+        """Summarise the predicted changes."""
+        if self.is_noop:
+            return "no changes"
+        else:
+            return ", ".join(
+                "{0} {1}".format(v, k)
+                for k, v in sorted(self.changes.items())
+                if k not in NO_OP_CHANGE_TYPES
+            )
+
+
+async def what_if(
+    resource_group_name: str,
+    arm_template_path: pathlib.Path,
+    arm_parameters_path: pathlib.Path,
+    mode: str,
+    subscription: AzureSubscriptionConfiguration,
+    deployment_name: typing.Optional[str] = None,
+    override_parameters: typing.Optional[dict] = None,
+) -> WhatIfSummary:
+    """
+    Predict the changes a resource group deployment would make.
+
+    The resource group must already exist.
+
+    Args:
+        resource_group_name: Resource group name
+        arm_template_path: Path to ARM template deployment file.
+        arm_parameters_path: Path to ARM template deployment parameters file.
+        mode: Deployment mode; "Complete" or "Incremental".
+        subscription: Target subscription/tenant for deployment.
+        deployment_name: Name of deployment. (optional; default None)
+        override_parameters: Key-value pairs of json compatible data to pass
+            to deployment. (optional; default None)
+
+    Returns:
+        Summary of predicted changes.
+    Raises:
+        ResourceGroupError: If the what-if operation failed.
+    """
+    this_command = [
+        "az",
+        "deployment",
+        "group",
+        "what-if",
+    ] + _template_arguments(
+        resource_group_name,
+        arm_template_path,
+        arm_parameters_path,
+        mode,
+        subscription,
+    )
+    if deployment_name:
+        this_command += ["--name", deployment_name]
+    this_command.append("--no-pretty-print")
+    log.debug("az command, {0}".format(str(this_command)))
+    this_command += _override_arguments(override_parameters)
+    try:
+        with trace_span(
+            "resource group what-if",
+            SpanKind.deployment,
+            resource_group=resource_group_name,
+            deployment_name=deployment_name,
+        ):
+            result = await run_async_command(this_command)
+
+        result_data = json.loads(result.out)
+        summary = WhatIfSummary(
+            changes=dict(
+                collections.Counter(
+                    x.get("changeType", "Unsupported")
+                    for x in result_data.get("changes", list())
+                )
+            )
+        )
+        log.info(
+            "resource group what-if, {0} ({1}), {2}".format(
+                resource_group_name, subscription.subscription_id, str(summary)
+            )
+        )
+
+        return summary
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        raise ResourceGroupError(
+            "Problem predicting deployment changes, {0}, {1}, {2}".format(
+                resource_group_name, type(e), str(e)
+            )
+        ) from e
+
+
+def _deployment_outputs(data: typing.Any) -> typing.Dict[str, typing.Any]:
+    """
+    Extract output values from ARM deployment data.
+
+    ARM outputs are of the form ``{"name": {"type": ..., "value": ...}}``;
+    only the values are retained.
+    """
+    outputs = (
+        (data.get("properties") or dict()).get("outputs")
+        if isinstance(data, dict)
+        else None
+    ) or dict()
+
+    return {
+        k: v.get("value") if isinstance(v, dict) else v
+        for k, v in outputs.items()
+    }
+
+
+async def last_deployment_outputs(
+    resource_group_name: str,
+    deployment_name_prefix: str,
+    subscription: AzureSubscriptionConfiguration,
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """
+    Get the outputs of the last successful deployment with a name prefix.
+
+    Deployment names are expected to be the prefix followed by a pipeline id
+    that does not contain an underscore.
+
+    Args:
+        resource_group_name: Resource group name
+        deployment_name_prefix: Deployment name prefix.
+        subscription: Target subscription/tenant of the resource group.
+
+    Returns:
+        Deployment output values, by output name, or ``None`` if there is no
+        successful deployment.
+    Raises:
+        ResourceGroupError: If the deployments could not be listed.
+    """
+    this_command = [
+        "az",
+        "deployment",
+        "group",
+        "list",
+        "--resource-group",
+        resource_group_name,
+        "--subscription",
+        subscription.subscription_id,
+        "--filter",
+        "provisioningState eq 'Succeeded'",
+    ]
+    try:
+        result = await run_async_command(this_command)
+        deployments = [
+            x
+            for x in json.loads(result.out)
+            if x["name"].startswith(deployment_name_prefix)
+            and ("_" not in x["name"][len(deployment_name_prefix) :])
+            and (x["properties"].get("provisioningState") == "Succeeded")
+        ]
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        raise ResourceGroupError(
+            "Problem listing deployments, {0}, {1}, {2}".format(
+                resource_group_name, type(e), str(e)
+            )
+        ) from e
+
+    if not deployments:
+        return None
+
+    last_deployment = max(
+        deployments, key=lambda x: x["properties"].get("timestamp") or ""
+    )
+    log.info(
+        "last deployment, {0} ({1}), {2}".format(
+            resource_group_name,
+            subscription.subscription_id,
+            last_deployment["name"],
+        )
+    )
+
+    return _deployment_outputs(last_deployment)
+
+
 async def deploy(
     resource_group_name: str,
     arm_template_path: pathlib.Path,
@@ -186,13 +741,18 @@ async def deploy(
     deployment_name: typing.Optional[str] = None,
     override_parameters: typing.Optional[dict] = None,
     validate: bool = False,
-) -> None:
+    tags: typing.Optional[typing.Dict[str, str]] = None,
+) -> typing.Dict[str, typing.Any]:
     """
     Deploy resource to a resource group.
 
     The resources are defined in ARM template JSON or bicep files, per Azure
     CLI utility.
 
+    If a deployment poller is installed (see ``set_deployment_poller``), the
+    deployment is submitted without waiting and its completion is tracked by
+    the poller instead of an ``az`` process.
+
     Args:
         resource_group_name: Resource group name
         arm_template_path: Path to ARM template deployment file.
@@ -204,54 +764,81 @@ async def deploy(
             to deployment. (optional; default None)
         validate: Flag to enable deployment validation. (optional; default
             False)
+        tags: Tags applied to the resource group if it is created.
+              (optional; default None)
+
+    Returns:
+        Deployment output values, by output name. Validation deployments
+        have no outputs.
     """
     result = None
+    outputs: typing.Dict[str, typing.Any] = dict()
     try:
-        await create(resource_group_name, location, subscription)
+        await create(resource_group_name, location, subscription, tags=tags)
         # assume az cli is in the PATH when command is run...
         this_command = [
             "az",
             "deployment",
             "group",
             "create" if not validate else "validate",
-            "--mode",
-            mode,
-            "--resource-group",
+        ] + _template_arguments(
             resource_group_name,
-            "--subscription",
-            subscription.subscription_id,
-            "--template-file",
-            str(arm_template_path),
-            "--parameters",
-            "@{0}".format(arm_parameters_path),
-        ]
+            arm_template_path,
+            arm_parameters_path,
+            mode,
+            subscription,
+        )
+        poller = None if validate else get_deployment_poller()
+        if poller and (not deployment_name):
+            # the poller tracks deployments by name; use the same default
+            # name as the az CLI.
+            deployment_name = arm_template_path.stem
         if deployment_name:
             this_command += [
                 "--name",
                 deployment_name,
             ]
+        if poller:
+            this_command.append("--no-wait")
         log.debug("az command, {0}".format(str(this_command)))
-        if override_parameters:
-            # WARNING: these external parameters may be sensitive content
-            # such as secrets, so DO NOT LOG.
-            log.debug(
-                "az command override parameters specified. content "
-                "withheld from log."
-            )
-            this_command += [
-                "--parameters",
-                "{0}".format(
-                    json.dumps(_make_arm_parameter_values(override_parameters))
-                ),
-            ]
-
-        result = await run_async_command(this_command)
+        this_command += _override_arguments(override_parameters)
+
+        with trace_span(
+            "resource group deployment",
+            SpanKind.deployment,
+            resource_group=resource_group_name,
+            deployment_name=deployment_name,
+        ):
+            result = await run_async_command(this_command)
+            if poller:
+                log.info(
+                    "resource group deployment submitted, {0} ({1})".format(
+                        resource_group_name, subscription.subscription_id
+                    )
+                )
+                deployment_data = await poller.wait(
+                    resource_group_name,
+                    typing.cast(str, deployment_name),
+                    subscription,
+                )
+                outputs = _deployment_outputs(deployment_data)
+            elif (not validate) and result.out:
+                try:
+                    outputs = _deployment_outputs(json.loads(result.out))
+                except ValueError:
+                    log.warning(
+                        "unable to parse deployment outputs, {0} ({1})".format(
+                            resource_group_name, subscription.subscription_id
+                        )
+                    )
         log.info(
             "resource group deployment succeeded, {0} ({1})".format(
                 resource_group_name, subscription.subscription_id
             )
         )
-    except CommandError as e:
+
+        return outputs
+    except (CommandError, DeploymentPollError) as e:
         log.error(
             "resource group deployment failed, {0} ({1}), {2}".format(
                 resource_group_name, subscription.subscription_id, str(e)
@@ -0,0 +1,208 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Batched, background deletion of transient resource groups."""
+
+import asyncio
+import logging
+import typing
+
+from foodx_devops_tools.profiling import SpanKind, trace_span
+
+from .model import AzureSubscriptionConfiguration
+from .resource_group import delete, get_resource_group_index
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAXIMUM_CONCURRENCY = 10
+
+_GroupKey = typing.Tuple[str, str]
+
+T = typing.TypeVar("T", bound="ResourceGroupCleanup")
+
+
+class ResourceGroupCleanup:
+    """
+    Collect resource groups during a run for deletion at the end of it.
+
+    Deletions are requested concurrently with ``az group delete --no-wait``
+    so the run does not wait for Azure to remove the resources.
+    """
+
+    __groups: typing.Dict[_GroupKey, AzureSubscriptionConfiguration]
+
+    def __init__(
+        self: T, maximum_concurrency: int = DEFAULT_MAXIMUM_CONCURRENCY
+    ) -> None:
+        """
+        Construct ``ResourceGroupCleanup`` object.
+
+        Args:
+            maximum_concurrency: Maximum number of concurrent delete requests.
+        """
+        self.maximum_concurrency = maximum_concurrency
+        self.__groups = dict()
+
+    @property
+    def pending(self: T) -> int:
+        """Number of resource groups awaiting deletion."""
+        return len(self.__groups)
+
+    def register(
+        self: T,
+        resource_group_name: str,
+        subscription: AzureSubscriptionConfiguration,
+    ) -> None:
+        """Register a resource group for deletion; repeats are ignored."""
+        self.__groups[
+            (subscription.subscription_id, resource_group_name)
+        ] = subscription
+
+    async def delete_all(self: T) -> typing.Dict[_GroupKey, Exception]:
+        """
+        Request deletion of all registered resource groups.
+
+        Returns:
+            Deletion failures, by subscription and resource group name.
+        """
+        groups = sorted(self.__groups.items())
+        self.__groups = dict()
+        if groups:
+            log.info("deleting resource groups, {0}".format(len(groups)))
+
+        return await _delete_groups(
+            [(x[0][1], x[1]) for x in groups], self.maximum_concurrency
+        )
+
+
+async def _delete_groups(
+    groups: typing.List[typing.Tuple[str, AzureSubscriptionConfiguration]],
+    maximum_concurrency: int,
+) -> typing.Dict[_GroupKey, Exception]:
+    """Concurrently request deletion of resource groups without waiting."""
+    limit = asyncio.Semaphore(maximum_concurrency)
+
+    async def _delete_one(
+        resource_group_name: str, subscription: AzureSubscriptionConfiguration
+    ) -> None:
+        async with limit:
+            await delete(resource_group_name, subscription, no_wait=True)
+
+    with trace_span(
+        "resource group cleanup",
+        SpanKind.resource_group,
+        resource_groups=len(groups),
+    ):
+        results = await asyncio.gather(
+            *[_delete_one(name, subscription) for name, subscription in groups],
+            return_exceptions=True,
+        )
+
+    failures: typing.Dict[_GroupKey, Exception] = dict()
+    for (name, subscription), this_result in zip(groups, results):
+        if isinstance(this_result, asyncio.CancelledError):
+            raise this_result
+        elif isinstance(this_result, Exception):
+            log.warning(
+                "resource group deletion failed, {0} ({1}), {2}".format(
+                    name, subscription.subscription_id, str(this_result)
+                )
+            )
+            failures[(subscription.subscription_id, name)] = this_result
+
+    return failures
+
+
+async def reap_resource_groups(
+    subscriptions: typing.List[AzureSubscriptionConfiguration],
+    is_stale: typing.Callable[[str, typing.Dict[str, str]], bool],
+    dry_run: bool = False,
+    maximum_concurrency: int = DEFAULT_MAXIMUM_CONCURRENCY,
+) -> typing.Dict[str, typing.List[str]]:
+    """
+    Find and delete stale resource groups across subscriptions.
+
+    Subscriptions are listed concurrently, once each, and deletion of all
+    stale resource groups is requested without waiting.
+
+    Args:
+        subscriptions: Subscriptions to search.
+        is_stale: Identify a stale resource group from its name and tags.
+        dry_run: Only find the stale resource groups; do not delete them.
+        maximum_concurrency: Maximum number of concurrent delete requests.
+
+    Returns:
+        Names of stale resource groups, by subscription.
+    """
+    index = get_resource_group_index()
+
+    async def _find_stale(
+        subscription: AzureSubscriptionConfiguration,
+    ) -> typing.List[str]:
+        groups = await index.groups(subscription)
+        return [
+            k
+            for k, v in sorted(groups.items())
+            if is_stale(k, v.get("tags") or dict())
+        ]
+
+    stale_groups = await asyncio.gather(
+        *[_find_stale(x) for x in subscriptions]
+    )
+    result = {x.subscription_id: y for x, y in zip(subscriptions, stale_groups)}
+    for subscription_id, names in result.items():
+        log.info(
+            "stale resource groups, {0}, {1}".format(
+                subscription_id, ", ".join(names)
+            )
+        )
+
+    if not dry_run:
+        await _delete_groups(
+            [
+                (name, subscription)
+                for subscription, names in zip(subscriptions, stale_groups)
+                for name in names
+            ],
+            maximum_concurrency,
+        )
+
+    return result
+
+
+_resource_group_cleanup: typing.Optional[ResourceGroupCleanup] = None
+
+
+def get_resource_group_cleanup() -> typing.Optional[ResourceGroupCleanup]:
+    """
+    Get the resource group cleanup of the current run.
+
+    Returns:
+        The resource group cleanup, or ``None`` if transient resource groups
+        are retained.
+    """
+    return _resource_group_cleanup
+
+
+def set_resource_group_cleanup(
+    cleanup: typing.Optional[ResourceGroupCleanup],
+) -> typing.Optional[ResourceGroupCleanup]:
+    """
+    Set the resource group cleanup of the current run.
+
+    Args:
+        cleanup: Resource group cleanup to install, or ``None`` to retain
+                 transient resource groups.
+
+    Returns:
+        The previously installed resource group cleanup.
+    """
+    global _resource_group_cleanup
+    previous_cleanup = _resource_group_cleanup
+    _resource_group_cleanup = cleanup
+
+    return previous_cleanup
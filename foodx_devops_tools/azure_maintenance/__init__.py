@@ -0,0 +1,10 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Maintenance of Azure resources created by deployments."""
+
+from ._group import azure_maintenance  # noqa: F401
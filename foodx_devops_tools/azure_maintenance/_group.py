@@ -0,0 +1,71 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Azure maintenance command group."""
+
+import pathlib
+
+import click
+
+from foodx_devops_tools._declarations import (
+    DEFAULT_CONSOLE_LOGGING_ENABLED,
+    DEFAULT_FILE_LOGGING_DISABLED,
+    DEFAULT_LOG_LEVEL,
+    VALID_LOG_LEVELS,
+)
+from foodx_devops_tools._logging import LoggingState
+from foodx_devops_tools._version import acquire_version
+
+from ._prune import prune_deployments_subcommand
+from ._reap import reap_validation_subcommand
+
+DEFAULT_LOG_FILE = pathlib.Path("azure_maintenance.log")
+
+
+@click.group()
+@click.version_option(version=acquire_version())
+@click.option(
+    "--log-enable-console",
+    "enable_console_log",
+    default=DEFAULT_CONSOLE_LOGGING_ENABLED,
+    help="Log to console.",
+    is_flag=True,
+)
+@click.option(
+    "--log-disable-file",
+    "disable_file_log",
+    default=DEFAULT_FILE_LOGGING_DISABLED,
+    help="Disable file logging.",
+    is_flag=True,
+)
+@click.option(
+    "--log-level",
+    "log_level",
+    default=DEFAULT_LOG_LEVEL,
+    help="Select logging level to apply to all enabled log sinks.",
+    type=click.Choice(VALID_LOG_LEVELS, case_sensitive=False),
+)
+def azure_maintenance(
+    disable_file_log: bool, enable_console_log: bool, log_level: str
+) -> None:
+    """Azure maintenance command group."""
+    # currently no need to change logging configuration at run time,
+    # so no need to preserve the object.
+    LoggingState(
+        disable_file_logging=disable_file_log,
+        enable_console_logging=enable_console_log,
+        log_level_text=log_level,
+        default_log_file=DEFAULT_LOG_FILE,
+    )
+
+
+azure_maintenance.add_command(
+    prune_deployments_subcommand, name="prune-deployments"
+)
+azure_maintenance.add_command(
+    reap_validation_subcommand, name="reap-validation"
+)
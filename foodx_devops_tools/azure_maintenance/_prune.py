@@ -0,0 +1,157 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Pruning of resource group deployment history."""
+
+import asyncio
+import logging
+import pathlib
+import sys
+import typing
+
+import click
+
+from foodx_devops_tools.azure.cloud.deployment_history import (
+    DEFAULT_MAXIMUM_CONCURRENCY,
+    DEFAULT_RETAIN_COUNT,
+    prune_deployment_history,
+)
+from foodx_devops_tools.azure.cloud.resource_group import (
+    reset_resource_group_index,
+)
+from foodx_devops_tools.console import report_failure, report_success
+from foodx_devops_tools.pipeline_config import PipelineConfiguration
+from foodx_devops_tools.utilities import forward_termination_signals
+
+from ._subscriptions import (
+    configured_resource_group_names,
+    load_configuration,
+    login_subscriptions,
+    subscription_credentials,
+)
+
+log = logging.getLogger(__name__)
+
+
+async def _prune(
+    configuration: PipelineConfiguration,
+    subscription_names: typing.Tuple[str, ...],
+    retain_count: int,
+    dry_run: bool,
+    maximum_concurrency: int,
+) -> typing.Dict[typing.Tuple[str, str], typing.List[str]]:
+    reset_resource_group_index()
+    subscriptions = await login_subscriptions(
+        subscription_credentials(configuration, subscription_names)
+    )
+    return await prune_deployment_history(
+        subscriptions,
+        configured_resource_group_names(configuration),
+        retain_count=retain_count,
+        dry_run=dry_run,
+        maximum_concurrency=maximum_concurrency,
+    )
+
+
+@click.command()
+@click.argument(
+    "client_path",
+    type=click.Path(dir_okay=True, file_okay=False, path_type=pathlib.Path),
+)
+@click.argument(
+    "system_path",
+    type=click.Path(dir_okay=True, file_okay=False, path_type=pathlib.Path),
+)
+@click.argument(
+    "password_file",
+    type=click.File(mode="r"),
+)
+@click.option(
+    "--dry-run",
+    default=False,
+    help="Report prunable deployments without deleting them.",
+    is_flag=True,
+)
+@click.option(
+    "--keep",
+    "retain_count",
+    default=DEFAULT_RETAIN_COUNT,
+    help="Number of deployments to retain for each deployment step.",
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--max-concurrency",
+    default=DEFAULT_MAXIMUM_CONCURRENCY,
+    help="Maximum number of concurrent deployment history requests.",
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--subscription",
+    "subscription_names",
+    help="Subscription name to search. May be specified multiple times. "
+    "[default: all subscriptions with a service principal]",
+    multiple=True,
+    type=str,
+)
+def prune_deployments_subcommand(
+    client_path: pathlib.Path,
+    system_path: pathlib.Path,
+    password_file: typing.IO,
+    dry_run: bool,
+    retain_count: int,
+    max_concurrency: int,
+    subscription_names: typing.Tuple[str, ...],
+) -> None:
+    """
+    Prune the deployment history of configured resource groups.
+
+    Resource groups accumulate a deployment history entry per step per
+    pipeline run; ARM limits the number of entries in a resource group. The
+    most recent entries of each deployment step are retained and deletion of
+    the rest is requested without waiting. Deployed resources are not
+    affected.
+
+    CLIENT_PATH  The client specific deployment definition directory.
+    SYSTEM_PATH  The directory containing all non-client related pipeline
+                   and deployment definition.
+    PASSWORD_FILE:  The path to a file where the service principal decryption
+                    password is stored, or "-" for stdin.
+    """
+    try:
+        configuration = load_configuration(
+            client_path, system_path, password_file
+        )
+        with forward_termination_signals():
+            result = asyncio.run(
+                _prune(
+                    configuration,
+                    subscription_names,
+                    retain_count,
+                    dry_run,
+                    max_concurrency,
+                )
+            )
+
+        for (subscription_name, group_name), names in sorted(result.items()):
+            for this_name in names:
+                click.echo(
+                    "{0}: {1}: {2}".format(
+                        subscription_name, group_name, this_name
+                    )
+                )
+        report_success(
+            "{0} deployments pruned{1}".format(
+                sum(len(x) for x in result.values()),
+                " (dry run)" if dry_run else "",
+            )
+        )
+    except Exception as e:
+        log.exception("deployment history pruning failed")
+        report_failure("deployment history pruning failed, {0}".format(str(e)))
+        sys.exit(1)
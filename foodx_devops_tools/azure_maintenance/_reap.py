@@ -0,0 +1,196 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Deletion of stale validation deployment resource groups."""
+
+import asyncio
+import logging
+import pathlib
+import sys
+import typing
+
+import click
+
+from foodx_devops_tools.azure.cloud.resource_group import (
+    VALIDATION_TAG,
+    reset_resource_group_index,
+)
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    DEFAULT_MAXIMUM_CONCURRENCY,
+    reap_resource_groups,
+)
+from foodx_devops_tools.console import report_failure, report_success
+from foodx_devops_tools.deploy_me.application_steps._deploy import (
+    _mangle_validation_resource_group,
+)
+from foodx_devops_tools.pipeline_config import PipelineConfiguration
+from foodx_devops_tools.utilities import forward_termination_signals
+
+from ._subscriptions import (
+    configured_resource_group_names,
+    load_configuration,
+    login_subscriptions,
+    subscription_credentials,
+)
+
+log = logging.getLogger(__name__)
+
+
+def validation_group_matcher(
+    configuration: PipelineConfiguration,
+    exclude_pipeline_ids: typing.Iterable[str] = tuple(),
+) -> typing.Callable[[str, typing.Dict[str, str]], bool]:
+    """
+    Construct a matcher of validation deployment resource groups.
+
+    A validation resource group is tagged with the pipeline id when it is
+    created, and its name is a configured resource group name mangled with
+    the pipeline id. Untagged resource groups and configured resource group
+    names themselves never match.
+
+    Args:
+        configuration: Pipeline configuration.
+        exclude_pipeline_ids: Pipelines whose validation resource groups
+                              must not match, eg. pipelines in progress.
+
+    Returns:
+        Matcher function.
+    """
+    names = configured_resource_group_names(configuration)
+    excluded = set(exclude_pipeline_ids)
+
+    def _is_validation_group(name: str, tags: typing.Dict[str, str]) -> bool:
+        pipeline_id = tags.get(VALIDATION_TAG)
+        return (
+            (pipeline_id is not None)
+            and (pipeline_id not in excluded)
+            and (name not in names)
+            and any(
+                name == _mangle_validation_resource_group(x, pipeline_id)
+                for x in names
+            )
+        )
+
+    return _is_validation_group
+
+
+async def _reap(
+    configuration: PipelineConfiguration,
+    subscription_names: typing.Tuple[str, ...],
+    exclude_pipeline_ids: typing.Tuple[str, ...],
+    dry_run: bool,
+    maximum_concurrency: int,
+) -> typing.Dict[str, typing.List[str]]:
+    reset_resource_group_index()
+    subscriptions = await login_subscriptions(
+        subscription_credentials(configuration, subscription_names)
+    )
+    return await reap_resource_groups(
+        subscriptions,
+        validation_group_matcher(configuration, exclude_pipeline_ids),
+        dry_run=dry_run,
+        maximum_concurrency=maximum_concurrency,
+    )
+
+
+@click.command()
+@click.argument(
+    "client_path",
+    type=click.Path(dir_okay=True, file_okay=False, path_type=pathlib.Path),
+)
+@click.argument(
+    "system_path",
+    type=click.Path(dir_okay=True, file_okay=False, path_type=pathlib.Path),
+)
+@click.argument(
+    "password_file",
+    type=click.File(mode="r"),
+)
+@click.option(
+    "--delete/--dry-run",
+    default=False,
+    help="Delete the stale validation resource groups, or only report them.",
+    show_default=True,
+)
+@click.option(
+    "--exclude-pipeline-id",
+    "exclude_pipeline_ids",
+    help="Retain the validation resource groups of a pipeline, such as a "
+    "pipeline in progress. May be specified multiple times.",
+    multiple=True,
+    type=str,
+)
+@click.option(
+    "--max-concurrency",
+    default=DEFAULT_MAXIMUM_CONCURRENCY,
+    help="Maximum number of concurrent resource group delete requests.",
+    show_default=True,
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--subscription",
+    "subscription_names",
+    help="Subscription name to search. May be specified multiple times. "
+    "[default: all subscriptions with a service principal]",
+    multiple=True,
+    type=str,
+)
+def reap_validation_subcommand(
+    client_path: pathlib.Path,
+    system_path: pathlib.Path,
+    password_file: typing.IO,
+    delete: bool,
+    exclude_pipeline_ids: typing.Tuple[str, ...],
+    max_concurrency: int,
+    subscription_names: typing.Tuple[str, ...],
+) -> None:
+    """
+    Delete stale validation deployment resource groups.
+
+    Validation resource groups are tagged with the pipeline id when they are
+    created, and named from configured deployment step resource groups,
+    mangled with the pipeline id. Subscriptions are searched in parallel.
+    Stale resource groups are only reported unless ``--delete`` is
+    specified; deletion is requested without waiting for completion.
+
+    CLIENT_PATH  The client specific deployment definition directory.
+    SYSTEM_PATH  The directory containing all non-client related pipeline
+                   and deployment definition.
+    PASSWORD_FILE:  The path to a file where the service principal decryption
+                    password is stored, or "-" for stdin.
+    """
+    dry_run = not delete
+    try:
+        configuration = load_configuration(
+            client_path, system_path, password_file
+        )
+        with forward_termination_signals():
+            result = asyncio.run(
+                _reap(
+                    configuration,
+                    subscription_names,
+                    exclude_pipeline_ids,
+                    dry_run,
+                    max_concurrency,
+                )
+            )
+
+        for subscription_name, names in result.items():
+            for this_name in names:
+                click.echo("{0}: {1}".format(subscription_name, this_name))
+        report_success(
+            "{0} stale validation resource groups{1}".format(
+                sum(len(x) for x in result.values()),
+                " (dry run)" if dry_run else "",
+            )
+        )
+    except Exception as e:
+        log.exception("validation resource group reaping failed")
+        report_failure(
+            "validation resource group reaping failed, {0}".format(str(e))
+        )
+        sys.exit(1)
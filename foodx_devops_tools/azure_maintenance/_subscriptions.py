@@ -0,0 +1,137 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Configuration and subscription access for maintenance commands."""
+
+import logging
+import pathlib
+import typing
+
+from foodx_devops_tools.azure.cloud import AzureSubscriptionConfiguration
+from foodx_devops_tools.azure.cloud.auth import (
+    AzureCredentials,
+    login_service_principal,
+)
+from foodx_devops_tools.deploy_me.application_steps._deploy import (
+    _construct_resource_group_name,
+)
+from foodx_devops_tools.pipeline_config import (
+    PipelineConfiguration,
+    PipelineConfigurationPaths,
+)
+from foodx_devops_tools.pipeline_config.frames import (
+    ApplicationStepDeploymentDefinition,
+)
+from foodx_devops_tools.utilities import acquire_token
+
+log = logging.getLogger(__name__)
+
+
+class MaintenanceError(Exception):
+    """Problem occurred with a maintenance action."""
+
+
+def load_configuration(
+    client_path: pathlib.Path,
+    system_path: pathlib.Path,
+    password_file: typing.IO,
+) -> PipelineConfiguration:
+    """Load pipeline configuration, including service principal secrets."""
+    configuration_paths = PipelineConfigurationPaths.from_paths(
+        client_path / "configuration", system_path / "configuration"
+    )
+    return PipelineConfiguration.from_files(
+        configuration_paths, acquire_token(password_file)
+    )
+
+
+def configured_resource_group_names(
+    configuration: PipelineConfiguration,
+) -> typing.Set[str]:
+    """Identify the resource groups of all client deployment steps."""
+    result: typing.Set[str] = set()
+    for this_frame in configuration.frames.frames.values():
+        for this_application in this_frame.applications.values():
+            for this_step in this_application.steps:
+                if isinstance(this_step, ApplicationStepDeploymentDefinition):
+                    result |= {
+                        _construct_resource_group_name(
+                            x, this_step.resource_group
+                        )
+                        for x in configuration.clients.keys()
+                    }
+
+    return result
+
+
+def subscription_credentials(
+    configuration: PipelineConfiguration,
+    subscription_names: typing.Optional[typing.Iterable[str]] = None,
+) -> typing.Dict[str, AzureCredentials]:
+    """
+    Identify the service principal credentials of subscriptions.
+
+    Args:
+        configuration: Pipeline configuration.
+        subscription_names: Subscriptions to select; all subscriptions with
+                            service principals if not specified.
+
+    Returns:
+        Credentials, by subscription name.
+    Raises:
+        MaintenanceError: If a selected subscription has no service
+                          principal.
+    """
+    service_principals = configuration.service_principals or dict()
+    selected = (
+        sorted(subscription_names)
+        if subscription_names
+        else sorted(
+            x for x in configuration.subscriptions if x in service_principals
+        )
+    )
+    result = dict()
+    for name in selected:
+        if (name not in configuration.subscriptions) or (
+            name not in service_principals
+        ):
+            raise MaintenanceError(
+                "subscription not configured with a service principal, "
+                "{0}".format(name)
+            )
+        this_subscription = configuration.subscriptions[name]
+        result[name] = AzureCredentials(
+            userid=service_principals[name].id,
+            secret=service_principals[name].secret,
+            name=service_principals[name].name,
+            subscription=this_subscription.azure_id,
+            tenant=configuration.tenants[this_subscription.tenant].azure_id,
+        )
+
+    return result
+
+
+async def login_subscriptions(
+    credentials: typing.Dict[str, AzureCredentials]
+) -> typing.List[AzureSubscriptionConfiguration]:
+    """
+    Log in to subscriptions.
+
+    Logins are serial to avoid ``az login`` concurrency problems.
+
+    Args:
+        credentials: Credentials, by subscription name.
+
+    Returns:
+        Logged in subscriptions.
+    """
+    result = list()
+    for name, this_credentials in credentials.items():
+        await login_service_principal(this_credentials)
+        result.append(AzureSubscriptionConfiguration(subscription_id=name))
+
+    return result
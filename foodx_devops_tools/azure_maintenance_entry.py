@@ -0,0 +1,16 @@
+#!python3
+# Copyright (c) 2022 Food-X Technologies
+#
+# This file is part of foodx_devops_tools.
+#
+# You should have received a copy of the MIT License along with
+# foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Azure maintenance utility."""
+
+from .azure_maintenance import azure_maintenance
+
+
+def flit_entry() -> None:
+    """Flit script entry function for ``foodx-azure-maintenance`` utility."""
+    azure_maintenance()
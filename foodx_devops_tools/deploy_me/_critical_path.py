@@ -0,0 +1,259 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Critical path analysis of executed deployments."""
+
+import dataclasses
+import datetime
+import logging
+import typing
+
+from foodx_devops_tools.profiling import Span, SpanKind
+
+log = logging.getLogger(__name__)
+
+NODE_KINDS = {
+    SpanKind.iteration,
+    SpanKind.frame,
+    SpanKind.application,
+    SpanKind.step,
+}
+
+
+@dataclasses.dataclass
+class CriticalPathNode:
+    """An executed iteration, frame, application or step."""
+
+    name: str
+    kind: SpanKind
+    # the time the node could start work; after its dependencies completed.
+    start_seconds: float
+    end_seconds: float
+    depends_on: typing.List[str]
+    parent: typing.Optional[str] = None
+    children: typing.List[str] = dataclasses.field(default_factory=list)
+    critical: bool = False
+    slack_seconds: float = 0.0
+
+    @property
+    def duration_seconds(self: "CriticalPathNode") -> float:
+        """Duration of the node from its effective start."""
+        return self.end_seconds - self.start_seconds
+
+
+T = typing.TypeVar("T", bound="CriticalPathAnalysis")
+
+
+class CriticalPathAnalysis:
+    """
+    Identify the chain of nodes that determined deployment wall clock time.
+
+    Nodes are related by their declared dependencies (``depends_on`` span
+    attribute) within the same parent node. The critical chain of a group of
+    sibling nodes ends with the last sibling to finish, and is traced back
+    through the dependency that finished last at each step. The critical
+    chain is then expanded into the children of each critical node.
+
+    Slack is the time a node could have been delayed without delaying any of
+    its dependents, or the end of its parent if it has no dependents.
+    """
+
+    __nodes: typing.Dict[str, CriticalPathNode]
+    __roots: typing.List[str]
+
+    def __init__(self: T, spans: typing.List[Span]) -> None:
+        """
+        Construct ``CriticalPathAnalysis`` object.
+
+        Args:
+            spans: Recorded trace spans.
+        """
+        self.__nodes = dict()
+        self.__roots = list()
+        self.__build_nodes(spans)
+        self.__calculate_slack()
+        for x in self.critical_path:
+            x.critical = True
+
+    @property
+    def nodes(self: T) -> typing.List[CriticalPathNode]:
+        """All nodes, ordered by effective start time."""
+        return sorted(self.__nodes.values(), key=lambda x: x.start_seconds)
+
+    @property
+    def critical_path(self: T) -> typing.List[CriticalPathNode]:
+        """The critical nodes, depth first in execution order."""
+        return self.__expand_chain(self.__roots)
+
+    @property
+    def total_seconds(self: T) -> float:
+        """Wall clock time from the first node start to the last node end."""
+        if self.__nodes:
+            values = list(self.__nodes.values())
+            return max([x.end_seconds for x in values]) - min(
+                [x.start_seconds for x in values]
+            )
+        else:
+            return 0.0
+
+    def __build_nodes(self: T, spans: typing.List[Span]) -> None:
+        spans_by_id = {x.span_id: x for x in spans}
+
+        def node_parent(this_span: Span) -> typing.Optional[str]:
+            parent_id = this_span.parent_id
+            while parent_id is not None:
+                parent = spans_by_id.get(parent_id)
+                if parent is None:
+                    return None
+                elif parent.kind in NODE_KINDS:
+                    return parent.name
+                parent_id = parent.parent_id
+            return None
+
+        node_spans = [x for x in spans if x.kind in NODE_KINDS]
+        for this_span in node_spans:
+            self.__nodes[this_span.name] = CriticalPathNode(
+                name=this_span.name,
+                kind=this_span.kind,
+                start_seconds=this_span.start_seconds,
+                end_seconds=this_span.end_seconds,
+                depends_on=list(this_span.attributes.get("depends_on", [])),
+                parent=node_parent(this_span),
+            )
+        for this_node in self.__nodes.values():
+            # a node cannot start work before its dependencies completed.
+            this_node.depends_on = [
+                x
+                for x in this_node.depends_on
+                if (x in self.__nodes)
+                and (self.__nodes[x].parent == this_node.parent)
+            ]
+            for x in this_node.depends_on:
+                this_node.start_seconds = max(
+                    this_node.start_seconds, self.__nodes[x].end_seconds
+                )
+            if this_node.parent and (this_node.parent in self.__nodes):
+                self.__nodes[this_node.parent].children.append(this_node.name)
+            else:
+                self.__roots.append(this_node.name)
+
+    def __calculate_slack(self: T) -> None:
+        groups: typing.Dict[typing.Optional[str], typing.List[str]] = {
+            None: self.__roots
+        }
+        for this_node in self.__nodes.values():
+            if this_node.children:
+                groups[this_node.name] = this_node.children
+
+        for parent_name, sibling_names in groups.items():
+            siblings = [self.__nodes[x] for x in sibling_names]
+            if not siblings:
+                continue
+            group_end = (
+                self.__nodes[parent_name].end_seconds
+                if parent_name
+                else max([x.end_seconds for x in siblings])
+            )
+            for this_node in siblings:
+                successor_starts = [
+                    x.start_seconds
+                    for x in siblings
+                    if this_node.name in x.depends_on
+                ]
+                limit = min(successor_starts) if successor_starts else group_end
+                this_node.slack_seconds = max(
+                    0.0, limit - this_node.end_seconds
+                )
+
+    def __group_chain(
+        self: T, sibling_names: typing.List[str]
+    ) -> typing.List[CriticalPathNode]:
+        if not sibling_names:
+            return list()
+
+        current = max(
+            [self.__nodes[x] for x in sibling_names],
+            key=lambda x: x.end_seconds,
+        )
+        chain = [current]
+        visited = {current.name}
+        while current.depends_on:
+            current = max(
+                [self.__nodes[x] for x in current.depends_on],
+                key=lambda x: x.end_seconds,
+            )
+            if current.name in visited:
+                log.warning(
+                    "dependency cycle in critical path, {0}".format(
+                        current.name
+                    )
+                )
+                break
+            visited.add(current.name)
+            chain.insert(0, current)
+
+        return chain
+
+    def __expand_chain(
+        self: T, sibling_names: typing.List[str]
+    ) -> typing.List[CriticalPathNode]:
+        result: typing.List[CriticalPathNode] = list()
+        for this_node in self.__group_chain(sibling_names):
+            result.append(this_node)
+            result += self.__expand_chain(this_node.children)
+
+        return result
+
+    def __depth(self: T, this_node: CriticalPathNode) -> int:
+        depth = 0
+        parent = this_node.parent
+        while parent and (parent in self.__nodes):
+            depth += 1
+            parent = self.__nodes[parent].parent
+
+        return depth
+
+    def format_report(self: T) -> str:
+        """Format the critical path and node slack as text."""
+        origin = min([x.start_seconds for x in self.nodes], default=0.0)
+        lines = [
+            "critical path, total {0}".format(
+                datetime.timedelta(seconds=self.total_seconds)
+            ),
+            "{0:>12} {1:>12}  {2}".format("start (s)", "duration (s)", "node"),
+        ]
+        for x in self.critical_path:
+            lines.append(
+                "{0:>12.3f} {1:>12.3f}  {2}{3} {4}".format(
+                    x.start_seconds - origin,
+                    x.duration_seconds,
+                    "  " * self.__depth(x),
+                    x.kind.value,
+                    x.name,
+                )
+            )
+
+        lines.append("slack of non-critical nodes")
+        lines.append(
+            "{0:>12} {1:>12}  {2:<12} {3}".format(
+                "slack (s)", "duration (s)", "kind", "node"
+            )
+        )
+        for x in sorted(
+            [y for y in self.nodes if not y.critical],
+            key=lambda y: y.slack_seconds,
+        ):
+            lines.append(
+                "{0:>12.3f} {1:>12.3f}  {2:<12} {3}".format(
+                    x.slack_seconds,
+                    x.duration_seconds,
+                    x.kind.value,
+                    x.name,
+                )
+            )
+
+        return "\n".join(lines)
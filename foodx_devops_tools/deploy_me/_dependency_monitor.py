@@ -18,6 +18,7 @@ from foodx_devops_tools.pipeline_config import (
     DependencyDeclarations,
     IterationContext,
 )
+from foodx_devops_tools.profiling import SpanKind, trace_span
 
 from ._exceptions import DeploymentTerminatedError
 from ._status import (
@@ -178,12 +179,16 @@ async def wait_for_dependencies(
         log.info(message)
         click.echo(click.style(message))
         try:
-            await asyncio.gather(
-                *[
-                    entity_status.wait_for_completion(x)
-                    for x in dependency_contexts
-                ]
-            )
+            with trace_span(
+                "{0} dependencies".format(iteration_context),
+                SpanKind.dependency_wait,
+            ):
+                await asyncio.gather(
+                    *[
+                        entity_status.wait_for_completion(x)
+                        for x in dependency_contexts
+                    ]
+                )
 
             dependency_status = [
                 await entity_status.read(x) for x in dependency_contexts
@@ -16,6 +16,7 @@ from foodx_devops_tools.azure.cloud.auth import (
     AzureAuthenticationError,
     login_service_principal,
 )
+from foodx_devops_tools.azure.cloud.resource_group import WhatIfSummary
 from foodx_devops_tools.pipeline_config import (
     ApplicationDefinition,
     ApplicationDeploymentSteps,
@@ -28,11 +29,17 @@ from foodx_devops_tools.pipeline_config.frames import (
     ApplicationStepDeploymentDefinition,
     ApplicationStepScript,
 )
-from foodx_devops_tools.profiling import timing
+from foodx_devops_tools.profiling import SpanKind, timing
 from foodx_devops_tools.puff import PuffError
 
-from ._dependency_monitor import wait_for_dependencies
+from ._dependency_monitor import (
+    _generate_dependency_contexts,
+    wait_for_dependencies,
+)
+from ._events import EntityKind
 from ._exceptions import DeploymentError
+from ._fail_fast import FailFastPolicy, is_fail_fast_cancelled, run_fail_fast
+from ._preflight import create_resource_groups
 from ._state import PipelineCliOptions
 from ._status import DeploymentState, DeploymentStatus, all_success
 from .application_steps import delay_step, deploy_step, script_step
@@ -92,49 +99,206 @@ async def assess_results(
     return this_result
 
 
+def _has_step_dependencies(steps: ApplicationDeploymentSteps) -> bool:
+    """Evaluate if any application steps declare dependencies."""
+    result = any([getattr(x, "depends_on", None) is not None for x in steps])
+    return result
+
+
+def _resolve_step_dependencies(
+    steps: ApplicationDeploymentSteps,
+) -> typing.List[typing.Set[int]]:
+    """
+    Resolve application step dependencies to the indices of earlier steps.
+
+    A step without a ``depends_on`` declaration depends on all of the steps
+    preceding it, so undeclared steps retain their sequential behaviour.
+
+    Args:
+        steps: Application steps to resolve.
+
+    Returns:
+        Indices of step dependencies, one set per step.
+    """
+    result: typing.List[typing.Set[int]] = list()
+    for index, this_step in enumerate(steps):
+        declared = getattr(this_step, "depends_on", None)
+        if declared is None:
+            result.append(set(range(index)))
+        else:
+            result.append(
+                {
+                    i
+                    for i, x in enumerate(steps[0:index])
+                    if getattr(x, "name", None) in declared
+                }
+            )
+
+    return result
+
+
+def _construct_step_context(
+    this_context: str,
+    index: int,
+    this_step: typing.Union[
+        ApplicationStepDelay,
+        ApplicationStepDeploymentDefinition,
+        ApplicationStepScript,
+    ],
+) -> str:
+    """Construct a step context, using the step index for unnamed steps."""
+    step_name = getattr(this_step, "name", None)
+    result = "{0}.{1}".format(
+        this_context, step_name if step_name else str(index)
+    )
+
+    return result
+
+
+async def _do_step(
+    application_data: ApplicationDeploymentSteps,
+    index: int,
+    step_dependencies: typing.List[typing.Set[int]],
+    deployment_data: FlattenedDeployment,
+    enable_validation: bool,
+    what_if: bool = False,
+) -> typing.Optional[WhatIfSummary]:
+    this_context = str(deployment_data.data.iteration_context)
+    this_step = application_data[index]
+    step_context = _construct_step_context(this_context, index, this_step)
+    dependency_contexts = [
+        _construct_step_context(this_context, x, application_data[x])
+        for x in sorted(step_dependencies[index])
+    ]
+    with timing(
+        log, step_context, SpanKind.step, depends_on=dependency_contexts
+    ):
+        if isinstance(this_step, ApplicationStepDeploymentDefinition):
+            return await deploy_step(
+                this_step,
+                deployment_data,
+                enable_validation,
+                what_if=what_if,
+            )
+        elif isinstance(this_step, ApplicationStepScript):
+            await script_step(
+                this_step,
+                deployment_data,
+            )
+        elif isinstance(this_step, ApplicationStepDelay):
+            await delay_step(this_step.delay_seconds)
+        else:
+            raise DeploymentError(
+                "Bad application step definition, {0}".format(this_context)
+            )
+
+    return None
+
+
+async def _do_step_graph(
+    application_data: ApplicationDeploymentSteps,
+    deployment_data: FlattenedDeployment,
+    enable_validation: bool,
+    what_if: bool = False,
+) -> typing.List[typing.Optional[WhatIfSummary]]:
+    """
+    Deploy application steps concurrently, subject to their dependencies.
+
+    Each step starts as soon as all of its dependencies have completed. The
+    first step failure cancels any steps that have not yet completed.
+    """
+    step_dependencies = _resolve_step_dependencies(application_data)
+    step_tasks: typing.List[asyncio.Task] = list()
+
+    async def run_when_ready(index: int) -> typing.Optional[WhatIfSummary]:
+        if step_dependencies[index]:
+            await asyncio.gather(
+                *[step_tasks[x] for x in step_dependencies[index]]
+            )
+        return await _do_step(
+            application_data,
+            index,
+            step_dependencies,
+            deployment_data,
+            enable_validation,
+            what_if=what_if,
+        )
+
+    for index in range(len(application_data)):
+        step_tasks.append(asyncio.create_task(run_when_ready(index)))
+
+    try:
+        return list(await asyncio.gather(*step_tasks))
+    finally:
+        incomplete_tasks = [x for x in step_tasks if not x.done()]
+        for x in incomplete_tasks:
+            x.cancel()
+        await asyncio.gather(*incomplete_tasks, return_exceptions=True)
+
+
+def _summarise_predicted_changes(
+    application_data: ApplicationDeploymentSteps,
+    predicted_changes: typing.List[typing.Optional[WhatIfSummary]],
+) -> typing.Optional[str]:
+    """Summarise the what-if predicted changes of application steps."""
+    # only deployment steps have predicted changes.
+    summaries = [
+        "{0}: {1}{2}".format(
+            typing.cast(
+                ApplicationStepDeploymentDefinition, application_data[index]
+            ).name,
+            str(x),
+            " (skipped)" if x.is_noop else "",
+        )
+        for index, x in enumerate(predicted_changes)
+        if x is not None
+    ]
+
+    return "what-if, {0}".format("; ".join(summaries)) if summaries else None
+
+
 async def _do_application_deployment(
     application_data: ApplicationDeploymentSteps,
     deployment_data: FlattenedDeployment,
     application_status: DeploymentStatus,
     enable_validation: bool,
+    what_if: bool = False,
 ) -> None:
     this_context = str(deployment_data.data.iteration_context)
     try:
-
-        for this_step in application_data:
-            with timing(log, this_context):
-                if isinstance(this_step, ApplicationStepDeploymentDefinition):
-                    await deploy_step(
-                        this_step,
+        predicted_changes: typing.List[typing.Optional[WhatIfSummary]]
+        if _has_step_dependencies(application_data):
+            log.info(
+                "application steps declare dependencies, deploying "
+                "concurrently, {0}".format(this_context)
+            )
+            predicted_changes = await _do_step_graph(
+                application_data,
+                deployment_data,
+                enable_validation,
+                what_if=what_if,
+            )
+        else:
+            step_dependencies = _resolve_step_dependencies(application_data)
+            predicted_changes = list()
+            for index in range(len(application_data)):
+                predicted_changes.append(
+                    await _do_step(
+                        application_data,
+                        index,
+                        step_dependencies,
                         deployment_data,
                         enable_validation,
+                        what_if=what_if,
                     )
-                elif isinstance(this_step, ApplicationStepScript):
-                    await script_step(
-                        this_step,
-                        deployment_data,
-                    )
-                elif isinstance(this_step, ApplicationStepDelay):
-                    await delay_step(this_step.delay_seconds)
-                else:
-                    raise DeploymentError(
-                        "Bad application step definition, "
-                        "{0}".format(this_context)
-                    )
+                )
 
         log.info("application deployment succeeded, {0}".format(this_context))
-        await application_status.write(
-            this_context, DeploymentState.ResultType.success
-        )
-    except asyncio.CancelledError:
-        message = "async cancelled signal"
-        log.error(message)
         await application_status.write(
             this_context,
-            DeploymentState.ResultType.cancelled,
-            message,
+            DeploymentState.ResultType.success,
+            _summarise_predicted_changes(application_data, predicted_changes),
         )
-        raise
     except (AzureAuthenticationError, PuffError) as e:
         message = (
             "application deployment authentication "
@@ -148,16 +312,76 @@ async def _do_application_deployment(
         log.error(message)
 
 
+async def _deploy_application_when_ready(
+    application_data: ApplicationDefinition,
+    deployment_data: FlattenedDeployment,
+    application_status: DeploymentStatus,
+    enable_validation: bool,
+    what_if: bool,
+) -> None:
+    this_context = str(deployment_data.data.iteration_context)
+    await wait_for_dependencies(
+        deployment_data.data.iteration_context,
+        application_data.depends_on if application_data.depends_on else list(),
+        application_status,
+    )
+
+    await application_status.write(
+        this_context, DeploymentState.ResultType.in_progress
+    )
+
+    deploy_to = deployment_data.data.to
+    application_name = deployment_data.context.application_name
+    if deploy_to.application and (application_name != deploy_to.application):
+        await application_status.write(
+            this_context,
+            DeploymentState.ResultType.skipped,
+            message="deployment targeted application, {0}".format(
+                str(deploy_to)
+            ),
+        )
+    else:
+        dependency_contexts = _generate_dependency_contexts(
+            deployment_data.data.iteration_context,
+            set(application_data.depends_on)
+            if application_data.depends_on
+            else set(),
+        )
+        with timing(
+            log,
+            this_context,
+            SpanKind.application,
+            depends_on=sorted(dependency_contexts),
+        ):
+            await _do_application_deployment(
+                application_data.steps,
+                deployment_data,
+                application_status,
+                enable_validation,
+                what_if=what_if,
+            )
+
+
 async def deploy_application(
     application_data: ApplicationDefinition,
     deployment_data: FlattenedDeployment,
     application_status: DeploymentStatus,
     enable_validation: bool,
+    fail_fast_policy: typing.Optional[FailFastPolicy] = None,
+    what_if: bool = False,
 ) -> None:
     """
     Deploy the steps of a frame application.
 
-    Application steps must be deployed in sequence (serially).
+    Application steps are deployed in sequence (serially), unless steps
+    declare ``depends_on`` in which case they are deployed concurrently as
+    soon as their dependencies have completed.
+
+    When a fail fast policy is enabled and triggered by a failure elsewhere,
+    the application deployment is cancelled.
+
+    When what-if is enabled, the changes of each step deployment are
+    predicted first and steps with no predicted changes are skipped.
     """
     this_context = str(deployment_data.data.iteration_context)
     try:
@@ -166,38 +390,26 @@ async def deploy_application(
         click.echo(message)
         await application_status.initialize(this_context)
 
-        await wait_for_dependencies(
-            deployment_data.data.iteration_context,
-            application_data.depends_on
-            if application_data.depends_on
-            else list(),
-            application_status,
+        await run_fail_fast(
+            fail_fast_policy,
+            _deploy_application_when_ready(
+                application_data,
+                deployment_data,
+                application_status,
+                enable_validation,
+                what_if,
+            ),
         )
-
+    except asyncio.CancelledError as e:
+        message = "application deployment cancelled, {0}".format(this_context)
+        log.error(message)
         await application_status.write(
-            this_context, DeploymentState.ResultType.in_progress
+            this_context,
+            DeploymentState.ResultType.cancelled,
+            message,
         )
-
-        deploy_to = deployment_data.data.to
-        application_name = deployment_data.context.application_name
-        if deploy_to.application and (
-            application_name != deploy_to.application
-        ):
-            await application_status.write(
-                this_context,
-                DeploymentState.ResultType.skipped,
-                message="deployment targeted application, {0}".format(
-                    str(deploy_to)
-                ),
-            )
-        else:
-            with timing(log, this_context):
-                await _do_application_deployment(
-                    application_data.steps,
-                    deployment_data,
-                    application_status,
-                    enable_validation,
-                )
+        if not is_fail_fast_cancelled(e):
+            raise
     except Exception as e:
         message = "application deployment failed, {0}, {1}, {2}".format(
             this_context, type(e), str(e)
@@ -223,7 +435,10 @@ async def _do_frame_deployment(
 ) -> None:
     # application status will show as "pending" until deployment activates.
     application_status = DeploymentStatus(
-        this_context, pipeline_parameters.wait_timeout_seconds
+        this_context,
+        pipeline_parameters.wait_timeout_seconds,
+        entity_kind=EntityKind.application,
+        event_bus=pipeline_parameters.event_bus,
     )
     try:
         wait_task = asyncio.create_task(
@@ -231,29 +446,59 @@ async def _do_frame_deployment(
         )
         application_status.start_monitor()
 
-        await wait_for_dependencies(
-            deployment_data.data.iteration_context,
-            frame_data.depends_on if frame_data.depends_on else list(),
-            frame_status,
-        )
+        try:
+            await run_fail_fast(
+                pipeline_parameters.fail_fast_policy,
+                wait_for_dependencies(
+                    deployment_data.data.iteration_context,
+                    frame_data.depends_on if frame_data.depends_on else list(),
+                    frame_status,
+                ),
+            )
+        except asyncio.CancelledError as e:
+            wait_task.cancel()
+            if not is_fail_fast_cancelled(e):
+                raise
+            message = "frame deployment cancelled, {0}".format(this_context)
+            log.error(message)
+            await frame_status.write(
+                this_context, DeploymentState.ResultType.cancelled, message
+            )
+            return
 
         frame_deployment = copy.deepcopy(deployment_data)
         frame_deployment.data.frame_folder = frame_data.folder
 
-        await asyncio.gather(
-            *[
-                deploy_application(
-                    application_data,
-                    frame_deployment.copy_add_application(application_name),
-                    application_status,
-                    pipeline_parameters.enable_validation,
-                )
-                for application_name, application_data in frame_data.applications.items()  # noqa: E501
-            ],
-            return_exceptions=False,
+        # create resource groups while applications prepare templates; steps
+        # wait for any creation still in flight.
+        preflight_task = asyncio.create_task(
+            create_resource_groups(
+                frame_data,
+                frame_deployment,
+                pipeline_parameters.enable_validation,
+            )
         )
+        try:
+            await asyncio.gather(
+                *[
+                    deploy_application(
+                        application_data,
+                        frame_deployment.copy_add_application(application_name),
+                        application_status,
+                        pipeline_parameters.enable_validation,
+                        fail_fast_policy=pipeline_parameters.fail_fast_policy,
+                        what_if=pipeline_parameters.what_if,
+                    )
+                    for application_name, application_data in frame_data.applications.items()  # noqa: E501
+                ],
+                return_exceptions=False,
+            )
 
-        await wait_task
+            await wait_task
+        finally:
+            if not preflight_task.done():
+                preflight_task.cancel()
+            await asyncio.gather(preflight_task, return_exceptions=True)
 
         message = "frame deployment completed, {0}".format(this_context)
         log.info(message)
@@ -319,7 +564,16 @@ async def deploy_frame(
             message="deployment targeted frame, {0}".format(str(deploy_to)),
         )
     else:
-        with timing(log, this_context):
+        dependency_contexts = _generate_dependency_contexts(
+            deployment_data.data.iteration_context,
+            set(frame_data.depends_on) if frame_data.depends_on else set(),
+        )
+        with timing(
+            log,
+            this_context,
+            SpanKind.frame,
+            depends_on=sorted(dependency_contexts),
+        ):
             await _do_frame_deployment(
                 this_context,
                 pipeline_parameters,
@@ -342,7 +596,6 @@ async def do_deploy(
                               ``pipeline_parameters`` is exceeded.
     """
     this_frames = configuration.frames
-    this_context = deployment_data.data.iteration_context.copy()
     deployment_data.data.iteration_context.append(
         deployment_data.data.deployment_tuple
     )
@@ -350,9 +603,15 @@ async def do_deploy(
     frame_deployment_status = DeploymentStatus(
         str(deployment_data.data.iteration_context),
         timeout_seconds=pipeline_parameters.wait_timeout_seconds,
+        entity_kind=EntityKind.frame,
+        event_bus=pipeline_parameters.event_bus,
     )
     try:
-        with timing(log, str(this_context)):
+        with timing(
+            log,
+            str(deployment_data.data.iteration_context),
+            SpanKind.iteration,
+        ):
             # this is a temporary work-around to the login concurrency problem -
             # it works provided there is no more than a single subscription per
             # deployment at a time.
@@ -0,0 +1,132 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Deployment state transition events."""
+
+import dataclasses
+import datetime
+import enum
+import json
+import logging
+import typing
+
+log = logging.getLogger(__name__)
+
+
+@enum.unique
+class EntityKind(str, enum.Enum):
+    """Kinds of entity reporting deployment state."""
+
+    application = "application"
+    frame = "frame"
+
+
+@dataclasses.dataclass
+class DeploymentEvent:
+    """A single deployment entity state transition."""
+
+    # monotonic clock time of the transition, in seconds.
+    timestamp_seconds: float
+    iteration_context: str
+    entity_kind: typing.Optional[EntityKind]
+    name: str
+    old_state: str
+    new_state: str
+    message: typing.Optional[str] = None
+    # time spent in the old state, in seconds.
+    duration_seconds: float = 0.0
+    # time the transition waited in the status queue before processing.
+    queue_wait_seconds: float = 0.0
+
+    def as_dict(self: "DeploymentEvent") -> dict:
+        """Generate a JSON compatible ``dict`` representation of the event."""
+        result = dataclasses.asdict(self)
+        result["entity_kind"] = (
+            self.entity_kind.value if self.entity_kind else None
+        )
+
+        return result
+
+
+EventSink = typing.Callable[[DeploymentEvent], None]
+
+T = typing.TypeVar("T", bound="EventBus")
+
+
+class EventBus:
+    """Distribute deployment events to subscribed sinks."""
+
+    __sinks: typing.List[EventSink]
+
+    def __init__(self: T) -> None:
+        """Construct ``EventBus`` object."""
+        self.__sinks = list()
+
+    def subscribe(self: T, sink: EventSink) -> None:
+        """
+        Subscribe a sink to receive all published events.
+
+        Args:
+            sink: Callable to receive events.
+        """
+        self.__sinks.append(sink)
+
+    def unsubscribe(self: T, sink: EventSink) -> None:
+        """
+        Remove a sink from the bus.
+
+        Args:
+            sink: Previously subscribed callable.
+        Raises:
+            ValueError: If the sink was not subscribed.
+        """
+        self.__sinks.remove(sink)
+
+    def publish(self: T, event: DeploymentEvent) -> None:
+        """
+        Publish an event to all subscribed sinks.
+
+        A failing sink is logged and does not prevent delivery of the event
+        to the remaining sinks.
+
+        Args:
+            event: Event to publish.
+        """
+        for this_sink in self.__sinks:
+            try:
+                this_sink(event)
+            except Exception as e:
+                log.exception(
+                    "event sink failed, {0}, {1}".format(this_sink, str(e))
+                )
+
+
+U = typing.TypeVar("U", bound="JsonLinesSink")
+
+
+class JsonLinesSink:
+    """Write events to a text stream as JSON lines."""
+
+    __stream: typing.TextIO
+
+    def __init__(self: U, stream: typing.TextIO) -> None:
+        """
+        Construct ``JsonLinesSink`` object.
+
+        Args:
+            stream: Text stream to write events to.
+        """
+        self.__stream = stream
+
+    def __call__(self: U, event: DeploymentEvent) -> None:
+        """Write an event as a single JSON line."""
+        data = event.as_dict()
+        data["wall_time"] = datetime.datetime.now(
+            tz=datetime.timezone.utc
+        ).isoformat()
+        self.__stream.write("{0}\n".format(json.dumps(data)))
+        self.__stream.flush()
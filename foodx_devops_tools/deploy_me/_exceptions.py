@@ -7,6 +7,8 @@
 
 """Manage deployment related exceptions."""
 
+import asyncio
+
 
 class DeploymentError(Exception):
     """Problem executing deployment."""
@@ -14,3 +16,7 @@ class DeploymentError(Exception):
 
 class DeploymentTerminatedError(DeploymentError):
     """Deployment was cancelled due to failing dependencies."""
+
+
+class FailFastCancelledError(asyncio.CancelledError):
+    """Deployment was cancelled by a triggered fail fast policy."""
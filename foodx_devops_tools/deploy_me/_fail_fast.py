@@ -0,0 +1,127 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Cancellation of outstanding deployments on the first failure."""
+
+import asyncio
+import logging
+import typing
+
+import click
+
+from ._events import DeploymentEvent
+from ._exceptions import FailFastCancelledError
+
+log = logging.getLogger(__name__)
+
+X = typing.TypeVar("X")
+
+T = typing.TypeVar("T", bound="FailFastPolicy")
+
+
+class FailFastPolicy:
+    """
+    Cancel outstanding deployment work on the first deployment failure.
+
+    The policy is an event sink; once subscribed to the deployment event bus
+    the first ``failed`` state transition cancels all deployment work run
+    via the policy, and any work subsequently run via the policy is
+    cancelled immediately.
+    """
+
+    __tasks: typing.Set[asyncio.Future]
+    # work cancelled by the policy, as distinct from any other cancellation.
+    __cancelled: typing.Set[asyncio.Future]
+    __trigger_event: typing.Optional[DeploymentEvent]
+
+    def __init__(self: T) -> None:
+        """Construct ``FailFastPolicy`` object."""
+        self.__tasks = set()
+        self.__cancelled = set()
+        self.__trigger_event = None
+
+    @property
+    def triggered(self: T) -> bool:
+        """Indicate that a failure has triggered cancellation."""
+        return self.__trigger_event is not None
+
+    @property
+    def trigger_event(self: T) -> typing.Optional[DeploymentEvent]:
+        """The failure event that triggered cancellation, if any."""
+        return self.__trigger_event
+
+    def __call__(self: T, event: DeploymentEvent) -> None:
+        """Trigger cancellation on the first failure event."""
+        if (event.new_state == "failed") and (not self.triggered):
+            self.__trigger_event = event
+            message = (
+                "fail fast, cancelling {0} outstanding deployments after "
+                "failure, {1}".format(len(self.__tasks), event.name)
+            )
+            log.error(message)
+            click.echo(click.style(message, fg="red"), err=True)
+            for this_task in list(self.__tasks):
+                self.__cancelled.add(this_task)
+                this_task.cancel()
+
+    async def run(self: T, work: typing.Awaitable[X]) -> X:
+        """
+        Run deployment work that is cancelled when the policy triggers.
+
+        Args:
+            work: Deployment work to run.
+
+        Returns:
+            Result of the work.
+        Raises:
+            FailFastCancelledError: If the work was cancelled by the policy.
+            asyncio.CancelledError: If the work was otherwise cancelled.
+        """
+        this_task = asyncio.ensure_future(work)
+        if self.triggered:
+            self.__cancelled.add(this_task)
+            this_task.cancel()
+        else:
+            self.__tasks.add(this_task)
+            this_task.add_done_callback(self.__tasks.discard)
+
+        try:
+            return await this_task
+        except asyncio.CancelledError as e:
+            if this_task in self.__cancelled:
+                raise FailFastCancelledError() from e
+            raise
+        finally:
+            self.__cancelled.discard(this_task)
+
+
+async def run_fail_fast(
+    policy: typing.Optional[FailFastPolicy], work: typing.Awaitable[X]
+) -> X:
+    """
+    Run deployment work via a fail fast policy, if one is enabled.
+
+    Args:
+        policy: Fail fast policy, or ``None`` if not enabled.
+        work: Deployment work to run.
+
+    Returns:
+        Result of the work.
+    """
+    if policy:
+        return await policy.run(work)
+    else:
+        return await work
+
+
+def is_fail_fast_cancelled(error: BaseException) -> bool:
+    """
+    Indicate that a cancellation is due to a triggered fail fast policy.
+
+    Any other cancellation, such as of the run itself, must be propagated.
+    """
+    return isinstance(error, FailFastCancelledError)
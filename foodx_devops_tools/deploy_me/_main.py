@@ -6,6 +6,8 @@
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
 import asyncio
+import concurrent.futures
+import json
 import logging
 import pathlib
 import sys
@@ -23,6 +25,18 @@ from foodx_devops_tools._log_check import check_credential_leakage
 from foodx_devops_tools._logging import LoggingState
 from foodx_devops_tools._to import StructuredTo, StructuredToParameter
 from foodx_devops_tools._version import acquire_version
+from foodx_devops_tools.azure.cloud.arm_rest import ArmRestBackend
+from foodx_devops_tools.azure.cloud.deployment_poller import (
+    DeploymentPoller,
+    set_deployment_poller,
+)
+from foodx_devops_tools.azure.cloud.resource_group import (
+    reset_resource_group_index,
+)
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    ResourceGroupCleanup,
+    set_resource_group_cleanup,
+)
 from foodx_devops_tools.pipeline_config import (
     DeploymentContext,
     PipelineConfiguration,
@@ -32,42 +46,183 @@ from foodx_devops_tools.pipeline_config import (
 from foodx_devops_tools.pipeline_config.exceptions import (
     ConfigurationPathsError,
 )
+from foodx_devops_tools.profiling import (
+    EventLoopLag,
+    EventLoopLagMonitor,
+    SpanTracer,
+    start_tracing,
+    stop_tracing,
+)
 from foodx_devops_tools.release_flow import (
     identify_release_id,
     identify_release_state,
 )
-from foodx_devops_tools.utilities import acquire_token, get_sha
+from foodx_devops_tools.utilities import (
+    acquire_token,
+    get_command_backend,
+    get_sha,
+    set_command_backend,
+)
+from foodx_devops_tools.utilities.cassette import (
+    MINIMUM_SECRET_LENGTH,
+    RecordingBackend,
+    ReplayBackend,
+    secret_leaves,
+    short_secrets,
+)
+from foodx_devops_tools.utilities.command import (
+    DEFAULT_COMMAND_TIMEOUTS,
+    StreamingSubprocessBackend,
+    command_timeout_counts,
+    forward_termination_signals,
+    reset_command_timeout_counts,
+    set_command_timeouts,
+)
+from foodx_devops_tools.utilities.jinja2 import (
+    DEFAULT_RENDER_WORKERS,
+    set_render_executor,
+)
+from foodx_devops_tools.utilities.templates import (
+    deployment_files,
+    reset_deployment_files,
+)
+from foodx_devops_tools.utilities.working import (
+    DEFAULT_WORKING_RETENTION_HOURS,
+    WORKING_DIR,
+    prune_working_directories,
+)
 
+from ._critical_path import CriticalPathAnalysis
 from ._deployment import (
     DeploymentState,
     FlattenedDeployment,
     assess_results,
     do_deploy,
 )
+from ._events import JsonLinesSink
 from ._exceptions import DeploymentTerminatedError
 from ._state import ExitState, PipelineCliOptions
 
 log = logging.getLogger(__name__)
 
 DEFAULT_LOG_FILE = pathlib.Path("deploy_me.log")
+TRACE_SUMMARY_LIMIT = 20
 
 
 class DeploymentConfigurationError(Exception):
     """Problem acquiring deployment configuration."""
 
 
+T = typing.TypeVar("T", bound="CommandTimeoutParameter")
+
+
+class CommandTimeoutParameter(click.ParamType):
+    """Custom click parameter for command timeout options."""
+
+    name: str = "command_timeout"
+
+    def convert(
+        self: T,
+        value: typing.Union[str, typing.Tuple[str, typing.Optional[float]]],
+        param: typing.Optional[click.Parameter],
+        context: typing.Optional[click.Context],
+    ) -> typing.Tuple[str, typing.Optional[float]]:
+        """Convert command line option value to a command timeout."""
+        if isinstance(value, tuple):
+            return value
+
+        words, separator, seconds = value.rpartition("=")
+        try:
+            if (not separator) or (not words.strip()):
+                raise ValueError()
+            timeout = float(seconds)
+            if timeout < 0:
+                raise ValueError()
+        except ValueError:
+            self.fail(
+                f"{value!r} is not a valid command timeout", param, context
+            )
+
+        # zero disables the timeout.
+        return " ".join(words.split()), (timeout if timeout else None)
+
+
+E = typing.TypeVar("E", bound="EventStreamParameter")
+
+
+class EventStreamParameter(click.File):
+    """Custom click parameter for the event stream file option."""
+
+    def convert(
+        self: E,
+        value: typing.Any,
+        param: typing.Optional[click.Parameter],
+        context: typing.Optional[click.Context],
+    ) -> typing.Any:
+        """Open the event stream file, rejecting stdout."""
+        if value == "-":
+            # console reporting is written to stdout.
+            self.fail(
+                "stdout is reserved for console output, specify a file",
+                param,
+                context,
+            )
+
+        return super().convert(value, param, context)
+
+
 async def _gather_main(
     configuration: PipelineConfiguration,
     deployment_iterations: typing.List[FlattenedDeployment],
     pipeline_parameters: PipelineCliOptions,
 ) -> None:
     """Deploy each deployment iteration asynchronously."""
-    results = await asyncio.gather(
-        *[
-            do_deploy(configuration, x, pipeline_parameters)
-            for x in deployment_iterations
-        ],
-        return_exceptions=False,
+    # resource groups are indexed afresh for each run.
+    reset_resource_group_index()
+    reset_command_timeout_counts()
+    reset_deployment_files()
+    lag_monitor = EventLoopLagMonitor()
+    lag_monitor.start()
+    poller = (
+        DeploymentPoller(
+            poll_interval_seconds=pipeline_parameters.monitor_sleep_seconds
+        )
+        if pipeline_parameters.no_wait
+        else None
+    )
+    previous_poller = set_deployment_poller(poller)
+    # validation resource groups are deleted in a batch at the end of the
+    # run.
+    cleanup = (
+        ResourceGroupCleanup()
+        if pipeline_parameters.enable_validation
+        and (not pipeline_parameters.keep_validation_groups)
+        else None
+    )
+    previous_cleanup = set_resource_group_cleanup(cleanup)
+    try:
+        results = await asyncio.gather(
+            *[
+                do_deploy(configuration, x, pipeline_parameters)
+                for x in deployment_iterations
+            ],
+            return_exceptions=False,
+        )
+    finally:
+        if poller:
+            log.info("deployment status queries, {0}".format(poller.queries))
+            await poller.stop()
+        set_deployment_poller(previous_poller)
+        if cleanup:
+            await cleanup.delete_all()
+        set_resource_group_cleanup(previous_cleanup)
+        await get_command_backend().aclose()
+        _report_event_loop_lag(await lag_monitor.stop())
+
+    await asyncio.get_running_loop().run_in_executor(
+        None,
+        _prune_working_directories,
+        pipeline_parameters.working_retention_hours,
     )
 
     filtered_results = [x for x in results if isinstance(x, DeploymentState)]
@@ -75,9 +230,42 @@ async def _gather_main(
         log.error("Some deployments may have had unexpected failures.")
 
     condensed_result = await assess_results(filtered_results)
+    _report_command_timeouts(command_timeout_counts())
     _report_results(condensed_result.code, len(deployment_iterations))
 
 
+def _prune_working_directories(retention_hours: float) -> None:
+    """Delete stale working directories alongside those of this run."""
+    in_use = {
+        y.parent
+        for x in deployment_files().values()
+        for y in (x.arm_template, x.parameters)
+    }
+    for this_root in {x.parent for x in in_use if x.parent.name == WORKING_DIR}:
+        try:
+            prune_working_directories(this_root, retention_hours * 3600, in_use)
+        except OSError as e:
+            log.warning(
+                "working directory pruning failed, {0}, {1}".format(
+                    this_root, str(e)
+                )
+            )
+
+
+def _report_event_loop_lag(lag: EventLoopLag) -> None:
+    log.info(
+        "event loop lag, {0:.3f} s (maximum), {1:.3f} s (mean), "
+        "{2} samples".format(lag.maximum_seconds, lag.mean_seconds, lag.samples)
+    )
+
+
+def _report_command_timeouts(counts: typing.Dict[str, int]) -> None:
+    for label, count in sorted(counts.items()):
+        message = "command timeouts, {0}, {1}".format(label, count)
+        log.warning(message)
+        click.echo(click.style(message, fg="yellow"))
+
+
 def _report_results(
     result_code: DeploymentState.ResultType, number_iterations: int
 ) -> None:
@@ -100,6 +288,24 @@ def _report_results(
         sys.exit(ExitState.DEPLOYMENT_FAILED.value)
 
 
+def _report_trace(tracer: SpanTracer, trace_file: pathlib.Path) -> None:
+    """Export trace spans to file and report the span summary."""
+    with trace_file.open(mode="w") as f:
+        json.dump(tracer.chrome_trace(), f)
+    log.info("trace spans exported to file, {0}".format(trace_file))
+
+    summary = tracer.format_summary(TRACE_SUMMARY_LIMIT)
+    log.info("top spans by self time\n{0}".format(summary))
+    click.echo(summary)
+
+
+def _report_critical_path(tracer: SpanTracer) -> None:
+    """Report the critical path through the executed deployment."""
+    report = CriticalPathAnalysis(tracer.spans).format_report()
+    log.info(report)
+    click.echo(report)
+
+
 @click.command()
 @click.version_option(acquire_version())
 @click.argument(
@@ -114,6 +320,58 @@ def _report_results(
     "password_file",
     type=click.File(mode="r"),
 )
+@click.option(
+    "--allow-short-secrets",
+    default=False,
+    help="Record external command interactions even though some secrets "
+    "are too short to be redacted from the cassette.",
+    is_flag=True,
+)
+@click.option(
+    "--azure-backend",
+    default="cli",
+    help="""Azure interface; "cli" runs the az CLI utility for each Azure
+operation, "rest" uses the ARM REST API directly for resource group and
+deployment operations.""",
+    show_default=True,
+    type=click.Choice(["cli", "rest"], case_sensitive=False),
+)
+@click.option(
+    "--command-timeout",
+    "command_timeouts",
+    help="""Override the timeout of a type of external command, identified by
+its leading words, in seconds; "0" disables the timeout. May be specified
+multiple times.
+
+eg.
+
+--command-timeout "az deployment group create=7200"
+""",
+    multiple=True,
+    type=CommandTimeoutParameter(),
+)
+@click.option(
+    "--critical-path",
+    default=False,
+    help="Report the chain of frames, applications and steps that "
+    "determined the deployment wall clock time, and the slack of all other "
+    "frames, applications and steps.",
+    is_flag=True,
+)
+@click.option(
+    "--event-stream",
+    default=None,
+    help="""File to write a JSON lines stream of deployment state
+transition events to.""",
+    type=EventStreamParameter(mode="w"),
+)
+@click.option(
+    "--fail-fast",
+    default=False,
+    help="Cancel all outstanding frame and application deployments on the "
+    "first deployment failure.",
+    is_flag=True,
+)
 @click.option(
     "--git-ref",
     default=None,
@@ -127,6 +385,13 @@ eg.
 """,
     type=str,
 )
+@click.option(
+    "--keep-validation-groups",
+    default=False,
+    help="Retain the resource groups of validation deployments. By default "
+    "their deletion is requested, without waiting, at the end of the run.",
+    is_flag=True,
+)
 @click.option(
     "--log-disable-file",
     "disable_file_log",
@@ -156,6 +421,13 @@ eg.
     show_default=True,
     type=int,
 )
+@click.option(
+    "--no-wait",
+    default=False,
+    help="Submit ARM deployments without waiting for completion and track "
+    "their status from a single poller, at the --monitor-sleep interval.",
+    is_flag=True,
+)
 @click.option(
     "--pipeline-id",
     default="000+local",
@@ -169,6 +441,46 @@ eg.
     ``${CI_PIPELINE_ID}`` for Gitlab-CI.""",
     type=str,
 )
+@click.option(
+    "--record-commands",
+    default=None,
+    help="Record external command interactions to a cassette file, with "
+    "secrets redacted, for offline replay.",
+    type=click.Path(dir_okay=False, file_okay=True, path_type=pathlib.Path),
+)
+@click.option(
+    "--render-workers",
+    default=DEFAULT_RENDER_WORKERS,
+    help="Number of threads rendering jinja2 template files outside the "
+    "event loop; zero to render in the event loop.",
+    show_default=True,
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--replay-commands",
+    default=None,
+    help="Serve external command interactions from a recorded cassette file "
+    "instead of executing them.",
+    type=click.Path(
+        dir_okay=False, exists=True, file_okay=True, path_type=pathlib.Path
+    ),
+)
+@click.option(
+    "--replay-latency-scale",
+    default=1.0,
+    help="Scale applied to recorded command durations when replaying; zero "
+    "for no latency.",
+    show_default=True,
+    type=click.FloatRange(min=0),
+)
+@click.option(
+    "--stream-command-output",
+    default=False,
+    help="Read external command output incrementally, forwarding error "
+    "output to the log as it arrives and retaining only the end of it, "
+    "rather than buffering it in memory.",
+    is_flag=True,
+)
 @click.option(
     "--to",
     default=StructuredTo(),
@@ -180,6 +492,14 @@ eg.
 """,
     type=StructuredToParameter(),
 )
+@click.option(
+    "--trace-file",
+    default=None,
+    help="""Record nested timing spans of the deployment and export them to
+file in Chrome trace event format. A summary of the top spans by self time
+is reported when the deployment completes.""",
+    type=click.Path(dir_okay=False, file_okay=True, path_type=pathlib.Path),
+)
 @click.option(
     "--validation",
     default=False,
@@ -195,19 +515,54 @@ eg.
     show_default=True,
     type=int,
 )
+@click.option(
+    "--working-retention",
+    "working_retention_hours",
+    default=DEFAULT_WORKING_RETENTION_HOURS,
+    help="Minimum age in hours of an unused deployment iteration working "
+    "directory, or of unused rendered content, for deletion at the end of "
+    "the run.",
+    show_default=True,
+    type=click.FloatRange(min=0),
+)
+@click.option(
+    "--what-if",
+    default=False,
+    help="Predict the changes of each step deployment using ARM what-if and "
+    "skip step deployments with no predicted changes.",
+    is_flag=True,
+)
 def deploy_me(
     client_path: pathlib.Path,
     system_path: pathlib.Path,
     password_file: typing.IO,
+    allow_short_secrets: bool,
+    azure_backend: str,
+    command_timeouts: typing.Tuple[
+        typing.Tuple[str, typing.Optional[float]], ...
+    ],
+    critical_path: bool,
     disable_file_log: bool,
     enable_console_log: bool,
+    event_stream: typing.Optional[typing.TextIO],
+    fail_fast: bool,
+    keep_validation_groups: bool,
     log_level: str,
     monitor_sleep: int,
+    no_wait: bool,
     git_ref: typing.Optional[str],
     pipeline_id: str,
+    record_commands: typing.Optional[pathlib.Path],
+    render_workers: int,
+    replay_commands: typing.Optional[pathlib.Path],
+    replay_latency_scale: float,
+    stream_command_output: bool,
     to: StructuredTo,
+    trace_file: typing.Optional[pathlib.Path],
     validation: bool,
     wait_timeout: int,
+    what_if: bool,
+    working_retention_hours: float,
 ) -> None:
     """
     Deploy system resources.
@@ -232,7 +587,14 @@ def deploy_me(
             enable_validation=validation,
             monitor_sleep_seconds=monitor_sleep,
             wait_timeout_seconds=(60 * wait_timeout),
+            fail_fast=fail_fast,
+            no_wait=no_wait,
+            what_if=what_if,
+            keep_validation_groups=keep_validation_groups,
+            working_retention_hours=working_retention_hours,
         )
+        if event_stream:
+            pipeline_parameters.event_bus.subscribe(JsonLinesSink(event_stream))
         client_config = client_path / "configuration"
         system_config = system_path / "configuration"
         configuration_paths = PipelineConfigurationPaths.from_paths(
@@ -271,15 +633,88 @@ def deploy_me(
         )
         log.debug(str(deployment_iterations))
 
-        asyncio.run(
-            _gather_main(
-                this_configuration, deployment_iterations, pipeline_parameters
+        if record_commands and replay_commands:
+            raise DeploymentConfigurationError(
+                "--record-commands and --replay-commands are mutually "
+                "exclusive"
             )
-        )
-
         credentials = {
             x.data.azure_credentials.secret for x in deployment_iterations
         }
+        redacted_secrets = credentials | {
+            y
+            for x in deployment_iterations
+            for y in secret_leaves(x.data.static_secrets)
+        }
+        if (
+            record_commands
+            and (not allow_short_secrets)
+            and short_secrets(redacted_secrets)
+        ):
+            raise DeploymentConfigurationError(
+                "secrets shorter than {0} characters cannot be redacted from "
+                "recorded commands, use --allow-short-secrets to record "
+                "them anyway".format(MINIMUM_SECRET_LENGTH)
+            )
+
+        if trace_file or critical_path:
+            start_tracing()
+        previous_backend = (
+            set_command_backend(StreamingSubprocessBackend())
+            if stream_command_output
+            else get_command_backend()
+        )
+        if replay_commands:
+            set_command_backend(
+                ReplayBackend.from_file(
+                    replay_commands,
+                    latency_scale=replay_latency_scale,
+                    secrets=redacted_secrets,
+                )
+            )
+        elif azure_backend.lower() == "rest":
+            set_command_backend(ArmRestBackend(fallback=get_command_backend()))
+        if record_commands:
+            set_command_backend(
+                RecordingBackend(
+                    get_command_backend(),
+                    record_commands,
+                    redacted_secrets,
+                    allow_short_secrets=allow_short_secrets,
+                )
+            )
+        previous_timeouts = set_command_timeouts(
+            {**DEFAULT_COMMAND_TIMEOUTS, **dict(command_timeouts)}
+        )
+        render_executor = (
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=render_workers, thread_name_prefix="render"
+            )
+            if render_workers
+            else None
+        )
+        previous_executor = set_render_executor(render_executor)
+        try:
+            with forward_termination_signals():
+                asyncio.run(
+                    _gather_main(
+                        this_configuration,
+                        deployment_iterations,
+                        pipeline_parameters,
+                    )
+                )
+        finally:
+            set_command_backend(previous_backend)
+            set_command_timeouts(previous_timeouts)
+            set_render_executor(previous_executor)
+            if render_executor:
+                render_executor.shutdown()
+            this_tracer = stop_tracing()
+            if this_tracer and trace_file:
+                _report_trace(this_tracer, trace_file)
+            if this_tracer and critical_path:
+                _report_critical_path(this_tracer)
+
         check_credential_leakage(credentials, DEFAULT_LOG_FILE)
     except (ConfigurationPathsError, DeploymentConfigurationError) as e:
         message = str(e)
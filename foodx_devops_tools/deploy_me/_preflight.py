@@ -0,0 +1,151 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Upfront creation of the resource groups required by a deployment."""
+
+import asyncio
+import logging
+import typing
+
+from foodx_devops_tools.azure.cloud import AzureSubscriptionConfiguration
+from foodx_devops_tools.azure.cloud.resource_group import (
+    create_all as create_all_resource_groups,
+)
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    get_resource_group_cleanup,
+)
+from foodx_devops_tools.pipeline_config import FlattenedDeployment
+from foodx_devops_tools.pipeline_config.frames import (
+    ApplicationStepDeploymentDefinition,
+    SingularFrameDefinition,
+)
+
+from .application_steps._deploy import (
+    _construct_resource_group_name,
+    _mangle_validation_resource_group,
+    _validation_group_tags,
+)
+
+log = logging.getLogger(__name__)
+
+
+def collect_resource_groups(
+    frame_data: SingularFrameDefinition,
+    deployment_data: FlattenedDeployment,
+    enable_validation: bool,
+) -> typing.Dict[str, str]:
+    """
+    Identify the resource groups a frame deploys to.
+
+    Applications and steps excluded by the deployment specifier (``--to``)
+    are excluded.
+
+    Args:
+        frame_data: Frame definition.
+        deployment_data: Frame deployment data.
+        enable_validation: Validation deployment resource groups are
+                           required.
+
+    Returns:
+        Location of each required resource group, by name.
+    """
+    deploy_to = deployment_data.data.to
+    result: typing.Dict[str, str] = dict()
+    for application_name, application_data in frame_data.applications.items():
+        if deploy_to.application and (
+            application_name != deploy_to.application
+        ):
+            continue
+        deployment_steps = [
+            x
+            for x in application_data.steps
+            if isinstance(x, ApplicationStepDeploymentDefinition)
+        ]
+        for this_step in deployment_steps:
+            if deploy_to.step and (this_step.name != deploy_to.step):
+                continue
+            resource_group = _construct_resource_group_name(
+                deployment_data.context.client,
+                this_step.resource_group,
+            )
+            if enable_validation:
+                resource_group = _mangle_validation_resource_group(
+                    resource_group,
+                    deployment_data.context.pipeline_id,
+                )
+            result[resource_group] = deployment_data.data.location_primary
+
+    return result
+
+
+async def create_resource_groups(
+    frame_data: SingularFrameDefinition,
+    deployment_data: FlattenedDeployment,
+    enable_validation: bool,
+) -> None:
+    """
+    Create the missing resource groups of a frame.
+
+    Called once the frame dependencies have completed, so that frames that
+    never deploy do not create resource groups. Resource groups are created
+    concurrently so that step deployments only need to check the resource
+    group index. Failures are logged rather than raised; the step
+    deployment retries creation of its own resource group and reports any
+    failure in the context of the step.
+
+    Validation resource groups are registered for cleanup before they are
+    created, and are tagged with the pipeline id so that they can be reaped
+    if cleanup does not happen.
+
+    Args:
+        frame_data: Frame definition.
+        deployment_data: Frame deployment data.
+        enable_validation: Validation deployment resource groups are
+                           required.
+    """
+    this_context = str(deployment_data.data.iteration_context)
+    resource_groups = collect_resource_groups(
+        frame_data, deployment_data, enable_validation
+    )
+    this_subscription = AzureSubscriptionConfiguration(
+        subscription_id=deployment_data.context.azure_subscription_name
+    )
+    cleanup = get_resource_group_cleanup()
+    if enable_validation and cleanup:
+        for name in resource_groups.keys():
+            cleanup.register(name, this_subscription)
+    log.info(
+        "creating resource groups, {0}, {1}".format(
+            this_context, len(resource_groups)
+        )
+    )
+    try:
+        failures = await create_all_resource_groups(
+            resource_groups,
+            this_subscription,
+            tags=(
+                _validation_group_tags(deployment_data.context.pipeline_id)
+                if enable_validation
+                else None
+            ),
+        )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        log.warning(
+            "resource group creation failed, {0}, {1}".format(
+                this_context, str(e)
+            )
+        )
+        return
+
+    for name, this_error in failures.items():
+        log.warning(
+            "resource group creation failed, {0}, {1}, {2}".format(
+                this_context, name, str(this_error)
+            )
+        )
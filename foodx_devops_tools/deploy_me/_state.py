@@ -7,6 +7,15 @@
 
 import dataclasses
 import enum
+import typing
+
+from foodx_devops_tools.utilities.working import (
+    DEFAULT_WORKING_RETENTION_HOURS,
+)
+
+from ._events import EventBus
+from ._fail_fast import FailFastPolicy
+from ._status import default_event_bus
 
 
 @dataclasses.dataclass
@@ -16,6 +25,24 @@ class PipelineCliOptions:
     enable_validation: bool
     monitor_sleep_seconds: float
     wait_timeout_seconds: float
+    fail_fast: bool = False
+    no_wait: bool = False
+    what_if: bool = False
+    keep_validation_groups: bool = False
+    working_retention_hours: float = DEFAULT_WORKING_RETENTION_HOURS
+
+    event_bus: EventBus = dataclasses.field(
+        default_factory=default_event_bus, compare=False
+    )
+    fail_fast_policy: typing.Optional[FailFastPolicy] = dataclasses.field(
+        default=None, init=False, compare=False
+    )
+
+    def __post_init__(self: "PipelineCliOptions") -> None:
+        """Subscribe the fail fast policy to deployment events, if enabled."""
+        if self.fail_fast:
+            self.fail_fast_policy = FailFastPolicy()
+            self.event_bus.subscribe(self.fail_fast_policy)
 
 
 @enum.unique
@@ -12,10 +12,13 @@ import copy
 import dataclasses
 import enum
 import logging
+import time
 import typing
 
 import click
 
+from ._events import DeploymentEvent, EntityKind, EventBus
+
 log = logging.getLogger(__name__)
 
 DEFAULT_MONITOR_SLEEP_SECONDS = 10
@@ -91,11 +94,14 @@ T = typing.TypeVar("T", bound="DeploymentStatus")
 class DeploymentStatus:
     """Coordinate reporting of asynchronous deployment status."""
 
+    __entity_kind: typing.Optional[EntityKind]
+    __event_bus: EventBus
     __iteration_context: str
     __rw_lock: asyncio.Lock
     __state_updates: asyncio.Queue
     __status: typing.Dict[str, DeploymentState]
     __timeout_seconds: float
+    __transition_times: typing.Dict[str, float]
 
     STATE_COLOURS = {
         DeploymentState.ResultType.cancelled: "yellow",
@@ -110,19 +116,35 @@ class DeploymentStatus:
     EVENT_KEY_COMPLETED = "_all_completed"
 
     def __init__(
-        self: T, iteration_context: str, timeout_seconds: float
+        self: T,
+        iteration_context: str,
+        timeout_seconds: float,
+        entity_kind: typing.Optional[EntityKind] = None,
+        event_bus: typing.Optional[EventBus] = None,
     ) -> None:
-        """Construct ``DeploymentStatus`` object."""
+        """
+        Construct ``DeploymentStatus`` object.
+
+        Args:
+            iteration_context: Deployment iteration context of the entities.
+            timeout_seconds: Maximum time to wait for entity completion.
+            entity_kind: Kind of entity whose status is recorded (optional).
+            event_bus: Bus to publish state transition events to. Defaults to
+                       a bus reporting transitions to console.
+        """
         self.__events: dict = {
             self.EVENT_KEY_COMPLETED: asyncio.Event(),
             self.EVENT_KEY_SUCCEEDED: asyncio.Event(),
         }
 
+        self.__entity_kind = entity_kind
+        self.__event_bus = event_bus if event_bus else default_event_bus()
         self.__iteration_context = iteration_context
         self.__rw_lock = asyncio.Lock()
         self.__state_updates = asyncio.Queue()
         self.__status = dict()
         self.__timeout_seconds = timeout_seconds
+        self.__transition_times = dict()
 
     async def initialize(self: T, name: str) -> None:
         """
@@ -140,6 +162,7 @@ class DeploymentStatus:
             self.__status[name] = DeploymentState(
                 code=DeploymentState.ResultType.pending
             )
+            self.__transition_times[name] = time.monotonic()
         log.info(f"initialized deployment status, {name}")
 
     async def write(
@@ -160,7 +183,7 @@ class DeploymentStatus:
             code=code,
             message=message,
         )
-        await self.__state_updates.put((name, state_update))
+        await self.__state_updates.put((name, state_update, time.monotonic()))
 
     async def read(self: T, name: str) -> DeploymentState:
         """
@@ -274,17 +297,19 @@ class DeploymentStatus:
         )
 
     def __report_update(
-        self: T, name: str, status: typing.Dict[str, DeploymentState]
+        self: T,
+        name: str,
+        status: typing.Dict[str, DeploymentState],
+        event: DeploymentEvent,
     ) -> bool:
-        """Report changes in deployment status to console and logs."""
+        """Report changes in deployment status to event bus and logs."""
         completed = False
-        state = status[name]
-        message = "{0}: {1} {2}".format(
-            self.__iteration_context, name, state.code.name
+        log.info(
+            "{0}: {1} {2}".format(
+                self.__iteration_context, name, event.new_state
+            )
         )
-        this_colour = self.STATE_COLOURS[state.code]
-        log.info(message)
-        click.echo(click.style(message, fg=this_colour))
+        self.__event_bus.publish(event)
 
         if all_success(list(status.values())):
             completed = True
@@ -307,7 +332,8 @@ class DeploymentStatus:
         completed = False
         while not completed:
             log.debug("waiting for items to be added to state queue")
-            name, state_update = await self.__state_updates.get()
+            name, state_update, put_time = await self.__state_updates.get()
+            transition_time = time.monotonic()
 
             current_status: typing.Dict[str, DeploymentState] = {
                 n: await self.read(n) for n in await self.names()
@@ -335,13 +361,44 @@ class DeploymentStatus:
                     self.__evaluate_all_success()
                     self.__evaluate_all_completed()
 
-                completed = self.__report_update(name, current_status)
+                    last_transition_time = self.__transition_times.get(
+                        name, transition_time
+                    )
+                    self.__transition_times[name] = transition_time
+
+                this_event = DeploymentEvent(
+                    timestamp_seconds=transition_time,
+                    iteration_context=self.__iteration_context,
+                    entity_kind=self.__entity_kind,
+                    name=name,
+                    old_state=current_state.code.name,
+                    new_state=state_update.code.name,
+                    message=state_update.message,
+                    duration_seconds=transition_time - last_transition_time,
+                    queue_wait_seconds=transition_time - put_time,
+                )
+                completed = self.__report_update(
+                    name, current_status, this_event
+                )
             else:
-                message = "nothing to report, {0}".format(
-                    self.__iteration_context
+                log.info(
+                    "nothing to report, {0}".format(self.__iteration_context)
+                )
+                # a repeated state is still published, so that every sink
+                # sees each write of the state.
+                this_event = DeploymentEvent(
+                    timestamp_seconds=transition_time,
+                    iteration_context=self.__iteration_context,
+                    entity_kind=self.__entity_kind,
+                    name=name,
+                    old_state=current_state.code.name,
+                    new_state=state_update.code.name,
+                    message=state_update.message,
+                    duration_seconds=transition_time
+                    - self.__transition_times.get(name, transition_time),
+                    queue_wait_seconds=transition_time - put_time,
                 )
-                log.info(message)
-                click.echo(click.style(message, fg="yellow"))
+                self.__event_bus.publish(this_event)
 
             self.__state_updates.task_done()
 
@@ -383,7 +440,30 @@ class DeploymentStatus:
         """
         Start the concurrent deployment status monitor.
 
-        Status is reported to console and log until all members have hit one
+        Status is reported to event bus and log until all members have hit one
         of the three deployment termination states [success|failed|cancelled].
         """
         asyncio.create_task(self.__process_state_queue())
+
+
+def report_console(event: DeploymentEvent) -> None:
+    """Event sink reporting deployment state transitions to console."""
+    if event.old_state == event.new_state:
+        message = "nothing to report, {0}".format(event.iteration_context)
+        this_colour = "yellow"
+    else:
+        message = "{0}: {1} {2}".format(
+            event.iteration_context, event.name, event.new_state
+        )
+        this_colour = DeploymentStatus.STATE_COLOURS[
+            DeploymentState.ResultType[event.new_state]
+        ]
+    click.echo(click.style(message, fg=this_colour))
+
+
+def default_event_bus() -> EventBus:
+    """Construct an event bus reporting state transitions to console."""
+    result = EventBus()
+    result.subscribe(report_console)
+
+    return result
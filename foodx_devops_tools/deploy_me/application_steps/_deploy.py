@@ -12,16 +12,33 @@ import typing
 import click
 
 from foodx_devops_tools.azure.cloud.resource_group import (
+    VALIDATION_TAG,
     AzureSubscriptionConfiguration,
+    ResourceGroupError,
+    WhatIfSummary,
+    check_exists,
 )
 from foodx_devops_tools.azure.cloud.resource_group import (
     deploy as deploy_resource_group,
 )
+from foodx_devops_tools.azure.cloud.resource_group import (
+    last_deployment_outputs,
+)
+from foodx_devops_tools.azure.cloud.resource_group import (
+    what_if as what_if_resource_group,
+)
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    get_resource_group_cleanup,
+)
 from foodx_devops_tools.pipeline_config import FlattenedDeployment
 from foodx_devops_tools.pipeline_config.frames import (
     ApplicationStepDeploymentDefinition,
 )
-from foodx_devops_tools.utilities.templates import prepare_deployment_files
+from foodx_devops_tools.utilities.templates import (
+    ArmTemplateDeploymentFiles,
+    prepare_deployment_files,
+    record_deployment_files,
+)
 
 log = logging.getLogger(__name__)
 
@@ -44,6 +61,11 @@ def _mangle_validation_resource_group(current_name: str, suffix: str) -> str:
     return mangled_name
 
 
+def _validation_group_tags(pipeline_id: str) -> typing.Dict[str, str]:
+    """Construct the tags identifying a validation resource group."""
+    return {VALIDATION_TAG: pipeline_id}
+
+
 def _make_secrets_object(key_values: dict) -> typing.List[dict]:
     """Construct secrets into object form required by Foodx ARM template."""
     result = list()
@@ -89,11 +111,84 @@ def _construct_override_parameters(
     return result
 
 
+async def _predict_step_changes(
+    resource_group: str,
+    deployment_files: ArmTemplateDeploymentFiles,
+    mode: str,
+    subscription: AzureSubscriptionConfiguration,
+    deployment_name: str,
+    override_parameters: dict,
+    step_context: str,
+) -> typing.Optional[WhatIfSummary]:
+    """Predict step deployment changes; ``None`` if they are unknown."""
+    try:
+        if not await check_exists(resource_group, subscription):
+            log.info(
+                "what-if not possible for new resource group, {0}".format(
+                    step_context
+                )
+            )
+            return None
+
+        return await what_if_resource_group(
+            resource_group,
+            deployment_files.arm_template,
+            deployment_files.parameters,
+            mode,
+            subscription,
+            deployment_name=deployment_name,
+            override_parameters=override_parameters,
+        )
+    except ResourceGroupError as e:
+        # what-if is only an optimisation, so always fall back to deploying.
+        log.warning(
+            "what-if failed, deploying regardless, {0}, {1}".format(
+                step_context, str(e)
+            )
+        )
+        return None
+
+
+async def _previous_step_outputs(
+    resource_group: str,
+    deployment_name_prefix: str,
+    subscription: AzureSubscriptionConfiguration,
+    step_context: str,
+) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """Get the outputs of the last step deployment; ``None`` if unknown."""
+    try:
+        return await last_deployment_outputs(
+            resource_group, deployment_name_prefix, subscription
+        )
+    except ResourceGroupError as e:
+        log.warning(
+            "previous deployment outputs unavailable, {0}, {1}".format(
+                step_context, str(e)
+            )
+        )
+        return None
+
+
+def _record_step_outputs(
+    deployment_data: FlattenedDeployment,
+    step_name: str,
+    outputs: typing.Dict[str, typing.Any],
+) -> None:
+    """Make step outputs available to the templates of subsequent steps."""
+    deployment_data.data.deployment_outputs.record(
+        deployment_data.context.frame_name,
+        deployment_data.context.application_name,
+        step_name,
+        outputs,
+    )
+
+
 async def _do_step_deployment(
     this_step: ApplicationStepDeploymentDefinition,
     deployment_data: FlattenedDeployment,
     enable_validation: bool,
-) -> None:
+    what_if: bool = False,
+) -> typing.Optional[WhatIfSummary]:
     this_context = str(deployment_data.data.iteration_context)
     step_context = f"{this_context}.{this_step.name}"
 
@@ -132,6 +227,8 @@ async def _do_step_deployment(
         template_files = deployment_data.construct_deployment_paths(
             this_step.arm_file,
             this_step.puff_file,
+            step_name=this_step.name,
+            resource_group_name=resource_group,
         )
         log.debug(f"template files, {template_files}")
 
@@ -139,6 +236,7 @@ async def _do_step_deployment(
             template_files,
             template_parameters,
         )
+        record_deployment_files(step_context, deployment_files)
 
         override_parameters = _construct_override_parameters(
             deployment_data, this_step.static_secrets, step_context
@@ -149,7 +247,53 @@ async def _do_step_deployment(
         this_subscription = AzureSubscriptionConfiguration(
             subscription_id=deployment_data.context.azure_subscription_name
         )
-        await deploy_resource_group(
+        predicted_changes = None
+        if what_if and (not enable_validation):
+            predicted_changes = await _predict_step_changes(
+                resource_group,
+                deployment_files,
+                this_step.mode.value,
+                this_subscription,
+                deployment_name,
+                override_parameters,
+                step_context,
+            )
+            previous_outputs = (
+                await _previous_step_outputs(
+                    resource_group,
+                    deployment_data.construct_deployment_name_prefix(
+                        this_step.name
+                    ),
+                    this_subscription,
+                    step_context,
+                )
+                if predicted_changes and predicted_changes.is_noop
+                else None
+            )
+            if previous_outputs is not None:
+                message = "step deployment skipped, no changes predicted, {0}"
+                log.info(message.format(step_context))
+                click.echo(message.format(step_context))
+                _record_step_outputs(
+                    deployment_data, this_step.name, previous_outputs
+                )
+                return predicted_changes
+            elif predicted_changes and predicted_changes.is_noop:
+                # the outputs of a skipped step may be read by the templates
+                # of subsequent steps, so a step is only skipped if the
+                # outputs of its previous deployment are known.
+                log.info(
+                    "no previous deployment outputs, deploying regardless, "
+                    "{0}".format(step_context)
+                )
+                predicted_changes = None
+
+        cleanup = get_resource_group_cleanup()
+        if enable_validation and cleanup:
+            # register before deploying so that the resource group is
+            # deleted even if the validation fails.
+            cleanup.register(resource_group, this_subscription)
+        outputs = await deploy_resource_group(
             resource_group,
             deployment_files.arm_template,
             deployment_files.parameters,
@@ -159,7 +303,18 @@ async def _do_step_deployment(
             deployment_name=deployment_name,
             override_parameters=override_parameters,
             validate=enable_validation,
+            tags=(
+                _validation_group_tags(deployment_data.context.pipeline_id)
+                if enable_validation
+                else None
+            ),
         )
+        if not enable_validation:
+            _record_step_outputs(
+                deployment_data, this_step.name, outputs or dict()
+            )
+
+        return predicted_changes
     except Exception as e:
         message = f"step deployment failed, {step_context}, {str(e)}"
         log.error(message)
@@ -171,7 +326,8 @@ async def deploy_step(
     this_step: ApplicationStepDeploymentDefinition,
     deployment_data: FlattenedDeployment,
     enable_validation: bool,
-) -> None:
+    what_if: bool = False,
+) -> typing.Optional[WhatIfSummary]:
     """
     Deploy Azure resources.
 
@@ -180,7 +336,16 @@ async def deploy_step(
         deployment_data: Deployment context related parameters.
         puff_parameter_data: Puff file parameter data.
         enable_validation: Enable or disable Azure validation deployment.
+        what_if: Predict changes before deploying, skipping the deployment
+                 if no changes are predicted. Skipped deployments provide
+                 the outputs of the previous deployment of the step to
+                 subsequent steps, and are not skipped if those are
+                 unknown.
+
+    Returns:
+        Predicted changes of the step deployment, if known.
     """
+    predicted_changes = None
     this_context = str(deployment_data.data.iteration_context)
     step_context = "{0}.{1}".format(this_context, this_step.name)
     deploy_to = deployment_data.data.to
@@ -190,9 +355,12 @@ async def deploy_step(
             "{0} skipped {1}".format(str(deploy_to), step_context)
         )
     else:
-        await _do_step_deployment(
+        predicted_changes = await _do_step_deployment(
             this_step,
             deployment_data,
             enable_validation,
+            what_if=what_if,
         )
         log.info("application step succeeded, {0}".format(step_context))
+
+    return predicted_changes
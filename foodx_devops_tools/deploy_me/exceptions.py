@@ -10,4 +10,5 @@
 from ._exceptions import (  # noqa: F401
     DeploymentError,
     DeploymentTerminatedError,
+    FailFastCancelledError,
 )
@@ -29,6 +29,7 @@ from ._declarations import (
     VALID_LOG_LEVELS,
 )
 from ._logging import LoggingState
+from .utilities import forward_termination_signals
 
 log = logging.getLogger(__name__)
 
@@ -244,9 +245,10 @@ def file_maintainer(
             default_log_file=DEFAULT_LOG_FILE,
         )
 
-        asyncio.run(
-            _run_maintainer(directory, persist_interval_minutes, threshold)
-        )
+        with forward_termination_signals():
+            asyncio.run(
+                _run_maintainer(directory, persist_interval_minutes, threshold)
+            )
 
         click.echo("maintainer exiting due to task completion")
     except asyncio.exceptions.CancelledError:
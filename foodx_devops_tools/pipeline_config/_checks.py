@@ -120,6 +120,7 @@ async def _prepare_deployment_files(
                 template_files = this_iteration.construct_deployment_paths(
                     arm_paths[structure_name].file,
                     puff_paths[structure_name].file,
+                    step_name=structure_name[-1],
                 )
                 log.debug(
                     f"template files for configuration validation,"
@@ -56,6 +56,7 @@ class ApplicationStepDeploymentDefinition(pydantic.BaseModel):
     resource_group: str
 
     arm_file: typing.Optional[pathlib.Path]
+    depends_on: typing.Optional[DependencyDeclarations]
     puff_file: typing.Optional[pathlib.Path]
     static_secrets: typing.Optional[bool] = False
 
@@ -63,6 +64,7 @@ class ApplicationStepDeploymentDefinition(pydantic.BaseModel):
 class ApplicationStepScript(pydantic.BaseModel):
     """Execute arbitrary shell commands during deployment."""
 
+    depends_on: typing.Optional[DependencyDeclarations]
     name: str
     script: str
 
@@ -101,6 +103,26 @@ class ApplicationDefinition(pydantic.BaseModel):
             log.error(message)
             raise ValueError(message)
 
+        named_steps: typing.Set[str] = set()
+        for this_step in steps_candidate:
+            step_dependencies = getattr(this_step, "depends_on", None)
+            if step_dependencies and any(
+                [x not in named_steps for x in step_dependencies]
+            ):
+                message = (
+                    "Application step dependencies must be named steps "
+                    "declared earlier in the application, {0}".format(
+                        str(step_dependencies)
+                    )
+                )
+                # log the message here because pydantic exception handling
+                # masks the true exception that caused a validation failure.
+                log.error(message)
+                raise ValueError(message)
+            step_name = getattr(this_step, "name", None)
+            if step_name:
+                named_steps.add(step_name)
+
         return steps_candidate
 
 
@@ -21,6 +21,10 @@ from foodx_devops_tools.azure.cloud import AzureCredentials
 from foodx_devops_tools.patterns import SubscriptionData
 from foodx_devops_tools.utilities.jinja2 import TemplateParameters
 from foodx_devops_tools.utilities.templates import TemplateFiles, TemplatePaths
+from foodx_devops_tools.utilities.working import (
+    WORKING_DIR,
+    encode_working_name,
+)
 
 from ..deployment import DeploymentTuple
 from ._exceptions import PipelineViewError
@@ -28,6 +32,12 @@ from .pipeline import PipelineConfiguration
 
 log = logging.getLogger(__name__)
 
+# reserving underscore for segmentation of deployment names.
+_DEPLOYMENT_NAME_REGEX = re.compile(r"[^A-Za-z0-9.\-]")
+
+# context tags that identify a run rather than what it deploys.
+RUN_IDENTITY_TAGS = frozenset({"commit_sha", "pipeline_id", "release_id"})
+
 Z = typing.TypeVar("Z", bound="IterationContext")
 
 
@@ -203,6 +213,58 @@ class DeploymentContext:
         return str(self.as_dict())
 
 
+R = typing.TypeVar("R", bound="DeploymentOutputs")
+
+
+class DeploymentOutputs:
+    """
+    Output values of the step deployments of a deployment iteration.
+
+    A single store is shared by all the frame and application copies of a
+    deployment iteration, so deep copies of it return the same object.
+    """
+
+    __outputs: typing.Dict[str, typing.Dict[str, typing.Dict[str, dict]]]
+
+    def __init__(self: R) -> None:
+        """Construct ``DeploymentOutputs`` object."""
+        self.__outputs = dict()
+
+    def __deepcopy__(self: R, memo: dict) -> R:
+        """Share the store between copies of a deployment iteration."""
+        return self
+
+    def record(
+        self: R,
+        frame_name: str,
+        application_name: str,
+        step_name: str,
+        outputs: typing.Dict[str, typing.Any],
+    ) -> None:
+        """
+        Record the output values of a step deployment.
+
+        Args:
+            frame_name: Frame of the step.
+            application_name: Application of the step.
+            step_name: Name of the step.
+            outputs: Deployment output values, by output name.
+        """
+        self.__outputs.setdefault(frame_name, dict()).setdefault(
+            application_name, dict()
+        )[step_name] = {"outputs": copy.deepcopy(outputs)}
+
+    def as_dict(self: R) -> dict:
+        """
+        Get the recorded output values for use in templates.
+
+        Returns:
+            Output values keyed by frame, application and step name, eg.
+            ``f1.a1.s1.outputs.hostname``.
+        """
+        return copy.deepcopy(self.__outputs)
+
+
 X = typing.TypeVar("X", bound="DeployDataView")
 
 
@@ -220,6 +282,7 @@ class DeployDataView:
     tenant_id: str
     url_endpoints: typing.List[str]
 
+    deployment_outputs: DeploymentOutputs
     frame_folder: typing.Optional[pathlib.Path] = None
 
     __location_secondary: typing.Optional[str] = None
@@ -254,6 +317,7 @@ class DeployDataView:
         self.url_endpoints = url_endpoints
         self.__location_secondary = location_secondary
 
+        self.deployment_outputs = DeploymentOutputs()
         self.iteration_context = IterationContext()
         self.to = StructuredTo()
 
@@ -376,6 +440,7 @@ class FlattenedDeployment:
             Dict of parameters to be applied to jinja2 templating.
         """
         engine_data = {
+            "deployments": self.data.deployment_outputs.as_dict(),
             "environment": {
                 "azure": {
                     "subscription_id": self.data.subscription_id,
@@ -403,6 +468,27 @@ class FlattenedDeployment:
 
         return result
 
+    def construct_deployment_name_prefix(self: W, step_name: str) -> str:
+        """
+        Construct the deployment name prefix of a step.
+
+        The prefix is shared by the deployments of the step in all
+        pipelines; the rest of the deployment name is the pipeline id, which
+        does not contain an underscore.
+        """
+        assert self.context.application_name is not None
+
+        filtered_app_name = _DEPLOYMENT_NAME_REGEX.sub(
+            "-", self.context.application_name
+        )[0:20]
+        filtered_step_name = _DEPLOYMENT_NAME_REGEX.sub("-", step_name)[0:20]
+
+        return "{0}_".format(
+            filtered_app_name
+            if filtered_app_name == filtered_step_name
+            else "{0}_{1}".format(filtered_app_name, filtered_step_name),
+        )
+
     def construct_deployment_name(self: W, step_name: str) -> str:
         """
         Construct the deployment name for use in az CLI.
@@ -412,26 +498,14 @@ class FlattenedDeployment:
         * limited to 64 characters
         * must only contain alphanumerics and the characters ".-_"
         """
-        assert self.context.application_name is not None
         assert self.context.pipeline_id is not None
         assert self.context.release_id is not None
 
-        substitution_value = "-"
-        # reserving underscore here for segmentation of deployment name.
-        regex = re.compile(r"[^A-Za-z0-9.\-]")
-
-        filtered_app_name = regex.sub(
-            substitution_value, self.context.application_name
-        )[0:20]
-        filtered_pipeline_id = regex.sub(
-            substitution_value, self.context.pipeline_id
+        filtered_pipeline_id = _DEPLOYMENT_NAME_REGEX.sub(
+            "-", self.context.pipeline_id
         )
-        filtered_step_name = regex.sub(substitution_value, step_name)[0:20]
-
-        result = "{0}_{1}".format(
-            filtered_app_name
-            if filtered_app_name == filtered_step_name
-            else "{0}_{1}".format(filtered_app_name, filtered_step_name),
+        result = "{0}{1}".format(
+            self.construct_deployment_name_prefix(step_name),
             filtered_pipeline_id,
         )
 
@@ -441,30 +515,55 @@ class FlattenedDeployment:
     def __construct_working_directory(
         parent_dir: pathlib.Path, working_name: str
     ) -> pathlib.Path:
-        working_dir = parent_dir / "working" / working_name
+        working_dir = parent_dir / WORKING_DIR / working_name
 
         return working_dir
 
-    @staticmethod
-    def __encode_working_name(parameters: TemplateParameters) -> str:
+    def __encode_working_name(
+        self: W, parameters: TemplateParameters, step_name: typing.Optional[str]
+    ) -> str:
         """Construct a working directory name from template parameters."""
-        # for now, use a simple predictable, non-empty value
-        value = "w"
-        return value
+        # outputs accumulate as the steps of the iteration are deployed, so
+        # they are excluded to retain one working directory per iteration.
+        # tags identifying the run are excluded so that an unchanged
+        # iteration reuses its working directory across runs.
+        context = {
+            k: v for k, v in parameters["context"].items() if k != "deployments"
+        }
+        if isinstance(context.get("tags"), dict):
+            context["tags"] = {
+                k: v
+                for k, v in context["tags"].items()
+                if k not in RUN_IDENTITY_TAGS
+            }
+        stable_parameters = {**parameters, "context": context}
+        # steps of an iteration deploy concurrently and may share template
+        # files, so each step renders to its own working directory.
+        working_context = (
+            "{0}.{1}".format(self.data.iteration_context, step_name)
+            if step_name
+            else str(self.data.iteration_context)
+        )
+        return encode_working_name(working_context, stable_parameters)
 
     def construct_deployment_paths(
         self: W,
         specified_arm_file: typing.Optional[pathlib.Path],
         specified_puff_file: typing.Optional[pathlib.Path],
+        step_name: typing.Optional[str] = None,
+        resource_group_name: typing.Optional[str] = None,
     ) -> TemplateFiles:
         """
         Construct paths for ARM template files.
 
+        The working directory is distinct for each step and resource group of
+        the deployment iteration.
+
         Args:
             specified_arm_file:
             specified_puff_file:
-            target_arm_parameter_path:
-            working_name:
+            step_name: Name of the application step deploying the files.
+            resource_group_name: Resource group the step deploys to.
 
         Returns:
             Tuple of necessary paths.
@@ -472,8 +571,12 @@ class FlattenedDeployment:
             PipelineViewError:  If any errors occur due to undefined deployment
                                 data.
         """
-        template_parameters = self.construct_template_parameters()
-        working_name = self.__encode_working_name(template_parameters)
+        template_parameters = self.construct_template_parameters(
+            resource_group_name
+        )
+        working_name = self.__encode_working_name(
+            template_parameters, step_name
+        )
         application_name = self.context.application_name
         frame_folder = self.data.frame_folder
         if not frame_folder:
@@ -529,6 +632,7 @@ class FlattenedDeployment:
                 source=source_puff_path,
                 target=parameters_path,
             ),
+            cache_dir=working_dir.parent,
         )
 
         return template_files
@@ -837,6 +941,8 @@ class ReleaseView:
 
                     updated_data = copy.deepcopy(this_deploy_data)
                     updated_data.to = to
+                    # deployment outputs are not shared between iterations.
+                    updated_data.deployment_outputs = DeploymentOutputs()
 
                     this_value = FlattenedDeployment(
                         context=updated_context,
@@ -7,11 +7,17 @@
 
 """Utilities for maintaining timing information."""
 
+import asyncio
 import contextlib
+import contextvars
+import dataclasses
 import datetime
+import enum
+import itertools
 import logging
 import time
 import typing
+import weakref
 
 log = logging.getLogger(__name__)
 
@@ -54,18 +60,463 @@ class Timer:
         )
 
 
+@enum.unique
+class SpanKind(str, enum.Enum):
+    """Kinds of activity recorded by trace spans."""
+
+    application = "application"
+    command = "command"
+    dependency_wait = "dependency_wait"
+    deployment = "deployment"
+    frame = "frame"
+    iteration = "iteration"
+    login = "login"
+    other = "other"
+    puff = "puff"
+    resource_group = "resource_group"
+    step = "step"
+    template = "template"
+
+
+@dataclasses.dataclass
+class Span:
+    """A timed, named activity with an optional parent activity."""
+
+    span_id: int
+    name: str
+    kind: SpanKind
+    parent_id: typing.Optional[int]
+    # trace "thread" lane; spans in the same asyncio task share a lane.
+    lane: int
+    timer: Timer
+    attributes: typing.Dict[str, typing.Any] = dataclasses.field(
+        default_factory=dict
+    )
+
+    @property
+    def start_seconds(self: "Span") -> float:
+        """Monotonic start time of the span."""
+        return self.timer.start_time_seconds
+
+    @property
+    def end_seconds(self: "Span") -> float:
+        """Monotonic end time of the span."""
+        return self.timer.stop_time_seconds
+
+
+@dataclasses.dataclass
+class SpanSummary:
+    """Aggregated timing of spans sharing a name and kind."""
+
+    name: str
+    kind: SpanKind
+    count: int
+    total_seconds: float
+    self_seconds: float
+
+
+_current_span: contextvars.ContextVar[
+    typing.Optional[Span]
+] = contextvars.ContextVar("current_span", default=None)
+
+S = typing.TypeVar("S", bound="SpanTracer")
+
+
+class SpanTracer:
+    """
+    Record nested spans of activity.
+
+    Parent spans are tracked per asyncio task context, so spans opened in
+    concurrent tasks are correctly linked to the span that created the task.
+    """
+
+    __counters: typing.Dict[str, int]
+    __lanes: "weakref.WeakKeyDictionary[asyncio.Task, int]"
+    __origin_seconds: float
+    __spans: typing.List[Span]
+
+    def __init__(self: S) -> None:
+        """Construct ``SpanTracer`` object."""
+        self.__counters = dict()
+        self.__lanes = weakref.WeakKeyDictionary()
+        self.__lane_ids = itertools.count(1)
+        self.__span_ids = itertools.count(1)
+        self.__origin_seconds = time.monotonic()
+        self.__spans = list()
+
+    @property
+    def spans(self: S) -> typing.List[Span]:
+        """Completed spans, in order of completion."""
+        return list(self.__spans)
+
+    @property
+    def counters(self: S) -> typing.Dict[str, int]:
+        """Event counts, by name."""
+        return dict(self.__counters)
+
+    def count(self: S, name: str, increment: int = 1) -> None:
+        """
+        Count occurrences of a named event, such as a cache hit.
+
+        Args:
+            name: Name of the event.
+            increment: Number of occurrences.
+        """
+        self.__counters[name] = self.__counters.get(name, 0) + increment
+
+    def __acquire_lane(self: S) -> int:
+        try:
+            this_task = asyncio.current_task()
+        except RuntimeError:
+            # not running in an event loop.
+            this_task = None
+        if this_task is None:
+            return 0
+        if this_task not in self.__lanes:
+            self.__lanes[this_task] = next(self.__lane_ids)
+        return self.__lanes[this_task]
+
+    @contextlib.contextmanager
+    def span(
+        self: S,
+        name: str,
+        kind: SpanKind = SpanKind.other,
+        **attributes: typing.Any,
+    ) -> typing.Generator[Span, None, None]:
+        """
+        Record a span for the duration of the context.
+
+        Args:
+            name: Name of the span.
+            kind: Kind of activity.
+            **attributes: Additional data recorded with the span.
+
+        Yields:
+            The active span.
+        """
+        parent = _current_span.get()
+        this_span = Span(
+            span_id=next(self.__span_ids),
+            name=name,
+            kind=kind,
+            parent_id=parent.span_id if parent else None,
+            lane=self.__acquire_lane(),
+            timer=Timer(),
+            attributes=attributes,
+        )
+        token = _current_span.set(this_span)
+        this_span.timer.start()
+        try:
+            yield this_span
+        finally:
+            this_span.timer.stop()
+            _current_span.reset(token)
+            self.__spans.append(this_span)
+
+    def chrome_trace(self: S) -> dict:
+        """
+        Export spans in the Chrome trace event format.
+
+        Load the result in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+        Returns:
+            JSON compatible trace data.
+        """
+        events = [
+            {
+                "name": x.name,
+                "cat": x.kind.value,
+                "ph": "X",
+                "ts": (x.start_seconds - self.__origin_seconds) * 1e6,
+                "dur": x.timer.elapsed_time_seconds * 1e6,
+                "pid": 1,
+                "tid": x.lane,
+                "args": {
+                    "span_id": x.span_id,
+                    "parent_id": x.parent_id,
+                    **x.attributes,
+                },
+            }
+            for x in sorted(self.__spans, key=lambda x: x.start_seconds)
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": self.counters},
+        }
+
+    def self_times(self: S) -> typing.Dict[int, float]:
+        """
+        Calculate the time of each span not covered by its child spans.
+
+        Concurrent child spans may overlap, so the union of child intervals
+        is subtracted from the span duration.
+
+        Returns:
+            Self time in seconds indexed by span id.
+        """
+        children: typing.Dict[int, typing.List[Span]] = dict()
+        for this_span in self.__spans:
+            if this_span.parent_id is not None:
+                children.setdefault(this_span.parent_id, list()).append(
+                    this_span
+                )
+
+        result: typing.Dict[int, float] = dict()
+        for this_span in self.__spans:
+            covered = 0.0
+            cursor = this_span.start_seconds
+            for child in sorted(
+                children.get(this_span.span_id, list()),
+                key=lambda x: x.start_seconds,
+            ):
+                child_start = max(child.start_seconds, cursor)
+                child_end = min(child.end_seconds, this_span.end_seconds)
+                if child_end > child_start:
+                    covered += child_end - child_start
+                    cursor = child_end
+            result[this_span.span_id] = max(
+                0.0, this_span.timer.elapsed_time_seconds - covered
+            )
+
+        return result
+
+    def summary(self: S, limit: int = 20) -> typing.List[SpanSummary]:
+        """
+        Summarise spans aggregated by name and kind.
+
+        Args:
+            limit: Maximum number of summary entries.
+
+        Returns:
+            Summary entries ordered by decreasing self time.
+        """
+        self_times = self.self_times()
+        aggregates: typing.Dict[
+            typing.Tuple[str, SpanKind], SpanSummary
+        ] = dict()
+        for this_span in self.__spans:
+            key = (this_span.name, this_span.kind)
+            if key not in aggregates:
+                aggregates[key] = SpanSummary(
+                    name=this_span.name,
+                    kind=this_span.kind,
+                    count=0,
+                    total_seconds=0.0,
+                    self_seconds=0.0,
+                )
+            aggregates[key].count += 1
+            aggregates[
+                key
+            ].total_seconds += this_span.timer.elapsed_time_seconds
+            aggregates[key].self_seconds += self_times[this_span.span_id]
+
+        result = sorted(
+            aggregates.values(), key=lambda x: x.self_seconds, reverse=True
+        )
+        return result[0:limit]
+
+    def format_summary(self: S, limit: int = 20) -> str:
+        """Format the span summary as a text table."""
+        lines = [
+            "{0:>10} {1:>10} {2:>6}  {3:<16} {4}".format(
+                "self (s)", "total (s)", "count", "kind", "name"
+            )
+        ]
+        for x in self.summary(limit):
+            lines.append(
+                "{0:>10.3f} {1:>10.3f} {2:>6}  {3:<16} {4}".format(
+                    x.self_seconds,
+                    x.total_seconds,
+                    x.count,
+                    x.kind.value,
+                    x.name,
+                )
+            )
+        if self.__counters:
+            lines.append("")
+            lines.append("{0:>10}  {1}".format("count", "counter"))
+            for name, value in sorted(self.__counters.items()):
+                lines.append("{0:>10}  {1}".format(value, name))
+
+        return "\n".join(lines)
+
+
+_active_tracer: typing.Optional[SpanTracer] = None
+
+
+def start_tracing() -> SpanTracer:
+    """
+    Start recording spans for the process.
+
+    Returns:
+        The active span tracer.
+    """
+    global _active_tracer
+    _active_tracer = SpanTracer()
+
+    return _active_tracer
+
+
+def stop_tracing() -> typing.Optional[SpanTracer]:
+    """
+    Stop recording spans for the process.
+
+    Returns:
+        The previously active span tracer, if any.
+    """
+    global _active_tracer
+    this_tracer = _active_tracer
+    _active_tracer = None
+
+    return this_tracer
+
+
+@contextlib.contextmanager
+def trace_span(
+    name: str,
+    kind: SpanKind = SpanKind.other,
+    **attributes: typing.Any,
+) -> typing.Generator[typing.Optional[Span], None, None]:
+    """
+    Record a span with the active tracer, if tracing has been started.
+
+    Args:
+        name: Name of the span.
+        kind: Kind of activity.
+        **attributes: Additional data recorded with the span.
+
+    Yields:
+        The active span, or ``None`` if tracing is not active.
+    """
+    if _active_tracer:
+        with _active_tracer.span(name, kind, **attributes) as this_span:
+            yield this_span
+    else:
+        yield None
+
+
+def trace_count(name: str, increment: int = 1) -> None:
+    """
+    Count a named event with the active tracer, if tracing has been started.
+
+    Args:
+        name: Name of the event.
+        increment: Number of occurrences.
+    """
+    if _active_tracer:
+        _active_tracer.count(name, increment)
+
+
+DEFAULT_LAG_INTERVAL_SECONDS = 0.05
+
+
+@dataclasses.dataclass
+class EventLoopLag:
+    """Statistics of event loop scheduling delay."""
+
+    samples: int = 0
+    total_seconds: float = 0.0
+    maximum_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self: "EventLoopLag") -> float:
+        """Mean scheduling delay."""
+        return (self.total_seconds / self.samples) if self.samples else 0.0
+
+    def record(self: "EventLoopLag", lag_seconds: float) -> None:
+        """Record a scheduling delay sample."""
+        self.samples += 1
+        self.total_seconds += lag_seconds
+        self.maximum_seconds = max(self.maximum_seconds, lag_seconds)
+
+
+_last_event_loop_lag: typing.Optional[EventLoopLag] = None
+
+M = typing.TypeVar("M", bound="EventLoopLagMonitor")
+
+
+class EventLoopLagMonitor:
+    """
+    Measure how late the event loop runs a periodic timer.
+
+    Lag is the delay beyond the timer interval before the timer coroutine is
+    resumed; synchronous work in any coroutine, such as template rendering,
+    delays every other coroutine by the same amount.
+    """
+
+    lag: EventLoopLag
+
+    def __init__(
+        self: M, interval_seconds: float = DEFAULT_LAG_INTERVAL_SECONDS
+    ) -> None:
+        """
+        Construct ``EventLoopLagMonitor`` object.
+
+        Args:
+            interval_seconds: Timer interval.
+        """
+        self.interval_seconds = interval_seconds
+        self.lag = EventLoopLag()
+        self.__task: typing.Optional[asyncio.Task] = None
+
+    async def __sample(self: M) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval_seconds)
+            self.lag.record(
+                max(0.0, time.monotonic() - start - self.interval_seconds)
+            )
+
+    def start(self: M) -> None:
+        """Start measuring; must be called from a running event loop."""
+        self.lag = EventLoopLag()
+        self.__task = asyncio.create_task(self.__sample())
+
+    async def stop(self: M) -> EventLoopLag:
+        """
+        Stop measuring.
+
+        The statistics are also retained for ``last_event_loop_lag``.
+
+        Returns:
+            Lag statistics.
+        """
+        global _last_event_loop_lag
+        if self.__task:
+            self.__task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        _last_event_loop_lag = self.lag
+
+        return self.lag
+
+
+def last_event_loop_lag() -> typing.Optional[EventLoopLag]:
+    """Get the lag statistics of the most recently stopped monitor."""
+    return _last_event_loop_lag
+
+
 @contextlib.contextmanager
 def timing(
     this_log: logging.Logger,
     iteration_context: str,
+    kind: SpanKind = SpanKind.other,
+    **attributes: typing.Any,
 ) -> typing.Generator[Timer, None, Timer]:
-    """Manage the context of calculating a time interval."""
-    this_timer = Timer()
-    this_timer.start()
+    """
+    Manage the context of calculating a time interval.
+
+    The interval is also recorded as a span if tracing has been started.
+    """
+    with trace_span(iteration_context, kind, **attributes):
+        this_timer = Timer()
+        this_timer.start()
 
-    yield this_timer
+        yield this_timer
 
-    this_timer.stop()
-    this_timer.log_duration(this_log, iteration_context)
+        this_timer.stop()
+        this_timer.log_duration(this_log, iteration_context)
 
     return this_timer
@@ -0,0 +1,261 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Manifest of the files generated from puff files."""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import typing
+import uuid
+
+import aiofiles
+
+from foodx_devops_tools._version import acquire_version
+
+log = logging.getLogger(__name__)
+
+MANIFEST_FILE = ".puff_manifest.json"
+MANIFEST_VERSION = 1
+
+
+async def hash_source(path: pathlib.Path) -> typing.Optional[str]:
+    """
+    Hash the content of a puff file.
+
+    Returns:
+        Content hash, or ``None`` if the file cannot be read.
+    """
+    try:
+        async with aiofiles.open(path, mode="rb") as f:
+            content = await f.read()
+    except OSError:
+        return None
+
+    return hashlib.sha256(content).hexdigest()
+
+
+def _modified_ns(path: pathlib.Path) -> typing.Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@dataclasses.dataclass
+class ManifestEntry:
+    """Files generated from a puff file."""
+
+    source_hash: str
+    is_pretty: bool
+    # generated file names relative to the manifest directory, and their
+    # modification times in nanoseconds.
+    outputs: typing.Dict[str, int]
+
+
+T = typing.TypeVar("T", bound="PuffManifest")
+
+
+class PuffManifest:
+    """
+    Map puff files by content hash to the files generated from them.
+
+    A manifest is stored in each directory of generated files. Manifests
+    from a different version of the package are discarded, since the files
+    generated from a puff file may differ between versions.
+    """
+
+    entries: typing.Dict[str, ManifestEntry]
+
+    def __init__(self: T, directory: pathlib.Path) -> None:
+        """
+        Construct ``PuffManifest`` object.
+
+        Args:
+            directory: Directory of generated files.
+        """
+        self.directory = directory
+        self.entries = dict()
+        self.changed = False
+
+    @property
+    def path(self: T) -> pathlib.Path:
+        """Path of the manifest file."""
+        return self.directory / MANIFEST_FILE
+
+    @classmethod
+    async def load(cls: typing.Type[T], directory: pathlib.Path) -> T:
+        """
+        Load the manifest of a directory of generated files.
+
+        A missing or unusable manifest results in an empty manifest.
+        """
+        manifest = cls(directory)
+        try:
+            async with aiofiles.open(manifest.path, mode="r") as f:
+                data = json.loads(await f.read())
+            if (data.get("version") == MANIFEST_VERSION) and (
+                data.get("generator") == acquire_version()
+            ):
+                manifest.entries = {
+                    k: ManifestEntry(**v) for k, v in data["entries"].items()
+                }
+            else:
+                log.info("discarding puff manifest, {0}".format(manifest.path))
+        except FileNotFoundError:
+            pass
+        except (OSError, TypeError, ValueError, KeyError) as e:
+            log.warning(
+                "unusable puff manifest, {0}, {1}".format(manifest.path, e)
+            )
+
+        return manifest
+
+    async def save(self: T) -> None:
+        """Save the manifest, if changed, replacing the manifest file."""
+        if not self.changed:
+            return
+
+        if not self.entries:
+            if self.path.is_file():
+                self.path.unlink()
+        else:
+            content = json.dumps(
+                {
+                    "version": MANIFEST_VERSION,
+                    "generator": acquire_version(),
+                    "entries": {
+                        k: dataclasses.asdict(v)
+                        for k, v in self.entries.items()
+                    },
+                },
+                indent=2,
+                sort_keys=True,
+            )
+            this_path = self.directory / ".{0}.{1}.tmp".format(
+                MANIFEST_FILE, uuid.uuid4().hex
+            )
+            async with aiofiles.open(this_path, mode="w") as f:
+                await f.write(content)
+            os.replace(this_path, self.path)
+        self.changed = False
+
+    def __key(self: T, source_path: pathlib.Path) -> str:
+        return os.path.relpath(source_path.resolve(), self.directory.resolve())
+
+    def __unowned(
+        self: T, entry: typing.Optional[ManifestEntry]
+    ) -> typing.List[pathlib.Path]:
+        """Select the outputs of a removed entry no other entry generates."""
+        if not entry:
+            return list()
+
+        owned = {y for x in self.entries.values() for y in x.outputs.keys()}
+        return [
+            self.directory / x
+            for x in sorted(entry.outputs.keys())
+            if x not in owned
+        ]
+
+    def __pop(self: T, key: str) -> typing.Optional[ManifestEntry]:
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.changed = True
+
+        return entry
+
+    def is_current(
+        self: T, source_path: pathlib.Path, source_hash: str, is_pretty: bool
+    ) -> bool:
+        """
+        Indicate whether the generated files of a puff file are up to date.
+
+        The files are up to date if the puff file content and the output
+        format are unchanged since they were generated, and the files have
+        not since been modified or deleted.
+        """
+        entry = self.entries.get(self.__key(source_path))
+        return (
+            (entry is not None)
+            and (entry.source_hash == source_hash)
+            and (entry.is_pretty == is_pretty)
+            and all(
+                _modified_ns(self.directory / k) == v
+                for k, v in entry.outputs.items()
+            )
+        )
+
+    def update(
+        self: T,
+        source_path: pathlib.Path,
+        source_hash: typing.Optional[str],
+        is_pretty: bool,
+        outputs: typing.List[pathlib.Path],
+    ) -> typing.List[pathlib.Path]:
+        """
+        Record the files generated from a puff file.
+
+        Args:
+            source_path: Puff file.
+            source_hash: Content hash of the puff file, or ``None`` to not
+                         record the generated files.
+            is_pretty: Output format of the generated files.
+            outputs: Generated files.
+
+        Returns:
+            Files previously generated from the puff file that no longer
+            are.
+        """
+        key = self.__key(source_path)
+        previous = self.__pop(key)
+        if source_hash:
+            modified = {
+                os.path.relpath(x, self.directory): _modified_ns(x)
+                for x in outputs
+            }
+            self.entries[key] = ManifestEntry(
+                source_hash=source_hash,
+                is_pretty=is_pretty,
+                outputs={k: v for k, v in modified.items() if v is not None},
+            )
+            self.changed = True
+
+        current = {x.resolve() for x in outputs}
+        return [
+            x for x in self.__unowned(previous) if x.resolve() not in current
+        ]
+
+    def remove(self: T, source_path: pathlib.Path) -> typing.List[pathlib.Path]:
+        """
+        Forget the files generated from a puff file.
+
+        Returns:
+            Files previously generated from the puff file.
+        """
+        if not self.entries:
+            return list()
+
+        return self.__unowned(self.__pop(self.__key(source_path)))
+
+    def remove_missing_sources(self: T) -> typing.List[pathlib.Path]:
+        """
+        Forget the files generated from puff files that no longer exist.
+
+        Returns:
+            Files generated from the missing puff files.
+        """
+        result: typing.List[pathlib.Path] = list()
+        for this_key in sorted(self.entries.keys()):
+            source_path = self.directory / this_key
+            if not source_path.is_file():
+                log.info("puff file removed, {0}".format(source_path))
+                result.extend(self.__unowned(self.__pop(this_key)))
+
+        return result
@@ -132,11 +132,18 @@ async def _save_parameter_file(
     if is_pretty:
         dump_arguments = {"sort_keys": True, "indent": 2}
 
+    content = json.dumps(generated_parameters, **dump_arguments)
     if not target_path.parent.exists():
         os.makedirs(str(target_path.parent), exist_ok=True)
+    elif target_path.is_file():
+        async with aiofiles.open(target_path, mode="r") as f:
+            if (await f.read()) == content:
+                # retain the modification time of unchanged files.
+                log.info("parameter file unchanged, {0}".format(target_path))
+                return
     async with aiofiles.open(target_path, mode="w") as f:
         log.info("saving parameter file, {0}".format(target_path))
-        await f.write(json.dumps(generated_parameters, **dump_arguments))
+        await f.write(content)
 
 
 async def _delete_parameter_file(
@@ -158,7 +165,7 @@ async def _do_file_actions(
     target_path: pathlib.Path,
     parameter_data: dict,
     is_pretty: bool,
-) -> None:
+) -> typing.List[pathlib.Path]:
     """
     Create or delete generated ARM template parameter files.
 
@@ -167,13 +174,20 @@ async def _do_file_actions(
         target_path: Directory to store or delete parameter files.
         parameter_data: Data for each ARM template parameter file.
         is_pretty: Create nicely formatted JSON for humans.
+
+    Returns:
+        Paths of the created or deleted parameter files.
     """
+    paths: typing.List[pathlib.Path] = list()
     for key, values in parameter_data.items():
         this_path = target_path / ".".join([key, "json"])
         if is_delete_action:
             await _delete_parameter_file(this_path)
         else:
             await _save_parameter_file(this_path, values, is_pretty)
+        paths.append(this_path)
+
+    return paths
 
 
 def _linearize_name(base_data: dict, filename: str) -> dict:
@@ -309,7 +323,7 @@ async def do_arm_template_parameter_action(
     output_dir: typing.Optional[pathlib.Path],
     is_delete_action: bool,
     is_pretty: bool,
-) -> None:
+) -> typing.List[pathlib.Path]:
     """
     Generate ARM template parameter files from puff YAML file.
 
@@ -321,6 +335,9 @@ async def do_arm_template_parameter_action(
         output_dir:         Optional path to directory for storing output files.
         is_delete_action:   True if files should be deleted instead of created.
         is_pretty:          Create nicely formatted JSON for humans.
+
+    Returns:
+        Paths of the created or deleted parameter files.
     """
     if output_dir:
         target_path = output_dir
@@ -335,7 +352,7 @@ async def do_arm_template_parameter_action(
 
         file_name = pathlib.Path(puff_file_path.stem).name
         merged_data = _linearize_parameters(yaml_data, file_name)
-        await _do_file_actions(
+        return await _do_file_actions(
             is_delete_action, target_path, merged_data, is_pretty
         )
     except pydantic.ValidationError as e:
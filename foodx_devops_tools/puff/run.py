@@ -18,7 +18,8 @@ import click
 
 from ._ascii_art import JELLY, PUFFIN
 from ._exceptions import PuffError
-from .arm import do_arm_template_parameter_action
+from ._manifest import PuffManifest, hash_source
+from .arm import _delete_parameter_file, do_arm_template_parameter_action
 from .puffignore import IgnorePatterns, load_puffignore
 
 log = logging.getLogger(__name__)
@@ -76,22 +77,61 @@ def _acquire_yaml_filenames(
     return yaml_files
 
 
+async def _delete_files(paths: typing.List[pathlib.Path]) -> None:
+    for this_path in paths:
+        await _delete_parameter_file(this_path)
+
+
+async def _generate_files(
+    puff_file_path: pathlib.Path,
+    output_dir: typing.Optional[pathlib.Path],
+    is_pretty: bool,
+    is_full: bool,
+    manifest: PuffManifest,
+) -> None:
+    """Generate the ARM template parameter files of a changed puff file."""
+    source_hash = await hash_source(puff_file_path)
+    if (
+        (not is_full)
+        and source_hash
+        and manifest.is_current(puff_file_path, source_hash, is_pretty)
+    ):
+        click.echo("unchanged, {0}".format(puff_file_path))
+        log.info("puff file unchanged, {0}".format(puff_file_path))
+        return
+
+    outputs = await do_arm_template_parameter_action(
+        puff_file_path, output_dir, False, is_pretty
+    )
+    await _delete_files(
+        manifest.update(puff_file_path, source_hash, is_pretty, outputs)
+    )
+
+
 async def run_puff(
     source_path: pathlib.Path,
     is_delete_files: bool,
     is_pretty: bool,
     disable_ascii_art: bool = False,
     output_dir: typing.Optional[pathlib.Path] = None,
+    is_full: bool = False,
 ) -> None:
     """
     Search filesystem for YAML files and create or delete ARM template files.
 
+    A manifest in each output directory records the content hash of each
+    YAML file and the files generated from it. Files are only generated from
+    YAML files that have changed since their files were last generated; the
+    files no longer generated from a changed or deleted YAML file are
+    deleted.
+
     Args:
         source_path: Root path to search recursively for YAML files.
         is_delete_files: Enable/disable delete instead of create action.
         is_pretty: Create nicely formatted JSON for humans.
         disable_ascii_art: Disable console ASCII art output.
         output_dir: Directory to save output files.
+        is_full: Generate files from all YAML files, changed or not.
     """
     if is_delete_files:
         this_action = PuffActions.delete
@@ -122,11 +162,32 @@ async def run_puff(
             )
         )
 
-    await asyncio.gather(
-        *[
-            do_arm_template_parameter_action(
-                x, output_dir, is_delete_files, is_pretty
-            )
-            for x in yaml_filenames
-        ]
-    )
+    target_dirs = {x: output_dir or x.parent for x in yaml_filenames}
+    manifests = {
+        x: await PuffManifest.load(x) for x in set(target_dirs.values())
+    }
+    if is_delete_files:
+        await asyncio.gather(
+            *[
+                do_arm_template_parameter_action(
+                    x, output_dir, is_delete_files, is_pretty
+                )
+                for x in yaml_filenames
+            ]
+        )
+        for this_file, this_dir in target_dirs.items():
+            await _delete_files(manifests[this_dir].remove(this_file))
+    else:
+        await asyncio.gather(
+            *[
+                _generate_files(
+                    x, output_dir, is_pretty, is_full, manifests[target_dirs[x]]
+                )
+                for x in yaml_filenames
+            ]
+        )
+        for this_manifest in manifests.values():
+            await _delete_files(this_manifest.remove_missing_sources())
+
+    for this_manifest in manifests.values():
+        await this_manifest.save()
@@ -25,6 +25,7 @@ from ._declarations import (
 )
 from ._logging import LoggingState
 from .puff import PuffError, run_puff
+from .utilities import forward_termination_signals
 
 log = logging.getLogger(__name__)
 
@@ -53,6 +54,14 @@ class ExitState(enum.Enum):
     is_flag=True,
     show_default=True,
 )
+@click.option(
+    "--full",
+    default=False,
+    help="Generate files from all YAML files, including those unchanged "
+    "since their files were last generated.",
+    is_flag=True,
+    show_default=True,
+)
 @click.option(
     "--log-enable-console",
     "enable_console_log",
@@ -87,6 +96,7 @@ def _main(
     delete: bool,
     disable_file_log: bool,
     enable_console_log: bool,
+    full: bool,
     log_level: str,
     pretty: bool,
 ) -> None:
@@ -99,6 +109,10 @@ def _main(
     in this case the json files are generated to the parameter files parent
     directory.
 
+    Files are only generated from YAML files that have changed since the
+    files were last generated, as recorded in a manifest file alongside the
+    generated files.
+
     PATH    Directory or file path for finding yml files to generate from.
     """
     try:
@@ -111,7 +125,10 @@ def _main(
             default_log_file=DEFAULT_LOG_FILE,
         )
 
-        asyncio.run(run_puff(pathlib.Path(path), delete, pretty))
+        with forward_termination_signals():
+            asyncio.run(
+                run_puff(pathlib.Path(path), delete, pretty, is_full=full)
+            )
     except PuffError as e:
         click.echo(str(e), err=True)
         sys.exit(ExitState.PUFF_FAILED.value)
@@ -10,8 +10,13 @@
 from .command import (  # noqa: F401
     CapturedStreams,
     CommandArgs,
+    CommandBackend,
+    CompletedCommand,
+    forward_termination_signals,
+    get_command_backend,
     run_async_command,
     run_command,
+    set_command_backend,
 )
 from .git import get_sha  # noqa: F401
 from .io import acquire_token  # noqa: F401
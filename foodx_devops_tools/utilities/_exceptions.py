@@ -16,5 +16,9 @@ class CommandError(Exception):
     """Problem completing an external command run."""
 
 
+class CommandTimeoutError(CommandError):
+    """An external command run did not complete within its timeout."""
+
+
 class TemplateError(Exception):
     """Problem processing puff, jinja templates."""
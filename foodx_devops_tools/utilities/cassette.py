@@ -0,0 +1,357 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Record and replay of external command interactions."""
+
+import asyncio
+import collections
+import dataclasses
+import json
+import logging
+import pathlib
+import time
+import typing
+
+from .command import (
+    CommandArgs,
+    CommandBackend,
+    CompletedCommand,
+    command_label,
+)
+
+log = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+REDACTED = "<redacted>"
+MINIMUM_SECRET_LENGTH = 8
+
+# options whose values are always redacted.
+SENSITIVE_OPTIONS = {
+    "--client-secret",
+    "--password",
+    "--secret",
+    "-p",
+}
+
+
+@dataclasses.dataclass
+class Interaction:
+    """A recorded external command execution."""
+
+    command: CommandArgs
+    returncode: int
+    out: str
+    error: str
+    # start time relative to the start of the recording.
+    start_seconds: float
+    duration_seconds: float
+
+    def completed(self: "Interaction") -> CompletedCommand:
+        """Construct the command result of the interaction."""
+        return CompletedCommand(
+            returncode=self.returncode,
+            out=self.out.encode(errors="surrogateescape"),
+            error=self.error.encode(errors="surrogateescape"),
+        )
+
+
+def secret_leaves(value: typing.Any) -> typing.Set[str]:
+    """
+    Collect the text of every leaf value of nested secret data.
+
+    Args:
+        value: Secret data, such as the static secrets of a deployment, of
+               nested mappings and sequences.
+
+    Returns:
+        Text of the leaf values.
+    """
+    result: typing.Set[str] = set()
+    if isinstance(value, typing.Mapping):
+        for this_value in value.values():
+            result |= secret_leaves(this_value)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for this_value in value:
+            result |= secret_leaves(this_value)
+    elif isinstance(value, str):
+        result.add(value)
+    elif (value is not None) and (not isinstance(value, bool)):
+        result.add(str(value))
+
+    return result
+
+
+def short_secrets(secrets: typing.Iterable[str]) -> typing.List[str]:
+    """Select secret text too short to be redacted."""
+    # redacting short text such as "true" would corrupt recorded output.
+    return sorted(
+        {x for x in secrets if x and (len(x) < MINIMUM_SECRET_LENGTH)}
+    )
+
+
+def _secret_values(secrets: typing.Iterable[str]) -> typing.List[str]:
+    """Select secret text to redact, longest first."""
+    result = {x for x in secrets if len(x) >= MINIMUM_SECRET_LENGTH}
+
+    # longest first, in case one secret contains another.
+    return sorted(result, key=len, reverse=True)
+
+
+def _redact_text(text: str, secrets: typing.Iterable[str]) -> str:
+    for this_secret in secrets:
+        text = text.replace(this_secret, REDACTED)
+
+    return text
+
+
+def redact_command(
+    command: CommandArgs, secrets: typing.Iterable[str] = tuple()
+) -> CommandArgs:
+    """
+    Redact sensitive values from a command.
+
+    The values of sensitive options, such as ``--password``, and inline
+    ``--parameters`` values, which may contain static secrets, are always
+    redacted. Parameter file references (``@file``) are retained.
+
+    Args:
+        command: Command and arguments.
+        secrets: Additional secret text to redact wherever it occurs.
+
+    Returns:
+        Redacted command.
+    """
+    result: CommandArgs = list()
+    previous = None
+    for this_argument in command:
+        if (previous in SENSITIVE_OPTIONS) or (
+            (previous == "--parameters") and (not this_argument.startswith("@"))
+        ):
+            result.append(REDACTED)
+        else:
+            result.append(_redact_text(this_argument, secrets))
+        previous = this_argument
+
+    return result
+
+
+def load_cassette(path: pathlib.Path) -> typing.List[Interaction]:
+    """
+    Load recorded interactions from a cassette file.
+
+    Raises:
+        ValueError: If the file is not a cassette of a supported version.
+    """
+    with path.open(mode="r") as f:
+        data = json.load(f)
+    if data.get("version") != CASSETTE_VERSION:
+        raise ValueError(
+            "unsupported cassette version, {0}, {1}".format(
+                path, data.get("version")
+            )
+        )
+
+    return [Interaction(**x) for x in data["interactions"]]
+
+
+def save_cassette(
+    path: pathlib.Path, interactions: typing.List[Interaction]
+) -> None:
+    """Save recorded interactions to a cassette file."""
+    with path.open(mode="w") as f:
+        json.dump(
+            {
+                "version": CASSETTE_VERSION,
+                "interactions": [dataclasses.asdict(x) for x in interactions],
+            },
+            f,
+            indent=2,
+        )
+
+
+R = typing.TypeVar("R", bound="RecordingBackend")
+
+
+class RecordingBackend(CommandBackend):
+    """
+    Record the commands executed by another backend to a cassette file.
+
+    The cassette is saved when the backend is closed.
+    """
+
+    interactions: typing.List[Interaction]
+
+    def __init__(
+        self: R,
+        backend: CommandBackend,
+        cassette_path: pathlib.Path,
+        secrets: typing.Iterable[str] = tuple(),
+        allow_short_secrets: bool = False,
+    ) -> None:
+        """
+        Construct ``RecordingBackend`` object.
+
+        Args:
+            backend: Backend executing the recorded commands.
+            cassette_path: Cassette file to save.
+            secrets: Secret text to redact from commands and their output.
+            allow_short_secrets: Record even though secrets shorter than
+                                 ``MINIMUM_SECRET_LENGTH`` cannot be
+                                 redacted.
+
+        Raises:
+            ValueError: If there are secrets too short to be redacted and
+                        they are not allowed.
+        """
+        secrets = list(secrets)
+        if short_secrets(secrets):
+            message = (
+                "secrets shorter than {0} characters cannot be "
+                "redacted".format(MINIMUM_SECRET_LENGTH)
+            )
+            if not allow_short_secrets:
+                raise ValueError(message)
+            log.warning(message)
+
+        self.backend = backend
+        self.cassette_path = cassette_path
+        self.secrets = _secret_values(secrets)
+        self.interactions = list()
+
+        self.__origin: typing.Optional[float] = None
+
+    async def run(self: R, command: CommandArgs) -> CompletedCommand:
+        """Execute a command with the wrapped backend, recording it."""
+        start = time.monotonic()
+        if self.__origin is None:
+            self.__origin = start
+        result = await self.backend.run(command)
+        self.interactions.append(
+            Interaction(
+                command=redact_command(command, self.secrets),
+                returncode=result.returncode,
+                out=_redact_text(
+                    result.out.decode(errors="surrogateescape"), self.secrets
+                ),
+                error=_redact_text(
+                    result.error.decode(errors="surrogateescape"),
+                    self.secrets,
+                ),
+                start_seconds=start - self.__origin,
+                duration_seconds=time.monotonic() - start,
+            )
+        )
+
+        return result
+
+    async def aclose(self: R) -> None:
+        """Save the cassette and close the wrapped backend."""
+        try:
+            save_cassette(self.cassette_path, self.interactions)
+            log.info(
+                "command cassette saved, {0}, {1}".format(
+                    self.cassette_path, len(self.interactions)
+                )
+            )
+        finally:
+            await self.backend.aclose()
+
+
+P = typing.TypeVar("P", bound="ReplayBackend")
+
+
+class ReplayBackend(CommandBackend):
+    """
+    Serve recorded command results from a cassette.
+
+    Commands are matched to recorded interactions by their redacted
+    arguments; repeats of a command, such as status polls, are served in
+    recorded order, repeating the last once exhausted. Commands with no
+    exact match, such as those naming a different pipeline id, are served
+    from interactions with the same command label in recorded order. A
+    command with no match at all fails.
+    """
+
+    def __init__(
+        self: P,
+        interactions: typing.List[Interaction],
+        latency_scale: float = 1.0,
+        secrets: typing.Iterable[str] = tuple(),
+    ) -> None:
+        """
+        Construct ``ReplayBackend`` object.
+
+        Args:
+            interactions: Recorded interactions.
+            latency_scale: Scale applied to the recorded command durations;
+                           zero for no latency.
+            secrets: Secret text to redact from commands before matching.
+        """
+        self.latency_scale = latency_scale
+        self.secrets = _secret_values(list(secrets))
+        # number of commands served and without a recorded interaction.
+        self.served = 0
+        self.unmatched = 0
+
+        self.__exact: typing.Dict[
+            str, typing.Deque[Interaction]
+        ] = collections.defaultdict(collections.deque)
+        self.__by_label: typing.Dict[
+            str, typing.Deque[Interaction]
+        ] = collections.defaultdict(collections.deque)
+        for x in interactions:
+            self.__exact[json.dumps(x.command)].append(x)
+            self.__by_label[command_label(x.command)].append(x)
+
+    @classmethod
+    def from_file(
+        cls: typing.Type[P],
+        cassette_path: pathlib.Path,
+        latency_scale: float = 1.0,
+        secrets: typing.Iterable[str] = tuple(),
+    ) -> P:
+        """Construct a replay backend from a cassette file."""
+        return cls(
+            load_cassette(cassette_path),
+            latency_scale=latency_scale,
+            secrets=secrets,
+        )
+
+    def __next(
+        self: P, queue: typing.Deque[Interaction]
+    ) -> typing.Optional[Interaction]:
+        if not queue:
+            return None
+        elif len(queue) > 1:
+            return queue.popleft()
+
+        return queue[0]
+
+    async def run(self: P, command: CommandArgs) -> CompletedCommand:
+        """Serve the recorded result of a command."""
+        redacted = redact_command(command, self.secrets)
+        this_interaction = self.__next(
+            self.__exact[json.dumps(redacted)]
+        ) or self.__next(self.__by_label[command_label(redacted)])
+        if not this_interaction:
+            self.unmatched += 1
+            log.warning(
+                "no recorded command interaction, {0}".format(
+                    command_label(command)
+                )
+            )
+            return CompletedCommand(
+                returncode=1, out=b"", error=b"no recorded command interaction"
+            )
+
+        self.served += 1
+        if self.latency_scale:
+            await asyncio.sleep(
+                this_interaction.duration_seconds * self.latency_scale
+            )
+
+        return this_interaction.completed()
@@ -14,22 +14,54 @@
 
 """General support for build harness implementation."""
 
+import abc
 import asyncio
+import collections
+import contextlib
 import dataclasses
 import locale
 import logging
+import os
 import pathlib
 import shutil
+import signal
 import subprocess
 import sys
+import threading
 import typing
 
-from ._exceptions import CommandError
+from foodx_devops_tools.profiling import SpanKind, trace_span
+
+from ._exceptions import CommandError, CommandTimeoutError
 
 log = logging.getLogger(__name__)
 
 CommandArgs = typing.List[str]
 
+# time allowed for a terminated process to exit before it is killed.
+TERMINATE_GRACE_SECONDS = 10.0
+
+# command timeouts in seconds, by leading command words; the longest match
+# applies and commands without a match have no timeout. Deployments, their
+# validation and resource group deletion wait for Azure to complete the
+# operation.
+DEFAULT_COMMAND_TIMEOUTS: typing.Dict[str, typing.Optional[float]] = {
+    "ansible-vault": 60.0,
+    "az": 5 * 60.0,
+    "az deployment group create": 60 * 60.0,
+    "az deployment group validate": 60 * 60.0,
+    "az deployment group what-if": 15 * 60.0,
+    "az group delete": 60 * 60.0,
+    "az login": 2 * 60.0,
+}
+
+# size of output excerpts in debug logs.
+DEBUG_EXCERPT_CHARACTERS = 4096
+
+# amount of the end of a streamed error output retained for reporting.
+DEFAULT_ERROR_TAIL_BYTES = 64 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+
 
 @dataclasses.dataclass()
 class CapturedStreams:
@@ -39,6 +71,469 @@ class CapturedStreams:
     error: str
 
 
+@dataclasses.dataclass()
+class CompletedCommand:
+    """Raw result of an external command executed by a command backend."""
+
+    returncode: int
+    out: bytes
+    error: bytes
+
+
+def _signal_process(
+    this_process: asyncio.subprocess.Process, kill: bool
+) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            # signal the process group to include any children of the
+            # process, such as the python interpreter of the ``az`` CLI.
+            os.killpg(
+                this_process.pid, signal.SIGKILL if kill else signal.SIGTERM
+            )
+        elif kill:
+            this_process.kill()
+        else:
+            this_process.terminate()
+    except ProcessLookupError:
+        log.debug("process already exited, {0}".format(this_process.pid))
+
+
+# subprocesses that have not exited; they are started in a new session so
+# they do not receive signals sent to the process group of the utility.
+_live_processes: typing.Set[asyncio.subprocess.Process] = set()
+
+
+async def _start_process(command: CommandArgs) -> asyncio.subprocess.Process:
+    """Start a subprocess in a new session, tracking it until it exits."""
+    this_process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    _live_processes.add(this_process)
+
+    return this_process
+
+
+def signal_live_processes(kill: bool = False) -> None:
+    """
+    Signal the process groups of subprocesses that have not exited.
+
+    Args:
+        kill: Send SIGKILL rather than SIGTERM.
+    """
+    for this_process in list(_live_processes):
+        if this_process.returncode is None:
+            _signal_process(this_process, kill)
+
+
+@contextlib.contextmanager
+def forward_termination_signals() -> typing.Iterator[None]:
+    """
+    Forward SIGINT and SIGTERM to running subprocesses within this context.
+
+    Subprocesses are started in a new session so that they, and any children
+    they start, can be terminated as a group. A signal sent to the process
+    group of the utility, such as SIGINT from a terminal or SIGTERM from a
+    cancelled CI job, is therefore forwarded to them before the previous
+    signal handler is invoked; eg. SIGINT still raises ``KeyboardInterrupt``.
+
+    Signal handlers can only be installed from the main thread; in other
+    threads signals are not forwarded.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    signal_numbers = [signal.SIGINT, signal.SIGTERM]
+    previous_handlers = {x: signal.getsignal(x) for x in signal_numbers}
+
+    def _forward(signal_number: int, frame: typing.Any) -> None:
+        signal_live_processes()
+        previous = previous_handlers[signal.Signals(signal_number)]
+        if callable(previous):
+            previous(signal_number, frame)
+        elif previous != signal.SIG_IGN:
+            # the default action terminates the utility.
+            signal.signal(signal_number, signal.SIG_DFL)
+            os.kill(os.getpid(), signal_number)
+
+    for this_number in signal_numbers:
+        signal.signal(this_number, _forward)
+    try:
+        yield
+    finally:
+        for this_number, this_handler in previous_handlers.items():
+            signal.signal(this_number, this_handler)
+
+
+async def terminate_process(
+    this_process: asyncio.subprocess.Process,
+    grace_seconds: float = TERMINATE_GRACE_SECONDS,
+) -> None:
+    """
+    Terminate a subprocess, killing it if it does not exit promptly.
+
+    Args:
+        this_process: Process to terminate.
+        grace_seconds: Time allowed for the process to exit after SIGTERM,
+                       before SIGKILL.
+    """
+    if this_process.returncode is None:
+        log.debug("terminating process, {0}".format(this_process.pid))
+        _signal_process(this_process, False)
+        try:
+            await asyncio.wait_for(this_process.wait(), timeout=grace_seconds)
+        except asyncio.TimeoutError:
+            log.warning(
+                "killing process that did not terminate, {0}".format(
+                    this_process.pid
+                )
+            )
+            _signal_process(this_process, True)
+            await this_process.wait()
+    if hasattr(os, "killpg"):
+        # children of the process may have survived it, holding its output
+        # pipes open.
+        _signal_process(this_process, True)
+
+
+B = typing.TypeVar("B", bound="CommandBackend")
+
+
+class CommandBackend(abc.ABC):
+    """
+    Execute external commands on behalf of ``run_async_command``.
+
+    The default backend runs commands as subprocesses. Alternative backends,
+    such as a simulation of external utilities for offline load testing, can
+    be installed for the process using ``set_command_backend``.
+    """
+
+    @abc.abstractmethod
+    async def run(self: B, command: CommandArgs) -> CompletedCommand:
+        """
+        Execute a command.
+
+        Args:
+            command: Command and arguments.
+
+        Returns:
+            Exit status and raw output streams of the command.
+        """
+
+    async def aclose(self: B) -> None:
+        """Release any resources, such as connections, held by the backend."""
+
+
+class SubprocessBackend(CommandBackend):
+    """Execute commands as asynchronous subprocesses."""
+
+    async def run(self: B, command: CommandArgs) -> CompletedCommand:
+        """
+        Execute a command as a subprocess.
+
+        The subprocess is started in a new session so that, if the command is
+        cancelled, the process and any children it started can be
+        terminated. Use ``forward_termination_signals`` to also terminate it
+        if the utility is interrupted or terminated.
+
+        Args:
+            command: Command and arguments.
+
+        Returns:
+            Exit status and raw output streams of the subprocess.
+        """
+        this_process = await _start_process(command)
+        try:
+            stdout, stderr = await this_process.communicate()
+        except asyncio.CancelledError:
+            log.warning(
+                "terminating cancelled command, {0}".format(
+                    command_label(command)
+                )
+            )
+            await terminate_process(this_process)
+            raise
+        finally:
+            _live_processes.discard(this_process)
+
+        return CompletedCommand(
+            returncode=typing.cast(int, this_process.returncode),
+            out=stdout,
+            error=stderr,
+        )
+
+
+Q = typing.TypeVar("Q", bound="_LineTail")
+
+
+class _LineTail:
+    """Retain the most recent lines of a stream, up to a total size."""
+
+    def __init__(self: Q, maximum_bytes: int) -> None:
+        self.maximum_bytes = maximum_bytes
+        self.truncated = False
+
+        self.__lines: typing.Deque[bytes] = collections.deque()
+        self.__size = 0
+
+    def append(self: Q, line: bytes) -> None:
+        self.__lines.append(line)
+        self.__size += len(line)
+        while (self.__size > self.maximum_bytes) and (len(self.__lines) > 1):
+            self.__size -= len(self.__lines.popleft())
+            self.truncated = True
+
+    def value(self: Q) -> bytes:
+        content = b"".join(self.__lines)
+        if len(content) > self.maximum_bytes:
+            content = content[-self.maximum_bytes :]
+            self.truncated = True
+
+        return (b"...\n" if self.truncated else b"") + content
+
+
+async def _forward_lines(
+    reader: asyncio.StreamReader, label: str, tail: _LineTail
+) -> None:
+    """Log lines of a stream as they arrive, retaining the most recent."""
+
+    def _emit(line: bytes) -> None:
+        log.debug(
+            "command stderr, {0}, {1}".format(
+                label, line.rstrip(b"\n").decode(errors="replace")
+            )
+        )
+        tail.append(line)
+
+    partial = b""
+    while True:
+        chunk = await reader.read(STREAM_CHUNK_BYTES)
+        if not chunk:
+            break
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for this_line in lines:
+            _emit(this_line + b"\n")
+        if len(partial) > tail.maximum_bytes:
+            # don't accumulate an unterminated line without bound.
+            _emit(partial)
+            partial = b""
+    if partial:
+        _emit(partial)
+
+
+async def _read_all(reader: asyncio.StreamReader) -> bytes:
+    """Read a stream to its end as it arrives."""
+    chunks: typing.List[bytes] = list()
+    while True:
+        chunk = await reader.read(STREAM_CHUNK_BYTES)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+S = typing.TypeVar("S", bound="StreamingSubprocessBackend")
+
+
+class StreamingSubprocessBackend(SubprocessBackend):
+    """
+    Execute commands as asynchronous subprocesses, streaming their output.
+
+    Output pipes are read incrementally rather than buffered in full by
+    ``communicate``. Error output lines are forwarded to the debug log as
+    they arrive and only the end of the error output is retained, so a
+    command with verbose error output does not accumulate it in memory.
+
+    The standard output is returned in full, since callers parse it as a
+    whole; its peak memory use is the same as ``SubprocessBackend``.
+    """
+
+    def __init__(
+        self: S,
+        error_tail_bytes: int = DEFAULT_ERROR_TAIL_BYTES,
+    ) -> None:
+        """
+        Construct ``StreamingSubprocessBackend`` object.
+
+        Args:
+            error_tail_bytes: Amount of the end of the error output retained.
+        """
+        self.error_tail_bytes = error_tail_bytes
+
+    async def run(self: S, command: CommandArgs) -> CompletedCommand:
+        """
+        Execute a command as a subprocess, streaming its output.
+
+        Args:
+            command: Command and arguments.
+
+        Returns:
+            Exit status, output and the end of the error output of the
+            subprocess.
+        """
+        label = command_label(command)
+        this_process = await _start_process(command)
+        error_tail = _LineTail(self.error_tail_bytes)
+        try:
+            stdout, _, _ = await asyncio.gather(
+                _read_all(
+                    typing.cast(asyncio.StreamReader, this_process.stdout)
+                ),
+                _forward_lines(
+                    typing.cast(asyncio.StreamReader, this_process.stderr),
+                    label,
+                    error_tail,
+                ),
+                this_process.wait(),
+            )
+        except asyncio.CancelledError:
+            log.warning("terminating cancelled command, {0}".format(label))
+            await terminate_process(this_process)
+            raise
+        finally:
+            _live_processes.discard(this_process)
+
+        log.debug("command stdout size, {0}, {1}".format(label, len(stdout)))
+
+        return CompletedCommand(
+            returncode=typing.cast(int, this_process.returncode),
+            out=stdout,
+            error=error_tail.value(),
+        )
+
+
+_active_backend: CommandBackend = SubprocessBackend()
+
+
+def get_command_backend() -> CommandBackend:
+    """Get the command backend used by ``run_async_command``."""
+    return _active_backend
+
+
+def set_command_backend(
+    backend: typing.Optional[CommandBackend],
+) -> CommandBackend:
+    """
+    Set the command backend used by ``run_async_command``.
+
+    Args:
+        backend: Command backend to install, or ``None`` to restore the
+                 default subprocess backend.
+
+    Returns:
+        The previously installed command backend.
+    """
+    global _active_backend
+    previous_backend = _active_backend
+    _active_backend = backend if backend else SubprocessBackend()
+
+    return previous_backend
+
+
+_command_timeouts: typing.Dict[
+    str, typing.Optional[float]
+] = DEFAULT_COMMAND_TIMEOUTS.copy()
+_timeout_counts: typing.Counter[str] = collections.Counter()
+
+
+def set_command_timeouts(
+    timeouts: typing.Optional[typing.Dict[str, typing.Optional[float]]],
+) -> typing.Dict[str, typing.Optional[float]]:
+    """
+    Set the timeouts applied to external commands.
+
+    Args:
+        timeouts: Timeouts in seconds, by leading command words, eg.
+                  ``{"az login": 120}``; ``None`` for no timeout. ``None``
+                  restores the default timeouts.
+
+    Returns:
+        The previous timeouts.
+    """
+    global _command_timeouts
+    previous_timeouts = _command_timeouts
+    _command_timeouts = (
+        timeouts.copy()
+        if timeouts is not None
+        else DEFAULT_COMMAND_TIMEOUTS.copy()
+    )
+
+    return previous_timeouts
+
+
+def command_timeout(command: CommandArgs) -> typing.Optional[float]:
+    """
+    Identify the timeout of a command.
+
+    The command name is matched without its path, so that commands
+    detected in a venv match.
+
+    Args:
+        command: Command and arguments.
+
+    Returns:
+        Timeout in seconds, or ``None`` for no timeout.
+    """
+    words = command_label(command).split()
+    if words:
+        words[0] = pathlib.PurePath(words[0]).name
+    for this_length in range(len(words), 0, -1):
+        key = " ".join(words[0:this_length])
+        if key in _command_timeouts:
+            return _command_timeouts[key]
+
+    return None
+
+
+def command_timeout_counts() -> typing.Dict[str, int]:
+    """Get the number of command timeouts, by command label."""
+    return dict(_timeout_counts)
+
+
+def reset_command_timeout_counts() -> None:
+    """Reset the command timeout counts, for a new run."""
+    _timeout_counts.clear()
+
+
+def _record_timeout(command: CommandArgs, timeout: float) -> CommandError:
+    label = command_label(command)
+    _timeout_counts[label] += 1
+    message = "External command timed out, {0}, {1} seconds".format(
+        label, timeout
+    )
+    log.error(message)
+
+    return CommandTimeoutError(message)
+
+
+def command_label(command: CommandArgs, maximum_words: int = 4) -> str:
+    """
+    Construct a short label for a command, suitable for logs and traces.
+
+    Only the leading words preceding any option are used, so that option
+    values such as credentials are never included in the label.
+
+    Args:
+        command: Command and arguments.
+        maximum_words: Maximum number of leading words in the label.
+
+    Returns:
+        Command label.
+    """
+    words: typing.List[str] = list()
+    for x in command[0:maximum_words]:
+        if x.startswith("-"):
+            break
+        words.append(x)
+
+    return " ".join(words)
+
+
 def detect_venv_command(command_name: str) -> pathlib.Path:
     """Detect a command in the same venv as the current utility."""
     venv_path = pathlib.Path(sys.argv[0]).parent.absolute()
@@ -72,17 +567,37 @@ def run_command(
 
     Returns:
         Subprocess results.
+    Raises:
+        CommandTimeoutError: If the command does not complete within its
+                             timeout (see ``set_command_timeouts``).
     """
     if enable_logging:
         # WARNING: logging is _disabled_ by default to prevent "default"
         # leakage of secrets into logs via command arguments
         log.debug("command to run, {0}".format(str(command)))
         log.debug("command arguments, {0}".format(str(kwargs)))
-    result = subprocess.run(command, **kwargs)
+    timeout = command_timeout(command)
+    if (timeout is not None) and ("timeout" not in kwargs):
+        kwargs["timeout"] = timeout
+    try:
+        result = subprocess.run(command, **kwargs)
+    except subprocess.TimeoutExpired as e:
+        # subprocess.run has already killed the process.
+        raise _record_timeout(command, e.timeout) from e
 
     return result
 
 
+def _excerpt(text: str) -> str:
+    """Limit the size of text in debug logs."""
+    if len(text) > DEBUG_EXCERPT_CHARACTERS:
+        return "{0}... ({1} characters)".format(
+            text[0:DEBUG_EXCERPT_CHARACTERS], len(text)
+        )
+
+    return text
+
+
 async def run_async_command(
     command: CommandArgs, enable_logging: bool = False
 ) -> CapturedStreams:
@@ -93,6 +608,9 @@ async def run_async_command(
     credential leakage to logs when commands may necessarily contain
     sensitive data.
 
+    The command is executed by the installed command backend; by default as
+    a subprocess.
+
     Args:
         command: Command to be executed.
         enable_logging: Enable command and argument logging (default disabled)
@@ -101,6 +619,8 @@ async def run_async_command(
         Any output or error streams captured from the process.
     Raises:
         CommandError: if the executed command returns non-zero exit status.
+        CommandTimeoutError: if the executed command does not complete
+                             within its timeout (see ``set_command_timeouts``).
     """
     if enable_logging:
         # WARNING: logging is _disabled_ by default to prevent "default"
@@ -117,22 +637,24 @@ async def run_async_command(
     log.debug(
         "sys.getfilesystemencoding(), {0}".format(sys.getfilesystemencoding())
     )
-    this_process = await asyncio.create_subprocess_exec(
-        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-    )
-
-    stdout, stderr = await this_process.communicate()
-    log.debug(
-        "run_async_command stdout, {0}".format(stdout.decode(this_encoding))
-    )
-    log.debug(
-        "run_async_command stderr, {0}".format(stderr.decode(this_encoding))
-    )
+    timeout = command_timeout(command)
+    with trace_span(command_label(command), SpanKind.command):
+        try:
+            # on timeout the backend run is cancelled, which terminates the
+            # command process.
+            completed = await asyncio.wait_for(
+                _active_backend.run(command), timeout
+            )
+        except asyncio.TimeoutError as e:
+            raise _record_timeout(command, typing.cast(float, timeout)) from e
+    # decode once; output such as deployment data can be large.
     result = CapturedStreams(
-        out=stdout.decode(this_encoding), error=stderr.decode(this_encoding)
+        out=completed.out.decode(this_encoding),
+        error=completed.error.decode(this_encoding),
     )
-    if this_process.returncode != 0:
-        log.debug(f"command std out, {result.out}")
+    log.debug("run_async_command stdout, {0}".format(_excerpt(result.out)))
+    log.debug("run_async_command stderr, {0}".format(_excerpt(result.error)))
+    if completed.returncode != 0:
         raise CommandError(
             "External command run did not exit cleanly, {0}".format(
                 result.error
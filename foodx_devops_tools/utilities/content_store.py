@@ -0,0 +1,147 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Content addressed storage of generated files."""
+
+import logging
+import os
+import pathlib
+import shutil
+import time
+import typing
+import uuid
+
+from foodx_devops_tools.profiling import trace_count
+
+log = logging.getLogger(__name__)
+
+CONTENT_STORE_DIR = ".content"
+
+
+def temporary_path(target_path: pathlib.Path) -> pathlib.Path:
+    """Construct a unique temporary file path alongside a target file."""
+    return target_path.parent / ".{0}.{1}.tmp".format(
+        target_path.name, uuid.uuid4().hex
+    )
+
+
+T = typing.TypeVar("T", bound="ContentStore")
+
+
+class ContentStore:
+    """
+    Store generated files by the hash of their content.
+
+    Target file paths are hard links to the stored content, so a target whose
+    content is unchanged is not rewritten and its modification time is
+    retained. Target files must therefore only be replaced, never modified in
+    place.
+    """
+
+    def __init__(self: T, root: pathlib.Path) -> None:
+        """
+        Construct ``ContentStore`` object.
+
+        Args:
+            root: Directory in which to store content. Created if necessary.
+        """
+        self.root = root
+
+    def object_path(self: T, content_hash: str) -> pathlib.Path:
+        """Path of stored content."""
+        return self.root / content_hash[0:2] / content_hash
+
+    def commit(
+        self: T,
+        source_path: pathlib.Path,
+        target_path: pathlib.Path,
+        content_hash: str,
+    ) -> bool:
+        """
+        Store a generated file and link the target path to it.
+
+        Args:
+            source_path: Generated file, which is consumed.
+            target_path: Path at which the content is required.
+            content_hash: Hash of the generated content.
+
+        Returns:
+            ``True`` if the target path was written, ``False`` if the target
+            already had the content.
+        """
+        object_path = self.object_path(content_hash)
+        if object_path.is_file():
+            source_path.unlink()
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source_path, object_path)
+
+        return self.link(content_hash, target_path)
+
+    def contains(self: T, content_hash: str) -> bool:
+        """Indicate whether content is stored."""
+        return self.object_path(content_hash).is_file()
+
+    def link(self: T, content_hash: str, target_path: pathlib.Path) -> bool:
+        """
+        Link a target path to stored content.
+
+        Args:
+            content_hash: Hash of the stored content.
+            target_path: Path at which the content is required.
+
+        Returns:
+            ``True`` if the target path was written, ``False`` if the target
+            already had the content.
+        """
+        object_path = self.object_path(content_hash)
+        if target_path.is_file() and os.path.samefile(target_path, object_path):
+            log.debug("content unchanged, {0}".format(target_path))
+            trace_count("content unchanged")
+            return False
+
+        link_path = temporary_path(target_path)
+        try:
+            os.link(object_path, link_path)
+        except OSError:
+            # file system does not support hard links.
+            shutil.copyfile(object_path, link_path)
+        os.replace(link_path, target_path)
+        trace_count("content changed")
+
+        return True
+
+    def prune(self: T, minimum_age_seconds: float = 0) -> int:
+        """
+        Delete stored content that no target path links to.
+
+        Content stored by copy, where hard links are unsupported, is never
+        linked and so is also deleted.
+
+        Args:
+            minimum_age_seconds: Minimum age of content, by modification
+                                 time, for deletion.
+
+        Returns:
+            Number of deleted items.
+        """
+        if not self.root.is_dir():
+            return 0
+
+        threshold = time.time() - minimum_age_seconds
+        count = 0
+        for this_path in self.root.glob("*/*"):
+            this_stat = this_path.stat()
+            if (this_stat.st_nlink == 1) and (this_stat.st_mtime < threshold):
+                this_path.unlink()
+                count += 1
+        if count:
+            log.info(
+                "deleted unused content, {0}, {1}".format(self.root, count)
+            )
+
+        return count
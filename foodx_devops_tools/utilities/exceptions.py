@@ -10,5 +10,6 @@
 from ._exceptions import (  # noqa: F401
     AnsibleVaultError,
     CommandError,
+    CommandTimeoutError,
     TemplateError,
 )
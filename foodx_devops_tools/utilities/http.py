@@ -0,0 +1,339 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Minimal asynchronous HTTP/1.1 client with keep-alive connection pooling."""
+
+import asyncio
+import dataclasses
+import json
+import logging
+import ssl
+import typing
+import urllib.parse
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAXIMUM_CONNECTIONS = 8
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 120.0
+
+
+class HttpError(Exception):
+    """Problem occurred with an HTTP exchange."""
+
+
+@dataclasses.dataclass
+class HttpResponse:
+    """Response to an HTTP request."""
+
+    status: int
+    # header names are lower case.
+    headers: typing.Dict[str, str]
+    body: bytes
+
+    @property
+    def ok(self: "HttpResponse") -> bool:
+        """Indicate a successful (2xx) response."""
+        return 200 <= self.status < 300
+
+    def json(self: "HttpResponse") -> typing.Any:
+        """Parse the response body as JSON; ``None`` if the body is empty."""
+        return json.loads(self.body) if self.body else None
+
+
+_Connection = typing.Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+T = typing.TypeVar("T", bound="HttpConnectionPool")
+
+
+class HttpConnectionPool:
+    """
+    Pool of keep-alive HTTP/1.1 connections to a single origin.
+
+    Connections are opened on demand up to a maximum, reused while the server
+    keeps them alive and closed by ``close``.
+    """
+
+    __idle: typing.List[_Connection]
+    __limit: typing.Optional[asyncio.Semaphore]
+
+    def __init__(
+        self: T,
+        origin: str,
+        maximum_connections: int = DEFAULT_MAXIMUM_CONNECTIONS,
+        timeout_seconds: float = DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    ) -> None:
+        """
+        Construct ``HttpConnectionPool`` object.
+
+        Args:
+            origin: Scheme, host and optional port, eg.
+                    ``https://management.azure.com``.
+            maximum_connections: Maximum number of concurrent connections.
+            timeout_seconds: Maximum time for a single request.
+        """
+        parsed = urllib.parse.urlsplit(origin)
+        if parsed.scheme not in ["http", "https"]:
+            raise HttpError("Unsupported URL scheme, {0}".format(origin))
+        self.host = typing.cast(str, parsed.hostname)
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.use_ssl = parsed.scheme == "https"
+        self.maximum_connections = maximum_connections
+        self.timeout_seconds = timeout_seconds
+        # number of connections opened over the life of the pool.
+        self.connections_opened = 0
+
+        self.__idle = list()
+        # asyncio primitives are bound to an event loop on creation, so
+        # defer creation to first use within the loop.
+        self.__limit = None
+
+    async def request(
+        self: T,
+        method: str,
+        target: str,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        body: typing.Optional[bytes] = None,
+    ) -> HttpResponse:
+        """
+        Send a request and read the response.
+
+        Args:
+            method: HTTP method.
+            target: Request path and query.
+            headers: Additional request headers.
+            body: Request body.
+
+        Returns:
+            Response.
+        Raises:
+            HttpError: If the exchange failed.
+        """
+        if not self.__limit:
+            self.__limit = asyncio.Semaphore(self.maximum_connections)
+        async with self.__limit:
+            try:
+                return await asyncio.wait_for(
+                    self.__exchange(method, target, headers, body),
+                    timeout=self.timeout_seconds,
+                )
+            except asyncio.TimeoutError as e:
+                raise HttpError(
+                    "HTTP request timed out, {0} {1}:{2}".format(
+                        method, self.host, self.port
+                    )
+                ) from e
+
+    async def close(self: T) -> None:
+        """Close idle connections."""
+        while self.__idle:
+            _, writer = self.__idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+    async def __exchange(
+        self: T,
+        method: str,
+        target: str,
+        headers: typing.Optional[typing.Dict[str, str]],
+        body: typing.Optional[bytes],
+    ) -> HttpResponse:
+        reused = bool(self.__idle)
+        reader, writer = self.__idle.pop() if reused else await self.__open()
+        try:
+            response, keep_alive = await self.__send(
+                reader, writer, method, target, headers, body
+            )
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            writer.close()
+            if not reused:
+                raise HttpError(
+                    "HTTP connection failed, {0}:{1}, {2}".format(
+                        self.host, self.port, str(e)
+                    )
+                ) from e
+            # the server may have closed an idle connection; retry once on
+            # a new connection.
+            log.debug(
+                "retrying request on new connection, {0}:{1}".format(
+                    self.host, self.port
+                )
+            )
+            return await self.__exchange(method, target, headers, body)
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive:
+            self.__idle.append((reader, writer))
+        else:
+            writer.close()
+
+        return response
+
+    async def __open(self: T) -> _Connection:
+        self.connections_opened += 1
+        log.debug(
+            "opening HTTP connection, {0}:{1}".format(self.host, self.port)
+        )
+        try:
+            return await asyncio.open_connection(
+                self.host,
+                self.port,
+                ssl=ssl.create_default_context() if self.use_ssl else None,
+            )
+        except OSError as e:
+            raise HttpError(
+                "HTTP connection failed, {0}:{1}, {2}".format(
+                    self.host, self.port, str(e)
+                )
+            ) from e
+
+    async def __send(
+        self: T,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        headers: typing.Optional[typing.Dict[str, str]],
+        body: typing.Optional[bytes],
+    ) -> typing.Tuple[HttpResponse, bool]:
+        this_body = body if body is not None else b""
+        request_headers = {
+            "Host": (
+                self.host
+                if self.port in [80, 443]
+                else "{0}:{1}".format(self.host, self.port)
+            ),
+            "Connection": "keep-alive",
+            "Content-Length": str(len(this_body)),
+        }
+        if headers:
+            request_headers.update(headers)
+        lines = ["{0} {1} HTTP/1.1".format(method, target)] + [
+            "{0}: {1}".format(k, v) for k, v in request_headers.items()
+        ]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + this_body)
+        await writer.drain()
+
+        status_line = await reader.readuntil(b"\r\n")
+        version, status, _ = (
+            status_line.decode("latin-1").split(" ", 2) + [""]
+        )[0:3]
+        response_headers: typing.Dict[str, str] = dict()
+        while True:
+            this_line = (await reader.readuntil(b"\r\n")).decode("latin-1")
+            if this_line == "\r\n":
+                break
+            name, _, value = this_line.partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (version == "HTTP/1.1") and (
+            response_headers.get("connection", "").lower() != "close"
+        )
+        if (
+            method == "HEAD"
+            or status.startswith("1")
+            or status in ["204", "304"]
+        ):
+            response_body = b""
+        elif "chunked" in response_headers.get("transfer-encoding", ""):
+            response_body = await _read_chunked(reader)
+        elif "content-length" in response_headers:
+            response_body = await reader.readexactly(
+                int(response_headers["content-length"])
+            )
+        else:
+            response_body = await reader.read()
+            keep_alive = False
+
+        return (
+            HttpResponse(
+                status=int(status), headers=response_headers, body=response_body
+            ),
+            keep_alive,
+        )
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = list()
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0], 16)
+        if size == 0:
+            # discard any trailers.
+            while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                pass
+            break
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+    return b"".join(chunks)
+
+
+P = typing.TypeVar("P", bound="HttpSession")
+
+
+class HttpSession:
+    """Connection pools for requests to any number of origins."""
+
+    __pools: typing.Dict[str, HttpConnectionPool]
+
+    def __init__(
+        self: P, maximum_connections: int = DEFAULT_MAXIMUM_CONNECTIONS
+    ) -> None:
+        """
+        Construct ``HttpSession`` object.
+
+        Args:
+            maximum_connections: Maximum concurrent connections per origin.
+        """
+        self.maximum_connections = maximum_connections
+        self.__pools = dict()
+
+    @property
+    def connections_opened(self: P) -> int:
+        """Number of connections opened over the life of the session."""
+        return sum(x.connections_opened for x in self.__pools.values())
+
+    async def request(
+        self: P,
+        method: str,
+        url: str,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        body: typing.Optional[bytes] = None,
+    ) -> HttpResponse:
+        """
+        Send a request to an absolute URL.
+
+        Args:
+            method: HTTP method.
+            url: Absolute request URL.
+            headers: Additional request headers.
+            body: Request body.
+
+        Returns:
+            Response.
+        """
+        parsed = urllib.parse.urlsplit(url)
+        origin = "{0}://{1}".format(parsed.scheme, parsed.netloc)
+        if origin not in self.__pools:
+            self.__pools[origin] = HttpConnectionPool(
+                origin, maximum_connections=self.maximum_connections
+            )
+        target = parsed.path or "/"
+        if parsed.query:
+            target += "?" + parsed.query
+
+        return await self.__pools[origin].request(method, target, headers, body)
+
+    async def close(self: P) -> None:
+        """Close idle connections of all pools."""
+        for this_pool in self.__pools.values():
+            await this_pool.close()
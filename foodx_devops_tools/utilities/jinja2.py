@@ -7,14 +7,191 @@
 
 """Jinja2 template application."""
 
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import logging
+import os
 import pathlib
+import threading
 import typing
 
-import aiofiles
 import jinja2
 
+from foodx_devops_tools.profiling import trace_count
+
+from .content_store import ContentStore, temporary_path
+from .template_inputs import analyze_template
+
+log = logging.getLogger(__name__)
+
 TemplateParameters = typing.Dict[str, typing.Any]
 
+BYTECODE_CACHE_DIR = ".jinja2_cache"
+DEFAULT_ENVIRONMENT_CACHE_SIZE = 64
+DEFAULT_RENDER_CACHE_SIZE = 1024
+DEFAULT_RENDER_WORKERS = 4
+DEFAULT_TEMPLATE_CACHE_SIZE = 128
+
+_render_executor: typing.Optional[concurrent.futures.Executor] = None
+
+
+def get_render_executor() -> typing.Optional[concurrent.futures.Executor]:
+    """
+    Get the executor used to render template files.
+
+    Returns:
+        The render executor, or ``None`` if templates are rendered in the
+        event loop.
+    """
+    return _render_executor
+
+
+def set_render_executor(
+    executor: typing.Optional[concurrent.futures.Executor],
+) -> typing.Optional[concurrent.futures.Executor]:
+    """
+    Set the executor used to render template files.
+
+    Jinja2 environments and compiled templates cannot be pickled, so the
+    executor must run in process, eg. ``ThreadPoolExecutor``.
+
+    Args:
+        executor: Executor to install, or ``None`` to render templates in the
+                  event loop.
+
+    Returns:
+        The previously installed executor.
+    """
+    global _render_executor
+    previous_executor = _render_executor
+    _render_executor = executor
+
+    return previous_executor
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode(errors="surrogateescape")).hexdigest()
+
+
+class _ContentCheckedLoader(jinja2.FileSystemLoader):
+    """
+    File system template loader that also checks template content.
+
+    Generated templates, such as puff parameter files, may be rewritten with
+    an unchanged modification time on file systems with a coarse timestamp
+    resolution, so a cached template is only reused if its content is also
+    unchanged.
+    """
+
+    def get_source(
+        self, environment: jinja2.Environment, template: str
+    ) -> typing.Tuple[str, str, typing.Callable[[], bool]]:
+        """Load template source, with an up to date check of its content."""
+        contents, filename, mtime_uptodate = super().get_source(
+            environment, template
+        )
+        content_hash = _content_hash(contents)
+
+        def uptodate() -> bool:
+            try:
+                with open(filename, encoding=self.encoding) as f:
+                    return mtime_uptodate() and (
+                        _content_hash(f.read()) == content_hash
+                    )
+            except OSError:
+                return False
+
+        return contents, filename, uptodate
+
+
+def _commit(
+    source_path: pathlib.Path,
+    target_path: pathlib.Path,
+    content_hash: str,
+    content_store: typing.Optional[ContentStore],
+) -> None:
+    """Move rendered content into place."""
+    if content_store:
+        content_store.commit(source_path, target_path, content_hash)
+    else:
+        os.replace(source_path, target_path)
+
+
+R = typing.TypeVar("R", bound="RenderedContentCache")
+
+
+class RenderedContentCache:
+    """
+    Least recently used cache of rendered content hashes by render key.
+
+    Shared by the threads of the render executor.
+    """
+
+    __hashes: "collections.OrderedDict[str, str]"
+
+    def __init__(
+        self: R, maximum_size: int = DEFAULT_RENDER_CACHE_SIZE
+    ) -> None:
+        """
+        Construct ``RenderedContentCache`` object.
+
+        Args:
+            maximum_size: Maximum number of rendered content hashes retained.
+        """
+        self.maximum_size = maximum_size
+        self.hits = 0
+        self.misses = 0
+
+        self.__hashes = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self: R) -> int:
+        """Get the number of cached content hashes."""
+        return len(self.__hashes)
+
+    def get(self: R, render_key: str) -> typing.Optional[str]:
+        """Get the content hash of a render, if cached."""
+        with self.__lock:
+            content_hash = self.__hashes.get(render_key)
+            if content_hash:
+                self.hits += 1
+                self.__hashes.move_to_end(render_key)
+            else:
+                self.misses += 1
+
+        trace_count(
+            "render cache {0}".format("hit" if content_hash else "miss")
+        )
+        return content_hash
+
+    def put(self: R, render_key: str, content_hash: str) -> None:
+        """Cache the content hash of a render."""
+        with self.__lock:
+            self.__hashes[render_key] = content_hash
+            self.__hashes.move_to_end(render_key)
+            if len(self.__hashes) > self.maximum_size:
+                self.__hashes.popitem(last=False)
+
+    def clear(self: R) -> None:
+        """Discard cached content hashes and reset the hit and miss counts."""
+        with self.__lock:
+            self.__hashes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_rendered_content = RenderedContentCache()
+
+
+def get_rendered_content_cache() -> RenderedContentCache:
+    """Get the process-wide cache of rendered content hashes."""
+    return _rendered_content
+
+
 T = typing.TypeVar("T", bound="FrameTemplates")
 
 
@@ -24,37 +201,264 @@ class FrameTemplates:
     environment: jinja2.Environment
 
     def __init__(
-        self: T, template_search_paths: typing.List[pathlib.Path]
+        self: T,
+        template_search_paths: typing.List[pathlib.Path],
+        bytecode_cache_dir: typing.Optional[pathlib.Path] = None,
     ) -> None:
         """
         Construct ``FrameTemplates`` object.
 
         Args:
             template_search_paths: Directory paths where templates may be found.
+            bytecode_cache_dir: Directory to cache compiled templates in, for
+                                reuse across runs. Created if necessary.
         """
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(
+                str(bytecode_cache_dir)
+            )
         self.environment = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(template_search_paths),
+            loader=_ContentCheckedLoader(template_search_paths),
             autoescape=jinja2.select_autoescape(),
+            bytecode_cache=bytecode_cache,
         )
 
+    def __reuse_render(
+        self: T,
+        source_template: str,
+        target_path: pathlib.Path,
+        parameters: TemplateParameters,
+        content_store: typing.Optional[ContentStore],
+    ) -> typing.Tuple[typing.Optional[str], typing.Optional[str]]:
+        """
+        Link the target file to stored content of an identical render.
+
+        Returns:
+            Render key, if the render can be cached, and the hash of the
+            reused content, if any.
+        """
+        if not content_store:
+            return None, None
+        inputs = analyze_template(self.environment, source_template)
+        if not inputs:
+            return None, None
+
+        render_key = inputs.key(parameters)
+        content_hash = _rendered_content.get(render_key)
+        if content_hash and content_store.contains(content_hash):
+            log.debug(
+                "reusing rendered content, {0}, {1}".format(
+                    source_template, target_path
+                )
+            )
+            content_store.link(content_hash, target_path)
+            return render_key, content_hash
+
+        return render_key, None
+
+    def __render_to_file(
+        self: T,
+        source_template: str,
+        target_path: pathlib.Path,
+        parameters: TemplateParameters,
+        content_store: typing.Optional[ContentStore],
+    ) -> str:
+        render_key, content_hash = self.__reuse_render(
+            source_template, target_path, parameters, content_store
+        )
+        if content_hash:
+            return content_hash
+
+        template = self.environment.get_template(source_template)
+        this_path = temporary_path(target_path)
+        hasher = hashlib.sha256()
+        try:
+            with this_path.open(mode="w") as f:
+                for chunk in template.generate(**parameters):
+                    f.write(chunk)
+                    hasher.update(chunk.encode(errors="surrogateescape"))
+            content_hash = hasher.hexdigest()
+            _commit(this_path, target_path, content_hash, content_store)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                this_path.unlink()
+            raise
+
+        if render_key:
+            _rendered_content.put(render_key, content_hash)
+        return content_hash
+
     async def apply_template(
         self: T,
         source_template: str,
         target_path: pathlib.Path,
         parameters: TemplateParameters,
-    ) -> None:
+        content_store: typing.Optional[ContentStore] = None,
+    ) -> str:
         """
         Apply jinja2 template to a target file.
 
+        The template is rendered incrementally to a temporary file that
+        replaces the target file once complete, so the rendered content is
+        never held in memory and the target file is never partially written.
+
+        With a content store, a render is identified by the template sources
+        and the values of only those parameters the templates read; a render
+        identical to an earlier one reuses its stored content without
+        rendering, eg. for deployment iterations differing only in unrelated
+        parameters.
+
         Args:
             source_template: Name of jinja2 template.
             target_path: Target fulfilled file.
             parameters: Parameters to be consumed by the template.
+            content_store: Store the rendered content by its hash; the target
+                           file is not rewritten if its content is
+                           unchanged.
+
+        Returns:
+            Hash of the rendered content.
         """
-        template = self.environment.get_template(source_template)
-        content = template.render(**parameters)
-        async with aiofiles.open(target_path, mode="w") as f:
-            await f.write(content)
+        if _render_executor:
+            # loading, compiling and rendering large templates is CPU bound
+            # and would otherwise block every other coroutine.
+            return await asyncio.get_running_loop().run_in_executor(
+                _render_executor,
+                functools.partial(
+                    self.__render_to_file,
+                    source_template,
+                    target_path,
+                    parameters,
+                    content_store,
+                ),
+            )
+
+        return self.__render_to_file(
+            source_template, target_path, parameters, content_store
+        )
+
+
+_FrameTemplatesKey = typing.Tuple[
+    typing.Tuple[pathlib.Path, ...], typing.Optional[pathlib.Path]
+]
+
+_frame_templates: "collections.OrderedDict[_FrameTemplatesKey, FrameTemplates]"
+_frame_templates = collections.OrderedDict()
+
+
+def get_frame_templates(
+    template_search_paths: typing.List[pathlib.Path],
+    bytecode_cache_dir: typing.Optional[pathlib.Path] = None,
+) -> FrameTemplates:
+    """
+    Get the shared template environment for template search paths.
+
+    The most recently used environments are cached for the life of the
+    process, so each template is loaded and compiled once for all the
+    deployment steps and iterations that use it; templates modified on disk
+    are reloaded.
+
+    Args:
+        template_search_paths: Directory paths where templates may be found.
+        bytecode_cache_dir: Directory to cache compiled templates in, for
+                            reuse across runs.
+
+    Returns:
+        Template environment.
+    """
+    key = (
+        tuple(x.resolve() for x in template_search_paths),
+        bytecode_cache_dir.resolve() if bytecode_cache_dir else None,
+    )
+    if key in _frame_templates:
+        _frame_templates.move_to_end(key)
+    else:
+        log.debug("new template environment, {0}".format(key))
+        _frame_templates[key] = FrameTemplates(
+            template_search_paths, bytecode_cache_dir
+        )
+        # each iteration working directory is a distinct search path, so
+        # environments are bounded; the bytecode cache avoids recompiling
+        # the templates of an evicted environment.
+        if len(_frame_templates) > DEFAULT_ENVIRONMENT_CACHE_SIZE:
+            _frame_templates.popitem(last=False)
+
+    return _frame_templates[key]
+
+
+def reset_frame_templates() -> None:
+    """Discard the shared template environments."""
+    _frame_templates.clear()
+
+
+C = typing.TypeVar("C", bound="CompiledTemplateCache")
+
+
+class CompiledTemplateCache:
+    """Least recently used cache of compiled template text."""
+
+    __templates: "collections.OrderedDict[str, jinja2.Template]"
+
+    def __init__(
+        self: C, maximum_size: int = DEFAULT_TEMPLATE_CACHE_SIZE
+    ) -> None:
+        """
+        Construct ``CompiledTemplateCache`` object.
+
+        Args:
+            maximum_size: Maximum number of compiled templates retained.
+        """
+        self.maximum_size = maximum_size
+        self.hits = 0
+        self.misses = 0
+
+        self.__templates = collections.OrderedDict()
+
+    def __len__(self: C) -> int:
+        """Get the number of cached templates."""
+        return len(self.__templates)
+
+    def get(self: C, source_template: str) -> jinja2.Template:
+        """
+        Get the compiled template of template text, compiling it if necessary.
+
+        Args:
+            source_template: Template text.
+
+        Returns:
+            Compiled template.
+        """
+        key = _content_hash(source_template)
+        if key in self.__templates:
+            self.hits += 1
+            trace_count("template cache hit")
+            self.__templates.move_to_end(key)
+            return self.__templates[key]
+
+        self.misses += 1
+        trace_count("template cache miss")
+        template = jinja2.Template(source_template)
+        self.__templates[key] = template
+        if len(self.__templates) > self.maximum_size:
+            self.__templates.popitem(last=False)
+
+        return template
+
+    def clear(self: C) -> None:
+        """Discard cached templates and reset the hit and miss counts."""
+        self.__templates.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_compiled_templates = CompiledTemplateCache()
+
+
+def get_compiled_template_cache() -> CompiledTemplateCache:
+    """Get the process-wide cache of compiled template text."""
+    return _compiled_templates
 
 
 def apply_dynamic_template(
@@ -71,7 +475,7 @@ def apply_dynamic_template(
     Returns:
         Text result of template processing.
     """
-    template = jinja2.Template(source_template)
+    template = _compiled_templates.get(source_template)
     content = template.render(**parameters)
 
     return content
@@ -0,0 +1,255 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Analysis of the template parameters read by jinja2 templates."""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import typing
+
+import jinja2
+import jinja2.meta
+import jinja2.nodes
+
+log = logging.getLogger(__name__)
+
+ContextPath = typing.Tuple[typing.Union[str, int], ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class _SourceAnalysis:
+    paths: typing.FrozenSet[ContextPath]
+    # ``None`` if any referenced template name is only known at render time.
+    referenced: typing.Optional[typing.FrozenSet[str]]
+
+
+# analyses by template source hash; template source is immutable for a hash.
+_source_analyses: typing.Dict[str, _SourceAnalysis] = dict()
+
+
+def _source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode(errors="surrogateescape")).hexdigest()
+
+
+def _context_path(
+    node: jinja2.nodes.Node, names: typing.Set[str]
+) -> typing.Optional[ContextPath]:
+    """Construct the parameter path of a chain of attribute/item accesses."""
+    if isinstance(node, jinja2.nodes.Name):
+        if (node.ctx == "load") and (node.name in names):
+            return (node.name,)
+    elif isinstance(node, jinja2.nodes.Getattr):
+        parent = _context_path(node.node, names)
+        if parent is not None:
+            return parent + (node.attr,)
+    elif (
+        isinstance(node, jinja2.nodes.Getitem)
+        and isinstance(node.arg, jinja2.nodes.Const)
+        and isinstance(node.arg.value, (str, int))
+    ):
+        parent = _context_path(node.node, names)
+        if parent is not None:
+            return parent + (node.arg.value,)
+
+    return None
+
+
+def _collect_paths(
+    node: jinja2.nodes.Node,
+    names: typing.Set[str],
+    paths: typing.Set[ContextPath],
+) -> None:
+    this_path = _context_path(node, names)
+    if this_path is not None:
+        paths.add(this_path)
+    elif isinstance(node, jinja2.nodes.Call) and isinstance(
+        node.node, jinja2.nodes.Getattr
+    ):
+        # a method call, such as ``x.items()``, reads the whole object.
+        _collect_paths(node.node.node, names, paths)
+        arguments: typing.List[typing.Optional[jinja2.nodes.Node]] = [
+            *node.args,
+            *node.kwargs,
+            node.dyn_args,
+            node.dyn_kwargs,
+        ]
+        for this_argument in arguments:
+            if this_argument is not None:
+                _collect_paths(this_argument, names, paths)
+    else:
+        for this_child in node.iter_child_nodes():
+            _collect_paths(this_child, names, paths)
+
+
+def find_context_paths(
+    ast: jinja2.nodes.Template,
+) -> typing.Set[ContextPath]:
+    """
+    Find the template parameter paths read by a parsed template.
+
+    A path is the chain of constant attribute and item names applied to a
+    template parameter, eg. ``{{ context.network.fqdns["a1"] }}`` reads
+    ``("context", "network", "fqdns", "a1")``. An access that is not a
+    constant chain, such as a method call or a variable item, reads the
+    whole object it is applied to.
+
+    Args:
+        ast: Parsed template.
+
+    Returns:
+        Parameter paths.
+    """
+    names = jinja2.meta.find_undeclared_variables(ast)
+    paths: typing.Set[ContextPath] = set()
+    _collect_paths(ast, names, paths)
+
+    return paths
+
+
+def _analyze_source(
+    environment: jinja2.Environment, source: str, source_hash: str
+) -> _SourceAnalysis:
+    if source_hash not in _source_analyses:
+        ast = environment.parse(source)
+        referenced = list(jinja2.meta.find_referenced_templates(ast))
+        _source_analyses[source_hash] = _SourceAnalysis(
+            paths=frozenset(find_context_paths(ast)),
+            referenced=(
+                None
+                if any(x is None for x in referenced)
+                else frozenset(typing.cast(typing.List[str], referenced))
+            ),
+        )
+
+    return _source_analyses[source_hash]
+
+
+def _resolve(
+    parameters: typing.Mapping[str, typing.Any], path: ContextPath
+) -> typing.Tuple[ContextPath, typing.Any]:
+    """
+    Resolve a parameter path to the value read by a template.
+
+    A path that cannot be followed, such as a method name or a missing key,
+    resolves to the whole object at the longest resolvable prefix.
+    """
+    value: typing.Any = parameters
+    for index, this_key in enumerate(path):
+        if isinstance(value, typing.Mapping) and (this_key in value):
+            value = value[this_key]
+        elif (
+            isinstance(value, (list, tuple))
+            and isinstance(this_key, int)
+            and (-len(value) <= this_key < len(value))
+        ):
+            value = value[this_key]
+        else:
+            return path[0:index], value
+
+    return path, value
+
+
+U = typing.TypeVar("U", bound="TemplateInputs")
+
+
+@dataclasses.dataclass(frozen=True)
+class TemplateInputs:
+    """The inputs of a template render."""
+
+    # hash of the template source, and the sources of the templates it
+    # references.
+    source_hash: str
+    paths: typing.FrozenSet[ContextPath]
+
+    def key(self: U, parameters: typing.Mapping[str, typing.Any]) -> str:
+        """
+        Construct a key identifying the render of the template.
+
+        The key depends only on the template sources and the parameter values
+        read by the templates, so renders with different values of other
+        parameters share a key.
+
+        Args:
+            parameters: Parameters to be consumed by the template.
+
+        Returns:
+            Render key.
+        """
+        values: typing.Dict[str, typing.Any] = dict()
+        undefined: typing.Set[str] = set()
+        for this_path in self.paths:
+            resolved_path, value = _resolve(parameters, this_path)
+            if resolved_path:
+                values[json.dumps(resolved_path)] = value
+            else:
+                # an undefined top level parameter, or template global.
+                undefined.add(json.dumps(this_path[0:1]))
+        data = json.dumps(
+            {
+                "source": self.source_hash,
+                "undefined": sorted(undefined),
+                "values": values,
+            },
+            default=str,
+            sort_keys=True,
+        )
+
+        return _source_hash(data)
+
+
+def analyze_template(
+    environment: jinja2.Environment, template_name: str
+) -> typing.Optional[TemplateInputs]:
+    """
+    Identify the inputs of a template, including the templates it references.
+
+    Templates are assumed not to use context functions that read template
+    parameters other than by name.
+
+    Args:
+        environment: Environment loading the template.
+        template_name: Name of the template.
+
+    Returns:
+        Template inputs, or ``None`` if they cannot be identified, such as if
+        a referenced template is only known at render time.
+    """
+    if not environment.loader:
+        return None
+
+    source_hashes: typing.Dict[str, str] = dict()
+    paths: typing.Set[ContextPath] = set()
+    pending = [template_name]
+    try:
+        while pending:
+            this_name = pending.pop()
+            if this_name in source_hashes:
+                continue
+
+            source, _, _ = environment.loader.get_source(environment, this_name)
+            source_hashes[this_name] = _source_hash(source)
+            analysis = _analyze_source(
+                environment, source, source_hashes[this_name]
+            )
+            if analysis.referenced is None:
+                log.debug(
+                    "template has dynamic references, {0}".format(this_name)
+                )
+                return None
+            paths |= analysis.paths
+            pending.extend(analysis.referenced)
+    except jinja2.TemplateError as e:
+        # leave rendering to report the error.
+        log.debug("template analysis failed, {0}, {1}".format(this_name, e))
+        return None
+
+    return TemplateInputs(
+        source_hash=_source_hash(json.dumps(source_hashes, sort_keys=True)),
+        paths=frozenset(paths),
+    )
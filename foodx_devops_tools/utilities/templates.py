@@ -11,13 +11,21 @@ import asyncio
 import dataclasses
 import logging
 import pathlib
+import typing
 
 import pydantic
 
+from foodx_devops_tools.profiling import SpanKind, trace_span
 from foodx_devops_tools.puff import run_puff
+from foodx_devops_tools.utilities.content_store import (
+    CONTENT_STORE_DIR,
+    ContentStore,
+)
 from foodx_devops_tools.utilities.jinja2 import (
+    BYTECODE_CACHE_DIR,
     FrameTemplates,
     TemplateParameters,
+    get_frame_templates,
 )
 
 from ._exceptions import TemplateError
@@ -40,6 +48,9 @@ class TemplateFiles:
 
     arm_template: TemplatePaths
     arm_template_parameters: TemplatePaths
+    # directory of caches shared by working directories; defaults to the
+    # working directory.
+    cache_dir: typing.Optional[pathlib.Path] = None
 
 
 @dataclasses.dataclass
@@ -48,6 +59,38 @@ class ArmTemplateDeploymentFiles:
 
     arm_template: pathlib.Path
     parameters: pathlib.Path
+    # content hashes of the rendered files.
+    arm_template_hash: typing.Optional[str] = None
+    parameters_hash: typing.Optional[str] = None
+
+
+_deployment_files: typing.Dict[str, ArmTemplateDeploymentFiles] = dict()
+
+
+def record_deployment_files(
+    step_context: str, deployment_files: ArmTemplateDeploymentFiles
+) -> None:
+    """Record the rendered deployment files of a deployment step iteration."""
+    _deployment_files[step_context] = deployment_files
+
+
+def deployment_files() -> typing.Dict[str, ArmTemplateDeploymentFiles]:
+    """
+    Get the rendered deployment files of the run.
+
+    Downstream caching, such as skipping unchanged deployments, can use the
+    content hashes to identify deployment step iterations whose inputs are
+    unchanged.
+
+    Returns:
+        Deployment files, by deployment step iteration context.
+    """
+    return dict(_deployment_files)
+
+
+def reset_deployment_files() -> None:
+    """Discard the recorded deployment files of a previous run."""
+    _deployment_files.clear()
 
 
 def json_inlining(content: str) -> str:
@@ -74,7 +117,8 @@ async def _apply_template(
     source_file: pathlib.Path,
     target_file: pathlib.Path,
     parameters: TemplateParameters,
-) -> None:
+    content_store: typing.Optional[ContentStore] = None,
+) -> str:
     """
     Apply frame-specific template and parameters ready for deployment.
 
@@ -84,17 +128,24 @@ async def _apply_template(
         target_directory:       Target directory in which to store fulfilled
                                 template file.
         parameters:             Parameter to apply to the template file.
+        content_store:          Store of rendered content.
 
     Returns:
-        Target file path of the fulfilled template.
+        Content hash of the fulfilled template.
     """
     log.debug(
         "Applying jinja2 templating, {0} (source), "
         "{1} (destination)".format(source_file, target_file)
     )
-    await template_environment.apply_template(
-        source_file.name, target_file, parameters
-    )
+    with trace_span(
+        "jinja2 render", SpanKind.template, source=str(source_file)
+    ):
+        return await template_environment.apply_template(
+            source_file.name,
+            target_file,
+            parameters,
+            content_store=content_store,
+        )
 
 
 def _verify_puff_target(file_path: pathlib.Path) -> None:
@@ -201,41 +252,52 @@ async def prepare_deployment_files(
         else [arm_source.parent]
     )
     log.debug(f"frame template paths, {template_paths}")
-    template_environment = FrameTemplates(template_paths)
-    template_environment.environment.filters["json_inlining"] = json_inlining
 
     await _prepare_working_directory(parameters_target.parent)
     if parameters_target.parent != arm_target.parent:
         # also prepare the distinct arm target directory
         await _prepare_working_directory(arm_target.parent)
 
-    # transform the puff file to arm template parameter json files.
-    await run_puff(
-        parameters_source,
-        False,
-        False,
-        disable_ascii_art=True,
-        output_dir=puffd_parameters_target.parent,
+    cache_dir = template_files.cache_dir or parameters_target.parent
+    template_environment = get_frame_templates(
+        template_paths, cache_dir / BYTECODE_CACHE_DIR
     )
+    template_environment.environment.filters["json_inlining"] = json_inlining
+
+    # transform the puff file to arm template parameter json files.
+    with trace_span("puff", SpanKind.puff, source=str(parameters_source)):
+        await run_puff(
+            parameters_source,
+            False,
+            False,
+            disable_ascii_art=True,
+            output_dir=puffd_parameters_target.parent,
+        )
     _verify_puff_target(puffd_parameters_target)
 
-    # now process jinja2 templates against JSON files.
-    await asyncio.gather(
+    # now process jinja2 templates against JSON files, skipping the write of
+    # unchanged content.
+    content_store = ContentStore(cache_dir / CONTENT_STORE_DIR)
+    parameters_hash, arm_template_hash = await asyncio.gather(
         _apply_template(
             template_environment,
             puffd_parameters_target,
             parameters_target,
             parameters,
+            content_store,
         ),
         _apply_template(
             template_environment,
             arm_source,
             arm_target,
             parameters,
+            content_store,
         ),
     )
     result = ArmTemplateDeploymentFiles(
         arm_template=arm_target,
         parameters=parameters_target,
+        arm_template_hash=arm_template_hash,
+        parameters_hash=parameters_hash,
     )
     return result
@@ -0,0 +1,131 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Naming and retention of deployment iteration working directories."""
+
+import hashlib
+import json
+import logging
+import pathlib
+import re
+import shutil
+import time
+import typing
+
+from .content_store import CONTENT_STORE_DIR, ContentStore
+from .jinja2 import BYTECODE_CACHE_DIR, TemplateParameters
+
+log = logging.getLogger(__name__)
+
+DEFAULT_WORKING_RETENTION_HOURS = 24
+WORKING_DIR = "working"
+WORKING_NAME_PREFIX = "w-"
+WORKING_NAME_HASH_CHARACTERS = 16
+
+# the constant working directory name of earlier releases is also pruned.
+WORKING_NAME_PATTERN = re.compile(
+    r"^(?:w|{0}[0-9a-f]{{{1}}})$".format(
+        re.escape(WORKING_NAME_PREFIX), WORKING_NAME_HASH_CHARACTERS
+    )
+)
+
+
+def encode_working_name(
+    iteration_context: str, parameters: TemplateParameters
+) -> str:
+    """
+    Construct a working directory name unique to a deployment iteration.
+
+    The name is a stable hash of the iteration context and its template
+    parameters, so concurrent iterations never share a working directory.
+    Repeated runs of an unchanged iteration reuse the same directory provided
+    that parameters identifying the run, such as the pipeline id, are
+    excluded by the caller.
+
+    Args:
+        iteration_context: Iteration context of the deployment.
+        parameters: Template parameters of the deployment iteration.
+
+    Returns:
+        Working directory name.
+    """
+    data = json.dumps(
+        {"iteration": iteration_context, "parameters": parameters},
+        default=str,
+        sort_keys=True,
+    )
+    value = hashlib.sha256(data.encode()).hexdigest()
+
+    return "{0}{1}".format(
+        WORKING_NAME_PREFIX, value[0:WORKING_NAME_HASH_CHARACTERS]
+    )
+
+
+def _prune_bytecode_cache(cache_dir: pathlib.Path, threshold: float) -> None:
+    """Delete compiled templates not modified since a threshold time."""
+    if not cache_dir.is_dir():
+        return
+
+    count = 0
+    for this_path in cache_dir.iterdir():
+        try:
+            if this_path.is_file() and (this_path.stat().st_mtime < threshold):
+                this_path.unlink()
+                count += 1
+        except OSError as e:
+            log.warning(
+                "unable to delete compiled template, {0}, {1}".format(
+                    this_path, str(e)
+                )
+            )
+    if count:
+        log.info(
+            "deleted compiled templates, {0}, {1}".format(cache_dir, count)
+        )
+
+
+def prune_working_directories(
+    working_root: pathlib.Path,
+    retention_seconds: float,
+    in_use: typing.Set[pathlib.Path],
+) -> typing.List[pathlib.Path]:
+    """
+    Delete stale iteration working directories, and content only they used.
+
+    Stale compiled templates in the bytecode cache at the working root are
+    also deleted.
+
+    Args:
+        working_root: Directory containing iteration working directories.
+        retention_seconds: Minimum age of a working directory, by
+                           modification time, for deletion.
+        in_use: Working directories that must not be deleted.
+
+    Returns:
+        Deleted working directories.
+    """
+    if not working_root.is_dir():
+        return list()
+
+    threshold = time.time() - retention_seconds
+    keep = {x.resolve() for x in in_use}
+    deleted: typing.List[pathlib.Path] = list()
+    for this_path in sorted(working_root.iterdir()):
+        if (
+            this_path.is_dir()
+            and WORKING_NAME_PATTERN.match(this_path.name)
+            and (this_path.resolve() not in keep)
+            and (this_path.stat().st_mtime < threshold)
+        ):
+            log.info("deleting working directory, {0}".format(this_path))
+            shutil.rmtree(this_path, ignore_errors=True)
+            deleted.append(this_path)
+
+    ContentStore(working_root / CONTENT_STORE_DIR).prune(retention_seconds)
+    _prune_bytecode_cache(working_root / BYTECODE_CACHE_DIR, threshold)
+
+    return deleted
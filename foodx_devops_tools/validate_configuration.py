@@ -44,7 +44,7 @@ from .pipeline_config.exceptions import (
     SystemsDefinitionError,
     TenantsDefinitionError,
 )
-from .utilities import acquire_token
+from .utilities import acquire_token, forward_termination_signals
 
 log = logging.getLogger(__name__)
 
@@ -172,7 +172,8 @@ def _main(
         )
 
         if check_paths:
-            asyncio.run(do_path_check(pipeline_configuration))
+            with forward_termination_signals():
+                asyncio.run(do_path_check(pipeline_configuration))
 
         report_success("pipeline configuration validated")
     except FileNotFoundError as e:
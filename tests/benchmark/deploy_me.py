@@ -0,0 +1,312 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""
+Offline benchmark of deploy-me against synthetic configurations.
+
+Run from the repository root, eg::
+
+    python -m tests.benchmark.deploy_me --frames 300 --latency-scale 0.01
+"""
+
+import contextlib
+import dataclasses
+import json
+import os
+import pathlib
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import click
+
+from foodx_devops_tools.deploy_me_entry import deploy_me
+from foodx_devops_tools.profiling import EventLoopLag, last_event_loop_lag
+from foodx_devops_tools.utilities.command import set_command_backend
+
+from .simulated_az import (
+    SimulatedAzBackend,
+    SimulationProfile,
+    SimulationStatistics,
+)
+from .synthetic import GIT_REF, SyntheticShape, generate_configuration
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    """Measurements of a single deploy-me run."""
+
+    wall_seconds: float
+    exit_code: int
+    # process peak resident set size.
+    peak_rss_bytes: int
+    # peak Python heap allocation, if memory tracing was enabled.
+    peak_traced_bytes: typing.Optional[int]
+    # event loop scheduling delay, if deploy-me reached deployment.
+    event_loop_lag: typing.Optional[EventLoopLag]
+    statistics: SimulationStatistics
+
+    def as_dict(self: "BenchmarkResult") -> dict:
+        """Generate a JSON compatible ``dict`` of the result."""
+        result = dataclasses.asdict(self)
+        result["statistics"] = self.statistics.as_dict()
+
+        return result
+
+    def format_report(self: "BenchmarkResult") -> str:
+        """Format the result as text."""
+        lines = [
+            "exit code, {0}".format(self.exit_code),
+            "wall time (s), {0:.3f}".format(self.wall_seconds),
+            "peak rss (MiB), {0:.1f}".format(self.peak_rss_bytes / 2**20),
+        ]
+        if self.peak_traced_bytes is not None:
+            lines.append(
+                "peak traced (MiB), {0:.1f}".format(
+                    self.peak_traced_bytes / 2**20
+                )
+            )
+        if self.event_loop_lag is not None:
+            lines += [
+                "event loop lag maximum (ms), {0:.1f}".format(
+                    self.event_loop_lag.maximum_seconds * 1000
+                ),
+                "event loop lag mean (ms), {0:.1f}".format(
+                    self.event_loop_lag.mean_seconds * 1000
+                ),
+            ]
+        lines += [
+            "simulated commands, {0}".format(
+                self.statistics.total_commands - self.statistics.subprocesses
+            ),
+            "subprocesses, {0}".format(self.statistics.subprocesses),
+            "command failures, {0}".format(self.statistics.failures),
+            "throttled requests, {0}".format(self.statistics.throttled),
+            "peak command concurrency, {0}".format(
+                self.statistics.peak_concurrency
+            ),
+        ]
+        for name, count in sorted(self.statistics.commands.items()):
+            lines.append("  {0:>6}  {1}".format(count, name))
+
+        return "\n".join(lines)
+
+
+def _peak_rss_bytes() -> int:
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS reports bytes.
+    return value if sys.platform == "darwin" else value * 1024
+
+
+@contextlib.contextmanager
+def _working_directory(
+    path: pathlib.Path,
+) -> typing.Generator[None, None, None]:
+    """Run deploy-me from a git repository, as it would in a pipeline."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        subprocess.run(["git", "init", "-q"], check=True)
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=benchmark",
+                "-c",
+                "user.email=benchmark@localhost",
+                "commit",
+                "--allow-empty",
+                "-q",
+                "-m",
+                "synthetic",
+            ],
+            check=True,
+        )
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run_benchmark(
+    work_path: pathlib.Path,
+    shape: SyntheticShape,
+    profile: SimulationProfile,
+    deploy_arguments: typing.Optional[typing.List[str]] = None,
+    trace_memory: bool = False,
+) -> BenchmarkResult:
+    """
+    Run deploy-me against a synthetic configuration and a simulated ``az``.
+
+    Args:
+        work_path: Directory in which to generate configuration and run.
+        shape: Size and structure of the synthetic configuration.
+        profile: Simulated ``az`` command behaviour.
+        deploy_arguments: Additional deploy-me command line arguments.
+        trace_memory: Measure peak Python heap allocation (slow).
+
+    Returns:
+        Benchmark measurements.
+    """
+    configuration = generate_configuration(work_path, shape)
+    backend = SimulatedAzBackend(profile, seed=shape.seed)
+    arguments = [
+        str(configuration.client_path),
+        str(configuration.system_path),
+        str(configuration.password_file),
+        "--git-ref",
+        GIT_REF,
+        "--log-level",
+        "info",
+        "--monitor-sleep",
+        "1",
+    ] + (deploy_arguments if deploy_arguments else list())
+
+    with _working_directory(work_path):
+        previous_backend = set_command_backend(backend)
+        if trace_memory:
+            tracemalloc.start()
+        start_seconds = time.perf_counter()
+        exit_code = 0
+        try:
+            deploy_me.main(args=arguments, standalone_mode=False)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        finally:
+            wall_seconds = time.perf_counter() - start_seconds
+            peak_traced_bytes = None
+            if trace_memory:
+                peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            set_command_backend(previous_backend)
+
+    return BenchmarkResult(
+        wall_seconds=wall_seconds,
+        exit_code=exit_code,
+        peak_rss_bytes=_peak_rss_bytes(),
+        peak_traced_bytes=peak_traced_bytes,
+        event_loop_lag=last_event_loop_lag(),
+        statistics=backend.statistics,
+    )
+
+
+@click.command()
+@click.option("--frames", default=100, show_default=True, type=int)
+@click.option(
+    "--applications", default=2, show_default=True, type=int, help="Per frame."
+)
+@click.option(
+    "--steps", default=1, show_default=True, type=int, help="Per application."
+)
+@click.option(
+    "--frame-dependencies",
+    default=0,
+    help="Maximum number of earlier frames each frame depends on.",
+    show_default=True,
+    type=int,
+)
+@click.option(
+    "--latency-scale",
+    default=None,
+    help="Simulate typical Azure latencies multiplied by this factor. "
+    "[default: zero latency]",
+    type=float,
+)
+@click.option(
+    "--failure-rate",
+    default=0.0,
+    help="Probability of any simulated az command failing.",
+    show_default=True,
+    type=float,
+)
+@click.option(
+    "--throttle-limit",
+    default=None,
+    help="Maximum az requests per subscription per second.",
+    type=int,
+)
+@click.option("--seed", default=None, type=int)
+@click.option(
+    "--trace-memory",
+    default=False,
+    help="Measure peak Python heap allocation (slow).",
+    is_flag=True,
+)
+@click.option(
+    "--json-report",
+    default=None,
+    help="File to write measurements to in JSON format.",
+    type=click.File(mode="w"),
+)
+@click.option(
+    "--keep",
+    default=False,
+    help="Keep the generated configuration and deploy-me log files.",
+    is_flag=True,
+)
+@click.argument("deploy_arguments", nargs=-1, type=click.UNPROCESSED)
+def main(
+    frames: int,
+    applications: int,
+    steps: int,
+    frame_dependencies: int,
+    latency_scale: typing.Optional[float],
+    failure_rate: float,
+    throttle_limit: typing.Optional[int],
+    seed: typing.Optional[int],
+    trace_memory: bool,
+    json_report: typing.Optional[typing.TextIO],
+    keep: bool,
+    deploy_arguments: typing.Tuple[str, ...],
+) -> None:
+    """
+    Benchmark deploy-me offline.
+
+    DEPLOY_ARGUMENTS are passed to deploy-me; precede them with "--".
+    """
+    shape = SyntheticShape(
+        frames=frames,
+        applications_per_frame=applications,
+        steps_per_application=steps,
+        frame_dependencies=frame_dependencies,
+        seed=seed,
+    )
+    profile = (
+        SimulationProfile.typical(latency_scale)
+        if latency_scale is not None
+        else SimulationProfile.instant()
+    ).with_failure_rate(failure_rate)
+    if throttle_limit is not None:
+        profile.throttling.requests_per_window = throttle_limit
+        profile.throttling.window_seconds = 1.0
+
+    with contextlib.ExitStack() as stack:
+        if keep:
+            work_path = pathlib.Path(tempfile.mkdtemp(prefix="deploy-me-"))
+            click.echo("working directory, {0}".format(work_path))
+        else:
+            work_path = pathlib.Path(
+                stack.enter_context(tempfile.TemporaryDirectory())
+            )
+        result = run_benchmark(
+            work_path, shape, profile, list(deploy_arguments), trace_memory
+        )
+
+    click.echo(result.format_report())
+    if json_report:
+        json.dump(
+            {"shape": dataclasses.asdict(shape), **result.as_dict()},
+            json_report,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,548 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Simulation of the Azure CLI utility for offline load testing."""
+
+import asyncio
+import collections
+import dataclasses
+import json
+import logging
+import math
+import random
+import re
+import time
+import typing
+import uuid
+
+from foodx_devops_tools.utilities.command import (
+    CommandArgs,
+    CommandBackend,
+    CompletedCommand,
+    SubprocessBackend,
+    command_label,
+)
+
+log = logging.getLogger(__name__)
+
+# deployment list filters supported by the simulation.
+FILTER_PATTERN = re.compile(r"^provisioningState eq '(?P<state>[A-Za-z]+)'$")
+
+
+@dataclasses.dataclass
+class LatencyDistribution:
+    """Log-normal distribution of simulated command latency."""
+
+    median_seconds: float = 0.0
+    # shape of the distribution; zero for a constant latency.
+    sigma: float = 0.0
+
+    def sample(self: "LatencyDistribution", rng: random.Random) -> float:
+        """Sample a latency from the distribution."""
+        if self.median_seconds <= 0.0:
+            return 0.0
+        elif self.sigma <= 0.0:
+            return self.median_seconds
+        else:
+            return rng.lognormvariate(math.log(self.median_seconds), self.sigma)
+
+
+@dataclasses.dataclass
+class CommandProfile:
+    """Simulated behaviour of a single ``az`` command."""
+
+    latency: LatencyDistribution = dataclasses.field(
+        default_factory=LatencyDistribution
+    )
+    # probability that the command fails.
+    failure_rate: float = 0.0
+
+
+@dataclasses.dataclass
+class ThrottlingPolicy:
+    """
+    Per subscription request rate limit.
+
+    Requests exceeding the limit wait for the retry interval before trying
+    again, in the same way that the ``az`` CLI retries throttled requests.
+    """
+
+    # maximum requests per subscription in the window; zero disables.
+    requests_per_window: int = 0
+    window_seconds: float = 1.0
+    retry_after_seconds: float = 1.0
+
+
+@dataclasses.dataclass
+class SimulationProfile:
+    """Simulated behaviour of all supported ``az`` commands."""
+
+    login: CommandProfile = dataclasses.field(default_factory=CommandProfile)
+    group_list: CommandProfile = dataclasses.field(
+        default_factory=CommandProfile
+    )
+    group_create: CommandProfile = dataclasses.field(
+        default_factory=CommandProfile
+    )
+    group_delete: CommandProfile = dataclasses.field(
+        default_factory=CommandProfile
+    )
+    deployment_create: CommandProfile = dataclasses.field(
+        default_factory=CommandProfile
+    )
+    deployment_validate: CommandProfile = dataclasses.field(
+        default_factory=CommandProfile
+    )
+    # deployment status queries, and submission of deployments without
+    # waiting.
+    deployment_list: CommandProfile = dataclasses.field(
+        default_factory=CommandProfile
+    )
+    throttling: ThrottlingPolicy = dataclasses.field(
+        default_factory=ThrottlingPolicy
+    )
+
+    @classmethod
+    def instant(cls: typing.Type["SimulationProfile"]) -> "SimulationProfile":
+        """Zero latency, no failures and no throttling."""
+        return cls()
+
+    @classmethod
+    def typical(
+        cls: typing.Type["SimulationProfile"], scale: float = 1.0
+    ) -> "SimulationProfile":
+        """
+        Latencies resembling those observed against Azure.
+
+        Args:
+            scale: Factor applied to all latencies.
+        """
+
+        def profile(median_seconds: float, sigma: float) -> CommandProfile:
+            return CommandProfile(
+                latency=LatencyDistribution(
+                    median_seconds=median_seconds * scale, sigma=sigma
+                )
+            )
+
+        return cls(
+            login=profile(4.0, 0.3),
+            group_list=profile(1.5, 0.4),
+            group_create=profile(2.0, 0.4),
+            group_delete=profile(30.0, 0.5),
+            deployment_create=profile(45.0, 0.6),
+            deployment_validate=profile(8.0, 0.4),
+            deployment_list=profile(1.5, 0.4),
+            throttling=ThrottlingPolicy(
+                requests_per_window=200,
+                window_seconds=300.0 * scale,
+                retry_after_seconds=10.0 * scale,
+            ),
+        )
+
+    def with_failure_rate(
+        self: "SimulationProfile", failure_rate: float
+    ) -> "SimulationProfile":
+        """Apply the same failure rate to all commands."""
+        result = dataclasses.replace(self)
+        for x in dataclasses.fields(self):
+            value = getattr(result, x.name)
+            if isinstance(value, CommandProfile):
+                setattr(
+                    result,
+                    x.name,
+                    dataclasses.replace(value, failure_rate=failure_rate),
+                )
+
+        return result
+
+
+@dataclasses.dataclass
+class SimulationStatistics:
+    """Counts of commands processed by the simulation."""
+
+    commands: typing.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+    failures: int = 0
+    throttled: int = 0
+    # commands that were not simulated, but run as actual subprocesses.
+    subprocesses: int = 0
+    peak_concurrency: int = 0
+
+    @property
+    def total_commands(self: "SimulationStatistics") -> int:
+        """Total number of commands processed."""
+        return sum(self.commands.values())
+
+    def as_dict(self: "SimulationStatistics") -> dict:
+        """Generate a JSON compatible ``dict`` of the statistics."""
+        result = dataclasses.asdict(self)
+        result["commands"] = dict(self.commands)
+        result["total_commands"] = self.total_commands
+
+        return result
+
+
+class SimulatedCommandError(Exception):
+    """A simulated ``az`` command exited with an error."""
+
+    def __init__(self: "SimulatedCommandError", code: int, message: str):
+        """Construct ``SimulatedCommandError`` object."""
+        super().__init__(message)
+        self.code = code
+
+
+def _parse_options(
+    arguments: CommandArgs,
+) -> typing.Tuple[typing.List[str], typing.Dict[str, typing.List[str]]]:
+    """Split command arguments into leading words and option values."""
+    words: typing.List[str] = list()
+    options: typing.Dict[str, typing.List[str]] = collections.defaultdict(list)
+    index = 0
+    while index < len(arguments):
+        this_argument = arguments[index]
+        if this_argument.startswith("--"):
+            if (index + 1 < len(arguments)) and (
+                not arguments[index + 1].startswith("--")
+            ):
+                options[this_argument].append(arguments[index + 1])
+                index += 1
+            else:
+                options[this_argument].append("")
+        elif not options:
+            words.append(this_argument)
+        index += 1
+
+    return words, options
+
+
+def _subscription_guid(subscription: str) -> str:
+    """Generate a stable Azure style GUID for a subscription name."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, subscription))
+
+
+T = typing.TypeVar("T", bound="SimulatedAzBackend")
+
+
+class SimulatedAzBackend(CommandBackend):
+    """
+    Command backend simulating the ``az`` CLI utility.
+
+    Supports ``login``, ``group list/create/delete`` and
+    ``deployment group create/validate/what-if/list/show``, maintaining resource
+    group and deployment state per subscription. Commands other than ``az``
+    are passed to the fallback backend.
+    """
+
+    resource_groups: typing.Dict[str, typing.Dict[str, dict]]
+    deployments: typing.Dict[typing.Tuple[str, str], typing.List[dict]]
+    statistics: SimulationStatistics
+
+    def __init__(
+        self: T,
+        profile: typing.Optional[SimulationProfile] = None,
+        seed: typing.Optional[int] = None,
+        fallback: typing.Optional[CommandBackend] = None,
+    ) -> None:
+        """
+        Construct ``SimulatedAzBackend`` object.
+
+        Args:
+            profile: Simulated command behaviour; instant by default.
+            seed: Random seed for repeatable latencies and failures.
+            fallback: Backend for commands that are not ``az``.
+        """
+        self.profile = profile if profile else SimulationProfile.instant()
+        self.fallback = fallback if fallback else SubprocessBackend()
+        self.resource_groups = collections.defaultdict(dict)
+        self.deployments = collections.defaultdict(list)
+        self.statistics = SimulationStatistics()
+
+        self.__rng = random.Random(seed)
+        # deployment id: completion time and final state of deployments
+        # submitted without waiting.
+        self.__completions: typing.Dict[str, typing.Tuple[float, str]] = dict()
+        self.__in_flight = 0
+        self.__requests: typing.Dict[
+            str, typing.Deque[float]
+        ] = collections.defaultdict(collections.deque)
+
+    async def run(self: T, command: CommandArgs) -> CompletedCommand:
+        """Simulate an ``az`` command, or run any other command."""
+        self.statistics.commands[command_label(command)] += 1
+        if (not command) or (command[0] != "az"):
+            self.statistics.subprocesses += 1
+            return await self.fallback.run(command)
+
+        self.__in_flight += 1
+        self.statistics.peak_concurrency = max(
+            self.statistics.peak_concurrency, self.__in_flight
+        )
+        try:
+            output = await self.__dispatch(command[1:])
+            return CompletedCommand(
+                returncode=0, out=json.dumps(output).encode(), error=b""
+            )
+        except SimulatedCommandError as e:
+            self.statistics.failures += 1
+            return CompletedCommand(
+                returncode=e.code,
+                out=b"",
+                error="ERROR: {0}".format(e).encode(),
+            )
+        finally:
+            self.__in_flight -= 1
+
+    async def __dispatch(self: T, arguments: CommandArgs) -> typing.Any:
+        words, options = _parse_options(arguments)
+        handlers: typing.Dict[
+            typing.Tuple[str, ...],
+            typing.Tuple[
+                CommandProfile,
+                typing.Callable[
+                    [typing.Dict[str, typing.List[str]]], typing.Any
+                ],
+            ],
+        ] = {
+            ("login",): (self.profile.login, self.__login),
+            ("group", "list"): (self.profile.group_list, self.__group_list),
+            ("group", "create"): (
+                self.profile.group_create,
+                self.__group_create,
+            ),
+            ("group", "delete"): (
+                self.profile.group_delete,
+                self.__group_delete,
+            ),
+            ("deployment", "group", "create"): (
+                self.profile.deployment_create,
+                self.__deployment_create,
+            ),
+            ("deployment", "group", "validate"): (
+                self.profile.deployment_validate,
+                self.__deployment_validate,
+            ),
+            ("deployment", "group", "what-if"): (
+                self.profile.deployment_validate,
+                self.__deployment_what_if,
+            ),
+        }
+        this_key = tuple(words)
+        if this_key == ("deployment", "group", "list"):
+            handlers[this_key] = (
+                self.profile.deployment_list,
+                self.__deployment_list,
+            )
+        elif this_key == ("deployment", "group", "show"):
+            handlers[this_key] = (
+                self.profile.deployment_list,
+                self.__deployment_show,
+            )
+        elif (this_key == ("deployment", "group", "create")) and (
+            "--no-wait" in options
+        ):
+            handlers[this_key] = (
+                self.profile.deployment_list,
+                self.__deployment_submit,
+            )
+        if this_key not in handlers:
+            raise SimulatedCommandError(
+                2, "unsupported simulated command, {0}".format(" ".join(words))
+            )
+        this_profile, this_handler = handlers[this_key]
+
+        subscription = options.get("--subscription", [""])[0]
+        await self.__throttle(subscription)
+        await asyncio.sleep(this_profile.latency.sample(self.__rng))
+        if self.__rng.random() < this_profile.failure_rate:
+            raise SimulatedCommandError(
+                1, "simulated failure, {0}".format(" ".join(words))
+            )
+
+        return this_handler(options)
+
+    async def __throttle(self: T, subscription: str) -> None:
+        policy = self.profile.throttling
+        if policy.requests_per_window <= 0:
+            return
+
+        requests = self.__requests[subscription]
+        while True:
+            now = time.monotonic()
+            while requests and (requests[0] <= (now - policy.window_seconds)):
+                requests.popleft()
+            if len(requests) < policy.requests_per_window:
+                requests.append(now)
+                return
+            self.statistics.throttled += 1
+            await asyncio.sleep(policy.retry_after_seconds)
+
+    def __login(self: T, options: typing.Dict[str, typing.List[str]]) -> list:
+        tenant = options.get("--tenant", [""])[0]
+        return [
+            {
+                "cloudName": "AzureCloud",
+                "id": _subscription_guid(tenant),
+                "isDefault": True,
+                "name": "simulated",
+                "state": "Enabled",
+                "tenantId": tenant,
+                "user": {"type": "servicePrincipal"},
+            }
+        ]
+
+    def __group_list(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> list:
+        subscription = options["--subscription"][0]
+        return list(self.resource_groups[subscription].values())
+
+    def __group_create(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        subscription = options["--subscription"][0]
+        name = options["--resource-group"][0]
+        group = {
+            "id": "/subscriptions/{0}/resourceGroups/{1}".format(
+                _subscription_guid(subscription), name
+            ),
+            "location": options.get("--location", [""])[0],
+            "name": name,
+            "properties": {"provisioningState": "Succeeded"},
+        }
+        self.resource_groups[subscription][name] = group
+
+        return group
+
+    def __group_delete(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> None:
+        subscription = options["--subscription"][0]
+        name = options["--resource-group"][0]
+        if name not in self.resource_groups[subscription]:
+            raise SimulatedCommandError(
+                3, "(ResourceGroupNotFound) {0}".format(name)
+            )
+        del self.resource_groups[subscription][name]
+        self.deployments.pop((subscription, name), None)
+
+    def __deployment(
+        self: T, options: typing.Dict[str, typing.List[str]], validate: bool
+    ) -> dict:
+        subscription = options["--subscription"][0]
+        group = options["--resource-group"][0]
+        if group not in self.resource_groups[subscription]:
+            raise SimulatedCommandError(
+                3, "(ResourceGroupNotFound) {0}".format(group)
+            )
+        name = options.get("--name", ["simulated"])[0]
+        deployment = {
+            "id": "{0}/providers/Microsoft.Resources/deployments/{1}".format(
+                self.resource_groups[subscription][group]["id"], name
+            ),
+            "name": name,
+            "properties": {
+                "mode": options.get("--mode", ["Incremental"])[0],
+                "outputs": {},
+                "provisioningState": "Succeeded",
+            },
+            "resourceGroup": group,
+        }
+        if not validate:
+            self.deployments[(subscription, group)].append(deployment)
+
+        return deployment
+
+    def __deployment_submit(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> None:
+        deployment = self.__deployment(options, False)
+        deployment["properties"]["provisioningState"] = "Running"
+        this_profile = self.profile.deployment_create
+        self.__completions[deployment["id"]] = (
+            time.monotonic() + this_profile.latency.sample(self.__rng),
+            "Failed"
+            if self.__rng.random() < this_profile.failure_rate
+            else "Succeeded",
+        )
+
+    def __group_deployments(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> typing.List[dict]:
+        subscription = options["--subscription"][0]
+        group = options["--resource-group"][0]
+        now = time.monotonic()
+        deployments = self.deployments[(subscription, group)]
+        for x in deployments:
+            if (x["id"] in self.__completions) and (
+                self.__completions[x["id"]][0] <= now
+            ):
+                x["properties"]["provisioningState"] = self.__completions.pop(
+                    x["id"]
+                )[1]
+
+        return deployments
+
+    def __deployment_list(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> list:
+        deployments = self.__group_deployments(options)
+        this_filter = FILTER_PATTERN.match(options.get("--filter", [""])[0])
+
+        return [
+            x
+            for x in deployments
+            if (not this_filter)
+            or (
+                x["properties"]["provisioningState"]
+                == this_filter.group("state")
+            )
+        ]
+
+    def __deployment_show(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        name = options["--name"][0]
+        for x in reversed(self.__group_deployments(options)):
+            if x["name"] == name:
+                return x
+
+        raise SimulatedCommandError(3, "(DeploymentNotFound) {0}".format(name))
+
+    def __deployment_create(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        return self.__deployment(options, False)
+
+    def __deployment_validate(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        return self.__deployment(options, True)
+
+    def __deployment_what_if(
+        self: T, options: typing.Dict[str, typing.List[str]]
+    ) -> dict:
+        deployment = self.__deployment(options, True)
+        # a repeat of a succeeded deployment is predicted to change nothing.
+        deployed = any(
+            (x["id"] == deployment["id"])
+            and (x["properties"]["provisioningState"] == "Succeeded")
+            for x in self.deployments[
+                (options["--subscription"][0], options["--resource-group"][0])
+            ]
+        )
+
+        return {
+            "status": "Succeeded",
+            "changes": [
+                {
+                    "changeType": "NoChange" if deployed else "Create",
+                    "resourceId": deployment["id"],
+                }
+            ],
+        }
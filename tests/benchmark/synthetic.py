@@ -0,0 +1,264 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Generate synthetic deploy-me configurations of arbitrary size."""
+
+import dataclasses
+import json
+import os
+import pathlib
+import random
+import typing
+
+import ruamel.yaml
+
+from foodx_devops_tools.utilities.ansible import _encrypt_vault
+
+CLIENT = "c1"
+SYSTEM = "sys1"
+RELEASE_STATE = "dev"
+SUBSCRIPTION = "{0}_{1}_{2}".format(SYSTEM, CLIENT, RELEASE_STATE)
+TENANT = "t1"
+DEPLOYMENT_TUPLE = "{0}-{1}-{2}".format(SYSTEM, CLIENT, RELEASE_STATE)
+
+# git reference mapping to the "dev" release state.
+GIT_REF = "refs/heads/main"
+
+ARM_TEMPLATE = {
+    "$schema": "https://schema.management.azure.com/schemas/2019-04-01/"
+    "deploymentTemplate.json#",
+    "contentVersion": "1.0.0.0",
+    "parameters": {
+        "p1": {"type": "string"},
+    },
+    "resources": [],
+    "outputs": {
+        "resourceGroup": {
+            "type": "string",
+            "value": "{{ context.environment.resource_group }}",
+        },
+        "fqdns": {
+            "type": "string",
+            "value": "{{ context.network.fqdns | tojson | json_inlining }}",
+        },
+    },
+}
+
+
+@dataclasses.dataclass
+class SyntheticShape:
+    """Size and structure of a synthetic configuration."""
+
+    frames: int = 100
+    applications_per_frame: int = 2
+    steps_per_application: int = 1
+    # maximum number of earlier frames each frame depends on.
+    frame_dependencies: int = 0
+    seed: typing.Optional[int] = None
+
+
+@dataclasses.dataclass
+class SyntheticConfiguration:
+    """Paths to a generated configuration."""
+
+    client_path: pathlib.Path
+    system_path: pathlib.Path
+    password_file: pathlib.Path
+    frames_path: pathlib.Path
+
+
+def _dump_yaml(file_path: pathlib.Path, data: typing.Any) -> None:
+    yaml = ruamel.yaml.YAML(typ="safe")
+    with file_path.open(mode="w") as f:
+        yaml.dump(data, f)
+
+
+def _frame_name(index: int) -> str:
+    return "f{0:04d}".format(index)
+
+
+def _generate_frames(
+    shape: SyntheticShape, frames_path: pathlib.Path
+) -> typing.Tuple[dict, dict]:
+    rng = random.Random(shape.seed)
+    frames: typing.Dict[str, typing.Any] = dict()
+    puff_map: typing.Dict[str, typing.Any] = dict()
+    for frame_index in range(shape.frames):
+        frame_name = _frame_name(frame_index)
+        frame_folder = frames_path / frame_name
+        os.makedirs(frame_folder, exist_ok=True)
+
+        applications: typing.Dict[str, typing.Any] = dict()
+        puff_applications: typing.Dict[str, typing.Any] = dict()
+        for application_index in range(shape.applications_per_frame):
+            application_name = "a{0}".format(application_index)
+            steps = [
+                {
+                    "mode": "Incremental",
+                    "name": "{0}s{1}".format(application_name, x),
+                    "resource_group": "{0}-{1}".format(
+                        frame_name, application_name
+                    ),
+                }
+                for x in range(shape.steps_per_application)
+            ]
+            applications[application_name] = {"steps": steps}
+            puff_applications[application_name] = {
+                "arm_parameters_files": {
+                    RELEASE_STATE: {
+                        SUBSCRIPTION: {
+                            x["name"]: "{0}.{1}.{2}.json".format(
+                                application_name, CLIENT, SUBSCRIPTION
+                            )
+                            for x in steps
+                        },
+                    },
+                },
+            }
+
+            with (frame_folder / "{0}.json".format(application_name)).open(
+                mode="w"
+            ) as f:
+                json.dump(ARM_TEMPLATE, f, indent=2)
+            _dump_yaml(
+                frame_folder / "{0}.yml".format(application_name),
+                {
+                    "services": {
+                        CLIENT: {
+                            "environments": {
+                                SUBSCRIPTION: {"p1": frame_name},
+                            },
+                        },
+                    },
+                },
+            )
+
+        frames[frame_name] = {
+            "applications": applications,
+            "folder": str(frame_folder),
+        }
+        if shape.frame_dependencies and frame_index:
+            frames[frame_name]["depends_on"] = sorted(
+                {
+                    _frame_name(x)
+                    for x in rng.sample(
+                        range(frame_index),
+                        min(shape.frame_dependencies, frame_index),
+                    )
+                }
+            )
+        puff_map[frame_name] = {"applications": puff_applications}
+
+    return frames, puff_map
+
+
+def generate_configuration(
+    base_path: pathlib.Path,
+    shape: SyntheticShape,
+    decrypt_token: str = "verysecret",
+) -> SyntheticConfiguration:
+    """
+    Generate a self-consistent deploy-me configuration.
+
+    Args:
+        base_path: Directory in which to generate configuration.
+        shape: Size and structure of the configuration.
+        decrypt_token: Password of the service principal vault.
+
+    Returns:
+        Paths to the generated configuration.
+    """
+    client_path = base_path / "client"
+    system_path = base_path / "system"
+    frames_path = base_path / "frames"
+    client_config = client_path / "configuration"
+    system_config = system_path / "configuration"
+    for x in [client_config, system_config, frames_path]:
+        os.makedirs(x, exist_ok=True)
+
+    frames, puff_map = _generate_frames(shape, frames_path)
+    _dump_yaml(
+        client_config / "clients.yml",
+        {
+            "clients": {
+                CLIENT: {"release_states": [RELEASE_STATE], "system": SYSTEM}
+            }
+        },
+    )
+    _dump_yaml(
+        client_config / "deployments.yml",
+        {
+            "deployments": {
+                "deployment_tuples": {
+                    DEPLOYMENT_TUPLE: {
+                        "subscriptions": {
+                            SUBSCRIPTION: {
+                                "locations": [{"primary": "westus2"}],
+                                "root_fqdn": "some.where",
+                            },
+                        },
+                    },
+                },
+                "url_endpoints": ["a", "p"],
+            },
+        },
+    )
+    _dump_yaml(client_config / "frames.yml", {"frames": {"frames": frames}})
+    _dump_yaml(
+        client_config / "puff_map.yml", {"puff_map": {"frames": puff_map}}
+    )
+    _dump_yaml(
+        system_config / "release_states.yml",
+        {"release_states": [RELEASE_STATE]},
+    )
+    _dump_yaml(
+        system_config / "subscriptions.yml",
+        {
+            "subscriptions": {
+                SUBSCRIPTION: {
+                    "ado_service_connection": "some-name",
+                    "azure_id": "abc123",
+                    "tenant": TENANT,
+                },
+            },
+        },
+    )
+    _dump_yaml(system_config / "systems.yml", {"systems": [SYSTEM]})
+    _dump_yaml(
+        system_config / "tenants.yml",
+        {"tenants": {TENANT: {"azure_id": "123abc"}}},
+    )
+
+    password_file = base_path / "password"
+    with password_file.open(mode="w") as f:
+        f.write(decrypt_token)
+    principals_file = client_config / "service_principals.yml"
+    _dump_yaml(
+        principals_file,
+        {
+            "service_principals": {
+                SUBSCRIPTION: {
+                    "id": "12345",
+                    "name": "sp_name",
+                    "secret": "synthetic-secret",
+                },
+            },
+        },
+    )
+    _encrypt_vault(
+        client_config / "service_principals.vault",
+        password_file,
+        principals_file,
+    )
+    os.remove(principals_file)
+
+    return SyntheticConfiguration(
+        client_path=client_path,
+        system_path=system_path,
+        password_file=password_file,
+        frames_path=frames_path,
+    )
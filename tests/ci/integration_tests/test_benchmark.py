@@ -0,0 +1,34 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+from tests.benchmark.deploy_me import run_benchmark
+from tests.benchmark.simulated_az import SimulationProfile
+from tests.benchmark.synthetic import SyntheticShape
+
+
+def test_deploy_me_simulated(tmp_path):
+    shape = SyntheticShape(
+        frames=3, applications_per_frame=2, frame_dependencies=1, seed=1
+    )
+
+    result = run_benchmark(tmp_path, shape, SimulationProfile.instant())
+
+    assert result.exit_code == 0
+    assert result.statistics.commands["az login"] == 1
+    assert result.statistics.commands["az deployment group create"] == 6
+    assert result.statistics.subprocesses == 0
+
+
+def test_deploy_me_simulated_failure(tmp_path):
+    shape = SyntheticShape(frames=2, seed=1)
+
+    result = run_benchmark(
+        tmp_path, shape, SimulationProfile.instant().with_failure_rate(1.0)
+    )
+
+    assert result.exit_code != 0
+    assert result.statistics.failures == 1
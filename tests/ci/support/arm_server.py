@@ -0,0 +1,418 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+"""Local stand-in for the Azure AD token and ARM REST API endpoints."""
+
+import contextlib
+import http.server
+import json
+import re
+import threading
+import typing
+import urllib.parse
+
+TENANT_ID = "abc-123"
+SUBSCRIPTION_ID = "00000000-1111-2222-3333-444444444444"
+SUBSCRIPTION_NAME = "sys1_c1_dev"
+
+# page size of list responses, to exercise "nextLink" paging.
+PAGE_SIZE = 2
+
+GROUP_PATTERN = re.compile(
+    r"^/subscriptions/(?P<subscription>[^/]+)/resourcegroups/(?P<group>[^/]+)"
+    r"(?P<deployments>/providers/Microsoft.Resources/deployments"
+    r"(/(?P<deployment>[^/]+)"
+    r"(?P<validate>/validate)?(?P<what_if>/whatIf)?)?)?$"
+)
+# the only deployment list filter supported.
+FILTER_PATTERN = re.compile(r"^provisioningState eq '(?P<state>[A-Za-z]+)'$")
+
+
+class FakeArmState:
+    """Mutable state of the stand-in server."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.token_requests = 0
+        self.connections = 0
+        self.requests: typing.List[typing.Tuple[str, str]] = list()
+        self.resource_groups: typing.Dict[str, dict] = dict()
+        self.deployments: typing.Dict[typing.Tuple[str, str], dict] = dict()
+        self.resources: typing.List[dict] = list()
+        # operation id: [remaining polls, final status document]
+        self.operations: typing.Dict[str, list] = dict()
+        # number of subsequent requests to throttle.
+        self.throttle_count = 0
+        # number of "in progress" polls of each long running operation.
+        self.operation_polls = 1
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.state.lock:
+            self.server.state.connections += 1
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def _reply(
+        self,
+        status: int,
+        data: typing.Any = None,
+        headers: typing.Optional[typing.Dict[str, str]] = None,
+        chunked: bool = False,
+    ) -> None:
+        body = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for k, v in (headers or dict()).items():
+            self.send_header(k, v)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for index in range(0, len(body), 16):
+                this_chunk = body[index : index + 16]
+                self.wfile.write(
+                    "{0:x}\r\n".format(len(this_chunk)).encode()
+                    + this_chunk
+                    + b"\r\n"
+                )
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _url(self, path: str) -> str:
+        return "http://{0}:{1}{2}".format(
+            self.server.server_address[0], self.server.server_address[1], path
+        )
+
+    def _new_operation(self, final: dict) -> str:
+        state = self.server.state
+        operation_id = "op{0}".format(len(state.operations))
+        state.operations[operation_id] = [state.operation_polls, final]
+        return operation_id
+
+    def _dispatch(self, method: str) -> None:
+        state = self.server.state
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        parsed = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        with state.lock:
+            state.requests.append((method, parsed.path))
+
+            if parsed.path.endswith("/oauth2/v2.0/token"):
+                form = urllib.parse.parse_qs(body.decode())
+                if form.get("client_secret") != ["verysecret"]:
+                    self._reply(
+                        401,
+                        {
+                            "error": "invalid_client",
+                            "error_description": "bad secret",
+                        },
+                    )
+                    return
+                state.token_requests += 1
+                self._reply(
+                    200,
+                    {
+                        "access_token": "token{0}".format(state.token_requests),
+                        "expires_in": 3600,
+                    },
+                )
+                return
+
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self._reply(401, {"error": {"code": "AuthenticationFailed"}})
+                return
+            if state.throttle_count:
+                state.throttle_count -= 1
+                self._reply(
+                    429,
+                    {"error": {"code": "TooManyRequests"}},
+                    {"Retry-After": "0"},
+                )
+                return
+
+            self._route(method, parsed.path, query, body)
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+        query: typing.Dict[str, typing.List[str]],
+        body: bytes,
+    ) -> None:
+        state = self.server.state
+        if path == "/subscriptions":
+            self._reply(
+                200,
+                {
+                    "value": [
+                        {
+                            "displayName": SUBSCRIPTION_NAME,
+                            "state": "Enabled",
+                            "subscriptionId": SUBSCRIPTION_ID,
+                            "tenantId": TENANT_ID,
+                        }
+                    ]
+                },
+            )
+        elif path.startswith("/operations/"):
+            operation_id = path.split("/")[2]
+            this_operation = state.operations[operation_id]
+            if this_operation[0] > 0:
+                this_operation[0] -= 1
+                if path.endswith("/status"):
+                    self._reply(200, {"status": "Running"})
+                else:
+                    self._reply(
+                        202,
+                        headers={
+                            "Location": self._url(path),
+                            "Retry-After": "0",
+                        },
+                    )
+            elif path.endswith("/status") or this_operation[1]:
+                self._reply(200, this_operation[1])
+            else:
+                self._reply(204)
+        elif path == "/subscriptions/{0}/resources".format(SUBSCRIPTION_ID):
+            self._reply(200, {"value": state.resources})
+        elif path == "/subscriptions/{0}/resourcegroups".format(
+            SUBSCRIPTION_ID
+        ):
+            groups = list(state.resource_groups.values())
+            start = int(query.get("page", ["0"])[0])
+            this_page: dict = {"value": groups[start : start + PAGE_SIZE]}
+            if start + PAGE_SIZE < len(groups):
+                this_page["nextLink"] = self._url(
+                    "{0}?api-version={1}&page={2}".format(
+                        path, query["api-version"][0], start + PAGE_SIZE
+                    )
+                )
+            self._reply(200, this_page, chunked=True)
+        else:
+            this_match = GROUP_PATTERN.match(path)
+            if (not this_match) or (
+                this_match.group("subscription") != SUBSCRIPTION_ID
+            ):
+                self._reply(404, {"error": {"code": "NotFound"}})
+            elif this_match.group("deployments") and (
+                not this_match.group("deployment")
+            ):
+                this_filter = FILTER_PATTERN.match(
+                    query.get("$filter", [""])[0]
+                )
+                self._reply(
+                    200,
+                    {
+                        "value": [
+                            v
+                            for k, v in state.deployments.items()
+                            if (k[0] == this_match.group("group"))
+                            and (
+                                (not this_filter)
+                                or (
+                                    v["properties"]["provisioningState"]
+                                    == this_filter.group("state")
+                                )
+                            )
+                        ]
+                    },
+                )
+            elif this_match.group("deployment"):
+                self._deployment(method, path, this_match, body)
+            else:
+                self._group(method, this_match.group("group"), body)
+
+    def _group(self, method: str, name: str, body: bytes) -> None:
+        state = self.server.state
+        if method == "PUT":
+            state.resource_groups[name] = {
+                "id": "/subscriptions/{0}/resourceGroups/{1}".format(
+                    SUBSCRIPTION_ID, name
+                ),
+                "location": json.loads(body)["location"],
+                "name": name,
+                "properties": {"provisioningState": "Succeeded"},
+                "tags": json.loads(body).get("tags") or dict(),
+            }
+            self._reply(201, state.resource_groups[name])
+        elif method == "DELETE":
+            if name not in state.resource_groups:
+                self._reply(
+                    404,
+                    {
+                        "error": {
+                            "code": "ResourceGroupNotFound",
+                            "message": "Resource group '{0}' could not be "
+                            "found.".format(name),
+                        }
+                    },
+                )
+                return
+            del state.resource_groups[name]
+            operation_id = self._new_operation(dict())
+            self._reply(
+                202,
+                headers={
+                    "Location": self._url(
+                        "/operations/{0}".format(operation_id)
+                    ),
+                    "Retry-After": "0",
+                },
+            )
+        else:
+            self._reply(200, state.resource_groups[name])
+
+    def _deployment(
+        self,
+        method: str,
+        path: str,
+        this_match: typing.Match,
+        body: bytes,
+    ) -> None:
+        state = self.server.state
+        key = (this_match.group("group"), this_match.group("deployment"))
+        if this_match.group("group") not in state.resource_groups:
+            self._reply(404, {"error": {"code": "ResourceGroupNotFound"}})
+        elif this_match.group("validate"):
+            properties = json.loads(body)["properties"]
+            if "invalid" in properties["parameters"]:
+                self._reply(
+                    400,
+                    {
+                        "error": {
+                            "code": "InvalidTemplate",
+                            "message": "bad template",
+                        }
+                    },
+                )
+            else:
+                self._reply(200, {"properties": properties})
+        elif this_match.group("what_if"):
+            properties = json.loads(body)["properties"]
+            # a repeat of a succeeded deployment is predicted to change
+            # nothing.
+            unchanged = (key in state.deployments) and (
+                state.deployments[key]["properties"]["parameters"]
+                == properties["parameters"]
+            )
+            operation_id = self._new_operation(
+                {
+                    "status": "Succeeded",
+                    "properties": {
+                        "changes": [
+                            {
+                                "changeType": "NoChange"
+                                if unchanged
+                                else "Create",
+                                "resourceId": path,
+                            }
+                        ]
+                    },
+                }
+            )
+            self._reply(
+                202,
+                headers={
+                    "Location": self._url(
+                        "/operations/{0}".format(operation_id)
+                    ),
+                    "Retry-After": "0",
+                },
+            )
+        elif method == "PUT":
+            properties = json.loads(body)["properties"]
+            failed = "fail" in properties["parameters"]
+            state.deployments[key] = {
+                "id": path,
+                "name": key[1],
+                "properties": {
+                    "mode": properties["mode"],
+                    "outputs": {"p1": properties["parameters"].get("p1")},
+                    "parameters": properties["parameters"],
+                    "provisioningState": "Failed" if failed else "Succeeded",
+                },
+            }
+            operation_id = self._new_operation(
+                {
+                    "status": "Failed",
+                    "error": {
+                        "code": "DeploymentFailed",
+                        "message": "simulated failure",
+                    },
+                }
+                if failed
+                else {"status": "Succeeded"}
+            )
+            self._reply(
+                201,
+                {
+                    "name": key[1],
+                    "properties": {"provisioningState": "Accepted"},
+                },
+                {
+                    "Azure-AsyncOperation": self._url(
+                        "/operations/{0}/status".format(operation_id)
+                    ),
+                    "Retry-After": "0",
+                },
+            )
+        elif key not in state.deployments:
+            self._reply(404, {"error": {"code": "DeploymentNotFound"}})
+        else:
+            self._reply(200, state.deployments[key])
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    state: FakeArmState
+
+
+@contextlib.contextmanager
+def fake_arm_server() -> typing.Generator[
+    typing.Tuple[str, FakeArmState], None, None
+]:
+    """
+    Run a stand-in ARM and Azure AD server in a background thread.
+
+    Yields:
+        Server endpoint URL and server state.
+    """
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.state = FakeArmState()
+    thread = threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    try:
+        yield "http://127.0.0.1:{0}".format(server.server_address[1]), (
+            server.state
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
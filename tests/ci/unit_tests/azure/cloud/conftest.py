@@ -0,0 +1,18 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import pytest
+
+from foodx_devops_tools.azure.cloud.resource_group import (
+    reset_resource_group_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_resource_group_index():
+    yield reset_resource_group_index()
+    reset_resource_group_index()
@@ -0,0 +1,472 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+import pathlib
+
+import pytest
+
+from foodx_devops_tools.azure.cloud import (
+    AzureCredentials,
+    AzureSubscriptionConfiguration,
+    login_service_principal,
+)
+from foodx_devops_tools.azure.cloud.arm_rest import ArmRestBackend
+from foodx_devops_tools.azure.cloud.auth import AzureAuthenticationError
+from foodx_devops_tools.azure.cloud.deployment_poller import (
+    DeploymentPoller,
+    set_deployment_poller,
+)
+from foodx_devops_tools.azure.cloud.resource import list_resources
+from foodx_devops_tools.azure.cloud.resource_group import (
+    check_exists,
+    create,
+    delete,
+    deploy,
+    last_deployment_outputs,
+    what_if,
+)
+from foodx_devops_tools.utilities import set_command_backend
+from foodx_devops_tools.utilities.command import (
+    CommandBackend,
+    CompletedCommand,
+)
+from foodx_devops_tools.utilities.exceptions import CommandError
+from tests.ci.support.arm_server import (
+    SUBSCRIPTION_ID,
+    SUBSCRIPTION_NAME,
+    TENANT_ID,
+    fake_arm_server,
+)
+
+MOCK_CREDENTIALS = AzureCredentials(
+    name="sp_name",
+    secret="verysecret",
+    subscription=SUBSCRIPTION_ID,
+    tenant=TENANT_ID,
+    userid="12345",
+)
+
+MOCK_SUBSCRIPTION = AzureSubscriptionConfiguration(
+    subscription_id=SUBSCRIPTION_NAME
+)
+
+
+class MockFallback(CommandBackend):
+    def __init__(self, returncode=0):
+        self.commands = list()
+        self.returncode = returncode
+
+    async def run(self, command):
+        self.commands.append(command)
+        return CompletedCommand(
+            returncode=self.returncode, out=b"{}", error=b"failed"
+        )
+
+
+@pytest.fixture()
+def arm_backend():
+    with fake_arm_server() as (endpoint, state):
+        fallback = MockFallback()
+        this_backend = ArmRestBackend(
+            arm_endpoint=endpoint,
+            authority_endpoint=endpoint,
+            fallback=fallback,
+            poll_interval_seconds=0,
+        )
+        previous = set_command_backend(this_backend)
+
+        yield this_backend, state, fallback
+
+        set_command_backend(previous)
+
+
+@pytest.fixture()
+def arm_files(tmp_path):
+    template_path = tmp_path / "template.json"
+    with template_path.open(mode="w") as f:
+        json.dump({"resources": [], "contentVersion": "1.0.0.0"}, f)
+    parameters_path = tmp_path / "parameters.json"
+    with parameters_path.open(mode="w") as f:
+        json.dump(
+            {"contentVersion": "1.0.0.0", "parameters": {"p1": {"value": 1}}},
+            f,
+        )
+
+    return template_path, parameters_path
+
+
+class TestLogin:
+    @pytest.mark.asyncio
+    async def test_clean(self, arm_backend):
+        _, state, _ = arm_backend
+
+        result = await login_service_principal(MOCK_CREDENTIALS)
+
+        assert state.token_requests == 1
+        assert result[0]["id"] == SUBSCRIPTION_ID
+        assert result[0]["name"] == SUBSCRIPTION_NAME
+
+    @pytest.mark.asyncio
+    async def test_fallback_login(self, arm_backend):
+        _, _, fallback = arm_backend
+
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        assert len(fallback.commands) == 1
+        assert fallback.commands[0][0:3] == [
+            "az",
+            "login",
+            "--service-principal",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fallback_login_failed(self, arm_backend):
+        _, _, fallback = arm_backend
+        fallback.returncode = 1
+
+        with pytest.raises(AzureAuthenticationError):
+            await login_service_principal(MOCK_CREDENTIALS)
+
+    @pytest.mark.asyncio
+    async def test_bad_secret(self, arm_backend):
+        bad_credentials = AzureCredentials(
+            name="sp_name",
+            secret="wrong",
+            subscription=SUBSCRIPTION_ID,
+            tenant=TENANT_ID,
+            userid="12345",
+        )
+
+        with pytest.raises(Exception, match=r"authentication failed"):
+            await login_service_principal(bad_credentials)
+
+    @pytest.mark.asyncio
+    async def test_not_logged_in(self, arm_backend):
+        with pytest.raises(Exception, match=r"subscription not found"):
+            await check_exists("some-group", MOCK_SUBSCRIPTION)
+
+
+class TestResourceGroups:
+    @pytest.mark.asyncio
+    async def test_create_delete(self, arm_backend):
+        this_backend, state, _ = arm_backend
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        for x in range(5):
+            await create("g{0}".format(x), "westus2", MOCK_SUBSCRIPTION)
+        await delete("g1", MOCK_SUBSCRIPTION)
+
+        assert sorted(state.resource_groups.keys()) == [
+            "g0",
+            "g2",
+            "g3",
+            "g4",
+        ]
+        # single token, pooled connections.
+        assert state.token_requests == 1
+        assert this_backend.connections_opened <= 2
+
+    @pytest.mark.asyncio
+    async def test_tagged(self, arm_backend):
+        _, state, _ = arm_backend
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        await create(
+            "g0", "westus2", MOCK_SUBSCRIPTION, tags={"foodx-validation": "1"}
+        )
+
+        assert state.resource_groups["g0"]["tags"] == {"foodx-validation": "1"}
+
+    @pytest.mark.asyncio
+    async def test_paged_list(self, arm_backend):
+        _, state, _ = arm_backend
+        await login_service_principal(MOCK_CREDENTIALS)
+        for x in range(5):
+            state.resource_groups["g{0}".format(x)] = {
+                "id": "/subscriptions/{0}/resourceGroups/g{1}".format(
+                    SUBSCRIPTION_ID, x
+                ),
+                "name": "g{0}".format(x),
+            }
+
+        result = await check_exists("g4", MOCK_SUBSCRIPTION)
+
+        assert result["name"] == "g4"
+
+    @pytest.mark.asyncio
+    async def test_throttled(self, arm_backend):
+        _, state, _ = arm_backend
+        await login_service_principal(MOCK_CREDENTIALS)
+        state.throttle_count = 2
+
+        await create("g0", "westus2", MOCK_SUBSCRIPTION)
+
+        assert "g0" in state.resource_groups
+
+
+class TestDeploy:
+    @pytest.mark.asyncio
+    async def test_clean(self, arm_backend, arm_files):
+        _, state, _ = arm_backend
+        template_path, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        result = await deploy(
+            "g0",
+            template_path,
+            parameters_path,
+            "westus2",
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+            deployment_name="d0",
+            override_parameters={"p2": "two"},
+        )
+
+        deployment = state.deployments[("g0", "d0")]
+        assert deployment["properties"]["parameters"] == {
+            "p1": {"value": 1},
+            "p2": {"value": "two"},
+        }
+        assert ("GET", "/operations/op0/status") in state.requests
+        assert result == {"p1": 1}
+
+    @pytest.mark.asyncio
+    async def test_no_wait(self, arm_backend, arm_files):
+        _, state, fallback = arm_backend
+        template_path, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+        previous = set_deployment_poller(
+            DeploymentPoller(poll_interval_seconds=0)
+        )
+        try:
+            result = await deploy(
+                "g0",
+                template_path,
+                parameters_path,
+                "westus2",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+                deployment_name="d0",
+            )
+        finally:
+            set_deployment_poller(previous)
+
+        assert ("g0", "d0") in state.deployments
+        assert ("GET", "/operations/op0/status") not in state.requests
+        # the completed deployment is served by the REST backend.
+        assert (
+            "GET",
+            "/subscriptions/{0}/resourcegroups/g0/providers/"
+            "Microsoft.Resources/deployments/d0".format(SUBSCRIPTION_ID),
+        ) in state.requests
+        assert [x[1] for x in fallback.commands] == ["login"]
+        assert result == {"p1": 1}
+
+    @pytest.mark.asyncio
+    async def test_failed(self, arm_backend, arm_files):
+        template_path, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        with pytest.raises(CommandError, match=r"simulated failure"):
+            await deploy(
+                "g0",
+                template_path,
+                parameters_path,
+                "westus2",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+                override_parameters={"fail": True},
+            )
+
+    @pytest.mark.asyncio
+    async def test_validate(self, arm_backend, arm_files):
+        template_path, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        await deploy(
+            "g0",
+            template_path,
+            parameters_path,
+            "westus2",
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+            validate=True,
+        )
+        with pytest.raises(CommandError, match=r"InvalidTemplate"):
+            await deploy(
+                "g0",
+                template_path,
+                parameters_path,
+                "westus2",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+                override_parameters={"invalid": True},
+                validate=True,
+            )
+
+    @pytest.mark.asyncio
+    async def test_bicep_fallback(self, arm_backend, arm_files):
+        _, state, fallback = arm_backend
+        _, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        await deploy(
+            "g0",
+            pathlib.Path("template.bicep"),
+            parameters_path,
+            "westus2",
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+        )
+
+        assert fallback.commands[0][0:2] == ["az", "login"]
+        assert fallback.commands[1][0:4] == [
+            "az",
+            "deployment",
+            "group",
+            "create",
+        ]
+        assert "g0" in state.resource_groups
+
+    @pytest.mark.asyncio
+    async def test_missing_template(self, arm_backend, arm_files, tmp_path):
+        _, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+
+        with pytest.raises(CommandError, match=r"No such file"):
+            await deploy(
+                "g0",
+                tmp_path / "missing.json",
+                parameters_path,
+                "westus2",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+            )
+
+    @pytest.mark.asyncio
+    async def test_show_missing(self, arm_backend):
+        under_test, _, fallback = arm_backend
+        await login_service_principal(MOCK_CREDENTIALS)
+        await create("g0", "westus2", MOCK_SUBSCRIPTION)
+
+        result = await under_test.run(
+            [
+                "az",
+                "deployment",
+                "group",
+                "show",
+                "--name",
+                "d0",
+                "--resource-group",
+                "g0",
+                "--subscription",
+                SUBSCRIPTION_NAME,
+            ]
+        )
+
+        assert result.returncode == 1
+        assert b"DeploymentNotFound" in result.error
+        assert [x[1] for x in fallback.commands] == ["login"]
+
+
+class TestLastDeploymentOutputs:
+    @pytest.mark.asyncio
+    async def test_clean(self, arm_backend, arm_files):
+        _, state, _ = arm_backend
+        template_path, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+        for this_name in ["app_step_123", "app_step_other_123"]:
+            await deploy(
+                "g0",
+                template_path,
+                parameters_path,
+                "westus2",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+                deployment_name=this_name,
+            )
+        state.deployments[("g0", "app_step_other_123")]["properties"][
+            "outputs"
+        ] = {"p1": {"type": "int", "value": 2}}
+
+        result = await last_deployment_outputs(
+            "g0", "app_step_", MOCK_SUBSCRIPTION
+        )
+
+        assert result == {"p1": 1}
+
+    @pytest.mark.asyncio
+    async def test_none(self, arm_backend):
+        await login_service_principal(MOCK_CREDENTIALS)
+        await create("g0", "westus2", MOCK_SUBSCRIPTION)
+
+        result = await last_deployment_outputs(
+            "g0", "app_step_", MOCK_SUBSCRIPTION
+        )
+
+        assert result is None
+
+
+class TestWhatIf:
+    @pytest.mark.asyncio
+    async def test_repeat_noop(self, arm_backend, arm_files):
+        template_path, parameters_path = arm_files
+        await login_service_principal(MOCK_CREDENTIALS)
+        await create("g0", "westus2", MOCK_SUBSCRIPTION)
+
+        before = await what_if(
+            "g0",
+            template_path,
+            parameters_path,
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+            deployment_name="d0",
+        )
+        await deploy(
+            "g0",
+            template_path,
+            parameters_path,
+            "westus2",
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+            deployment_name="d0",
+        )
+        after = await what_if(
+            "g0",
+            template_path,
+            parameters_path,
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+            deployment_name="d0",
+        )
+
+        assert before.changes == {"Create": 1}
+        assert after.is_noop
+
+
+class TestResourceList:
+    @pytest.mark.asyncio
+    async def test_filtered(self, arm_backend):
+        _, state, _ = arm_backend
+        await login_service_principal(MOCK_CREDENTIALS)
+        state.resources = [
+            {"name": "r1", "location": "westus2", "tags": {"a": "1"}},
+            {"name": "r2", "location": "westus2", "tags": None},
+            {"name": "r1", "location": "eastus", "tags": {"a": "2"}},
+        ]
+
+        assert len(await list_resources(MOCK_SUBSCRIPTION, name="r1")) == 2
+        assert len(await list_resources(MOCK_SUBSCRIPTION, tag="a=1")) == 1
+        assert (
+            len(
+                await list_resources(
+                    MOCK_SUBSCRIPTION, name="r1", location="eastus"
+                )
+            )
+            == 1
+        )
@@ -0,0 +1,156 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+
+import pytest
+
+from foodx_devops_tools.azure.cloud import AzureSubscriptionConfiguration
+from foodx_devops_tools.azure.cloud.deployment_history import (
+    DeploymentHistoryError,
+    deployment_step_name,
+    prune_deployment_history,
+    select_prunable,
+)
+from foodx_devops_tools.utilities import CapturedStreams
+from foodx_devops_tools.utilities.exceptions import CommandError
+
+SUBSCRIPTION_1 = AzureSubscriptionConfiguration(subscription_id="sub1")
+
+
+def _deployment(name, timestamp, state="Succeeded"):
+    return {
+        "name": name,
+        "properties": {"provisioningState": state, "timestamp": timestamp},
+    }
+
+
+MOCK_HISTORY = [
+    _deployment("app_step1_100", "2022-03-01T00:00:00Z"),
+    _deployment("app_step1_101", "2022-03-02T00:00:00Z"),
+    _deployment("app_step1_102", "2022-03-03T00:00:00Z"),
+    _deployment("app_step2_100", "2022-03-01T00:00:00Z"),
+    _deployment("app_102", "2022-03-03T00:00:00Z"),
+]
+
+
+class MockAz:
+    def __init__(self, groups, history, fail_list=None):
+        self.groups = groups
+        self.history = history
+        self.fail_list = fail_list
+        self.deleted = list()
+
+    async def run(self, command):
+        if command[1:3] == ["group", "list"]:
+            return CapturedStreams(
+                out=json.dumps(
+                    [
+                        {
+                            "id": "/subscriptions/abc-123/resourceGroups/"
+                            "{0}".format(x),
+                            "name": x,
+                        }
+                        for x in self.groups
+                    ]
+                ),
+                error="",
+            )
+
+        group = command[command.index("--resource-group") + 1]
+        if command[1:4] == ["deployment", "group", "list"]:
+            if group == self.fail_list:
+                raise CommandError("some error")
+            return CapturedStreams(out=json.dumps(self.history), error="")
+        elif command[1:4] == ["deployment", "group", "delete"]:
+            assert command[-1] == "--no-wait"
+            self.deleted.append((group, command[command.index("--name") + 1]))
+            return CapturedStreams(out="", error="")
+
+
+@pytest.fixture()
+def mock_az(mock_async_method):
+    def _apply(groups, history, fail_list=None):
+        this_az = MockAz(groups, history, fail_list=fail_list)
+        for this_path in [
+            "foodx_devops_tools.azure.cloud.resource_group.run_async_command",
+            "foodx_devops_tools.azure.cloud.deployment_history"
+            ".run_async_command",
+        ]:
+            mock_async_method(this_path, side_effect=this_az.run)
+
+        return this_az
+
+    return _apply
+
+
+class TestDeploymentStepName:
+    def test_clean(self):
+        assert deployment_step_name("app_step_123") == "app_step"
+        assert deployment_step_name("app_123") == "app"
+        assert deployment_step_name("template") == "template"
+
+
+class TestSelectPrunable:
+    def test_clean(self):
+        result = select_prunable(MOCK_HISTORY, 1)
+
+        assert result == ["app_step1_100", "app_step1_101"]
+
+    def test_retain_all(self):
+        assert select_prunable(MOCK_HISTORY, 3) == list()
+
+    def test_running_retained(self):
+        history = MOCK_HISTORY + [
+            _deployment("app_step2_099", "2022-02-28T00:00:00Z", "Running")
+        ]
+
+        result = select_prunable(history, 0)
+
+        assert "app_step2_099" not in result
+        assert "app_step2_100" in result
+
+
+class TestPruneDeploymentHistory:
+    @pytest.mark.asyncio
+    async def test_clean(self, mock_az):
+        this_az = mock_az(["g1", "g2", "other"], MOCK_HISTORY)
+
+        result = await prune_deployment_history(
+            [SUBSCRIPTION_1], {"g1", "g2", "absent"}, retain_count=2
+        )
+
+        assert result == {
+            ("sub1", "g1"): ["app_step1_100"],
+            ("sub1", "g2"): ["app_step1_100"],
+        }
+        assert sorted(this_az.deleted) == [
+            ("g1", "app_step1_100"),
+            ("g2", "app_step1_100"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_dry_run(self, mock_az):
+        this_az = mock_az(["g1"], MOCK_HISTORY)
+
+        result = await prune_deployment_history(
+            [SUBSCRIPTION_1], {"g1"}, retain_count=2, dry_run=True
+        )
+
+        assert result == {("sub1", "g1"): ["app_step1_100"]}
+        assert not this_az.deleted
+
+    @pytest.mark.asyncio
+    async def test_failed_group(self, mock_az):
+        this_az = mock_az(["g1", "g2"], MOCK_HISTORY, fail_list="g1")
+
+        with pytest.raises(DeploymentHistoryError, match=r"failed, g1$"):
+            await prune_deployment_history(
+                [SUBSCRIPTION_1], {"g1", "g2"}, retain_count=2
+            )
+
+        assert this_az.deleted == [("g2", "app_step1_100")]
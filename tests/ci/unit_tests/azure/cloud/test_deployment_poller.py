@@ -0,0 +1,224 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import asyncio
+import json
+
+import pytest
+
+from foodx_devops_tools.azure.cloud import AzureSubscriptionConfiguration
+from foodx_devops_tools.azure.cloud.deployment_poller import (
+    DeploymentPoller,
+    DeploymentPollError,
+)
+from foodx_devops_tools.utilities import CapturedStreams
+from foodx_devops_tools.utilities.exceptions import CommandError
+
+MOCK_SUBSCRIPTION = AzureSubscriptionConfiguration(subscription_id="123-abc")
+
+MOCK_RUN = "foodx_devops_tools.azure.cloud.deployment_poller.run_async_command"
+
+
+def _output(data) -> CapturedStreams:
+    return CapturedStreams(out=json.dumps(data), error="")
+
+
+class MockDeployments:
+    """Deployment states advancing on each resource group list query."""
+
+    def __init__(self, *polls):
+        self.polls = list(polls)
+        self.states = dict()
+        self.commands = list()
+
+    async def run(self, command):
+        self.commands.append(command)
+        if command[3] == "list":
+            if isinstance(self.polls[0], Exception):
+                raise self.polls.pop(0)
+            if len(self.polls) > 1:
+                self.states = self.polls.pop(0)
+            else:
+                self.states = self.polls[0]
+            return _output(
+                [
+                    {"name": k, "properties": {"provisioningState": v}}
+                    for k, v in self.states.items()
+                    if v == "Running"
+                ]
+            )
+
+        name = command[command.index("--name") + 1]
+        if name not in self.states:
+            raise CommandError("deployment not found")
+        return _output(
+            {
+                "name": name,
+                "properties": {"provisioningState": self.states[name]},
+            }
+        )
+
+    def count(self, action):
+        return len([x for x in self.commands if x[3] == action])
+
+
+class TestDeploymentPoller:
+    @pytest.mark.asyncio
+    async def test_succeeded(self, mock_async_method):
+        mock_deployments = MockDeployments(
+            {"d1": "Running", "d2": "Running"},
+            {"d1": "Succeeded", "d2": "Running"},
+            {"d1": "Succeeded", "d2": "Succeeded"},
+        )
+        mock_async_method(MOCK_RUN, side_effect=mock_deployments.run)
+        under_test = DeploymentPoller(poll_interval_seconds=0)
+
+        results = await asyncio.gather(
+            under_test.wait("g1", "d1", MOCK_SUBSCRIPTION),
+            under_test.wait("g1", "d2", MOCK_SUBSCRIPTION),
+        )
+        await under_test.stop()
+
+        assert [x["name"] for x in results] == ["d1", "d2"]
+        # one list query per poll of the resource group, and one show query
+        # per deployment once it is no longer running.
+        assert mock_deployments.count("list") == 3
+        assert mock_deployments.count("show") == 2
+        assert under_test.queries == 5
+        assert under_test.pending == 0
+        assert all(
+            x[-2:] == ["--filter", "provisioningState eq 'Running'"]
+            for x in mock_deployments.commands
+            if x[3] == "list"
+        )
+
+    @pytest.mark.asyncio
+    async def test_batched_per_group(self, mock_async_method, mocker):
+        mock_deployments = MockDeployments({"d1": "Running", "d2": "Running"})
+        mock_async_method(MOCK_RUN, side_effect=mock_deployments.run)
+        under_test = DeploymentPoller(poll_interval_seconds=0)
+        waits = asyncio.gather(
+            under_test.wait("g1", "d1", MOCK_SUBSCRIPTION),
+            under_test.wait("g1", "d2", MOCK_SUBSCRIPTION),
+            under_test.wait("g2", "d1", MOCK_SUBSCRIPTION),
+        )
+        while mock_deployments.count("list") < 2:
+            await asyncio.sleep(0)
+
+        await under_test.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await waits
+
+        first_poll = mock_deployments.commands[0:2]
+        assert sorted(x[5] for x in first_poll) == ["g1", "g2"]
+        assert mock_deployments.count("show") == 0
+
+    @pytest.mark.asyncio
+    async def test_failed(self, mock_async_method):
+        mock_deployments = MockDeployments({"d1": "Failed"})
+        mock_async_method(MOCK_RUN, side_effect=mock_deployments.run)
+        under_test = DeploymentPoller(poll_interval_seconds=0)
+
+        with pytest.raises(DeploymentPollError, match=r"^deployment failed"):
+            await under_test.wait("g1", "d1", MOCK_SUBSCRIPTION)
+        await under_test.stop()
+
+    @pytest.mark.asyncio
+    async def test_missing(self, mock_async_method):
+        mock_deployments = MockDeployments(dict())
+        mock_async_method(MOCK_RUN, side_effect=mock_deployments.run)
+        under_test = DeploymentPoller(
+            poll_interval_seconds=0, missing_poll_limit=3
+        )
+
+        with pytest.raises(DeploymentPollError, match=r"not found"):
+            await under_test.wait("g1", "d1", MOCK_SUBSCRIPTION)
+        await under_test.stop()
+
+        assert mock_deployments.count("list") == 3
+        assert mock_deployments.count("show") == 3
+
+    @pytest.mark.asyncio
+    async def test_query_error_retried(self, mock_async_method):
+        mock_deployments = MockDeployments(
+            CommandError("some error"), {"d1": "Succeeded"}
+        )
+        mock_async_method(MOCK_RUN, side_effect=mock_deployments.run)
+        under_test = DeploymentPoller(poll_interval_seconds=0)
+
+        await under_test.wait("g1", "d1", MOCK_SUBSCRIPTION)
+        await under_test.stop()
+
+        assert mock_deployments.count("list") == 2
+        assert mock_deployments.count("show") == 1
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_list(self, mock_async_method):
+        deployment = {
+            "name": "d1",
+            "properties": {"provisioningState": "Succeeded"},
+        }
+        mock_run = mock_async_method(
+            MOCK_RUN,
+            side_effect=[_output([deployment]), _output(deployment)],
+        )
+        under_test = DeploymentPoller(poll_interval_seconds=0)
+
+        result = await under_test.wait("g1", "d1", MOCK_SUBSCRIPTION)
+        await under_test.stop()
+
+        # a terminal deployment in the list is not treated as running.
+        assert result == deployment
+        assert mock_run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels(self, mock_async_method):
+        mock_deployments = MockDeployments({"d1": "Running"})
+        mock_async_method(MOCK_RUN, side_effect=mock_deployments.run)
+        under_test = DeploymentPoller(poll_interval_seconds=0)
+        this_wait = asyncio.ensure_future(
+            under_test.wait("g1", "d1", MOCK_SUBSCRIPTION)
+        )
+        await asyncio.sleep(0.01)
+
+        await under_test.stop()
+
+        with pytest.raises(asyncio.CancelledError):
+            await this_wait
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limited(self, mocker):
+        mock_deployments = MockDeployments(
+            {"d1": "Succeeded", "d2": "Succeeded", "d3": "Succeeded"}
+        )
+        active = list()
+        peak = list()
+
+        async def _run(command):
+            active.append(command)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(command)
+            return await mock_deployments.run(command)
+
+        mocker.patch(MOCK_RUN, side_effect=_run)
+        under_test = DeploymentPoller(
+            poll_interval_seconds=0, maximum_concurrency=2
+        )
+
+        await asyncio.gather(
+            *[
+                under_test.wait(x, y, MOCK_SUBSCRIPTION)
+                for x in ["g1", "g2", "g3"]
+                for y in ["d1", "d2", "d3"]
+            ]
+        )
+        await under_test.stop()
+
+        assert max(peak) == 2
+        assert mock_deployments.count("list") == 3
+        assert mock_deployments.count("show") == 9
@@ -11,24 +11,43 @@
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
 import asyncio
+import json
 import pathlib
 import re
+import unittest.mock
 
 import pytest
 
 from foodx_devops_tools.azure.cloud import AzureSubscriptionConfiguration
+from foodx_devops_tools.azure.cloud.deployment_poller import (
+    DeploymentPoller,
+    set_deployment_poller,
+)
 from foodx_devops_tools.azure.cloud.exceptions import ResourceGroupError
-from foodx_devops_tools.azure.cloud.resource_group import AZURE_GROUP_ID_PATTERN
+from foodx_devops_tools.azure.cloud.resource_group import (
+    AZURE_GROUP_ID_PATTERN,
+    WhatIfSummary,
+)
 from foodx_devops_tools.azure.cloud.resource_group import (
     check_exists as resource_group_exists,
 )
 from foodx_devops_tools.azure.cloud.resource_group import (
     create as create_resource_group,
 )
+from foodx_devops_tools.azure.cloud.resource_group import (
+    create_all as create_all_resource_groups,
+)
+from foodx_devops_tools.azure.cloud.resource_group import (
+    delete as delete_resource_group,
+)
 from foodx_devops_tools.azure.cloud.resource_group import (
     deploy as deploy_resource_group,
 )
+from foodx_devops_tools.azure.cloud.resource_group import (
+    what_if as what_if_resource_group,
+)
 from foodx_devops_tools.utilities import CapturedStreams
+from foodx_devops_tools.utilities.exceptions import CommandError
 
 MOCK_SUBSCRIPTION = AzureSubscriptionConfiguration(
     subscription_id="123-abc", tenant_id="abc-123"
@@ -196,6 +215,50 @@ class TestCreateResourceGroup:
 
         mock_run.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_concurrent_single_creation(self, mock_async_method):
+        async def _slow_create(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return self.MOCK_RETURN
+
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"], side_effect=_slow_create
+        )
+        mock_async_method(MOCKING_PATHS["group_exists"], return_value=None)
+
+        await asyncio.gather(
+            *[
+                create_resource_group(
+                    "some-name", "canadacentral", MOCK_SUBSCRIPTION
+                )
+                for _ in range(3)
+            ]
+        )
+
+        mock_run.assert_called_once()
+
+
+class TestCreateAllResourceGroups:
+    @pytest.mark.asyncio
+    async def test_failures(self, mock_async_method):
+        async def _create(command):
+            if command[4] == "bad-group":
+                raise CommandError("some error")
+            return CapturedStreams(out="", error="")
+
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"], side_effect=_create
+        )
+        mock_async_method(MOCKING_PATHS["group_exists"], return_value=None)
+
+        result = await create_all_resource_groups(
+            {"g1": "l1", "bad-group": "l1", "g2": "l2"}, MOCK_SUBSCRIPTION
+        )
+
+        assert list(result.keys()) == ["bad-group"]
+        assert isinstance(result["bad-group"], CommandError)
+        assert mock_run.call_count == 3
+
 
 class TestDeployResourceGroup:
     MOCK_SUBSCRIPTION = AzureSubscriptionConfiguration(
@@ -250,6 +313,62 @@ class TestDeployResourceGroup:
             ]
         )
 
+    @pytest.mark.asyncio
+    async def test_outputs(self, mock_async_method):
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.create"
+        )
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.run_async_command",
+            return_value=CapturedStreams(
+                out=json.dumps(
+                    {
+                        "properties": {
+                            "outputs": {
+                                "hostname": {
+                                    "type": "String",
+                                    "value": "h1.some.where",
+                                },
+                            },
+                        },
+                    }
+                ),
+                error="",
+            ),
+        )
+
+        result = await deploy_resource_group(
+            self.EXPECTED_PARAMETERS["group"],
+            self.EXPECTED_PARAMETERS["arm_path"],
+            self.EXPECTED_PARAMETERS["parameter_path"],
+            self.EXPECTED_PARAMETERS["location"],
+            self.EXPECTED_PARAMETERS["mode"],
+            self.EXPECTED_PARAMETERS["subscription"],
+        )
+
+        assert result == {"hostname": "h1.some.where"}
+
+    @pytest.mark.asyncio
+    async def test_unparseable_outputs(self, mock_async_method):
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.create"
+        )
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.run_async_command",
+            return_value=self.MOCK_RETURN,
+        )
+
+        result = await deploy_resource_group(
+            self.EXPECTED_PARAMETERS["group"],
+            self.EXPECTED_PARAMETERS["arm_path"],
+            self.EXPECTED_PARAMETERS["parameter_path"],
+            self.EXPECTED_PARAMETERS["location"],
+            self.EXPECTED_PARAMETERS["mode"],
+            self.EXPECTED_PARAMETERS["subscription"],
+        )
+
+        assert result == dict()
+
     @pytest.mark.asyncio
     async def test_deployment_name(self, mock_async_method):
         mock_create = mock_async_method(
@@ -416,3 +535,243 @@ class TestDeployResourceGroup:
                 "@{0}".format(self.EXPECTED_PARAMETERS["parameter_path"]),
             ]
         )
+
+
+class TestResourceGroupIndex:
+    MOCK_LIST = CapturedStreams(
+        out="""[
+  {
+    "id": "/subscriptions/123-abc/resourceGroups/some-name",
+    "location": "canadacentral",
+    "name": "some-name"
+  }
+]
+""",
+        error="",
+    )
+
+    @pytest.mark.asyncio
+    async def test_single_listing(self, mock_async_method):
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            return_value=self.MOCK_LIST,
+        )
+
+        results = await asyncio.gather(
+            resource_group_exists("some-name", MOCK_SUBSCRIPTION),
+            resource_group_exists("other-name", MOCK_SUBSCRIPTION),
+            resource_group_exists("some-name", MOCK_SUBSCRIPTION),
+        )
+        await resource_group_exists("some-name", MOCK_SUBSCRIPTION)
+
+        mock_run.assert_called_once()
+        assert [bool(x) for x in results] == [True, False, True]
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_independent(self, mock_async_method):
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            return_value=self.MOCK_LIST,
+        )
+        other_subscription = AzureSubscriptionConfiguration(
+            subscription_id="456-def"
+        )
+
+        await resource_group_exists("some-name", MOCK_SUBSCRIPTION)
+        await resource_group_exists("some-name", other_subscription)
+
+        assert mock_run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_listing_retried(self, mock_async_method):
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            side_effect=[RuntimeError("some error"), self.MOCK_LIST],
+        )
+
+        with pytest.raises(ResourceGroupError):
+            await resource_group_exists("some-name", MOCK_SUBSCRIPTION)
+        assert await resource_group_exists("some-name", MOCK_SUBSCRIPTION)
+
+        assert mock_run.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_create_updates_index(self, mock_async_method):
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            side_effect=[
+                self.MOCK_LIST,
+                CapturedStreams(out="good run", error=""),
+            ],
+        )
+
+        await create_resource_group(
+            "new-name", "canadacentral", MOCK_SUBSCRIPTION
+        )
+        result = await resource_group_exists("new-name", MOCK_SUBSCRIPTION)
+
+        assert mock_run.call_count == 2
+        assert result == {
+            "id": "/subscriptions/123-abc/resourceGroups/new-name",
+            "location": "canadacentral",
+            "name": "new-name",
+        }
+
+    @pytest.mark.asyncio
+    async def test_delete_updates_index(self, mock_async_method):
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            side_effect=[
+                self.MOCK_LIST,
+                CapturedStreams(out="", error=""),
+            ],
+        )
+
+        await delete_resource_group("some-name", MOCK_SUBSCRIPTION)
+
+        assert not await resource_group_exists("some-name", MOCK_SUBSCRIPTION)
+        assert mock_run.call_count == 2
+
+
+class TestDeployNoWait:
+    @pytest.mark.asyncio
+    async def test_submitted(self, mock_async_method, mocker):
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.create"
+        )
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            return_value=CapturedStreams(out="", error=""),
+        )
+        this_poller = DeploymentPoller()
+        mock_wait = mocker.patch.object(
+            this_poller, "wait", side_effect=unittest.mock.AsyncMock()
+        )
+        previous = set_deployment_poller(this_poller)
+        try:
+            await deploy_resource_group(
+                "some_group",
+                pathlib.Path("arm_path.json"),
+                pathlib.Path("parameter_path.json"),
+                "some location",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+            )
+        finally:
+            set_deployment_poller(previous)
+
+        this_command = mock_run.call_args[0][0]
+        assert this_command[-3:] == ["--name", "arm_path", "--no-wait"]
+        mock_wait.assert_called_once_with(
+            "some_group", "arm_path", MOCK_SUBSCRIPTION
+        )
+
+    @pytest.mark.asyncio
+    async def test_validation_waits(self, mock_async_method):
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.create"
+        )
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            return_value=CapturedStreams(out="", error=""),
+        )
+        previous = set_deployment_poller(DeploymentPoller())
+        try:
+            await deploy_resource_group(
+                "some_group",
+                pathlib.Path("arm_path.json"),
+                pathlib.Path("parameter_path.json"),
+                "some location",
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+                validate=True,
+            )
+        finally:
+            set_deployment_poller(previous)
+
+        assert "--no-wait" not in mock_run.call_args[0][0]
+
+
+class TestWhatIf:
+    @pytest.mark.asyncio
+    async def test_changes(self, mock_async_method):
+        mock_run = mock_async_method(
+            MOCKING_PATHS["run_async"],
+            return_value=CapturedStreams(
+                out="""{"status": "Succeeded", "changes": [
+                    {"changeType": "Create"},
+                    {"changeType": "Modify"},
+                    {"changeType": "NoChange"},
+                    {"changeType": "Create"}
+                ]}""",
+                error="",
+            ),
+        )
+
+        result = await what_if_resource_group(
+            "some_group",
+            pathlib.Path("arm_path.json"),
+            pathlib.Path("parameter_path.json"),
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+            deployment_name="some_name",
+            override_parameters={"p1": "v1"},
+        )
+
+        assert result.changes == {"Create": 2, "Modify": 1, "NoChange": 1}
+        assert not result.is_noop
+        assert str(result) == "2 Create, 1 Modify"
+        this_command = mock_run.call_args[0][0]
+        assert this_command[0:4] == ["az", "deployment", "group", "what-if"]
+        assert this_command[-5:] == [
+            "--name",
+            "some_name",
+            "--no-pretty-print",
+            "--parameters",
+            '{"p1": {"value": "v1"}}',
+        ]
+
+    @pytest.mark.asyncio
+    async def test_noop(self, mock_async_method):
+        mock_async_method(
+            MOCKING_PATHS["run_async"],
+            return_value=CapturedStreams(
+                out="""{"status": "Succeeded", "changes": [
+                    {"changeType": "NoChange"},
+                    {"changeType": "Ignore"}
+                ]}""",
+                error="",
+            ),
+        )
+
+        result = await what_if_resource_group(
+            "some_group",
+            pathlib.Path("arm_path.json"),
+            pathlib.Path("parameter_path.json"),
+            "Incremental",
+            MOCK_SUBSCRIPTION,
+        )
+
+        assert result.is_noop
+        assert str(result) == "no changes"
+
+    @pytest.mark.asyncio
+    async def test_raises(self, mock_async_method):
+        mock_async_method(
+            MOCKING_PATHS["run_async"],
+            side_effect=CommandError("some error"),
+        )
+
+        with pytest.raises(
+            ResourceGroupError, match=r"^Problem predicting deployment changes"
+        ):
+            await what_if_resource_group(
+                "some_group",
+                pathlib.Path("arm_path.json"),
+                pathlib.Path("parameter_path.json"),
+                "Incremental",
+                MOCK_SUBSCRIPTION,
+            )
+
+    def test_empty_summary(self):
+        assert WhatIfSummary().is_noop
@@ -0,0 +1,139 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+
+import pytest
+
+from foodx_devops_tools.azure.cloud import AzureSubscriptionConfiguration
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    ResourceGroupCleanup,
+    get_resource_group_cleanup,
+    reap_resource_groups,
+    set_resource_group_cleanup,
+)
+from foodx_devops_tools.utilities import CapturedStreams
+from foodx_devops_tools.utilities.exceptions import CommandError
+
+MOCK_RUN_PATH = (
+    "foodx_devops_tools.azure.cloud.resource_group.run_async_command"
+)
+
+SUBSCRIPTION_1 = AzureSubscriptionConfiguration(subscription_id="sub1")
+SUBSCRIPTION_2 = AzureSubscriptionConfiguration(subscription_id="sub2")
+
+
+def _group_list(names):
+    return json.dumps(
+        [
+            {
+                "id": "/subscriptions/abc-123/resourceGroups/{0}".format(x),
+                "name": x,
+            }
+            for x in names
+        ]
+    )
+
+
+class MockAz:
+    def __init__(self, groups, fail_delete=None):
+        self.groups = groups
+        self.fail_delete = fail_delete
+        self.deleted = list()
+
+    async def run(self, command):
+        subscription = command[command.index("--subscription") + 1]
+        if command[1:3] == ["group", "list"]:
+            return CapturedStreams(
+                out=_group_list(self.groups[subscription]), error=""
+            )
+        elif command[1:3] == ["group", "delete"]:
+            assert command[-1] == "--no-wait"
+            name = command[command.index("--resource-group") + 1]
+            if name == self.fail_delete:
+                raise CommandError("some error")
+            self.deleted.append((subscription, name))
+            return CapturedStreams(out="", error="")
+
+
+class TestResourceGroupCleanup:
+    @pytest.mark.asyncio
+    async def test_delete_all(self, mock_async_method):
+        this_az = MockAz({"sub1": ["g1", "g2", "g3"], "sub2": ["g1"]})
+        mock_async_method(MOCK_RUN_PATH, side_effect=this_az.run)
+        under_test = ResourceGroupCleanup()
+        under_test.register("g1", SUBSCRIPTION_1)
+        under_test.register("g2", SUBSCRIPTION_1)
+        under_test.register("g1", SUBSCRIPTION_1)
+        under_test.register("g1", SUBSCRIPTION_2)
+
+        assert under_test.pending == 3
+
+        result = await under_test.delete_all()
+
+        assert result == dict()
+        assert sorted(this_az.deleted) == [
+            ("sub1", "g1"),
+            ("sub1", "g2"),
+            ("sub2", "g1"),
+        ]
+        assert under_test.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_failures(self, mock_async_method):
+        this_az = MockAz({"sub1": ["g1", "g2"]}, fail_delete="g1")
+        mock_async_method(MOCK_RUN_PATH, side_effect=this_az.run)
+        under_test = ResourceGroupCleanup()
+        under_test.register("g1", SUBSCRIPTION_1)
+        under_test.register("g2", SUBSCRIPTION_1)
+
+        result = await under_test.delete_all()
+
+        assert list(result.keys()) == [("sub1", "g1")]
+        assert this_az.deleted == [("sub1", "g2")]
+
+    def test_installed(self):
+        this_cleanup = ResourceGroupCleanup()
+        previous = set_resource_group_cleanup(this_cleanup)
+        try:
+            assert get_resource_group_cleanup() is this_cleanup
+        finally:
+            set_resource_group_cleanup(previous)
+
+        assert get_resource_group_cleanup() is previous
+
+
+class TestReapResourceGroups:
+    @pytest.mark.asyncio
+    async def test_clean(self, mock_async_method):
+        this_az = MockAz(
+            {"sub1": ["g1-123", "g1", "g2-456"], "sub2": ["g3-789"]}
+        )
+        mock_async_method(MOCK_RUN_PATH, side_effect=this_az.run)
+
+        result = await reap_resource_groups(
+            [SUBSCRIPTION_1, SUBSCRIPTION_2], lambda x, _: "-" in x
+        )
+
+        assert result == {"sub1": ["g1-123", "g2-456"], "sub2": ["g3-789"]}
+        assert sorted(this_az.deleted) == [
+            ("sub1", "g1-123"),
+            ("sub1", "g2-456"),
+            ("sub2", "g3-789"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_dry_run(self, mock_async_method):
+        this_az = MockAz({"sub1": ["g1-123", "g1"]})
+        mock_async_method(MOCK_RUN_PATH, side_effect=this_az.run)
+
+        result = await reap_resource_groups(
+            [SUBSCRIPTION_1], lambda x, _: "-" in x, dry_run=True
+        )
+
+        assert result == {"sub1": ["g1-123"]}
+        assert not this_az.deleted
@@ -0,0 +1,140 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+
+import pytest
+
+from foodx_devops_tools.azure_maintenance import azure_maintenance
+from foodx_devops_tools.pipeline_config import PipelineConfiguration
+from foodx_devops_tools.utilities import (
+    CapturedStreams,
+    forward_termination_signals,
+)
+from tests.ci.support.click_runner import click_runner  # noqa: F401
+from tests.ci.support.pipeline_config import MOCK_RESULTS
+
+MOCK_HISTORY = [
+    {
+        "name": "a1_s1_{0}".format(x),
+        "properties": {
+            "provisioningState": "Succeeded",
+            "timestamp": "2022-03-0{0}T00:00:00Z".format(x),
+        },
+    }
+    for x in range(1, 4)
+]
+
+
+@pytest.fixture()
+def prep_data(mock_async_method, mocker):
+    mocker.patch(
+        "foodx_devops_tools.azure_maintenance._prune.load_configuration",
+        return_value=PipelineConfiguration.parse_obj(MOCK_RESULTS),
+    )
+    mock_async_method(
+        "foodx_devops_tools.azure_maintenance._subscriptions"
+        ".login_service_principal"
+    )
+    deleted = list()
+
+    async def _az(command):
+        if command[1:3] == ["group", "list"]:
+            return CapturedStreams(
+                out=json.dumps(
+                    [
+                        {
+                            "id": "/subscriptions/abc/resourceGroups/"
+                            "{0}".format(x),
+                            "name": x,
+                        }
+                        for x in ["c1-a1_group", "unrelated"]
+                    ]
+                ),
+                error="",
+            )
+        elif command[1:4] == ["deployment", "group", "delete"]:
+            deleted.append(command[command.index("--name") + 1])
+            return CapturedStreams(out="", error="")
+        return CapturedStreams(out=json.dumps(MOCK_HISTORY), error="")
+
+    for this_path in [
+        "foodx_devops_tools.azure.cloud.resource_group.run_async_command",
+        "foodx_devops_tools.azure.cloud.deployment_history.run_async_command",
+    ]:
+        mock_async_method(this_path, side_effect=_az)
+
+    return deleted
+
+
+class TestPruneDeploymentsSubcommand:
+    def test_clean(self, click_runner, prep_data):
+        deleted = prep_data
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "prune-deployments",
+                "client",
+                "system",
+                "-",
+                "--keep",
+                "1",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        assert deleted == ["a1_s1_1", "a1_s1_2"]
+        assert "sys1_c1_r1a: c1-a1_group: a1_s1_1" in result.output
+        assert "2 deployments pruned" in result.output
+
+    def test_dry_run(self, click_runner, prep_data):
+        deleted = prep_data
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "prune-deployments",
+                "client",
+                "system",
+                "-",
+                "--keep",
+                "2",
+                "--dry-run",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not deleted
+        assert "1 deployments pruned (dry run)" in result.output
+
+    def test_signals_forwarded(self, click_runner, mocker, prep_data):
+        mock_forward = mocker.patch(
+            "foodx_devops_tools.azure_maintenance._prune"
+            ".forward_termination_signals",
+            wraps=forward_termination_signals,
+        )
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "prune-deployments",
+                "client",
+                "system",
+                "-",
+                "--dry-run",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        mock_forward.assert_called_once_with()
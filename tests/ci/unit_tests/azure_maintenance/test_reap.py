@@ -0,0 +1,209 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+
+import pytest
+
+from foodx_devops_tools.azure_maintenance import azure_maintenance
+from foodx_devops_tools.azure_maintenance._reap import validation_group_matcher
+from foodx_devops_tools.pipeline_config import PipelineConfiguration
+from foodx_devops_tools.utilities import (
+    CapturedStreams,
+    forward_termination_signals,
+)
+from tests.ci.support.click_runner import click_runner  # noqa: F401
+from tests.ci.support.pipeline_config import MOCK_RESULTS
+
+MOCK_GROUPS = {
+    "c1-a1_group": None,
+    "c1-a1_group-123456": "123456",
+    "c1-a1_group-000-local": "000+local",
+    "c2-a1_group-20220315-1": "20220315.1",
+    # tagged with a different pipeline.
+    "c1-a1_group-db": "123456",
+    # untagged.
+    "c1-a1_group-654321": None,
+    "unrelated-123": "123",
+}
+
+
+def _tags(name):
+    pipeline_id = MOCK_GROUPS[name]
+    return {"foodx-validation": pipeline_id} if pipeline_id else dict()
+
+
+@pytest.fixture()
+def mock_configuration():
+    return PipelineConfiguration.parse_obj(MOCK_RESULTS)
+
+
+class TestValidationGroupMatcher:
+    def test_clean(self, mock_configuration):
+        under_test = validation_group_matcher(mock_configuration)
+
+        assert [x for x in MOCK_GROUPS if under_test(x, _tags(x))] == [
+            "c1-a1_group-123456",
+            "c1-a1_group-000-local",
+            "c2-a1_group-20220315-1",
+        ]
+
+    def test_excluded_pipeline(self, mock_configuration):
+        under_test = validation_group_matcher(
+            mock_configuration, exclude_pipeline_ids=["000+local"]
+        )
+
+        assert not under_test(
+            "c1-a1_group-000-local", _tags("c1-a1_group-000-local")
+        )
+        assert under_test("c1-a1_group-123456", _tags("c1-a1_group-123456"))
+
+
+class TestReapValidationSubcommand:
+    @pytest.fixture()
+    def prep_data(self, mock_async_method, mock_configuration, mocker):
+        mocker.patch(
+            "foodx_devops_tools.azure_maintenance._reap.load_configuration",
+            return_value=mock_configuration,
+        )
+        mock_login = mock_async_method(
+            "foodx_devops_tools.azure_maintenance._subscriptions"
+            ".login_service_principal"
+        )
+        deleted = list()
+
+        async def _az(command):
+            if command[1:3] == ["group", "delete"]:
+                deleted.append(command[4])
+                return CapturedStreams(out="", error="")
+            return CapturedStreams(
+                out=json.dumps(
+                    [
+                        {
+                            "id": "/subscriptions/abc/resourceGroups/"
+                            "{0}".format(x),
+                            "name": x,
+                            "tags": _tags(x),
+                        }
+                        for x in MOCK_GROUPS
+                    ]
+                ),
+                error="",
+            )
+
+        mock_async_method(
+            "foodx_devops_tools.azure.cloud.resource_group.run_async_command",
+            side_effect=_az,
+        )
+
+        return mock_login, deleted
+
+    def test_clean(self, click_runner, prep_data):
+        mock_login, deleted = prep_data
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "reap-validation",
+                "client",
+                "system",
+                "-",
+                "--exclude-pipeline-id",
+                "000+local",
+                "--delete",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        mock_login.assert_called_once()
+        assert mock_login.call_args[0][0].subscription == "abc123"
+        assert sorted(deleted) == [
+            "c1-a1_group-123456",
+            "c2-a1_group-20220315-1",
+        ]
+        assert "sys1_c1_r1a: c1-a1_group-123456" in result.output
+
+    def test_dry_run(self, click_runner, prep_data):
+        _, deleted = prep_data
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "reap-validation",
+                "client",
+                "system",
+                "-",
+                "--dry-run",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not deleted
+        assert "3 stale validation resource groups (dry run)" in result.output
+
+    def test_default_dry_run(self, click_runner, prep_data):
+        _, deleted = prep_data
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "reap-validation",
+                "client",
+                "system",
+                "-",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not deleted
+        assert "(dry run)" in result.output
+
+    def test_signals_forwarded(self, click_runner, mocker, prep_data):
+        mock_forward = mocker.patch(
+            "foodx_devops_tools.azure_maintenance._reap"
+            ".forward_termination_signals",
+            wraps=forward_termination_signals,
+        )
+
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "reap-validation",
+                "client",
+                "system",
+                "-",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 0, result.output
+        mock_forward.assert_called_once_with()
+
+    def test_unknown_subscription(self, click_runner, prep_data):
+        result = click_runner.invoke(
+            azure_maintenance,
+            [
+                "--log-disable-file",
+                "reap-validation",
+                "client",
+                "system",
+                "-",
+                "--subscription",
+                "bad_subscription",
+            ],
+            input="password",
+        )
+
+        assert result.exit_code == 1
+        assert "bad_subscription" in result.output
@@ -0,0 +1,191 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+import random
+
+import pytest
+
+from foodx_devops_tools.utilities.command import (
+    CommandBackend,
+    CompletedCommand,
+)
+from tests.benchmark.simulated_az import (
+    CommandProfile,
+    LatencyDistribution,
+    SimulatedAzBackend,
+    SimulationProfile,
+    ThrottlingPolicy,
+    _parse_options,
+)
+
+GROUP_OPTIONS = [
+    "--resource-group",
+    "g1",
+    "--subscription",
+    "s1",
+]
+
+
+class MockFallback(CommandBackend):
+    async def run(self, command):
+        return CompletedCommand(returncode=0, out=b"fallback", error=b"")
+
+
+def test_parse_options():
+    words, options = _parse_options(
+        ["group", "delete", "--resource-group", "g1", "--yes", "--p", "1"]
+    )
+
+    assert words == ["group", "delete"]
+    assert options == {"--resource-group": ["g1"], "--yes": [""], "--p": ["1"]}
+
+
+class TestLatencyDistribution:
+    def test_zero(self):
+        assert LatencyDistribution().sample(random.Random(1)) == 0.0
+
+    def test_constant(self):
+        under_test = LatencyDistribution(median_seconds=2.0)
+
+        assert under_test.sample(random.Random(1)) == 2.0
+
+    def test_lognormal(self):
+        under_test = LatencyDistribution(median_seconds=2.0, sigma=0.5)
+        rng = random.Random(1)
+
+        values = sorted([under_test.sample(rng) for _ in range(1001)])
+
+        assert all([x > 0 for x in values])
+        assert values[500] == pytest.approx(2.0, rel=0.1)
+
+
+class TestSimulatedAzBackend:
+    @pytest.mark.asyncio
+    async def test_group_lifecycle(self):
+        under_test = SimulatedAzBackend()
+
+        result = await under_test.run(
+            ["az", "group", "create", "--location", "l1"] + GROUP_OPTIONS
+        )
+        assert result.returncode == 0
+        result = await under_test.run(
+            ["az", "group", "list", "--subscription", "s1"]
+        )
+        groups = json.loads(result.out)
+        assert [x["name"] for x in groups] == ["g1"]
+        assert groups[0]["id"].endswith("/resourceGroups/g1")
+
+        result = await under_test.run(
+            ["az", "group", "delete", "--yes"] + GROUP_OPTIONS
+        )
+        assert result.returncode == 0
+        assert under_test.resource_groups["s1"] == dict()
+        assert under_test.statistics.commands == {
+            "az group create": 1,
+            "az group list": 1,
+            "az group delete": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_deployment(self):
+        under_test = SimulatedAzBackend()
+        await under_test.run(["az", "group", "create"] + GROUP_OPTIONS)
+
+        result = await under_test.run(
+            ["az", "deployment", "group", "create", "--name", "d1"]
+            + GROUP_OPTIONS
+        )
+
+        assert result.returncode == 0
+        assert json.loads(result.out)["name"] == "d1"
+        assert len(under_test.deployments[("s1", "g1")]) == 1
+
+    @pytest.mark.asyncio
+    async def test_validation_not_recorded(self):
+        under_test = SimulatedAzBackend()
+        await under_test.run(["az", "group", "create"] + GROUP_OPTIONS)
+
+        result = await under_test.run(
+            ["az", "deployment", "group", "validate"] + GROUP_OPTIONS
+        )
+
+        assert result.returncode == 0
+        assert ("s1", "g1") not in under_test.deployments
+
+    @pytest.mark.asyncio
+    async def test_deployment_missing_group(self):
+        under_test = SimulatedAzBackend()
+
+        result = await under_test.run(
+            ["az", "deployment", "group", "create"] + GROUP_OPTIONS
+        )
+
+        assert result.returncode == 3
+        assert b"ResourceGroupNotFound" in result.error
+        assert under_test.statistics.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_unsupported(self):
+        under_test = SimulatedAzBackend()
+
+        result = await under_test.run(["az", "vm", "list"])
+
+        assert result.returncode == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_rate(self):
+        profile = SimulationProfile.instant().with_failure_rate(1.0)
+        under_test = SimulatedAzBackend(profile)
+
+        result = await under_test.run(["az", "login", "--tenant", "t1"])
+
+        assert result.returncode == 1
+        assert b"simulated failure" in result.error
+
+    @pytest.mark.asyncio
+    async def test_throttling(self):
+        profile = SimulationProfile(
+            throttling=ThrottlingPolicy(
+                requests_per_window=2,
+                window_seconds=0.1,
+                retry_after_seconds=0.05,
+            )
+        )
+        under_test = SimulatedAzBackend(profile)
+
+        for _ in range(3):
+            result = await under_test.run(
+                ["az", "group", "list", "--subscription", "s1"]
+            )
+            assert result.returncode == 0
+
+        assert under_test.statistics.throttled >= 1
+
+    @pytest.mark.asyncio
+    async def test_fallback(self):
+        under_test = SimulatedAzBackend(fallback=MockFallback())
+
+        result = await under_test.run(["bash", "-c", "true"])
+
+        assert result.out == b"fallback"
+        assert under_test.statistics.subprocesses == 1
+
+
+class TestSimulationProfile:
+    def test_typical_scale(self):
+        under_test = SimulationProfile.typical(0.5)
+
+        assert under_test.deployment_create.latency.median_seconds == 22.5
+
+    def test_failure_rate(self):
+        under_test = SimulationProfile(
+            login=CommandProfile(failure_rate=0.0)
+        ).with_failure_rate(0.5)
+
+        assert under_test.login.failure_rate == 0.5
+        assert under_test.deployment_validate.failure_rate == 0.5
@@ -5,12 +5,19 @@
 #  You should have received a copy of the MIT License along with
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
+import asyncio
 import copy
 import logging
 
 import pytest
 
 from foodx_devops_tools._to import StructuredTo
+from foodx_devops_tools.azure.cloud.exceptions import ResourceGroupError
+from foodx_devops_tools.azure.cloud.resource_group import WhatIfSummary
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    ResourceGroupCleanup,
+    set_resource_group_cleanup,
+)
 from foodx_devops_tools.deploy_me.application_steps import deploy_step
 
 
@@ -55,6 +62,7 @@ async def test_default_override_parameters(
         deployment_name="app-name_this-step_12345",
         override_parameters=expected_defaults,
         validate=mocker.ANY,
+        tags=mocker.ANY,
     )
 
 
@@ -107,6 +115,7 @@ async def test_secrets_enabled(
         deployment_name="app-name_this-step_12345",
         override_parameters=expected_parameters,
         validate=mocker.ANY,
+        tags=mocker.ANY,
     )
 
 
@@ -124,3 +133,261 @@ async def test_step_skip(caplog, mock_deploystep_context, mock_rg_deploy):
         assert (
             "application step skipped using deployment specifier" in caplog.text
         )
+
+
+MOCK_DEPLOY_PATH = "foodx_devops_tools.deploy_me.application_steps._deploy"
+
+
+class TestWhatIf:
+    @pytest.mark.asyncio
+    async def test_noop_skipped(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".check_exists", return_value={"name": "g"}
+        )
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".what_if_resource_group",
+            return_value=WhatIfSummary(changes={"NoChange": 3}),
+        )
+        mock_outputs = mock_async_method(
+            MOCK_DEPLOY_PATH + ".last_deployment_outputs",
+            return_value={"hostname": "h0"},
+        )
+        deployment_data = mock_deploystep_context["deployment_data"]
+
+        result = await deploy_step(**mock_deploystep_context, what_if=True)
+
+        mock_rg_deploy.assert_not_called()
+        assert result.is_noop
+        assert mock_outputs.call_args[0][1] == "app-name_this-step_"
+        # outputs of the skipped step are available to subsequent steps.
+        parameters = deployment_data.construct_template_parameters()
+        frame_outputs = parameters["context"]["deployments"][
+            deployment_data.context.frame_name
+        ]
+        assert frame_outputs[deployment_data.context.application_name] == {
+            "this_step": {"outputs": {"hostname": "h0"}}
+        }
+
+    @pytest.mark.asyncio
+    async def test_noop_no_previous_deployed(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".check_exists", return_value={"name": "g"}
+        )
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".what_if_resource_group",
+            return_value=WhatIfSummary(changes={"NoChange": 3}),
+        )
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".last_deployment_outputs",
+            side_effect=ResourceGroupError("some error"),
+        )
+
+        result = await deploy_step(**mock_deploystep_context, what_if=True)
+
+        mock_rg_deploy.assert_called_once()
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_changes_deployed(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".check_exists", return_value={"name": "g"}
+        )
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".what_if_resource_group",
+            return_value=WhatIfSummary(changes={"Modify": 1}),
+        )
+
+        result = await deploy_step(**mock_deploystep_context, what_if=True)
+
+        mock_rg_deploy.assert_called_once()
+        assert str(result) == "1 Modify"
+
+    @pytest.mark.asyncio
+    async def test_new_group_deployed(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(MOCK_DEPLOY_PATH + ".check_exists", return_value=None)
+        mock_what_if = mock_async_method(
+            MOCK_DEPLOY_PATH + ".what_if_resource_group"
+        )
+
+        result = await deploy_step(**mock_deploystep_context, what_if=True)
+
+        mock_what_if.assert_not_called()
+        mock_rg_deploy.assert_called_once()
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_failure_deployed(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".check_exists", return_value={"name": "g"}
+        )
+        mock_async_method(
+            MOCK_DEPLOY_PATH + ".what_if_resource_group",
+            side_effect=ResourceGroupError("some error"),
+        )
+
+        result = await deploy_step(**mock_deploystep_context, what_if=True)
+
+        mock_rg_deploy.assert_called_once()
+        assert result is None
+
+
+class TestValidationCleanup:
+    @pytest.mark.asyncio
+    async def test_registered(
+        self,
+        mock_apply_template,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        this_cleanup = ResourceGroupCleanup()
+        previous = set_resource_group_cleanup(this_cleanup)
+        try:
+            await deploy_step(
+                **{**mock_deploystep_context, "enable_validation": True}
+            )
+        finally:
+            set_resource_group_cleanup(previous)
+
+        mock_rg_deploy.assert_called_once()
+        assert this_cleanup.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_not_validation(
+        self,
+        mock_apply_template,
+        mock_deploystep_context,
+        mock_rg_deploy,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        this_cleanup = ResourceGroupCleanup()
+        previous = set_resource_group_cleanup(this_cleanup)
+        try:
+            await deploy_step(**mock_deploystep_context)
+        finally:
+            set_resource_group_cleanup(previous)
+
+        assert this_cleanup.pending == 0
+
+
+class TestDeploymentOutputs:
+    @pytest.mark.asyncio
+    async def test_recorded(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(
+            "foodx_devops_tools.deploy_me.application_steps._deploy"
+            ".deploy_resource_group",
+            return_value={"hostname": "h1"},
+        )
+        deployment_data = mock_deploystep_context["deployment_data"]
+
+        await deploy_step(**mock_deploystep_context)
+
+        result = deployment_data.construct_template_parameters()
+        frame_outputs = result["context"]["deployments"][
+            deployment_data.context.frame_name
+        ]
+        assert frame_outputs[deployment_data.context.application_name] == {
+            "this_step": {"outputs": {"hostname": "h1"}}
+        }
+
+    @pytest.mark.asyncio
+    async def test_validation_not_recorded(
+        self,
+        mock_apply_template,
+        mock_async_method,
+        mock_deploystep_context,
+        mock_run_puff,
+        mock_verify_puff_target,
+    ):
+        mock_async_method(
+            "foodx_devops_tools.deploy_me.application_steps._deploy"
+            ".deploy_resource_group",
+            return_value={"hostname": "h1"},
+        )
+        deployment_data = mock_deploystep_context["deployment_data"]
+
+        await deploy_step(
+            **{**mock_deploystep_context, "enable_validation": True}
+        )
+
+        result = deployment_data.construct_template_parameters()
+        assert result["context"]["deployments"] == dict()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_steps_shared_template(
+    mock_apply_template,
+    mock_deploystep_context,
+    mock_rg_deploy,
+    mock_run_puff,
+    mock_verify_puff_target,
+):
+    contexts = list()
+    for step_name, resource_group in [("s1", "rg1"), ("s2", "rg2")]:
+        this_context = copy.copy(mock_deploystep_context)
+        this_context["this_step"] = copy.deepcopy(
+            mock_deploystep_context["this_step"]
+        )
+        this_context["this_step"].name = step_name
+        this_context["this_step"].resource_group = resource_group
+        contexts.append(this_context)
+
+    await asyncio.gather(*[deploy_step(**x) for x in contexts])
+
+    assert mock_rg_deploy.call_count == 2
+    deployed = {x.args[0]: x.args[1:3] for x in mock_rg_deploy.call_args_list}
+    assert len(deployed) == 2
+    first, second = deployed.values()
+    # the steps share source files but render to distinct working files.
+    assert first[0].name == second[0].name
+    assert first[0].parent != second[0].parent
+    assert first[1].parent != second[1].parent
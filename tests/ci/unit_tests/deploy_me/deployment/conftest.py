@@ -32,6 +32,14 @@ def mock_login(mock_async_method):
     )
 
 
+@pytest.fixture(autouse=True)
+def mock_preflight(mock_async_method):
+    this_mock = mock_async_method(
+        "foodx_devops_tools.deploy_me._deployment.create_resource_groups"
+    )
+    return this_mock
+
+
 @pytest.fixture()
 def mock_rg_deploy(mock_async_method):
     this_mock = mock_async_method(
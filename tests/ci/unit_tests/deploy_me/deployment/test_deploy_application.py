@@ -17,6 +17,8 @@ from foodx_devops_tools.deploy_me._deployment import (
     DeploymentStatus,
     deploy_application,
 )
+from foodx_devops_tools.deploy_me._events import DeploymentEvent, EntityKind
+from foodx_devops_tools.deploy_me._fail_fast import FailFastPolicy
 from foodx_devops_tools.deploy_me.application_steps._deploy import (
     AzureSubscriptionConfiguration,
 )
@@ -24,6 +26,7 @@ from foodx_devops_tools.pipeline_config import (
     IterationContext,
     PipelineConfiguration,
 )
+from foodx_devops_tools.utilities.working import WORKING_NAME_PATTERN
 from tests.ci.support.pipeline_config import MOCK_RESULTS
 
 MOCK_ITERATION_CONTEXT = IterationContext()
@@ -85,6 +88,14 @@ class DeploymentChecks:
 
         return mock_deploy
 
+    @staticmethod
+    def working_dir(mock_deploy) -> pathlib.Path:
+        working_dir = mock_deploy.call_args.args[1].parent
+        assert working_dir.parent == pathlib.Path("some/path/working")
+        assert WORKING_NAME_PATTERN.match(working_dir.name)
+
+        return working_dir
+
 
 class TestValidation(DeploymentChecks):
     @pytest.mark.asyncio
@@ -98,16 +109,18 @@ class TestValidation(DeploymentChecks):
         )
 
         expected_parameters = default_override_parameters(prep_data[2])
+        working_dir = self.working_dir(mock_deploy)
         mock_deploy.assert_called_once_with(
             "c1-a1_group-123456",
-            pathlib.Path("some/path/working/w/a1.json"),
-            pathlib.Path("some/path/working/w/jinjad.a1.c1.sys1_c1_r1a.json"),
+            working_dir / "a1.json",
+            working_dir / "jinjad.a1.c1.sys1_c1_r1a.json",
             "l1",
             "Incremental",
             AzureSubscriptionConfiguration(subscription_id="sys1_c1_r1a"),
             deployment_name="a1_a1l1_123456",
             override_parameters=expected_parameters,
             validate=True,
+            tags={"foodx-validation": "123456"},
         )
 
 
@@ -123,16 +136,18 @@ class TestDeployment(DeploymentChecks):
         )
 
         expected_parameters = default_override_parameters(prep_data[2])
+        working_dir = self.working_dir(mock_deploy)
         mock_deploy.assert_called_once_with(
             "c1-a1_group",
-            pathlib.Path("some/path/working/w/a1.json"),
-            pathlib.Path("some/path/working/w/jinjad.a1.c1.sys1_c1_r1a.json"),
+            working_dir / "a1.json",
+            working_dir / "jinjad.a1.c1.sys1_c1_r1a.json",
             "l1",
             "Incremental",
             AzureSubscriptionConfiguration(subscription_id="sys1_c1_r1a"),
             deployment_name="a1_a1l1_123456",
             override_parameters=expected_parameters,
             validate=False,
+            tags=None,
         )
 
     @pytest.mark.asyncio
@@ -165,3 +180,39 @@ class TestDeployment(DeploymentChecks):
 
         status = await this_status.read("a1")
         assert status.code == DeploymentState.ResultType.skipped
+
+
+class TestFailFast:
+    @pytest.mark.asyncio
+    async def test_cancelled(self, prep_data):
+        mock_deploy, mock_puff, deployment_data, app_data = prep_data
+        this_policy = FailFastPolicy()
+        this_policy(
+            DeploymentEvent(
+                timestamp_seconds=1.0,
+                iteration_context="c",
+                entity_kind=EntityKind.application,
+                name="other",
+                old_state="in_progress",
+                new_state="failed",
+            )
+        )
+        this_status = DeploymentStatus(MOCK_CONTEXT, timeout_seconds=0.1)
+        this_status.start_monitor()
+        application_deployment_data = copy.deepcopy(deployment_data)
+        application_deployment_data.data.frame_folder = pathlib.Path(
+            "some/path"
+        )
+
+        await deploy_application(
+            app_data,
+            application_deployment_data,
+            this_status,
+            False,
+            fail_fast_policy=this_policy,
+        )
+        await asyncio.sleep(0.01)
+
+        mock_deploy.assert_not_called()
+        status = await this_status.read("a1")
+        assert status.code == DeploymentState.ResultType.cancelled
@@ -46,6 +46,8 @@ class MockAppDeploy:
         deployment_data: FlattenedDeployment,
         application_status: DeploymentStatus,
         enable_validation: bool,
+        fail_fast_policy=None,
+        what_if=False,
     ) -> None:
         this_context = str(deployment_data.data.iteration_context)
         await application_status.initialize(this_context)
@@ -400,3 +402,51 @@ async def test_frame_skipped(
 
     f1_status = await this_status.read("f1")
     assert f1_status.code == DeploymentState.ResultType.skipped
+
+
+@pytest.mark.asyncio
+async def test_resource_groups_created(
+    mocker,
+    mock_application_deploy,
+    mock_completion_event,
+    mock_preflight,
+    pipeline_parameters,
+):
+    cli_options = pipeline_parameters(enable_validation=True)
+    mock_application, deployment_data, frame_data = mock_application_deploy
+
+    this_status = DeploymentStatus(MOCK_CONTEXT, timeout_seconds=1)
+    this_status.start_monitor()
+
+    await deploy_frame(
+        frame_data,
+        deployment_data,
+        this_status,
+        cli_options,
+    )
+
+    mock_preflight.assert_called_once_with(frame_data, mocker.ANY, True)
+
+
+@pytest.mark.asyncio
+async def test_dependency_failed_no_resource_groups(
+    mock_application_deploy,
+    mock_completion_event,
+    mock_preflight,
+    pipeline_parameters,
+):
+    dependency_frame = "other-frame"
+
+    mock_application, deployment_data, frame_data = mock_application_deploy
+    frame_data.depends_on = [dependency_frame]
+
+    this_status = DeploymentStatus(MOCK_CONTEXT, timeout_seconds=1)
+    this_status.start_monitor()
+    await this_status.initialize(dependency_frame)
+    await this_status.write(dependency_frame, DeploymentState.ResultType.failed)
+
+    await check_is_cancelled(
+        this_status, frame_data, deployment_data, pipeline_parameters
+    )
+
+    mock_preflight.assert_not_called()
@@ -0,0 +1,118 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import pytest
+
+from foodx_devops_tools._to import StructuredTo
+from foodx_devops_tools.azure.cloud.exceptions import ResourceGroupError
+from foodx_devops_tools.azure.cloud.resource_group_cleanup import (
+    ResourceGroupCleanup,
+    set_resource_group_cleanup,
+)
+from foodx_devops_tools.deploy_me._preflight import (
+    collect_resource_groups,
+    create_resource_groups,
+)
+
+MOCK_CREATE_ALL_PATH = (
+    "foodx_devops_tools.deploy_me._preflight.create_all_resource_groups"
+)
+
+
+@pytest.fixture()
+def prep_data(prep_frame_data):
+    deployment_data, frame_data = prep_frame_data
+    deployment_data.context.azure_subscription_name = "sub1"
+
+    return frame_data, deployment_data
+
+
+class TestCollectResourceGroups:
+    def test_clean(self, prep_data):
+        frame_data, deployment_data = prep_data
+
+        result = collect_resource_groups(frame_data, deployment_data, False)
+
+        assert result == {"c1-a1_group": deployment_data.data.location_primary}
+
+    def test_validation(self, prep_data):
+        frame_data, deployment_data = prep_data
+
+        result = collect_resource_groups(frame_data, deployment_data, True)
+
+        assert list(result.keys()) == ["c1-a1_group-123456"]
+
+    def test_targeted_excluded(self, prep_data):
+        frame_data, deployment_data = prep_data
+        deployment_data.data.to = StructuredTo(frame="f1", application="a2")
+
+        result = collect_resource_groups(frame_data, deployment_data, False)
+
+        assert result == dict()
+
+
+class TestCreateResourceGroups:
+    @pytest.mark.asyncio
+    async def test_clean(self, mock_async_method, mocker, prep_data):
+        frame_data, deployment_data = prep_data
+        mock_create = mock_async_method(
+            MOCK_CREATE_ALL_PATH,
+            return_value=dict(),
+        )
+
+        await create_resource_groups(frame_data, deployment_data, False)
+
+        mock_create.assert_called_once_with(
+            {"c1-a1_group": deployment_data.data.location_primary},
+            mocker.ANY,
+            tags=None,
+        )
+        assert mock_create.call_args[0][1].subscription_id == "sub1"
+
+    @pytest.mark.asyncio
+    async def test_failures_logged(self, caplog, mock_async_method, prep_data):
+        frame_data, deployment_data = prep_data
+        mock_async_method(
+            MOCK_CREATE_ALL_PATH,
+            return_value={"c1-a1_group": ResourceGroupError("some error")},
+        )
+
+        await create_resource_groups(frame_data, deployment_data, False)
+
+        assert "resource group creation failed" in caplog.text
+        assert "some error" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_validation_registered(self, mock_async_method, prep_data):
+        frame_data, deployment_data = prep_data
+        mock_create = mock_async_method(
+            MOCK_CREATE_ALL_PATH, return_value=dict()
+        )
+        this_cleanup = ResourceGroupCleanup()
+        previous = set_resource_group_cleanup(this_cleanup)
+        try:
+            await create_resource_groups(frame_data, deployment_data, True)
+        finally:
+            set_resource_group_cleanup(previous)
+
+        assert this_cleanup.pending == 1
+        assert mock_create.call_args[1]["tags"] == {
+            "foodx-validation": "123456"
+        }
+
+    @pytest.mark.asyncio
+    async def test_not_validation(self, mock_async_method, prep_data):
+        frame_data, deployment_data = prep_data
+        mock_async_method(MOCK_CREATE_ALL_PATH, return_value=dict())
+        this_cleanup = ResourceGroupCleanup()
+        previous = set_resource_group_cleanup(this_cleanup)
+        try:
+            await create_resource_groups(frame_data, deployment_data, False)
+        finally:
+            set_resource_group_cleanup(previous)
+
+        assert this_cleanup.pending == 0
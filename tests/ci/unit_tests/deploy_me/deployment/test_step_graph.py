@@ -0,0 +1,140 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import asyncio
+
+import pytest
+
+from foodx_devops_tools.deploy_me._deployment import (
+    _do_step_graph,
+    _has_step_dependencies,
+    _resolve_step_dependencies,
+)
+from foodx_devops_tools.pipeline_config.frames import (
+    ApplicationStepDelay,
+    ApplicationStepScript,
+)
+
+
+def _script(name, depends_on=None):
+    return ApplicationStepScript(
+        name=name, script="echo {0}".format(name), depends_on=depends_on
+    )
+
+
+class TestResolveStepDependencies:
+    def test_undeclared_sequential(self):
+        steps = [
+            _script("s1"),
+            _script("s2"),
+            ApplicationStepDelay(delay_seconds=1),
+        ]
+
+        assert not _has_step_dependencies(steps)
+        assert _resolve_step_dependencies(steps) == [set(), {0}, {0, 1}]
+
+    def test_declared(self):
+        steps = [
+            _script("storage", depends_on=list()),
+            _script("monitoring", depends_on=list()),
+            _script("app"),
+            _script("dns", depends_on=["storage"]),
+        ]
+
+        assert _has_step_dependencies(steps)
+        assert _resolve_step_dependencies(steps) == [
+            set(),
+            set(),
+            {0, 1},
+            {0},
+        ]
+
+
+@pytest.fixture()
+def mock_step(mocker):
+    events = list()
+    dependencies = list()
+
+    async def _record(
+        steps,
+        index,
+        step_dependencies,
+        deployment_data,
+        enable_validation,
+        what_if=False,
+    ):
+        this_step = steps[index]
+        events.append(("start", this_step.name))
+        dependencies.append((this_step.name, step_dependencies[index]))
+        await asyncio.sleep(1 if this_step.name == "slow" else 0.01)
+        if this_step.name == "bad":
+            raise RuntimeError("step failed")
+        events.append(("end", this_step.name))
+
+    mocker.patch(
+        "foodx_devops_tools.deploy_me._deployment._do_step",
+        side_effect=_record,
+    )
+
+    return events, dependencies
+
+
+class TestDoStepGraph:
+    @pytest.mark.asyncio
+    async def test_concurrent(self, mock_step):
+        events, _ = mock_step
+        steps = [
+            _script("storage", depends_on=list()),
+            _script("monitoring", depends_on=list()),
+            _script("app", depends_on=["storage", "monitoring"]),
+        ]
+
+        await _do_step_graph(steps, None, False)
+
+        assert events[0:2] == [
+            ("start", "storage"),
+            ("start", "monitoring"),
+        ]
+        assert events[-2:] == [("start", "app"), ("end", "app")]
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_dependents(self, mock_step):
+        events, _ = mock_step
+        steps = [
+            _script("bad", depends_on=list()),
+            _script("slow", depends_on=list()),
+            _script("app", depends_on=["bad"]),
+        ]
+
+        with pytest.raises(RuntimeError, match=r"^step failed"):
+            await _do_step_graph(steps, None, False)
+
+        assert ("start", "app") not in events
+        assert ("end", "slow") not in events
+
+    @pytest.mark.asyncio
+    async def test_dependencies_resolved_once(self, mock_step, mocker):
+        _, dependencies = mock_step
+        mock_resolve = mocker.patch(
+            "foodx_devops_tools.deploy_me._deployment"
+            "._resolve_step_dependencies",
+            wraps=_resolve_step_dependencies,
+        )
+        steps = [
+            _script("storage", depends_on=list()),
+            _script("monitoring", depends_on=list()),
+            _script("app", depends_on=["storage"]),
+        ]
+
+        await _do_step_graph(steps, None, False)
+
+        mock_resolve.assert_called_once_with(steps)
+        assert sorted(dependencies) == [
+            ("app", {0}),
+            ("monitoring", set()),
+            ("storage", set()),
+        ]
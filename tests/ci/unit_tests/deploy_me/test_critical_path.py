@@ -0,0 +1,100 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import pytest
+
+from foodx_devops_tools.deploy_me._critical_path import CriticalPathAnalysis
+from foodx_devops_tools.profiling import Span, SpanKind, Timer
+
+
+def _make_span(span_id, name, kind, start, end, parent_id=None, **attributes):
+    timer = Timer()
+    timer.start_time_seconds = start
+    timer.stop_time_seconds = end
+    return Span(
+        span_id=span_id,
+        name=name,
+        kind=kind,
+        parent_id=parent_id,
+        lane=0,
+        timer=timer,
+        attributes=attributes,
+    )
+
+
+@pytest.fixture()
+def mock_spans():
+    return [
+        _make_span(0, "i", SpanKind.iteration, 0.0, 10.0),
+        _make_span(1, "f1", SpanKind.frame, 0.0, 3.0, 0, depends_on=[]),
+        _make_span(2, "f2", SpanKind.frame, 0.0, 1.0, 0, depends_on=[]),
+        _make_span(
+            3, "f3", SpanKind.frame, 0.0, 10.0, 0, depends_on=["f1", "f2"]
+        ),
+        # non-node span between frame and application
+        _make_span(4, "cmd", SpanKind.command, 3.0, 4.0, 3),
+        _make_span(5, "a1", SpanKind.application, 3.0, 6.0, 4, depends_on=[]),
+        _make_span(6, "a2", SpanKind.application, 3.0, 10.0, 3, depends_on=[]),
+    ]
+
+
+class TestCriticalPathAnalysis:
+    def test_critical_chain(self, mock_spans):
+        under_test = CriticalPathAnalysis(mock_spans)
+
+        assert [x.name for x in under_test.critical_path] == [
+            "i",
+            "f1",
+            "f3",
+            "a2",
+        ]
+        assert under_test.total_seconds == 10.0
+
+    def test_effective_start(self, mock_spans):
+        under_test = CriticalPathAnalysis(mock_spans)
+
+        nodes = {x.name: x for x in under_test.nodes}
+        # f3 could not start until f1 completed
+        assert nodes["f3"].start_seconds == 3.0
+        assert nodes["f3"].duration_seconds == 7.0
+        assert nodes["a1"].parent == "f3"
+
+    def test_slack(self, mock_spans):
+        under_test = CriticalPathAnalysis(mock_spans)
+
+        nodes = {x.name: x for x in under_test.nodes}
+        assert nodes["f1"].slack_seconds == 0.0
+        assert nodes["f2"].slack_seconds == 2.0
+        assert nodes["a1"].slack_seconds == 4.0
+        assert not nodes["f2"].critical
+        assert nodes["f1"].critical
+
+    def test_cycle(self):
+        spans = [
+            _make_span(0, "f1", SpanKind.frame, 0.0, 2.0, depends_on=["f2"]),
+            _make_span(1, "f2", SpanKind.frame, 0.0, 1.0, depends_on=["f1"]),
+        ]
+        under_test = CriticalPathAnalysis(spans)
+
+        assert [x.name for x in under_test.critical_path] == ["f2", "f1"]
+
+    def test_empty(self):
+        under_test = CriticalPathAnalysis(list())
+
+        assert under_test.critical_path == list()
+        assert under_test.total_seconds == 0.0
+        assert "critical path" in under_test.format_report()
+
+    def test_format_report(self, mock_spans):
+        under_test = CriticalPathAnalysis(mock_spans)
+
+        result = under_test.format_report()
+
+        lines = result.splitlines()
+        assert lines[0] == "critical path, total 0:00:10"
+        assert "      3.000        7.000    frame f3" in result
+        assert lines[-1].split() == ["4.000", "3.000", "application", "a1"]
@@ -0,0 +1,153 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import asyncio
+import io
+import json
+
+import pytest
+
+from foodx_devops_tools.deploy_me._events import (
+    DeploymentEvent,
+    EntityKind,
+    EventBus,
+    JsonLinesSink,
+)
+from foodx_devops_tools.deploy_me._status import (
+    DeploymentState,
+    DeploymentStatus,
+    report_console,
+)
+
+MOCK_EVENT = DeploymentEvent(
+    timestamp_seconds=12.5,
+    iteration_context="c1-r1-s1.f1",
+    entity_kind=EntityKind.application,
+    name="c1-r1-s1.f1.a1",
+    old_state="pending",
+    new_state="in_progress",
+    duration_seconds=2.0,
+    queue_wait_seconds=0.5,
+)
+
+
+class TestEventBus:
+    def test_publish(self):
+        received = list()
+        under_test = EventBus()
+        under_test.subscribe(received.append)
+
+        under_test.publish(MOCK_EVENT)
+
+        assert received == [MOCK_EVENT]
+
+    def test_unsubscribe(self):
+        received = list()
+        under_test = EventBus()
+        under_test.subscribe(received.append)
+        under_test.unsubscribe(received.append)
+
+        under_test.publish(MOCK_EVENT)
+
+        assert not received
+
+    def test_failed_sink_isolated(self):
+        received = list()
+
+        def bad_sink(event):
+            raise RuntimeError("sink failed")
+
+        under_test = EventBus()
+        under_test.subscribe(bad_sink)
+        under_test.subscribe(received.append)
+
+        under_test.publish(MOCK_EVENT)
+
+        assert received == [MOCK_EVENT]
+
+
+class TestJsonLinesSink:
+    def test_clean(self):
+        stream = io.StringIO()
+        under_test = JsonLinesSink(stream)
+
+        under_test(MOCK_EVENT)
+        under_test(MOCK_EVENT)
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 2
+        result = json.loads(lines[0])
+        assert result["entity_kind"] == "application"
+        assert result["old_state"] == "pending"
+        assert result["new_state"] == "in_progress"
+        assert result["duration_seconds"] == 2.0
+        assert result["queue_wait_seconds"] == 0.5
+        assert "wall_time" in result
+
+
+class TestStatusEvents:
+    @pytest.mark.asyncio
+    async def test_transitions(self):
+        received = list()
+        bus = EventBus()
+        bus.subscribe(received.append)
+        under_test = DeploymentStatus(
+            "some.context",
+            10,
+            entity_kind=EntityKind.frame,
+            event_bus=bus,
+        )
+        await under_test.initialize("n1")
+        under_test.start_monitor()
+
+        await under_test.write("n1", DeploymentState.ResultType.in_progress)
+        await under_test.write("n1", DeploymentState.ResultType.success)
+        await asyncio.sleep(0.1)
+
+        assert [(x.old_state, x.new_state) for x in received] == [
+            ("pending", "in_progress"),
+            ("in_progress", "success"),
+        ]
+        assert all([x.entity_kind == EntityKind.frame for x in received])
+        assert all([x.iteration_context == "some.context" for x in received])
+        assert all([x.duration_seconds >= 0 for x in received])
+        assert all([x.queue_wait_seconds >= 0 for x in received])
+        assert received[0].timestamp_seconds <= received[1].timestamp_seconds
+
+    @pytest.mark.asyncio
+    async def test_default_console(self, capsys):
+        under_test = DeploymentStatus("some.context", 10)
+        await under_test.initialize("n1")
+        under_test.start_monitor()
+
+        await under_test.write("n1", DeploymentState.ResultType.success)
+        await asyncio.sleep(0.1)
+
+        captured = capsys.readouterr()
+        assert "some.context: n1 success" in captured.out
+
+    @pytest.mark.asyncio
+    async def test_unchanged_published(self, capsys):
+        received = list()
+        bus = EventBus()
+        bus.subscribe(received.append)
+        bus.subscribe(report_console)
+        under_test = DeploymentStatus("some.context", 10, event_bus=bus)
+        await under_test.initialize("n1")
+        await under_test.initialize("n2")
+        under_test.start_monitor()
+
+        await under_test.write("n1", DeploymentState.ResultType.in_progress)
+        await under_test.write("n1", DeploymentState.ResultType.in_progress)
+        await asyncio.sleep(0.1)
+
+        assert [(x.old_state, x.new_state) for x in received] == [
+            ("pending", "in_progress"),
+            ("in_progress", "in_progress"),
+        ]
+        captured = capsys.readouterr()
+        assert "nothing to report, some.context" in captured.out
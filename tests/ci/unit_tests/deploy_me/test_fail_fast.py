@@ -0,0 +1,145 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import asyncio
+
+import pytest
+
+from foodx_devops_tools.deploy_me._events import DeploymentEvent, EntityKind
+from foodx_devops_tools.deploy_me._fail_fast import (
+    FailFastPolicy,
+    is_fail_fast_cancelled,
+    run_fail_fast,
+)
+from foodx_devops_tools.deploy_me._state import PipelineCliOptions
+
+
+def _make_event(new_state: str) -> DeploymentEvent:
+    return DeploymentEvent(
+        timestamp_seconds=1.0,
+        iteration_context="c",
+        entity_kind=EntityKind.application,
+        name="c.f1.a1",
+        old_state="in_progress",
+        new_state=new_state,
+    )
+
+
+class TestFailFastPolicy:
+    def test_ignore_other_states(self):
+        under_test = FailFastPolicy()
+
+        under_test(_make_event("success"))
+        under_test(_make_event("cancelled"))
+
+        assert not under_test.triggered
+        assert under_test.trigger_event is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_outstanding(self):
+        under_test = FailFastPolicy()
+        completed = list()
+
+        async def work(value):
+            await asyncio.sleep(value)
+            completed.append(value)
+            return value
+
+        async def run_work(value):
+            # a task boundary converts any cancellation to a plain
+            # CancelledError.
+            try:
+                return await under_test.run(work(value))
+            except asyncio.CancelledError as e:
+                return e
+
+        fast_task = asyncio.create_task(run_work(0))
+        slow_task = asyncio.create_task(run_work(10))
+        assert await fast_task == 0
+
+        this_event = _make_event("failed")
+        under_test(this_event)
+
+        assert is_fail_fast_cancelled(await slow_task)
+        assert completed == [0]
+        assert under_test.triggered
+        assert under_test.trigger_event == this_event
+
+    @pytest.mark.asyncio
+    async def test_cancel_after_trigger(self):
+        under_test = FailFastPolicy()
+        under_test(_make_event("failed"))
+
+        with pytest.raises(asyncio.CancelledError) as e:
+            await under_test.run(asyncio.sleep(0))
+        assert is_fail_fast_cancelled(e.value)
+
+    @pytest.mark.asyncio
+    async def test_other_cancellation(self):
+        under_test = FailFastPolicy()
+        this_task = asyncio.create_task(under_test.run(asyncio.sleep(10)))
+        await asyncio.sleep(0)
+
+        this_task.cancel()
+        with pytest.raises(asyncio.CancelledError) as e:
+            await this_task
+        under_test(_make_event("failed"))
+
+        # cancellation by anything other than the policy is propagated.
+        assert not is_fail_fast_cancelled(e.value)
+
+    @pytest.mark.asyncio
+    async def test_first_failure_only(self):
+        under_test = FailFastPolicy()
+        first_event = _make_event("failed")
+
+        under_test(first_event)
+        under_test(_make_event("failed"))
+
+        assert under_test.trigger_event is first_event
+
+
+class TestRunFailFast:
+    @pytest.mark.asyncio
+    async def test_no_policy(self):
+        async def work():
+            return 3
+
+        assert await run_fail_fast(None, work()) == 3
+
+    @pytest.mark.asyncio
+    async def test_policy(self):
+        under_test = FailFastPolicy()
+
+        async def work():
+            return 3
+
+        assert await run_fail_fast(under_test, work()) == 3
+        assert not under_test.triggered
+
+
+class TestPipelineCliOptions:
+    def test_disabled(self):
+        under_test = PipelineCliOptions(
+            enable_validation=False,
+            monitor_sleep_seconds=1,
+            wait_timeout_seconds=1,
+        )
+
+        assert under_test.fail_fast_policy is None
+
+    def test_subscribed(self):
+        under_test = PipelineCliOptions(
+            enable_validation=False,
+            monitor_sleep_seconds=1,
+            wait_timeout_seconds=1,
+            fail_fast=True,
+        )
+
+        under_test.event_bus.publish(_make_event("failed"))
+
+        assert under_test.fail_fast_policy.triggered
@@ -5,12 +5,15 @@
 #  You should have received a copy of the MIT License along with
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
+import concurrent.futures
 import copy
 import enum
+import json
 import logging
 
 import pytest
 
+from foodx_devops_tools.azure.cloud.arm_rest import ArmRestBackend
 from foodx_devops_tools.deploy_me._deployment import DeploymentState
 from foodx_devops_tools.deploy_me._main import (
     ConfigurationPathsError,
@@ -18,6 +21,23 @@ from foodx_devops_tools.deploy_me._main import (
     _report_results,
 )
 from foodx_devops_tools.deploy_me_entry import deploy_me
+from foodx_devops_tools.utilities.cassette import (
+    RecordingBackend,
+    ReplayBackend,
+    load_cassette,
+    save_cassette,
+)
+from foodx_devops_tools.utilities.command import (
+    DEFAULT_COMMAND_TIMEOUTS,
+    StreamingSubprocessBackend,
+    SubprocessBackend,
+    command_timeout,
+    get_command_backend,
+)
+from foodx_devops_tools.utilities.jinja2 import (
+    get_render_executor,
+    set_render_executor,
+)
 from tests.ci.support.click_runner import click_runner  # noqa: F401
 from tests.ci.support.pipeline_config import (
     CLEAN_SPLIT,
@@ -228,6 +248,564 @@ class TestDeployMe:
 
         return result, mock_deploy
 
+    def test_event_stream(
+        self,
+        click_runner,
+        caplog,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        tmp_path,
+    ):
+        event_path = tmp_path / "events.jsonl"
+        mock_input = [
+            "--event-stream",
+            str(event_path),
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        pipeline_parameters = mock_deploy.call_args.args[2]
+        assert pipeline_parameters == self.EXPECTED_DEFAULT_OPTIONS
+
+    def test_event_stream_stdout(
+        self,
+        click_runner,
+        caplog,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--event-stream",
+            "-",
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 2
+        assert "stdout is reserved for console output" in result.output
+        mock_deploy.assert_not_called()
+
+    def test_trace_file(
+        self,
+        click_runner,
+        caplog,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        tmp_path,
+    ):
+        trace_file = tmp_path / "trace.json"
+        mock_input = [
+            "--trace-file",
+            str(trace_file),
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        with trace_file.open(mode="r") as f:
+            trace_data = json.load(f)
+        assert "traceEvents" in trace_data
+        assert "self (s)" in result.output
+
+    def test_critical_path(
+        self,
+        click_runner,
+        caplog,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--critical-path",
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        assert "critical path, total" in result.output
+        assert "slack of non-critical nodes" in result.output
+
+    def test_fail_fast(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--fail-fast",
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        expected_options = copy.deepcopy(self.EXPECTED_DEFAULT_OPTIONS)
+        expected_options.fail_fast = True
+        mock_deploy.assert_has_calls(
+            [
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+            ]
+        )
+        actual_options = mock_deploy.call_args[0][2]
+        assert actual_options.fail_fast_policy is not None
+
+    def test_azure_backend_rest(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--azure-backend",
+            "rest",
+        ]
+        backends = list()
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.get_command_backend",
+            side_effect=lambda: backends.append(get_command_backend())
+            or backends[-1],
+        )
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        assert isinstance(backends[-1], ArmRestBackend)
+        assert isinstance(get_command_backend(), SubprocessBackend)
+
+    def test_stream_command_output(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--stream-command-output",
+        ]
+        backends = list()
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.get_command_backend",
+            side_effect=lambda: backends.append(get_command_backend())
+            or backends[-1],
+        )
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        assert isinstance(backends[-1], StreamingSubprocessBackend)
+        assert not isinstance(get_command_backend(), StreamingSubprocessBackend)
+
+    @pytest.mark.parametrize(
+        "workers, expected_type",
+        [
+            (None, concurrent.futures.ThreadPoolExecutor),
+            ("0", type(None)),
+        ],
+    )
+    def test_render_workers(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        workers,
+        expected_type,
+    ):
+        mock_input = ["--render-workers", workers] if workers else list()
+        executors = list()
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.set_render_executor",
+            side_effect=lambda x: executors.append(x) or set_render_executor(x),
+        )
+        mock_lag = mocker.patch(
+            "foodx_devops_tools.deploy_me._main._report_event_loop_lag"
+        )
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert isinstance(executors[0], expected_type)
+        assert executors[-1] is None
+        assert get_render_executor() is None
+        mock_lag.assert_called_once()
+
+    def test_record_commands(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        tmp_path,
+    ):
+        cassette_path = tmp_path / "cassette.json"
+        mock_input = [
+            "--allow-short-secrets",
+            "--record-commands",
+            str(cassette_path),
+        ]
+        backends = list()
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.get_command_backend",
+            side_effect=lambda: backends.append(get_command_backend())
+            or backends[-1],
+        )
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert isinstance(backends[-1], RecordingBackend)
+        assert isinstance(backends[-1].backend, SubprocessBackend)
+        assert MOCK_SECRET in backends[-1].secrets
+        # the mock static secret is too short to be redacted.
+        assert "k1v" not in backends[-1].secrets
+        assert load_cassette(cassette_path) == list()
+
+    def test_record_short_secrets(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        tmp_path,
+    ):
+        cassette_path = tmp_path / "cassette.json"
+        mock_input = [
+            "--record-commands",
+            str(cassette_path),
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 102
+        assert "--allow-short-secrets" in result.output
+        mock_deploy.assert_not_called()
+        assert not cassette_path.exists()
+
+    def test_replay_commands(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        tmp_path,
+    ):
+        cassette_path = tmp_path / "cassette.json"
+        save_cassette(cassette_path, list())
+        mock_input = [
+            "--azure-backend",
+            "rest",
+            "--replay-commands",
+            str(cassette_path),
+            "--replay-latency-scale",
+            "0",
+        ]
+        backends = list()
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.get_command_backend",
+            side_effect=lambda: backends.append(get_command_backend())
+            or backends[-1],
+        )
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert isinstance(backends[-1], ReplayBackend)
+        assert backends[-1].latency_scale == 0
+        assert not isinstance(get_command_backend(), ReplayBackend)
+
+    def test_record_replay_exclusive(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+        tmp_path,
+    ):
+        cassette_path = tmp_path / "cassette.json"
+        save_cassette(cassette_path, list())
+        mock_input = [
+            "--record-commands",
+            str(tmp_path / "other.json"),
+            "--replay-commands",
+            str(cassette_path),
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 102
+        assert "mutually exclusive" in result.output
+        mock_deploy.assert_not_called()
+
+    def test_command_timeout(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--command-timeout",
+            "az login=30",
+            "--command-timeout",
+            "az  group   create=0",
+        ]
+        timeouts = list()
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.get_command_backend",
+            side_effect=lambda: timeouts.append(
+                (
+                    command_timeout(["az", "login"]),
+                    command_timeout(["az", "group", "create"]),
+                    command_timeout(["az", "group", "list"]),
+                )
+            )
+            or get_command_backend(),
+        )
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0, result.output
+        assert timeouts[-1] == (30, None, DEFAULT_COMMAND_TIMEOUTS["az"])
+        assert (
+            command_timeout(["az", "login"])
+            == DEFAULT_COMMAND_TIMEOUTS["az login"]
+        )
+
+    def test_bad_command_timeout(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--command-timeout",
+            "az login",
+        ]
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 2
+        assert "not a valid command timeout" in result.output
+
+    def test_command_timeouts_reported(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mocker.patch(
+            "foodx_devops_tools.deploy_me._main.command_timeout_counts",
+            return_value={"az login": 2},
+        )
+
+        result, _ = self._run_test(
+            list(),
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        assert "command timeouts, az login, 2" in result.output
+
+    def test_no_wait(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--no-wait",
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        expected_options = copy.deepcopy(self.EXPECTED_DEFAULT_OPTIONS)
+        expected_options.no_wait = True
+        mock_deploy.assert_has_calls(
+            [
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+            ]
+        )
+
+    def test_what_if(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_input = [
+            "--what-if",
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        expected_options = copy.deepcopy(self.EXPECTED_DEFAULT_OPTIONS)
+        expected_options.what_if = True
+        mock_deploy.assert_has_calls(
+            [
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+            ]
+        )
+
     def test_validation(
         self,
         caplog,
@@ -260,6 +838,75 @@ class TestDeployMe:
             ]
         )
 
+    def test_validation_groups_deleted(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_delete = mock_async_method(
+            "foodx_devops_tools.deploy_me._main.ResourceGroupCleanup"
+            ".delete_all",
+            return_value=dict(),
+        )
+        mock_input = [
+            "--validation",
+        ]
+
+        result, _ = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        mock_delete.assert_called_once()
+
+    def test_keep_validation_groups(
+        self,
+        caplog,
+        click_runner,
+        mock_async_method,
+        mock_getsha,
+        mock_leakage_check,
+        mocker,
+    ):
+        mock_delete = mock_async_method(
+            "foodx_devops_tools.deploy_me._main.ResourceGroupCleanup"
+            ".delete_all",
+            return_value=dict(),
+        )
+        mock_input = [
+            "--validation",
+            "--keep-validation-groups",
+        ]
+
+        result, mock_deploy = self._run_test(
+            mock_input,
+            caplog,
+            click_runner,
+            mock_async_method,
+            mock_getsha,
+            mocker,
+        )
+
+        assert result.exit_code == 0
+        expected_options = copy.deepcopy(self.EXPECTED_DEFAULT_OPTIONS)
+        expected_options.enable_validation = True
+        expected_options.keep_validation_groups = True
+        mock_deploy.assert_has_calls(
+            [
+                mocker.call(mocker.ANY, mocker.ANY, expected_options),
+            ]
+        )
+        mock_delete.assert_not_called()
+
     def test_monitor_sleep(
         self,
         click_runner,
@@ -407,6 +407,84 @@ frames:
     assert result_frames.frames["f1"].applications["a1"].depends_on[0] == "a2"
 
 
+def test_steps_sequenced(apply_applications_test):
+    file_text = """---
+frames:
+  frames:
+    f1:
+      applications:
+        a1:
+          steps:
+            - name: storage
+              resource_group: f1a1s
+              mode: Incremental
+              depends_on: []
+            - name: monitoring
+              resource_group: f1a1m
+              mode: Incremental
+              depends_on: []
+            - name: configure
+              script: echo configure
+              depends_on:
+                - storage
+                - monitoring
+      folder: some/f1-path
+"""
+
+    result = apply_applications_test(file_text)
+
+    result_steps = result.frames.frames["f1"].applications["a1"].steps
+    assert result_steps[0].depends_on == list()
+    assert result_steps[1].depends_on == list()
+    assert result_steps[2].depends_on == ["storage", "monitoring"]
+
+
+def test_step_dependency_undeclared_default(apply_applications_test):
+    file_text = """---
+frames:
+  frames:
+    f1:
+      applications:
+        a1:
+          steps:
+            - name: a1l1
+              resource_group: f1a1
+              mode: Incremental
+      folder: some/f1-path
+"""
+
+    result = apply_applications_test(file_text)
+
+    result_steps = result.frames.frames["f1"].applications["a1"].steps
+    assert result_steps[0].depends_on is None
+
+
+def test_step_forward_dependency_raises(apply_applications_test):
+    file_text = """---
+frames:
+  frames:
+    f1:
+      applications:
+        a1:
+          steps:
+            - name: a1l1
+              resource_group: f1a1
+              mode: Incremental
+              depends_on:
+                - a1l2
+            - name: a1l2
+              resource_group: f1a2
+              mode: Incremental
+      folder: some/f1-path
+"""
+
+    with pytest.raises(
+        FrameDefinitionsError,
+        match=r"Application step dependencies must be named steps",
+    ):
+        apply_applications_test(file_text)
+
+
 def test_multiple_unsequenced(apply_applications_test):
     file_text = """---
 frames:
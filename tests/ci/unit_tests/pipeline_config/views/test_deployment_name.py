@@ -44,3 +44,15 @@ def test_underscore(mock_flattened_deployment):
     result = under_test.construct_deployment_name("stepname")
 
     assert result == "app-name_stepname_12345678-24"
+
+
+def test_prefix(mock_flattened_deployment):
+    under_test = copy.deepcopy(mock_flattened_deployment[0])
+    under_test.context.application_name = "app_name"
+    under_test.context.frame_name = "f1"
+    under_test.context.pipeline_id = "12345678_24"
+
+    result = under_test.construct_deployment_name_prefix("stepname")
+
+    assert result == "app-name_stepname_"
+    assert under_test.construct_deployment_name("stepname").startswith(result)
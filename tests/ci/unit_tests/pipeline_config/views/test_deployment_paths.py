@@ -6,12 +6,14 @@
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
 import copy
+import dataclasses
 import pathlib
 
 import pytest
 
 from foodx_devops_tools.pipeline_config.views import FlattenedDeployment
 from foodx_devops_tools.utilities.templates import TemplateFiles, TemplatePaths
+from foodx_devops_tools.utilities.working import WORKING_NAME_PATTERN
 
 
 @pytest.fixture()
@@ -30,7 +32,25 @@ class TestConstructDeploymentPaths:
     def _do_check(self, parameters: dict, under_test: FlattenedDeployment):
         result = under_test.construct_deployment_paths(*parameters["input"])
 
-        assert result == parameters["expected"]
+        working_name = result.arm_template_parameters.target.parent.name
+        assert WORKING_NAME_PATTERN.match(working_name)
+        assert working_name != "w"
+
+        def _named(x: TemplatePaths) -> TemplatePaths:
+            return TemplatePaths(
+                source=x.source,
+                target=pathlib.Path(
+                    str(x.target).replace("/w/", "/{0}/".format(working_name))
+                ),
+            )
+
+        expected = parameters["expected"]
+        assert result == dataclasses.replace(
+            expected,
+            arm_template=_named(expected.arm_template),
+            arm_template_parameters=_named(expected.arm_template_parameters),
+            cache_dir=pathlib.Path("frame/folder/working"),
+        )
 
     def test_none_arm_file_puff_file(self, mock_test_data):
         parameters = {
@@ -309,3 +329,37 @@ class TestConstructDeploymentPaths:
         }
 
         self._do_check(parameters, mock_test_data)
+
+
+class TestWorkingName:
+    @staticmethod
+    def _working_name(under_test: FlattenedDeployment) -> str:
+        result = under_test.construct_deployment_paths(None, None)
+
+        return result.arm_template.target.parent.name
+
+    def test_run_identity_excluded(self, mock_test_data):
+        first = self._working_name(mock_test_data)
+        other_run = copy.deepcopy(mock_test_data)
+        other_run.context.pipeline_id = "other-pipeline"
+        other_run.context.commit_sha = "other-sha"
+        other_run.context.release_id = "other-release"
+
+        assert self._working_name(other_run) == first
+
+    def test_deployed_content_included(self, mock_test_data):
+        first = self._working_name(mock_test_data)
+        other_content = copy.deepcopy(mock_test_data)
+        other_content.context.release_state = "other-state"
+
+        assert self._working_name(other_content) != first
+
+    def test_step_resource_group_distinct(self, mock_test_data):
+        result = {
+            mock_test_data.construct_deployment_paths(
+                None, None, step_name=x, resource_group_name=y
+            ).arm_template.target.parent.name
+            for x, y in [("s1", "rg1"), ("s2", "rg1"), ("s1", "rg2")]
+        }
+
+        assert len(result) == 3
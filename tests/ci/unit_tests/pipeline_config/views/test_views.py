@@ -106,6 +106,7 @@ class TestFlattenedDeployment:
 
         assert result == {
             "context": {
+                "deployments": dict(),
                 "environment": {
                     "azure": {
                         "subscription_id": "abc123",
@@ -160,6 +161,24 @@ class TestFlattenedDeployment:
 
         assert result["context"]["environment"]["resource_group"] is None
 
+    def test_deployment_outputs(self, mock_flattened_deployment):
+        iteration = mock_flattened_deployment[0]
+        frame_copy = iteration.copy_add_frame("f1")
+        application_copy = frame_copy.copy_add_application("a1")
+
+        application_copy.data.deployment_outputs.record(
+            "f1", "a1", "s1", {"hostname": "h1"}
+        )
+        result = iteration.copy_add_frame("f2").construct_template_parameters()
+
+        assert result["context"]["deployments"] == {
+            "f1": {"a1": {"s1": {"outputs": {"hostname": "h1"}}}}
+        }
+        other_result = mock_flattened_deployment[
+            1
+        ].construct_template_parameters()
+        assert other_result["context"]["deployments"] == dict()
+
 
 class TestSubscriptionView:
     def test_clean(self, mock_pipeline_config):
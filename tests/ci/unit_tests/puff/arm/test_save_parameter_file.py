@@ -9,6 +9,7 @@ import asyncio
 import contextlib
 import copy
 import json
+import os
 import pathlib
 import typing
 import uuid
@@ -118,6 +119,22 @@ class TestSaveParameterFile:
     async def test_empty_parameters(self, tmp_path_factory):
         await self._do_create_test(dict(), tmp_path_factory)
 
+    @pytest.mark.asyncio
+    async def test_unchanged(self, tmp_path):
+        this_file = tmp_path / "some_file"
+        await _save_parameter_file(this_file, {"p1": "v1"}, True)
+        os.utime(this_file, (1, 1))
+
+        await _save_parameter_file(this_file, {"p1": "v1"}, True)
+
+        assert this_file.stat().st_mtime == 1
+
+        await _save_parameter_file(this_file, {"p1": "v2"}, True)
+
+        assert this_file.stat().st_mtime != 1
+        content = self._check_basic_content(this_file)
+        assert content["parameters"]["p1"]["value"] == "v2"
+
     @pytest.mark.asyncio
     async def test_pretty(self, mock_context, mocker):
         mock_context("foodx_devops_tools.puff.arm.aiofiles.open")
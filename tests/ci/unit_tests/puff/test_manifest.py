@@ -0,0 +1,152 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+
+import pytest
+
+from foodx_devops_tools.puff._manifest import (
+    MANIFEST_FILE,
+    PuffManifest,
+    hash_source,
+)
+
+
+@pytest.fixture()
+def prepared(tmp_path):
+    source = tmp_path / "source.yml"
+    source.write_text("---")
+    outputs = [tmp_path / "a.json", tmp_path / "b.json"]
+    for this_output in outputs:
+        this_output.write_text("{}")
+
+    return source, outputs
+
+
+class TestHashSource:
+    @pytest.mark.asyncio
+    async def test_missing(self, tmp_path):
+        assert (await hash_source(tmp_path / "missing.yml")) is None
+
+    @pytest.mark.asyncio
+    async def test_content(self, tmp_path):
+        first = tmp_path / "first.yml"
+        first.write_text("---")
+        second = tmp_path / "second.yml"
+        second.write_text("---")
+
+        assert (await hash_source(first)) == (await hash_source(second))
+        second.write_text("--- {}")
+        assert (await hash_source(first)) != (await hash_source(second))
+
+
+class TestPuffManifest:
+    def test_current(self, prepared, tmp_path):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+
+        assert not under_test.is_current(source, "h1", False)
+
+        under_test.update(source, "h1", False, outputs)
+
+        assert under_test.is_current(source, "h1", False)
+        assert not under_test.is_current(source, "h2", False)
+        assert not under_test.is_current(source, "h1", True)
+
+    def test_output_modified(self, prepared, tmp_path):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+
+        outputs[0].unlink()
+
+        assert not under_test.is_current(source, "h1", False)
+
+    def test_stale_outputs(self, prepared, tmp_path):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+
+        result = under_test.update(source, "h2", False, outputs[0:1])
+
+        assert result == [outputs[1]]
+
+    def test_shared_outputs_retained(self, prepared, tmp_path):
+        source, outputs = prepared
+        other = tmp_path / "other.yml"
+        other.write_text("---")
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+        under_test.update(other, "h2", False, outputs[1:2])
+
+        assert under_test.remove(source) == [outputs[0]]
+
+    def test_missing_sources(self, prepared, tmp_path):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+
+        assert under_test.remove_missing_sources() == list()
+
+        source.unlink()
+
+        assert under_test.remove_missing_sources() == outputs
+        assert not under_test.entries
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, prepared, tmp_path):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+
+        await under_test.save()
+        result = await PuffManifest.load(tmp_path)
+
+        assert result.entries == under_test.entries
+        assert result.is_current(source, "h1", False)
+        assert sorted(x.name for x in tmp_path.iterdir()) == [
+            MANIFEST_FILE,
+            "a.json",
+            "b.json",
+            "source.yml",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_empty_removed(self, prepared, tmp_path):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+        await under_test.save()
+
+        under_test.remove(source)
+        await under_test.save()
+
+        assert not (tmp_path / MANIFEST_FILE).exists()
+
+    @pytest.mark.asyncio
+    async def test_other_version_discarded(self, prepared, tmp_path, mocker):
+        source, outputs = prepared
+        under_test = PuffManifest(tmp_path)
+        under_test.update(source, "h1", False, outputs)
+        await under_test.save()
+        mocker.patch(
+            "foodx_devops_tools.puff._manifest.acquire_version",
+            return_value="0.0.0-other",
+        )
+
+        result = await PuffManifest.load(tmp_path)
+
+        assert not result.entries
+
+    @pytest.mark.asyncio
+    async def test_corrupt(self, caplog, tmp_path):
+        (tmp_path / MANIFEST_FILE).write_text(json.dumps({"version": 1})[0:5])
+
+        result = await PuffManifest.load(tmp_path)
+
+        assert not result.entries
+        assert "unusable puff manifest" in caplog.text
@@ -15,6 +15,8 @@ from unittest.mock import AsyncMock
 import pytest
 
 from foodx_devops_tools.puff import run_puff
+from foodx_devops_tools.puff._manifest import MANIFEST_FILE
+from foodx_devops_tools.puff.arm import do_arm_template_parameter_action
 from foodx_devops_tools.puff.run import (
     DELETING_MESSAGE,
     GENERATING_MESSAGE,
@@ -210,3 +212,120 @@ class TestRunPuff:
 
         result = capsys.readouterr().out
         assert DELETING_MESSAGE in result
+
+
+class TestIncrementalRunPuff:
+    MOCK_PUFF = """---
+name: {0}
+environments:
+  e1: {{}}
+  e2: {{}}
+"""
+
+    @pytest.fixture()
+    def prepared(self, mocker, tmp_path):
+        mocker.patch(
+            "foodx_devops_tools.puff.run.load_puffignore",
+            side_effect=AsyncMock(return_value=list()),
+        )
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "y1.yml").write_text(self.MOCK_PUFF.format("y1"))
+        (source_dir / "y2.yml").write_text(self.MOCK_PUFF.format("y2"))
+        mock_action = mocker.patch(
+            "foodx_devops_tools.puff.run.do_arm_template_parameter_action",
+            wraps=do_arm_template_parameter_action,
+        )
+
+        return source_dir, mock_action
+
+    @staticmethod
+    def _generated(source_dir):
+        return sorted(
+            x.name
+            for x in source_dir.glob("*.json")
+            if not x.name.startswith(".")
+        )
+
+    @pytest.mark.asyncio
+    async def test_unchanged_skipped(self, prepared):
+        source_dir, mock_action = prepared
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+        assert mock_action.call_count == 2
+        assert (source_dir / MANIFEST_FILE).is_file()
+
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+
+        assert mock_action.call_count == 2
+        assert self._generated(source_dir) == [
+            "y1.e1.json",
+            "y1.e2.json",
+            "y2.e1.json",
+            "y2.e2.json",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full(self, prepared):
+        source_dir, mock_action = prepared
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+
+        await run_puff(
+            source_dir, False, False, disable_ascii_art=True, is_full=True
+        )
+
+        assert mock_action.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_changed_source(self, prepared):
+        source_dir, mock_action = prepared
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+        (source_dir / "y1.yml").write_text(
+            """---
+name: y1
+environments:
+  e3: {}
+"""
+        )
+
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+
+        assert mock_action.call_count == 3
+        mock_action.assert_called_with(
+            source_dir / "y1.yml", None, False, False
+        )
+        assert self._generated(source_dir) == [
+            "y1.e3.json",
+            "y2.e1.json",
+            "y2.e2.json",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_modified_output(self, prepared):
+        source_dir, mock_action = prepared
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+        (source_dir / "y2.e1.json").write_text("{}")
+
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+
+        assert mock_action.call_count == 3
+        assert (source_dir / "y2.e1.json").read_text() != "{}"
+
+    @pytest.mark.asyncio
+    async def test_deleted_source(self, prepared):
+        source_dir, mock_action = prepared
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+        (source_dir / "y1.yml").unlink()
+
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+
+        assert self._generated(source_dir) == ["y2.e1.json", "y2.e2.json"]
+
+    @pytest.mark.asyncio
+    async def test_delete(self, prepared):
+        source_dir, mock_action = prepared
+        await run_puff(source_dir, False, False, disable_ascii_art=True)
+
+        await run_puff(source_dir, True, False, disable_ascii_art=True)
+
+        assert self._generated(source_dir) == list()
+        assert not (source_dir / MANIFEST_FILE).exists()
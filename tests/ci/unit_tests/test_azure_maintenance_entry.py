@@ -0,0 +1,19 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+from foodx_devops_tools.azure_maintenance_entry import flit_entry
+
+
+class TestFlitEntry:
+    def test_clean(self, mocker):
+        mock_maintenance = mocker.patch(
+            "foodx_devops_tools.azure_maintenance_entry.azure_maintenance"
+        )
+
+        flit_entry()
+
+        mock_maintenance.assert_called_once_with()
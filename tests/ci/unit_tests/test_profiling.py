@@ -5,10 +5,24 @@
 #  You should have received a copy of the MIT License along with
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
+import asyncio
 import logging
 import time
 
-from foodx_devops_tools.profiling import timing
+import pytest
+
+from foodx_devops_tools.profiling import (
+    EventLoopLag,
+    EventLoopLagMonitor,
+    SpanKind,
+    SpanTracer,
+    last_event_loop_lag,
+    start_tracing,
+    stop_tracing,
+    timing,
+    trace_count,
+    trace_span,
+)
 
 log = logging.getLogger(__name__)
 
@@ -23,3 +37,148 @@ def test_clean(mocker):
 
     assert t.elapsed_time_seconds == 2.3
     assert t.elapsed_time_formatted == "0:00:02.300000"
+
+
+class TestSpanTracer:
+    def test_nested(self):
+        under_test = SpanTracer()
+
+        with under_test.span("outer", SpanKind.iteration) as outer:
+            with under_test.span("inner", SpanKind.frame, extra=3) as inner:
+                pass
+
+        assert [x.name for x in under_test.spans] == ["inner", "outer"]
+        assert outer.parent_id is None
+        assert inner.parent_id == outer.span_id
+        assert inner.attributes == {"extra": 3}
+
+    @pytest.mark.asyncio
+    async def test_async_parents(self):
+        under_test = SpanTracer()
+
+        async def child(name):
+            with under_test.span(name, SpanKind.application):
+                await asyncio.sleep(0.01)
+
+        with under_test.span("parent", SpanKind.frame) as parent:
+            await asyncio.gather(child("c1"), child("c2"))
+
+        children = [x for x in under_test.spans if x.name != "parent"]
+        assert len(children) == 2
+        assert all([x.parent_id == parent.span_id for x in children])
+        # concurrent children are recorded in distinct lanes
+        assert children[0].lane != children[1].lane
+
+    def test_chrome_trace(self):
+        under_test = SpanTracer()
+        with under_test.span("outer", SpanKind.iteration):
+            with under_test.span("inner", SpanKind.command):
+                pass
+
+        result = under_test.chrome_trace()
+
+        events = result["traceEvents"]
+        assert [x["name"] for x in events] == ["outer", "inner"]
+        assert all([x["ph"] == "X" for x in events])
+        assert events[0]["cat"] == "iteration"
+        assert events[1]["args"]["parent_id"] == events[0]["args"]["span_id"]
+        assert events[0]["dur"] >= events[1]["dur"]
+
+    def test_counters(self):
+        under_test = SpanTracer()
+
+        under_test.count("some event")
+        under_test.count("some event", 2)
+        under_test.count("other event")
+
+        assert under_test.counters == {"some event": 3, "other event": 1}
+        assert under_test.chrome_trace()["otherData"]["counters"] == {
+            "some event": 3,
+            "other event": 1,
+        }
+        assert "some event" in under_test.format_summary()
+
+    def test_self_times(self, mocker):
+        mocker.patch(
+            "foodx_devops_tools.profiling.time.monotonic",
+            # tracer origin, then span start/stop times.
+            side_effect=[0.0, 0.0, 1.0, 2.0, 3.0, 5.0, 10.0],
+        )
+        under_test = SpanTracer()
+        with under_test.span("outer") as outer:
+            with under_test.span("inner") as inner:
+                pass
+            with under_test.span("inner") as inner2:
+                pass
+
+        result = under_test.self_times()
+
+        assert result[inner.span_id] == 1.0
+        assert result[inner2.span_id] == 2.0
+        assert result[outer.span_id] == 7.0
+
+        summary = under_test.summary()
+        assert [(x.name, x.count) for x in summary] == [
+            ("outer", 1),
+            ("inner", 2),
+        ]
+        assert summary[1].total_seconds == 3.0
+        assert "outer" in under_test.format_summary()
+
+
+class TestTraceSpan:
+    def test_inactive(self):
+        with trace_span("something") as this_span:
+            assert this_span is None
+
+    def test_active_timing(self):
+        this_tracer = start_tracing()
+        try:
+            with timing(log, "some.context", SpanKind.frame):
+                with trace_span("something", SpanKind.command):
+                    pass
+        finally:
+            assert stop_tracing() is this_tracer
+
+        result = {x.name: x for x in this_tracer.spans}
+        assert result["some.context"].kind == SpanKind.frame
+        assert result["something"].parent_id == result["some.context"].span_id
+
+    def test_count(self):
+        # no effect while tracing is inactive.
+        trace_count("something")
+        this_tracer = start_tracing()
+        try:
+            trace_count("something")
+        finally:
+            stop_tracing()
+
+        assert this_tracer.counters == {"something": 1}
+
+
+class TestEventLoopLag:
+    def test_statistics(self):
+        under_test = EventLoopLag()
+        assert under_test.mean_seconds == 0.0
+
+        under_test.record(0.1)
+        under_test.record(0.3)
+
+        assert under_test.samples == 2
+        assert under_test.maximum_seconds == 0.3
+        assert under_test.mean_seconds == pytest.approx(0.2)
+
+    @pytest.mark.asyncio
+    async def test_blocked_loop(self):
+        under_test = EventLoopLagMonitor(interval_seconds=0.01)
+        under_test.start()
+        await asyncio.sleep(0.05)
+        # block the event loop.
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+
+        result = await under_test.stop()
+
+        assert result.samples >= 2
+        assert result.maximum_seconds >= 0.15
+        assert last_event_loop_lag() is result
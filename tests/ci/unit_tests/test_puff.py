@@ -122,6 +122,18 @@ class TestMain:
             message = "No puff parameter files found in directory"
             assert message not in caplog.text
 
+    def test_full(self, click_runner, mocker):
+        expected_dir = "some_path"
+        mock_run = mocker.patch("foodx_devops_tools.puff_utility.run_puff")
+
+        with singlefile_fs(expected_dir, click_runner) as puff_file:
+            result = click_runner.invoke(_main, [str(puff_file), "--full"])
+
+            assert result.exit_code == 0
+            mock_run.assert_called_once_with(
+                puff_file, False, False, is_full=True
+            )
+
     def test_puff_error_exits_dirty(self, click_runner, mocker):
         expected_dir = "some_path"
         error_message = "some puff error"
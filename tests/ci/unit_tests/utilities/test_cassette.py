@@ -0,0 +1,258 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import json
+
+import pytest
+
+from foodx_devops_tools.utilities.cassette import (
+    REDACTED,
+    Interaction,
+    RecordingBackend,
+    ReplayBackend,
+    load_cassette,
+    redact_command,
+    save_cassette,
+    secret_leaves,
+    short_secrets,
+)
+from foodx_devops_tools.utilities.command import (
+    CommandBackend,
+    CompletedCommand,
+)
+
+MOCK_SECRET = "very-secret-value"
+
+
+class MockBackend(CommandBackend):
+    def __init__(self):
+        self.commands = list()
+        self.closed = False
+
+    async def run(self, command):
+        self.commands.append(command)
+        return CompletedCommand(
+            returncode=0,
+            out="output {0} {1}".format(command[-1], MOCK_SECRET).encode(),
+            error=b"",
+        )
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _interaction(command, out="", duration_seconds=0.0):
+    return Interaction(
+        command=command,
+        returncode=0,
+        out=out,
+        error="",
+        start_seconds=0.0,
+        duration_seconds=duration_seconds,
+    )
+
+
+class TestSecretLeaves:
+    def test_nested(self):
+        result = secret_leaves(
+            {
+                "sys1": {"k1": "v1-secret", "k2": ["v2-secret", 12345678]},
+                "k3": "v3-secret",
+                "k4": None,
+                "k5": True,
+            }
+        )
+
+        assert result == {"v1-secret", "v2-secret", "12345678", "v3-secret"}
+
+    def test_none(self):
+        assert secret_leaves(None) == set()
+
+    def test_short_secrets(self):
+        assert short_secrets(["true", MOCK_SECRET, ""]) == ["true"]
+
+
+class TestRedactCommand:
+    def test_sensitive_options(self):
+        result = redact_command(
+            ["az", "login", "-u", "user", "-p", "pw", "--tenant", "t"]
+        )
+
+        assert result == [
+            "az",
+            "login",
+            "-u",
+            "user",
+            "-p",
+            REDACTED,
+            "--tenant",
+            "t",
+        ]
+
+    def test_inline_parameters(self):
+        result = redact_command(
+            [
+                "az",
+                "deployment",
+                "group",
+                "create",
+                "--parameters",
+                "@some/file.json",
+                "--parameters",
+                '{"k": "v"}',
+            ]
+        )
+
+        assert result[5] == "@some/file.json"
+        assert result[7] == REDACTED
+
+    def test_secrets(self):
+        result = redact_command(
+            ["something", "--name=x{0}y".format(MOCK_SECRET)], [MOCK_SECRET]
+        )
+
+        assert result == ["something", "--name=x{0}y".format(REDACTED)]
+
+
+class TestCassetteFile:
+    def test_roundtrip(self, tmp_path):
+        cassette_path = tmp_path / "cassette.json"
+        interactions = [_interaction(["az", "group", "list"], out="[]")]
+
+        save_cassette(cassette_path, interactions)
+        result = load_cassette(cassette_path)
+
+        assert result == interactions
+
+    def test_bad_version(self, tmp_path):
+        cassette_path = tmp_path / "cassette.json"
+        cassette_path.write_text(json.dumps({"version": 0}))
+
+        with pytest.raises(ValueError, match=r"unsupported cassette version"):
+            load_cassette(cassette_path)
+
+
+class TestRecordingBackend:
+    @pytest.mark.asyncio
+    async def test_recorded(self, tmp_path):
+        cassette_path = tmp_path / "cassette.json"
+        mock_backend = MockBackend()
+        under_test = RecordingBackend(
+            mock_backend, cassette_path, secrets=[MOCK_SECRET]
+        )
+
+        result = await under_test.run(["az", "login", "-p", MOCK_SECRET])
+        await under_test.aclose()
+
+        assert mock_backend.commands == [["az", "login", "-p", MOCK_SECRET]]
+        assert MOCK_SECRET.encode() in result.out
+        assert mock_backend.closed
+        assert MOCK_SECRET not in cassette_path.read_text()
+        interactions = load_cassette(cassette_path)
+        assert len(interactions) == 1
+        assert interactions[0].command == ["az", "login", "-p", REDACTED]
+        assert interactions[0].out == "output {0} {0}".format(REDACTED)
+
+    def test_short_secrets_refused(self, tmp_path):
+        with pytest.raises(ValueError, match=r"cannot be redacted"):
+            RecordingBackend(
+                MockBackend(),
+                tmp_path / "cassette.json",
+                secrets=["true", MOCK_SECRET, ""],
+            )
+
+    def test_short_secrets_allowed(self, caplog, tmp_path):
+        under_test = RecordingBackend(
+            MockBackend(),
+            tmp_path / "cassette.json",
+            secrets=["true", MOCK_SECRET, ""],
+            allow_short_secrets=True,
+        )
+
+        assert under_test.secrets == [MOCK_SECRET]
+        assert "cannot be redacted" in caplog.text
+
+
+class TestReplayBackend:
+    @pytest.mark.asyncio
+    async def test_replayed(self, tmp_path):
+        cassette_path = tmp_path / "cassette.json"
+        recorder = RecordingBackend(MockBackend(), cassette_path)
+        await recorder.run(["az", "group", "show", "g1"])
+        await recorder.run(["az", "group", "show", "g2"])
+        await recorder.aclose()
+
+        under_test = ReplayBackend.from_file(cassette_path, latency_scale=0)
+        second = await under_test.run(["az", "group", "show", "g2"])
+        first = await under_test.run(["az", "group", "show", "g1"])
+
+        assert first.out.startswith(b"output g1")
+        assert second.out.startswith(b"output g2")
+        assert under_test.served == 2
+
+    @pytest.mark.asyncio
+    async def test_repeats_in_order(self):
+        command = ["az", "deployment", "group", "show"]
+        under_test = ReplayBackend(
+            [
+                _interaction(command, out="Running"),
+                _interaction(command, out="Succeeded"),
+            ],
+            latency_scale=0,
+        )
+
+        result = [(await under_test.run(command)).out for _ in range(3)]
+
+        assert result == [b"Running", b"Succeeded", b"Succeeded"]
+
+    @pytest.mark.asyncio
+    async def test_label_fallback(self):
+        under_test = ReplayBackend(
+            [_interaction(["az", "group", "create", "-n", "g-1"], out="g")],
+            latency_scale=0,
+        )
+
+        result = await under_test.run(["az", "group", "create", "-n", "g-2"])
+
+        assert result.returncode == 0
+        assert result.out == b"g"
+
+    @pytest.mark.asyncio
+    async def test_unmatched(self, caplog):
+        under_test = ReplayBackend(
+            [_interaction(["az", "group", "list"])], latency_scale=0
+        )
+
+        result = await under_test.run(["ansible-vault", "decrypt"])
+
+        assert result.returncode == 1
+        assert under_test.unmatched == 1
+        assert "no recorded command interaction" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_secrets_matched(self):
+        under_test = ReplayBackend(
+            [_interaction(["az", "login", "--tenant", REDACTED], out="x")],
+            latency_scale=0,
+            secrets=[MOCK_SECRET],
+        )
+
+        result = await under_test.run(["az", "login", "--tenant", MOCK_SECRET])
+
+        assert result.out == b"x"
+
+    @pytest.mark.asyncio
+    async def test_latency_scaled(self, mock_async_method):
+        mock_sleep = mock_async_method(
+            "foodx_devops_tools.utilities.cassette.asyncio.sleep"
+        )
+        command = ["az", "group", "list"]
+        interactions = [_interaction(command, duration_seconds=0.2)]
+
+        await ReplayBackend(interactions, latency_scale=0.5).run(command)
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.1))
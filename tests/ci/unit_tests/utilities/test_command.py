@@ -7,6 +7,10 @@
 # https://gitlab.com/ci-cd-devops/build_harness/-/blob/main/tests/ci/unit_tests/test_utility.py
 
 import asyncio
+import logging
+import os
+import signal
+import subprocess
 from unittest.mock import AsyncMock
 
 import pytest
@@ -16,7 +20,39 @@ from foodx_devops_tools.utilities import (
     run_async_command,
     run_command,
 )
-from foodx_devops_tools.utilities.exceptions import CommandError
+from foodx_devops_tools.utilities.command import (
+    DEBUG_EXCERPT_CHARACTERS,
+    DEFAULT_COMMAND_TIMEOUTS,
+    CommandBackend,
+    CompletedCommand,
+    StreamingSubprocessBackend,
+    SubprocessBackend,
+    command_label,
+    command_timeout,
+    command_timeout_counts,
+    forward_termination_signals,
+    get_command_backend,
+    reset_command_timeout_counts,
+    set_command_backend,
+    set_command_timeouts,
+    terminate_process,
+)
+from foodx_devops_tools.utilities.exceptions import (
+    CommandError,
+    CommandTimeoutError,
+)
+
+
+class TestCommandLabel:
+    def test_options_excluded(self):
+        command = ["az", "login", "--password", "secret"]
+
+        assert command_label(command) == "az login"
+
+    def test_maximum_words(self):
+        command = ["az", "deployment", "group", "create", "extra"]
+
+        assert command_label(command) == "az deployment group create"
 
 
 class TestRunCommand:
@@ -54,7 +90,8 @@ class TestRunAsyncCommand:
         mock_run.assert_called_once_with(
             *command,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
         assert result == expected_output
 
@@ -79,3 +116,280 @@ class TestRunAsyncCommand:
             match=r"^External command run did " r"not exit cleanly",
         ):
             await run_async_command(command)
+
+
+class MockBackend(CommandBackend):
+    def __init__(self, returncode=0):
+        self.commands = list()
+        self.returncode = returncode
+        self.out = b"some output"
+
+    async def run(self, command):
+        self.commands.append(command)
+        return CompletedCommand(
+            returncode=self.returncode, out=self.out, error=b"some error"
+        )
+
+
+@pytest.fixture()
+def restore_backend():
+    previous = get_command_backend()
+
+    yield
+
+    set_command_backend(previous)
+
+
+class TestCommandBackend:
+    def test_abstract(self):
+        with pytest.raises(TypeError):
+            CommandBackend()
+
+    def test_default(self, restore_backend):
+        assert isinstance(get_command_backend(), SubprocessBackend)
+
+    def test_set(self, restore_backend):
+        this_backend = MockBackend()
+
+        previous = set_command_backend(this_backend)
+
+        assert isinstance(previous, SubprocessBackend)
+        assert get_command_backend() is this_backend
+
+    def test_reset(self, restore_backend):
+        this_backend = MockBackend()
+        set_command_backend(this_backend)
+
+        previous = set_command_backend(None)
+
+        assert previous is this_backend
+        assert isinstance(get_command_backend(), SubprocessBackend)
+
+    @pytest.mark.asyncio
+    async def test_run_async_command(self, restore_backend):
+        this_backend = MockBackend()
+        set_command_backend(this_backend)
+        command = ["something", "--option"]
+
+        result = await run_async_command(command)
+
+        assert this_backend.commands == [command]
+        assert result == CapturedStreams(out="some output", error="some error")
+
+    @pytest.mark.asyncio
+    async def test_run_async_command_error(self, restore_backend):
+        set_command_backend(MockBackend(returncode=2))
+
+        with pytest.raises(CommandError, match=r"some error$"):
+            await run_async_command(["something"])
+
+
+class TestSubprocessCancellation:
+    @pytest.mark.asyncio
+    async def test_terminated(self):
+        this_task = asyncio.ensure_future(
+            SubprocessBackend().run(["sleep", "30"])
+        )
+        await asyncio.sleep(0.2)
+        this_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(this_task, timeout=5)
+
+
+class TestForwardTerminationSignals:
+    @pytest.fixture()
+    def previous_handler(self):
+        received = list()
+        original = signal.signal(
+            signal.SIGTERM, lambda x, _: received.append(x)
+        )
+
+        yield received
+
+        signal.signal(signal.SIGTERM, original)
+
+    @pytest.mark.asyncio
+    async def test_forwarded(self, previous_handler):
+        with forward_termination_signals():
+            this_task = asyncio.ensure_future(
+                SubprocessBackend().run(["sleep", "30"])
+            )
+            await asyncio.sleep(0.2)
+
+            os.kill(os.getpid(), signal.SIGTERM)
+            result = await asyncio.wait_for(this_task, timeout=5)
+
+        assert result.returncode == -signal.SIGTERM
+        assert previous_handler == [signal.SIGTERM]
+
+    def test_restored(self, previous_handler):
+        before = signal.getsignal(signal.SIGTERM)
+
+        with forward_termination_signals():
+            assert signal.getsignal(signal.SIGTERM) is not before
+
+        assert signal.getsignal(signal.SIGTERM) is before
+
+
+class TestStreamingSubprocessBackend:
+    @pytest.mark.asyncio
+    async def test_clean(self):
+        under_test = StreamingSubprocessBackend()
+
+        result = await under_test.run(
+            ["sh", "-c", "echo out1; echo err1 >&2; echo out2"]
+        )
+
+        assert result.returncode == 0
+        assert result.out == b"out1\nout2\n"
+        assert result.error == b"err1\n"
+
+    @pytest.mark.asyncio
+    async def test_error_returncode(self):
+        under_test = StreamingSubprocessBackend()
+
+        result = await under_test.run(["sh", "-c", "echo failed >&2; exit 3"])
+
+        assert result.returncode == 3
+        assert result.error == b"failed\n"
+
+    @pytest.mark.asyncio
+    async def test_error_tail_bounded(self, caplog):
+        under_test = StreamingSubprocessBackend(error_tail_bytes=20)
+
+        with caplog.at_level(logging.DEBUG):
+            result = await under_test.run(
+                ["sh", "-c", "for x in 1 2 3 4 5 6; do echo line$x >&2; done"]
+            )
+
+        assert result.error == b"...\nline4\nline5\nline6\n"
+        # all lines are forwarded to the log as they arrive.
+        assert "command stderr, sh, line1" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_large_output(self):
+        under_test = StreamingSubprocessBackend()
+
+        result = await under_test.run(
+            ["sh", "-c", "head -c 200000 /dev/zero | tr '\\0' 'x'"]
+        )
+
+        assert result.out == b"x" * 200000
+
+    @pytest.mark.asyncio
+    async def test_run_async_command(self, restore_backend):
+        set_command_backend(StreamingSubprocessBackend())
+
+        with pytest.raises(CommandError, match=r"bad thing\n$"):
+            await run_async_command(["sh", "-c", "echo bad thing >&2; exit 1"])
+
+    @pytest.mark.asyncio
+    async def test_terminated(self):
+        this_task = asyncio.ensure_future(
+            StreamingSubprocessBackend().run(["sleep", "30"])
+        )
+        await asyncio.sleep(0.2)
+        this_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(this_task, timeout=5)
+
+
+class TestDebugExcerpt:
+    @pytest.mark.asyncio
+    async def test_large_output_limited(self, caplog, restore_backend):
+        this_backend = MockBackend()
+        this_backend.out = b"x" * (DEBUG_EXCERPT_CHARACTERS + 10)
+        set_command_backend(this_backend)
+
+        with caplog.at_level(logging.DEBUG):
+            result = await run_async_command(["something"])
+
+        assert len(result.out) == DEBUG_EXCERPT_CHARACTERS + 10
+        assert "({0} characters)".format(len(result.out)) in caplog.text
+        assert result.out not in caplog.text
+
+
+@pytest.fixture()
+def restore_timeouts():
+    previous = set_command_timeouts(None)
+    reset_command_timeout_counts()
+
+    yield
+
+    set_command_timeouts(previous)
+    reset_command_timeout_counts()
+
+
+class TestCommandTimeout:
+    def test_longest_match(self, restore_timeouts):
+        set_command_timeouts({"az": 10, "az login": 5})
+
+        assert command_timeout(["az", "login", "--password", "x"]) == 5
+        assert command_timeout(["az", "group", "list"]) == 10
+        assert command_timeout(["something"]) is None
+
+    def test_path_ignored(self, restore_timeouts):
+        set_command_timeouts({"ansible-vault": 10})
+
+        assert command_timeout(["/venv/bin/ansible-vault", "decrypt"]) == 10
+
+    def test_defaults(self, restore_timeouts):
+        assert (
+            command_timeout(["az", "login"])
+            == DEFAULT_COMMAND_TIMEOUTS["az login"]
+        )
+        assert command_timeout(
+            ["az", "deployment", "group", "validate", "--name", "x"]
+        ) == command_timeout(["az", "deployment", "group", "create"])
+        assert command_timeout(["bash", "-c", "something"]) is None
+
+    @pytest.mark.asyncio
+    async def test_async_timeout(self, restore_timeouts):
+        set_command_timeouts({"sleep": 0.2})
+
+        with pytest.raises(CommandTimeoutError, match=r"timed out, sleep"):
+            await run_async_command(["sleep", "30"])
+
+        assert command_timeout_counts() == {"sleep 30": 1}
+
+    @pytest.mark.asyncio
+    async def test_orphaned_children_killed(self, restore_timeouts):
+        set_command_timeouts({"sh": 0.5})
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+
+        # the background child holds the output pipes open after the shell
+        # exits.
+        with pytest.raises(CommandTimeoutError):
+            await run_async_command(["sh", "-c", "sleep 30 & exit 0"])
+
+        assert (loop.time() - start) < 5
+
+    @pytest.mark.asyncio
+    async def test_terminate_escalation(self):
+        this_process = await asyncio.create_subprocess_exec(
+            "sh",
+            "-c",
+            "trap '' TERM; while true; do sleep 0.1; done",
+            start_new_session=True,
+        )
+        await asyncio.sleep(0.2)
+
+        await terminate_process(this_process, grace_seconds=0.2)
+
+        assert this_process.returncode == -signal.SIGKILL
+
+    def test_sync_timeout(self, mocker, restore_timeouts):
+        set_command_timeouts({"something": 2})
+        mock_run = mocker.patch(
+            "foodx_devops_tools.utilities.command.subprocess.run",
+            side_effect=subprocess.TimeoutExpired(["something"], 2),
+        )
+
+        with pytest.raises(CommandTimeoutError):
+            run_command(["something"])
+
+        mock_run.assert_called_once_with(["something"], timeout=2)
+        assert command_timeout_counts() == {"something": 1}
@@ -0,0 +1,118 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import hashlib
+import os
+import time
+
+from foodx_devops_tools.profiling import start_tracing, stop_tracing
+from foodx_devops_tools.utilities.content_store import (
+    ContentStore,
+    temporary_path,
+)
+
+
+def _generate(target_path, content):
+    source_path = temporary_path(target_path)
+    source_path.write_text(content)
+
+    return source_path, hashlib.sha256(content.encode()).hexdigest()
+
+
+def _commit(store, target_path, content):
+    source_path, content_hash = _generate(target_path, content)
+
+    return store.commit(source_path, target_path, content_hash)
+
+
+class TestContentStore:
+    def test_new(self, tmp_path):
+        under_test = ContentStore(tmp_path / "store")
+        target_path = tmp_path / "target"
+        source_path, content_hash = _generate(target_path, "some content")
+
+        result = under_test.commit(source_path, target_path, content_hash)
+
+        assert result
+        assert target_path.read_text() == "some content"
+        assert not source_path.exists()
+        assert os.path.samefile(
+            target_path, under_test.object_path(content_hash)
+        )
+
+    def test_unchanged(self, tmp_path):
+        under_test = ContentStore(tmp_path / "store")
+        target_path = tmp_path / "target"
+        _commit(under_test, target_path, "some content")
+        os.utime(target_path, (1, 1))
+
+        this_tracer = start_tracing()
+        try:
+            source_path, content_hash = _generate(target_path, "some content")
+            result = under_test.commit(source_path, target_path, content_hash)
+        finally:
+            stop_tracing()
+
+        assert not result
+        assert target_path.stat().st_mtime == 1
+        assert not source_path.exists()
+        assert this_tracer.counters == {"content unchanged": 1}
+        assert sorted(x.name for x in tmp_path.iterdir()) == [
+            "store",
+            "target",
+        ]
+
+    def test_changed(self, tmp_path):
+        under_test = ContentStore(tmp_path / "store")
+        target_path = tmp_path / "target"
+        _commit(under_test, target_path, "first")
+
+        result = _commit(under_test, target_path, "second")
+
+        assert result
+        assert target_path.read_text() == "second"
+        # the previous content is retained in the store.
+        assert len(list((tmp_path / "store").glob("*/*"))) == 2
+
+    def test_shared(self, tmp_path):
+        under_test = ContentStore(tmp_path / "store")
+        first_path = tmp_path / "first"
+        second_path = tmp_path / "second"
+
+        _commit(under_test, first_path, "same")
+        _commit(under_test, second_path, "same")
+
+        assert os.path.samefile(first_path, second_path)
+        assert len(list((tmp_path / "store").glob("*/*"))) == 1
+
+
+class TestPrune:
+    def test_missing_root(self, tmp_path):
+        assert ContentStore(tmp_path / "store").prune() == 0
+
+    def test_linked_retained(self, tmp_path):
+        store = ContentStore(tmp_path / "store")
+        target_path = tmp_path / "target.json"
+        _commit(store, target_path, "content")
+
+        assert store.prune() == 0
+        assert target_path.read_text() == "content"
+
+    def test_unlinked(self, tmp_path):
+        store = ContentStore(tmp_path / "store")
+        target_path = tmp_path / "target.json"
+        _commit(store, target_path, "content")
+        target_path.unlink()
+        (object_path,) = list(store.root.glob("*/*"))
+
+        assert store.prune(60) == 0
+
+        stale = time.time() - 3600
+        os.utime(object_path, (stale, stale))
+
+        assert store.prune(60) == 1
+        assert not object_path.exists()
@@ -0,0 +1,86 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import asyncio
+
+import pytest
+
+from foodx_devops_tools.utilities.http import (
+    HttpConnectionPool,
+    HttpError,
+    HttpSession,
+)
+from tests.ci.support.arm_server import fake_arm_server
+
+TOKEN_PATH = "/t1/oauth2/v2.0/token"
+TOKEN_FORM = b"client_secret=verysecret"
+
+
+class TestHttpConnectionPool:
+    @pytest.mark.asyncio
+    async def test_keep_alive(self):
+        with fake_arm_server() as (endpoint, state):
+            this_pool = HttpConnectionPool(endpoint)
+
+            for _ in range(3):
+                result = await this_pool.request(
+                    "POST", TOKEN_PATH, body=TOKEN_FORM
+                )
+                assert result.ok
+            await this_pool.close()
+
+        assert result.json()["access_token"] == "token3"
+        assert this_pool.connections_opened == 1
+        assert state.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent(self):
+        with fake_arm_server() as (endpoint, state):
+            this_pool = HttpConnectionPool(endpoint, maximum_connections=2)
+
+            results = await asyncio.gather(
+                *[
+                    this_pool.request("POST", TOKEN_PATH, body=TOKEN_FORM)
+                    for _ in range(6)
+                ]
+            )
+            await this_pool.close()
+
+        assert all(x.ok for x in results)
+        assert this_pool.connections_opened <= 2
+
+    @pytest.mark.asyncio
+    async def test_chunked(self):
+        with fake_arm_server() as (endpoint, state):
+            this_session = HttpSession()
+            await this_session.request(
+                "POST", endpoint + TOKEN_PATH, body=TOKEN_FORM
+            )
+            token = (
+                await this_session.request(
+                    "POST", endpoint + TOKEN_PATH, body=TOKEN_FORM
+                )
+            ).json()["access_token"]
+            result = await this_session.request(
+                "GET",
+                endpoint + "/subscriptions/00000000-1111-2222-3333-444444444444"
+                "/resourcegroups?api-version=1",
+                headers={"Authorization": "Bearer {0}".format(token)},
+            )
+            await this_session.close()
+
+        assert result.headers["transfer-encoding"] == "chunked"
+        assert result.json() == {"value": []}
+
+    @pytest.mark.asyncio
+    async def test_connection_refused(self):
+        with fake_arm_server() as (endpoint, _):
+            pass
+        this_pool = HttpConnectionPool(endpoint)
+
+        with pytest.raises(HttpError, match=r"^HTTP connection failed"):
+            await this_pool.request("GET", "/")
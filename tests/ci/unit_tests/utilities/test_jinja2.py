@@ -5,17 +5,31 @@
 #  You should have received a copy of the MIT License along with
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
+import concurrent.futures
 import contextlib
+import os
 import pathlib
 import tempfile
+import threading
 import typing
 
+import jinja2
 import pytest
 import ruamel.yaml
 
+from foodx_devops_tools.profiling import start_tracing, stop_tracing
+from foodx_devops_tools.utilities.content_store import ContentStore
 from foodx_devops_tools.utilities.jinja2 import (
+    CompiledTemplateCache,
     FrameTemplates,
+    RenderedContentCache,
     apply_dynamic_template,
+    get_compiled_template_cache,
+    get_frame_templates,
+    get_render_executor,
+    get_rendered_content_cache,
+    reset_frame_templates,
+    set_render_executor,
 )
 
 MOCK_TEMPLATE = """---
@@ -64,6 +78,316 @@ class TestFrameTemplates:
             target_data = load_yaml(target_file)
             assert target_data == {"this_field": "this_value"}
 
+    @pytest.mark.asyncio
+    async def test_bytecode_cache(self, tmp_path):
+        parameters = {"this_parameter": "this_value"}
+        cache_dir = tmp_path / "cache"
+        with mock_template_dir(MOCK_TEMPLATE) as template_file_path:
+            target_file = template_file_path.parent / "this_target"
+
+            under_test = FrameTemplates([template_file_path.parent], cache_dir)
+            await under_test.apply_template(
+                "mock_template", target_file, parameters
+            )
+
+            assert load_yaml(target_file) == {"this_field": "this_value"}
+            assert len(list(cache_dir.glob("*.cache"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_content_change_reloaded(self, mocker):
+        # the modification time is unchanged on a coarse resolution file
+        # system.
+        mocker.patch("os.path.getmtime", return_value=1.0)
+        parameters = {"this_parameter": "this_value"}
+        with mock_template_dir(MOCK_TEMPLATE) as template_file_path:
+            target_file = template_file_path.parent / "this_target"
+            under_test = FrameTemplates([template_file_path.parent])
+            await under_test.apply_template(
+                "mock_template", target_file, parameters
+            )
+            template_file_path.write_text("other_field: {{ this_parameter }}")
+
+            await under_test.apply_template(
+                "mock_template", target_file, parameters
+            )
+
+            assert load_yaml(target_file) == {"other_field": "this_value"}
+
+
+class TestRenderExecutor:
+    @pytest.mark.asyncio
+    async def test_rendered_in_executor(self):
+        threads = list()
+        parameters = {
+            "this_parameter": "this_value",
+            "record": lambda: threads.append(threading.current_thread()),
+        }
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="render"
+        ) as executor:
+            previous = set_render_executor(executor)
+            try:
+                with mock_template_dir(
+                    "{{ record() or '' }}" + MOCK_TEMPLATE
+                ) as template_file_path:
+                    target_file = template_file_path.parent / "this_target"
+                    under_test = FrameTemplates([template_file_path.parent])
+                    await under_test.apply_template(
+                        "mock_template", target_file, parameters
+                    )
+
+                    target_data = load_yaml(target_file)
+            finally:
+                assert set_render_executor(previous) is executor
+
+        assert target_data == {"this_field": "this_value"}
+        assert threads[0].name.startswith("render")
+
+    def test_default(self):
+        assert get_render_executor() is None
+
+
+@pytest.fixture(params=["event loop", "executor"])
+def render_mode(request):
+    if request.param == "executor":
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            previous = set_render_executor(executor)
+            yield request.param
+            set_render_executor(previous)
+    else:
+        yield request.param
+
+
+class TestStreamingRender:
+    @pytest.mark.asyncio
+    async def test_large(self, render_mode):
+        parameters = {"count": 20000}
+        template = "{% for i in range(count) %}line {{ i }}\n{% endfor %}"
+        with mock_template_dir(template) as template_file_path:
+            target_file = template_file_path.parent / "this_target"
+            under_test = FrameTemplates([template_file_path.parent])
+
+            await under_test.apply_template(
+                "mock_template", target_file, parameters
+            )
+
+            lines = target_file.read_text().splitlines()
+            assert len(lines) == 20000
+            assert lines[-1] == "line 19999"
+            assert sorted(x.name for x in target_file.parent.iterdir()) == [
+                "mock_template",
+                "this_target",
+            ]
+
+    @pytest.mark.asyncio
+    async def test_failed_render(self, render_mode):
+        with mock_template_dir(
+            "{% for i in range(3) %}{{ i }}{% endfor %}{{ x.missing.value }}"
+        ) as template_file_path:
+            target_file = template_file_path.parent / "this_target"
+            target_file.write_text("previous content")
+            under_test = FrameTemplates([template_file_path.parent])
+
+            with pytest.raises(jinja2.UndefinedError):
+                await under_test.apply_template(
+                    "mock_template", target_file, dict()
+                )
+
+            assert target_file.read_text() == "previous content"
+            assert sorted(x.name for x in target_file.parent.iterdir()) == [
+                "mock_template",
+                "this_target",
+            ]
+
+
+class TestRenderReuse:
+    MOCK_TEMPLATE = (
+        "{{ context.network.fqdns.a1 }}\n"
+        '{% include "included" %}\n'
+        "{% for k, v in context.tags.items() %}{{ k }}={{ v }}\n{% endfor %}"
+    )
+
+    @staticmethod
+    def _parameters(a1="a1.example.com", a2="a2.example.com", **tags):
+        return {
+            "context": {
+                "network": {"fqdns": {"a1": a1, "a2": a2}},
+                "tags": tags,
+            }
+        }
+
+    @pytest.fixture()
+    def prepared(self, tmp_path):
+        get_rendered_content_cache().clear()
+        (tmp_path / "templates").mkdir()
+        (tmp_path / "templates" / "mock_template").write_text(
+            self.MOCK_TEMPLATE
+        )
+        (tmp_path / "templates" / "included").write_text(
+            "{{ context.network.fqdns.a1 | upper }}"
+        )
+        yield (
+            FrameTemplates([tmp_path / "templates"]),
+            ContentStore(tmp_path / "store"),
+            tmp_path,
+        )
+        get_rendered_content_cache().clear()
+
+    @pytest.mark.asyncio
+    async def test_unrelated_parameters(self, prepared, render_mode):
+        under_test, store, tmp_path = prepared
+        start_tracing()
+        try:
+            first_hash = await under_test.apply_template(
+                "mock_template",
+                tmp_path / "t1",
+                self._parameters(a2="other", k="v"),
+                content_store=store,
+            )
+            second_hash = await under_test.apply_template(
+                "mock_template",
+                tmp_path / "t2",
+                self._parameters(a2="changed", k="v"),
+                content_store=store,
+            )
+        finally:
+            tracer = stop_tracing()
+
+        assert second_hash == first_hash
+        assert (tmp_path / "t2").read_text() == (
+            "a1.example.com\nA1.EXAMPLE.COM\nk=v\n"
+        )
+        assert os.path.samefile(tmp_path / "t1", tmp_path / "t2")
+        assert tracer.counters["render cache hit"] == 1
+        assert tracer.counters["render cache miss"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_parameters(self, prepared, render_mode):
+        under_test, store, tmp_path = prepared
+        for index, parameters in enumerate(
+            [
+                self._parameters(k="v"),
+                self._parameters(a1="changed", k="v"),
+                self._parameters(k="v", other="x"),
+            ]
+        ):
+            await under_test.apply_template(
+                "mock_template",
+                tmp_path / "t{0}".format(index),
+                parameters,
+                content_store=store,
+            )
+
+        assert (tmp_path / "t1").read_text().startswith("changed\nCHANGED")
+        assert (tmp_path / "t2").read_text().endswith("k=v\nother=x\n")
+        assert get_rendered_content_cache().hits == 0
+
+    @pytest.mark.asyncio
+    async def test_template_changed(self, prepared):
+        under_test, store, tmp_path = prepared
+        await under_test.apply_template(
+            "mock_template", tmp_path / "t1", self._parameters(), store
+        )
+        (tmp_path / "templates" / "included").write_text("changed")
+
+        await under_test.apply_template(
+            "mock_template", tmp_path / "t2", self._parameters(), store
+        )
+
+        assert (tmp_path / "t2").read_text() == "a1.example.com\nchanged\n"
+
+    @pytest.mark.asyncio
+    async def test_pruned_content(self, prepared):
+        under_test, store, tmp_path = prepared
+        await under_test.apply_template(
+            "mock_template", tmp_path / "t1", self._parameters(), store
+        )
+        (tmp_path / "t1").unlink()
+        store.prune()
+
+        await under_test.apply_template(
+            "mock_template", tmp_path / "t2", self._parameters(), store
+        )
+
+        assert (tmp_path / "t2").read_text().startswith("a1.example.com")
+
+    @pytest.mark.asyncio
+    async def test_no_store(self, prepared):
+        under_test, store, tmp_path = prepared
+        for this_name in ["t1", "t2"]:
+            await under_test.apply_template(
+                "mock_template", tmp_path / this_name, self._parameters()
+            )
+
+        assert not os.path.samefile(tmp_path / "t1", tmp_path / "t2")
+        assert len(get_rendered_content_cache()) == 0
+
+
+class TestRenderedContentCache:
+    def test_least_recently_used(self):
+        under_test = RenderedContentCache(maximum_size=2)
+        under_test.put("a", "h1")
+        under_test.put("b", "h2")
+        assert under_test.get("a") == "h1"
+
+        under_test.put("c", "h3")
+
+        assert len(under_test) == 2
+        assert under_test.get("b") is None
+        assert under_test.get("c") == "h3"
+        assert (under_test.hits, under_test.misses) == (2, 1)
+
+    def test_clear(self):
+        under_test = RenderedContentCache()
+        under_test.put("a", "h1")
+        under_test.get("a")
+
+        under_test.clear()
+
+        assert len(under_test) == 0
+        assert (under_test.hits, under_test.misses) == (0, 0)
+
+
+class TestGetFrameTemplates:
+    def test_shared(self, tmp_path):
+        reset_frame_templates()
+        search_paths = [tmp_path / "a", tmp_path / "b"]
+
+        first = get_frame_templates(search_paths)
+        second = get_frame_templates(list(search_paths))
+
+        assert first is second
+
+    def test_distinct(self, tmp_path):
+        reset_frame_templates()
+
+        first = get_frame_templates([tmp_path / "a"])
+        second = get_frame_templates([tmp_path / "b"])
+        third = get_frame_templates([tmp_path / "a"], tmp_path / "cache")
+
+        assert first is not second
+        assert first is not third
+
+    def test_reset(self, tmp_path):
+        first = get_frame_templates([tmp_path])
+
+        reset_frame_templates()
+
+        assert get_frame_templates([tmp_path]) is not first
+
+    def test_least_recently_used_evicted(self, mocker, tmp_path):
+        module = "foodx_devops_tools.utilities.jinja2"
+        mocker.patch(module + ".DEFAULT_ENVIRONMENT_CACHE_SIZE", 2)
+        reset_frame_templates()
+        first = get_frame_templates([tmp_path / "a"])
+        second = get_frame_templates([tmp_path / "b"])
+        get_frame_templates([tmp_path / "a"])
+
+        get_frame_templates([tmp_path / "c"])
+
+        assert get_frame_templates([tmp_path / "a"]) is first
+        assert get_frame_templates([tmp_path / "b"]) is not second
+
 
 class TestApplyDynamicTemplate:
     def test_clean(self):
@@ -75,3 +399,55 @@ class TestApplyDynamicTemplate:
         result = apply_dynamic_template(source_template, parameters)
 
         assert result == "some text variable content"
+
+    def test_cached(self):
+        get_compiled_template_cache().clear()
+        source_template = "some text {{ this_variable }}"
+
+        first = apply_dynamic_template(source_template, {"this_variable": "a"})
+        second = apply_dynamic_template(source_template, {"this_variable": "b"})
+
+        assert (first, second) == ("some text a", "some text b")
+        assert get_compiled_template_cache().misses == 1
+        assert get_compiled_template_cache().hits == 1
+
+    def test_traced_counts(self):
+        get_compiled_template_cache().clear()
+        this_tracer = start_tracing()
+        try:
+            for _ in range(3):
+                apply_dynamic_template("{{ x }}", {"x": 1})
+        finally:
+            stop_tracing()
+
+        assert this_tracer.counters == {
+            "template cache hit": 2,
+            "template cache miss": 1,
+        }
+
+
+class TestCompiledTemplateCache:
+    def test_least_recently_used(self):
+        under_test = CompiledTemplateCache(maximum_size=2)
+
+        first = under_test.get("a")
+        under_test.get("b")
+        # "a" is now the most recently used, so "b" is evicted.
+        assert under_test.get("a") is first
+        under_test.get("c")
+
+        assert len(under_test) == 2
+        assert under_test.get("a") is first
+        assert (under_test.hits, under_test.misses) == (2, 3)
+        under_test.get("b")
+        assert under_test.misses == 4
+
+    def test_clear(self):
+        under_test = CompiledTemplateCache()
+        under_test.get("a")
+        under_test.get("a")
+
+        under_test.clear()
+
+        assert len(under_test) == 0
+        assert (under_test.hits, under_test.misses) == (0, 0)
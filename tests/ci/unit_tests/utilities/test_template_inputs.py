@@ -0,0 +1,159 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import jinja2
+import pytest
+
+from foodx_devops_tools.utilities.template_inputs import (
+    TemplateInputs,
+    analyze_template,
+    find_context_paths,
+)
+
+MOCK_PARAMETERS = {
+    "context": {
+        "environment": {"resource_group": "g1"},
+        "network": {"fqdns": {"a1": "a1.example.com", "a2": "a2.example"}},
+        "items": [{"x": 1}, {"x": 2}],
+    },
+}
+
+
+def _paths(template: str):
+    return find_context_paths(jinja2.Environment().parse(template))
+
+
+class TestFindContextPaths:
+    @pytest.mark.parametrize(
+        "template,expected",
+        [
+            (
+                '{{ context.network.fqdns["a1"] }} {{ context.items[0].x }}',
+                {
+                    ("context", "network", "fqdns", "a1"),
+                    ("context", "items", 0, "x"),
+                },
+            ),
+            # method calls read the whole object.
+            (
+                "{% for k, v in context.network.fqdns.items() %}"
+                "{{ v.upper() }}{% endfor %}",
+                {("context", "network", "fqdns")},
+            ),
+            # local variables and template globals are not parameters.
+            (
+                "{% set n = context.network %}{{ n.fqdns.a1 }}"
+                "{% for i in range(3) %}{{ i.x }}{% endfor %}",
+                {("context", "network")},
+            ),
+            # variable items read the whole object, and the item name.
+            (
+                "{{ context.network.fqdns[name] | tojson }}",
+                {("context", "network", "fqdns"), ("name",)},
+            ),
+            (
+                "{% macro m(v) %}{{ v.a }}{% endmacro %}{{ m(context) }}",
+                {("context",)},
+            ),
+        ],
+    )
+    def test_paths(self, template, expected):
+        assert _paths(template) == expected
+
+
+class TestTemplateInputs:
+    def test_unrelated_parameters(self):
+        under_test = TemplateInputs(
+            source_hash="s1", paths=frozenset({("context", "network", "fqdns")})
+        )
+        changed = {
+            "context": {**MOCK_PARAMETERS["context"], "environment": dict()}
+        }
+
+        assert under_test.key(MOCK_PARAMETERS) == under_test.key(changed)
+
+    def test_read_parameters(self):
+        under_test = TemplateInputs(
+            source_hash="s1",
+            paths=frozenset({("context", "network", "fqdns", "a1")}),
+        )
+        changed = {
+            "context": {
+                **MOCK_PARAMETERS["context"],
+                "network": {"fqdns": {"a1": "changed"}},
+            }
+        }
+
+        assert under_test.key(MOCK_PARAMETERS) != under_test.key(changed)
+        assert under_test.key(MOCK_PARAMETERS) != TemplateInputs(
+            source_hash="s2", paths=under_test.paths
+        ).key(MOCK_PARAMETERS)
+
+    def test_unresolved_path(self):
+        # "keys" is not a key, so the whole object is read.
+        under_test = TemplateInputs(
+            source_hash="s1",
+            paths=frozenset({("context", "network", "fqdns", "keys")}),
+        )
+        changed = {
+            "context": {
+                **MOCK_PARAMETERS["context"],
+                "network": {"fqdns": {"a1": "a1.example.com"}},
+            }
+        }
+
+        assert under_test.key(MOCK_PARAMETERS) != under_test.key(changed)
+
+    def test_undefined_parameter(self):
+        under_test = TemplateInputs(
+            source_hash="s1", paths=frozenset({("other", "value")})
+        )
+
+        assert under_test.key(MOCK_PARAMETERS) == under_test.key(dict())
+        assert under_test.key(MOCK_PARAMETERS) != under_test.key(
+            {"other": {"value": None}}
+        )
+
+
+class TestAnalyzeTemplate:
+    def test_referenced(self):
+        environment = jinja2.Environment(
+            loader=jinja2.DictLoader(
+                {
+                    "main": '{% include "other" %}{{ a.b }}',
+                    "other": '{% import "macros" as m %}{{ c }}',
+                    "macros": "{% macro x() %}{{ d.e }}{% endmacro %}",
+                }
+            )
+        )
+
+        result = analyze_template(environment, "main")
+
+        assert result.paths == {("a", "b"), ("c",), ("d", "e")}
+
+    def test_source_changed(self):
+        templates = {"main": '{% include "other" %}', "other": "{{ a }}"}
+        environment = jinja2.Environment(loader=jinja2.DictLoader(templates))
+        first = analyze_template(environment, "main")
+
+        templates["other"] = "{{ a }}!"
+
+        assert analyze_template(environment, "main") != first
+
+    def test_dynamic_reference(self):
+        environment = jinja2.Environment(
+            loader=jinja2.DictLoader({"main": "{% include name %}"})
+        )
+
+        assert analyze_template(environment, "main") is None
+
+    def test_syntax_error(self):
+        environment = jinja2.Environment(
+            loader=jinja2.DictLoader({"main": "{{ a "})
+        )
+
+        assert analyze_template(environment, "main") is None
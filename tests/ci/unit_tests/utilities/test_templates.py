@@ -5,17 +5,28 @@
 #  You should have received a copy of the MIT License along with
 #  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
 
+import hashlib
 import pathlib
 
 import pytest
 
+import foodx_devops_tools.utilities.jinja2
+from foodx_devops_tools.utilities.content_store import CONTENT_STORE_DIR
+from foodx_devops_tools.utilities.jinja2 import (
+    BYTECODE_CACHE_DIR,
+    reset_frame_templates,
+)
 from foodx_devops_tools.utilities.templates import (
+    ArmTemplateDeploymentFiles,
     TemplateFiles,
     TemplatePaths,
     _apply_template,
     _construct_arm_template_parameter_paths,
+    deployment_files,
     json_inlining,
     prepare_deployment_files,
+    record_deployment_files,
+    reset_deployment_files,
 )
 
 
@@ -119,11 +130,13 @@ class TestPrepareDeploymentFiles:
                     mock_templates.arm_template_parameters.target.name,
                     pathlib.Path("some/target/jinjad.generated.json"),
                     self.MOCK_PARAMETERS,
+                    content_store=mocker.ANY,
                 ),
                 mocker.call(
                     mock_templates.arm_template.source.name,
                     mock_templates.arm_template.target,
                     self.MOCK_PARAMETERS,
+                    content_store=mocker.ANY,
                 ),
             ],
             any_order=True,
@@ -165,12 +178,121 @@ class TestPrepareDeploymentFiles:
                     mock_templates.arm_template_parameters.target.name,
                     pathlib.Path("some/target/jinjad.generated.json"),
                     self.MOCK_PARAMETERS,
+                    content_store=mocker.ANY,
                 ),
                 mocker.call(
                     mock_templates.arm_template.source.name,
                     mock_templates.arm_template.target,
                     self.MOCK_PARAMETERS,
+                    content_store=mocker.ANY,
                 ),
             ],
             any_order=True,
         )
+
+    @pytest.mark.asyncio
+    async def test_shared_environment(
+        self, mock_async_method, mocker, tmp_path
+    ):
+        reset_frame_templates()
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "arm.json").write_text('{"k": "{{ k1 }}"}')
+        working_dir = tmp_path / "working"
+        mock_templates = TemplateFiles(
+            arm_template=TemplatePaths(
+                source=source_dir / "arm.json",
+                target=working_dir / "arm.json",
+            ),
+            arm_template_parameters=TemplatePaths(
+                source=source_dir / "arm.yml",
+                target=working_dir / "arm.c.s.json",
+            ),
+        )
+
+        async def _mock_puff(*args, output_dir, **kwargs):
+            (output_dir / "arm.c.s.json").write_text('{"p": "{{ k2 }}"}')
+
+        mock_async_method(
+            "foodx_devops_tools.utilities.templates.run_puff",
+            side_effect=_mock_puff,
+        )
+        mock_environment = mocker.spy(
+            foodx_devops_tools.utilities.jinja2, "FrameTemplates"
+        )
+
+        for _ in range(2):
+            result = await prepare_deployment_files(
+                mock_templates, self.MOCK_PARAMETERS
+            )
+
+        mock_environment.assert_called_once()
+        assert result.arm_template.read_text() == '{"k": "v1"}'
+        assert result.parameters.read_text() == '{"p": "v2"}'
+        assert list((working_dir / BYTECODE_CACHE_DIR).glob("*.cache"))
+
+    @pytest.mark.asyncio
+    async def test_unchanged_content(self, mock_async_method, mocker, tmp_path):
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "arm.json").write_text('{"k": "{{ k1 }}"}')
+        working_dir = tmp_path / "working"
+        mock_templates = TemplateFiles(
+            arm_template=TemplatePaths(
+                source=source_dir / "arm.json",
+                target=working_dir / "arm.json",
+            ),
+            arm_template_parameters=TemplatePaths(
+                source=source_dir / "arm.yml",
+                target=working_dir / "arm.c.s.json",
+            ),
+        )
+
+        async def _mock_puff(*args, output_dir, **kwargs):
+            (output_dir / "arm.c.s.json").write_text('{"p": "{{ k2 }}"}')
+
+        mock_async_method(
+            "foodx_devops_tools.utilities.templates.run_puff",
+            side_effect=_mock_puff,
+        )
+
+        first = await prepare_deployment_files(
+            mock_templates, self.MOCK_PARAMETERS
+        )
+        first_stat = first.arm_template.stat()
+        second = await prepare_deployment_files(
+            mock_templates, self.MOCK_PARAMETERS
+        )
+        second_stat = second.arm_template.stat()
+        third = await prepare_deployment_files(
+            mock_templates, {**self.MOCK_PARAMETERS, "k1": "changed"}
+        )
+
+        assert second == first
+        assert (
+            first.arm_template_hash
+            == hashlib.sha256(b'{"k": "v1"}').hexdigest()
+        )
+        assert first.parameters_hash
+        assert second_stat.st_ino == first_stat.st_ino
+        assert third.arm_template_hash != first.arm_template_hash
+        assert third.parameters_hash == first.parameters_hash
+        assert third.arm_template.read_text() == '{"k": "changed"}'
+        assert (working_dir / CONTENT_STORE_DIR).is_dir()
+
+
+class TestDeploymentFiles:
+    def test_record(self):
+        reset_deployment_files()
+        this_files = ArmTemplateDeploymentFiles(
+            arm_template=pathlib.Path("a"),
+            parameters=pathlib.Path("p"),
+            arm_template_hash="h1",
+            parameters_hash="h2",
+        )
+
+        record_deployment_files("some.context", this_files)
+
+        assert deployment_files() == {"some.context": this_files}
+        reset_deployment_files()
+        assert deployment_files() == dict()
@@ -0,0 +1,113 @@
+#  Copyright (c) 2022 Food-X Technologies
+#
+#  This file is part of foodx_devops_tools.
+#
+#  You should have received a copy of the MIT License along with
+#  foodx_devops_tools. If not, see <https://opensource.org/licenses/MIT>.
+
+import os
+import time
+
+from foodx_devops_tools.utilities.content_store import (
+    CONTENT_STORE_DIR,
+    ContentStore,
+)
+from foodx_devops_tools.utilities.jinja2 import BYTECODE_CACHE_DIR
+from foodx_devops_tools.utilities.working import (
+    WORKING_NAME_PATTERN,
+    encode_working_name,
+    prune_working_directories,
+)
+
+MOCK_PARAMETERS = {"context": {"frame_name": "f1"}, "environment": {"k": 1}}
+
+
+def _make_stale(path, age_seconds=3600):
+    stale = time.time() - age_seconds
+    os.utime(path, (stale, stale))
+
+
+class TestEncodeWorkingName:
+    def test_stable(self):
+        first = encode_working_name("some.context", MOCK_PARAMETERS)
+        second = encode_working_name(
+            "some.context",
+            {"environment": {"k": 1}, "context": {"frame_name": "f1"}},
+        )
+
+        assert first == second
+        assert WORKING_NAME_PATTERN.match(first)
+
+    def test_distinct(self):
+        result = {
+            encode_working_name("some.context", MOCK_PARAMETERS),
+            encode_working_name("other.context", MOCK_PARAMETERS),
+            encode_working_name(
+                "some.context", {**MOCK_PARAMETERS, "environment": {"k": 2}}
+            ),
+        }
+
+        assert len(result) == 3
+
+    def test_legacy_name_pattern(self):
+        assert WORKING_NAME_PATTERN.match("w")
+        assert not WORKING_NAME_PATTERN.match("w-xyz")
+        assert not WORKING_NAME_PATTERN.match(".content")
+
+
+class TestPruneWorkingDirectories:
+    def test_missing_root(self, tmp_path):
+        result = prune_working_directories(tmp_path / "working", 0, set())
+
+        assert result == list()
+
+    def test_pruned(self, tmp_path):
+        names = [
+            encode_working_name(x, MOCK_PARAMETERS) for x in ["a", "b", "c"]
+        ]
+        for this_name in names + ["w", "other", ".jinja2_cache"]:
+            (tmp_path / this_name).mkdir()
+            _make_stale(tmp_path / this_name)
+        # recently used.
+        (tmp_path / names[2]).touch()
+
+        result = prune_working_directories(tmp_path, 60, {tmp_path / names[0]})
+
+        assert set(result) == {tmp_path / names[1], tmp_path / "w"}
+        assert (tmp_path / names[0]).is_dir()
+        assert (tmp_path / names[2]).is_dir()
+        assert (tmp_path / "other").is_dir()
+        assert (tmp_path / ".jinja2_cache").is_dir()
+
+    def test_unlinked_content_pruned(self, tmp_path):
+        store = ContentStore(tmp_path / CONTENT_STORE_DIR)
+        working_name = encode_working_name("a", MOCK_PARAMETERS)
+        (tmp_path / working_name).mkdir()
+        for this_hash, this_target in [
+            ("ab01", tmp_path / working_name / "t1.json"),
+            ("cd02", tmp_path / "t2.json"),
+        ]:
+            source = tmp_path / "source"
+            source.write_text(this_hash)
+            store.commit(source, this_target, this_hash)
+            _make_stale(store.object_path(this_hash))
+        _make_stale(tmp_path / working_name)
+        (tmp_path / "t2.json").unlink()
+
+        prune_working_directories(tmp_path, 60, set())
+
+        assert not (tmp_path / working_name).exists()
+        assert not store.object_path("ab01").exists()
+        assert not store.object_path("cd02").exists()
+
+    def test_compiled_templates_pruned(self, tmp_path):
+        cache_dir = tmp_path / BYTECODE_CACHE_DIR
+        cache_dir.mkdir()
+        for this_name in ["stale.cache", "fresh.cache"]:
+            (cache_dir / this_name).write_text("compiled")
+        _make_stale(cache_dir / "stale.cache")
+
+        prune_working_directories(tmp_path, 60, set())
+
+        assert not (cache_dir / "stale.cache").exists()
+        assert (cache_dir / "fresh.cache").is_file()